@@ -0,0 +1,68 @@
+"""
+Micro-benchmark of the TOML backends used by StylingParser.
+
+Builds a large Styling.toml by cloning the letter style of the bundled
+example file, then times each installed backend on a full parse and on
+parse plus a single dropdown list (which StylingData derives lazily).
+
+    python benchmark_styling_parser.py --letter-styles 500 --repeat 5
+"""
+import argparse
+import os
+import re
+import tempfile
+import time
+
+import toml_backends
+from styling_parser import StylingParser
+
+EXAMPLE_STYLING = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'asset', 'Styling.toml')
+
+
+def build_styling_text(letter_styles: int) -> str:
+    """Return the example styling file with ``letter_styles`` extra letter styles appended."""
+    with open(EXAMPLE_STYLING, 'r', encoding='utf-8') as f:
+        text = f.read()
+    # The first [[letterStyle]] block, including its layers, is the template
+    start = text.index('[[letterStyle]]')
+    end = text.index('[[letterStyle]]', start + 1)
+    template = text[start:end]
+    blocks = [re.sub(r'^name = ".*"$', f'name = "Generated {i}"', template, count=1, flags=re.M)
+              for i in range(letter_styles)]
+    return text + '\n' + ''.join(blocks)
+
+
+def best_time(func, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--letter-styles', type=int, default=500, help="Extra letter styles to generate")
+    parser.add_argument('--repeat', type=int, default=5, help="Runs per measurement; the best is reported")
+    args = parser.parse_args()
+
+    text = build_styling_text(args.letter_styles)
+    with tempfile.NamedTemporaryFile('w', suffix='.toml', delete=False, encoding='utf-8') as f:
+        f.write(text)
+        path = f.name
+    try:
+        print(f"Styling file: {len(text) / 1024:.0f} KiB, {text.count('[[letterStyle]]')} letter styles")
+        for name in toml_backends.available_backends():
+            styling_parser = StylingParser(backend=name)
+            parse = best_time(lambda: styling_parser.parse_styling_file(path), args.repeat)
+            one_list = best_time(lambda: styling_parser.parse_styling_file(path)['content_styles'], args.repeat)
+            all_lists = best_time(lambda: [v for v in styling_parser.parse_styling_file(path).values()], args.repeat)
+            print(f"{name:8s} parse {parse * 1000:8.1f} ms   "
+                  f"+1 list {one_list * 1000:8.1f} ms   +all lists {all_lists * 1000:8.1f} ms")
+    finally:
+        os.unlink(path)
+
+
+if __name__ == '__main__':
+    main()
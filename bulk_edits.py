@@ -0,0 +1,101 @@
+"""
+Cell lists for bulk edits of a selection: fill down, fill with a value,
+numeric series and clear.
+
+Each helper returns ``(row, col, value)`` tuples for ``set_values`` so a
+bulk edit is applied as one batched write, one change notification and one
+undo entry. Selections are given as rectangles (see selection_ranges.py) and
+every selected cell appears at most once.
+"""
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+from selection_ranges import Rect, iter_cells, merge_intervals, row_bands
+
+Number = Union[int, float]
+Cell = Tuple[int, int, str]
+
+
+def column_runs(rects: List[Rect]) -> Dict[int, List[Tuple[int, int]]]:
+    """Return {col: merged inclusive row intervals} of the selected cells per column."""
+    runs: Dict[int, List[Tuple[int, int]]] = {}
+    for first, last, columns in row_bands(rects):
+        for start, end in columns:
+            for col in range(start, end + 1):
+                runs.setdefault(col, []).append((first, last))
+    return {col: merge_intervals(intervals) for col, intervals in runs.items()}
+
+
+def fill_down_cells(rows: list, rects: List[Rect]) -> Iterator[Cell]:
+    """
+    Copy the top cell of each selected run down the rest of the run.
+    A run of a single cell is filled from the cell above it, like in
+    other spreadsheets.
+    """
+    for col, runs in column_runs(rects).items():
+        for first, last in runs:
+            if first == last:
+                if first == 0:
+                    continue
+                value = rows[first - 1][col]
+            else:
+                value = rows[first][col]
+                first += 1
+            for row in range(first, last + 1):
+                yield row, col, value
+
+
+def fill_value_cells(rects: List[Rect], value: str) -> Iterator[Cell]:
+    return ((row, col, value) for row, col in iter_cells(rects))
+
+
+def parse_number(text) -> Optional[Number]:
+    """Parse an int or float cell value; returns None for empty or non-numeric text."""
+    text = str(text).strip()
+    if not text:
+        return None
+    try:
+        return int(text)
+    except ValueError:
+        pass
+    try:
+        return float(text)
+    except ValueError:
+        return None
+
+
+def format_number(value: Number) -> str:
+    if isinstance(value, int):
+        return str(value)
+    # Round away float noise (0.1 * 3 == 0.30000000000000004)
+    return f"{value:.9f}".rstrip('0').rstrip('.')
+
+
+def infer_series(rows: list, rects: List[Rect]) -> Tuple[Number, Number]:
+    """
+    Guess (start, step) from the first selected column: its first two selected
+    cells if both are numeric, else its first cell with a step of 1.
+    """
+    runs = column_runs(rects)
+    if not runs:
+        return 0, 1
+    col = min(runs)
+    selected = (row for first, last in runs[col] for row in range(first, last + 1))
+    first_row = next(selected)
+    start = parse_number(rows[first_row][col])
+    second_row = next(selected, None)
+    second = parse_number(rows[second_row][col]) if second_row is not None else None
+    if start is None:
+        return 0, 1
+    if second is None or second == start:
+        return start, 1
+    return start, second - start
+
+
+def series_cells(rects: List[Rect], start: Number, step: Number) -> Iterator[Cell]:
+    """Number the selected cells of each column start, start + step, ... from the top."""
+    for col, runs in column_runs(rects).items():
+        i = 0
+        for first, last in runs:
+            for row in range(first, last + 1):
+                yield row, col, format_number(start + i * step)
+                i += 1
@@ -0,0 +1,190 @@
+"""
+Uppercasing of credits text the way letter styles with ``uppercase = true``
+render it.
+
+``[global].uppercaseExceptions`` lists patterns that are left as written:
+``_`` marks a word boundary and a trailing ``#`` means the word goes on, its
+remainder being uppercased. So ``_van_`` keeps the word "van" lowercase and
+``_Mc#`` keeps "Mc" in "McDonald" but uppercases "DONALD". The patterns are
+compiled into one regular expression shaped like a trie of the literals
+(longer ones first, so "_von und zu_" wins over "_von_"), which finds every
+exception in a single pass over a string;
+results are memoized, as credits repeat the same names and words a lot.
+
+Which letter style a cell uses follows Cinecred: the head, body or tail
+letter style of the row's content style, where a blank ``@Content Style``
+keeps the one of the row above, switched inline by ``{{Style Name}}`` and
+reset by ``{{Style}}``.
+"""
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from style_usage import STYLE_TAG
+
+CACHE_SIZE = 65536
+# Column header -> index into a content style's (head, body, tail) letter styles
+NAME_SLOTS = {'@Head': 0, '@Body': 1, '@Tail': 2}
+CONTENT_STYLE_HEADER = '@Content Style'
+LETTER_STYLE_KEYS = ('headLetterStyleName', 'bodyLetterStyleName', 'tailLetterStyleName')
+# Any {{...}} directive; its text is never uppercased
+DIRECTIVE = re.compile(r'\{\{[^{}]*\}\}')
+STYLE_RESET = re.compile(r'\{\{\s*Style\s*\}\}', re.IGNORECASE)
+
+
+def compile_exceptions(patterns: Iterable[str]) -> Optional["re.Pattern"]:
+    """Return one regex matching the literal part of any exception pattern, or None for no patterns."""
+    # Literals grouped by whether they must start a word, each as (literal, end condition)
+    anchored, unanchored = [], []
+    for pattern in {str(p) for p in patterns}:
+        body, end = pattern, ''
+        group = unanchored
+        if body.startswith('_'):
+            body, group = body[1:], anchored
+        if body.endswith('_'):
+            body, end = body[:-1], r'(?!\w)'
+        elif body.endswith('#'):
+            body, end = body[:-1], r'(?=\w)'
+        if body:
+            group.append((body, end))
+    alternatives = []
+    if anchored:
+        alternatives.append(r'(?<!\w)' + _trie_regex(anchored))
+    if unanchored:
+        alternatives.append(_trie_regex(unanchored))
+    return re.compile('|'.join(alternatives)) if alternatives else None
+
+
+def _trie_regex(entries) -> str:
+    """Build a regex from a trie of the literals, so each position is tested once per character."""
+    trie = {}
+    for literal, end in entries:
+        node = trie
+        for char in literal:
+            node = node.setdefault(char, {})
+        node.setdefault(None, set()).add(end)
+    return _node_regex(trie)
+
+
+def _node_regex(node) -> str:
+    # Longer literals first, then the ones ending here
+    alternatives = [re.escape(char) + _node_regex(child) for char, child in sorted(
+        (item for item in node.items() if item[0] is not None), key=lambda item: item[0])]
+    alternatives.extend(sorted(node.get(None, ())))
+    if len(alternatives) == 1:
+        return alternatives[0]
+    return '(?:' + '|'.join(alternatives) + ')'
+
+
+class CasingEngine:
+    """Uppercases strings except where an exception pattern matches."""
+
+    def __init__(self, exceptions: Iterable[str] = ()):
+        self.exceptions = list(exceptions)
+        self.regex = compile_exceptions(self.exceptions)
+        self.uppercase = lru_cache(maxsize=CACHE_SIZE)(self._uppercase)
+
+    def _uppercase(self, text: str) -> str:
+        if self.regex is None:
+            return text.upper()
+        parts = []
+        position = 0
+        for match in self.regex.finditer(text):
+            parts.append(text[position:match.start()].upper())
+            parts.append(match.group())
+            position = match.end()
+        if not parts:
+            return text.upper()
+        parts.append(text[position:].upper())
+        return ''.join(parts)
+
+    def exceptions_in(self, text: str) -> List[str]:
+        """Return the text kept as written by exceptions."""
+        return [m.group() for m in self.regex.finditer(text)] if self.regex is not None else []
+
+
+class LetterCasing:
+    """
+    Renders cell text with the casing of its letter styles, from the raw
+    Styling.toml document.
+    """
+
+    def __init__(self, document: Optional[dict] = None):
+        document = document or {}
+        self.engine = CasingEngine(document.get('global', {}).get('uppercaseExceptions', []) or [])
+        self.uppercase_styles = {str(style.get('name', '')) for style in document.get('letterStyle', [])
+                                 if style.get('uppercase')}
+        self.content_letter_styles: Dict[str, Tuple[str, str, str]] = {
+            str(style.get('name', '')): tuple(str(style.get(key, '')) for key in LETTER_STYLE_KEYS)
+            for style in document.get('contentStyle', [])
+        }
+        self.render = lru_cache(maxsize=CACHE_SIZE)(self._render)
+
+    def is_active(self) -> bool:
+        """Return True if any letter style is uppercased, i.e. rendering can change text."""
+        return bool(self.uppercase_styles)
+
+    def letter_style(self, content_style: str, slot: int) -> str:
+        styles = self.content_letter_styles.get(content_style)
+        return styles[slot] if styles else ''
+
+    def _render(self, text: str, letter_style: str) -> str:
+        """Return ``text`` as rendered in ``letter_style``; markup is kept as written."""
+        if '{{' not in text:
+            return self.engine.uppercase(text) if letter_style in self.uppercase_styles else text
+        parts = []
+        style = letter_style
+        position = 0
+        for match in DIRECTIVE.finditer(text):
+            segment = text[position:match.start()]
+            parts.append(self.engine.uppercase(segment) if style in self.uppercase_styles else segment)
+            parts.append(match.group())
+            tag = STYLE_TAG.fullmatch(match.group())
+            if tag and tag.group(2).strip():
+                style = tag.group(2).strip()
+            elif STYLE_RESET.fullmatch(match.group()):
+                style = letter_style
+            position = match.end()
+        segment = text[position:]
+        parts.append(self.engine.uppercase(segment) if style in self.uppercase_styles else segment)
+        return ''.join(parts)
+
+    @staticmethod
+    def row_content_styles(headers: List[str], rows: List[List[str]]) -> List[str]:
+        """Return the content style in effect on each row (blank cells keep the previous one)."""
+        try:
+            col = headers.index(CONTENT_STYLE_HEADER)
+        except ValueError:
+            return [''] * len(rows)
+        styles = []
+        current = ''
+        for row in rows:
+            current = row[col].strip() or current
+            styles.append(current)
+        return styles
+
+    def check(self, headers: List[str], rows: List[List[str]], limit: int = 5000) -> dict:
+        """
+        Render every @Head/@Body/@Tail cell in one pass. Returns the number of
+        uppercased cells and up to ``limit`` (row, col, text, rendered) of
+        those where exception patterns matched. ``headers`` are canonical
+        headers.
+        """
+        columns = [(col, NAME_SLOTS[h]) for col, h in enumerate(headers) if h in NAME_SLOTS]
+        content_styles = self.row_content_styles(headers, rows)
+        uppercase_styles = self.uppercase_styles
+        uppercased = 0
+        kept = []
+        for r, (row, content_style) in enumerate(zip(rows, content_styles)):
+            letter_styles = self.content_letter_styles.get(content_style, ('', '', ''))
+            for col, slot in columns:
+                text = row[col]
+                if not text or (letter_styles[slot] not in uppercase_styles and '{{' not in text):
+                    continue
+                rendered = self.render(text, letter_styles[slot])
+                if rendered == text:
+                    continue
+                uppercased += 1
+                if len(kept) < limit and self.engine.exceptions_in(text):
+                    kept.append((r, col, text, rendered))
+        return {'uppercased': uppercased, 'exceptions': kept}
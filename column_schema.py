@@ -0,0 +1,120 @@
+"""
+Column schema of the credits table.
+
+Each known column has a role (``content_style``, ``page_runtime``, ...), a
+canonical header and, for styling columns, the ``styling_data`` key holding
+its dropdown items. Headers are matched case- and whitespace-insensitively,
+so reordered columns, extra columns and localized header names all resolve.
+Localized names are read from an optional ``column_names.toml`` next to the
+application, mapping roles to header lists::
+
+    content_style = ["@Inhaltsstil"]
+    page_style = ["@Seitenstil"]
+
+``ColumnSchema.compile`` resolves the headers once per table layout into a
+``ColumnLayout``: flat per-column lists, so per-cell lookups are an index.
+"""
+import os
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+import toml_backends
+
+ALIASES_FILE = Path(__file__).resolve().parent / 'column_names.toml'
+
+
+class ColumnRole(NamedTuple):
+    name: str
+    header: str
+    # styling_data key of the dropdown items; None for free text columns
+    items_key: Optional[str] = None
+
+
+COLUMN_ROLES = (
+    ColumnRole('head', '@Head'),
+    ColumnRole('body', '@Body'),
+    ColumnRole('tail', '@Tail'),
+    ColumnRole('vertical_gap', '@Vertical Gap', 'gaps'),
+    ColumnRole('content_style', '@Content Style', 'content_styles'),
+    ColumnRole('break_harmonization', '@Break Harmonization', 'harmonization_values'),
+    ColumnRole('spine_position', '@Spine Position', 'spine_positions'),
+    ColumnRole('page_style', '@Page Style', 'page_styles'),
+    ColumnRole('page_runtime', '@Page Runtime', 'runtimes'),
+    ColumnRole('page_gap', '@Page Gap', 'gaps'),
+)
+
+
+def header_key(header) -> str:
+    """Return the lookup key of a header: folded case, single spaces."""
+    return ' '.join(str(header).split()).casefold()
+
+
+class ColumnLayout:
+    """
+    The roles of one table's columns, resolved from its headers. All
+    per-column attributes are lists indexed by column.
+    """
+
+    def __init__(self, headers: List[str], roles: List[Optional[ColumnRole]], plugin_types: List):
+        self.headers = headers
+        self.roles = roles
+        self.items_keys = [role.items_key if role else None for role in roles]
+        # Column types contributed by plugins (plugin_registry.ColumnType), or None
+        self.plugin_types = plugin_types
+        # Canonical header per column, so indexes keyed by English headers work on localized tables
+        self.canonical_headers = [role.header if role else header.strip() for header, role in zip(headers, roles)]
+        self._columns: Dict[str, int] = {}
+        for col, role in enumerate(roles):
+            if role is not None:
+                self._columns.setdefault(role.name, col)
+
+    def __len__(self) -> int:
+        return len(self.headers)
+
+    def column_of(self, role: str) -> int:
+        """Return the first column with ``role``, or -1."""
+        return self._columns.get(role, -1)
+
+    def is_style_column(self, col: int) -> bool:
+        """Return True if the column offers a style dropdown."""
+        return 0 <= col < len(self.items_keys) and self.items_keys[col] is not None
+
+    def style_columns(self) -> List[int]:
+        return [col for col, key in enumerate(self.items_keys) if key is not None]
+
+
+class ColumnSchema:
+    """Known column roles and the header names (canonical and localized) that select them."""
+
+    def __init__(self, roles: Iterable[ColumnRole] = COLUMN_ROLES, aliases_file=ALIASES_FILE):
+        self.roles = {role.name: role for role in roles}
+        self._by_header: Dict[str, ColumnRole] = {header_key(role.header): role for role in self.roles.values()}
+        if aliases_file and os.path.exists(aliases_file):
+            try:
+                for name, headers in toml_backends.load(str(aliases_file)).items():
+                    self.add_aliases(name, headers)
+            except Exception as e:
+                print(f"Ignoring column names in {aliases_file}: {e}")
+
+    def add_aliases(self, role_name: str, headers) -> None:
+        """Let ``headers`` (e.g. localized names) select the column role ``role_name``."""
+        role = self.roles.get(role_name)
+        if role is None:
+            raise ValueError(f"Unknown column role: {role_name}")
+        for header in [headers] if isinstance(headers, str) else headers:
+            self._by_header.setdefault(header_key(header), role)
+
+    def role_for_header(self, header) -> Optional[ColumnRole]:
+        return self._by_header.get(header_key(header))
+
+    def compile(self, headers: List[str], plugins=None) -> ColumnLayout:
+        """Resolve ``headers`` into a ColumnLayout; ``plugins`` is an optional PluginRegistry."""
+        headers = [str(h) for h in headers]
+        roles = [self.role_for_header(h) for h in headers]
+        plugin_types = [None] * len(headers)
+        if plugins is not None:
+            for col, (header, role) in enumerate(zip(headers, roles)):
+                plugin_types[col] = plugins.column_type_for_header(header)
+                if plugin_types[col] is None and role is not None:
+                    plugin_types[col] = plugins.column_type_for_header(role.header)
+        return ColumnLayout(headers, roles, plugin_types)
@@ -2,21 +2,31 @@
 Controller for CredGen Spreadsheet Editor.
 Coordinates between UI widgets and data logic.
 """
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 from file_manager import FileManager
-from styling_parser import StylingParser
+from plugin_registry import Plugin, PluginRegistry
+from project_cache import ProjectCache
+from styling_parser import StylingParser, StylingData
 
 class CredGenController:
     """
     Mediates between the main window, spreadsheet widget, and data managers.
     Handles project state, undo/redo, and validation.
+    Undo history holds compact edit commands (see edit_commands.py) rather
+    than table snapshots.
     """
     def __init__(self):
         self.file_manager = FileManager()
         self.styling_parser = StylingParser()
+        self.project_cache = ProjectCache()
+        # Only plugin metadata is read here; plugin code is imported on first use
+        self.plugins = PluginRegistry()
+        self.plugins.discover()
         self.current_csv_file: Optional[str] = None
         self.current_styling_file: Optional[str] = None
-        self.styling_data: Optional[dict] = None
+        self.styling_data: Optional[StylingData] = None
         self.undo_stack = []
         self.redo_stack = []
 
@@ -24,69 +34,103 @@ class CredGenController:
         """
         Load a project and return (csv_data, styling_data).
         Raises ValueError on validation errors.
+        An unchanged project is served from the sidecar cache; otherwise the
+        styling file is parsed on a worker thread while the CSV loads.
         """
-        csv_data = self.file_manager.load_csv(csv_path)
+        cached = self.project_cache.load(csv_path, styling_path)
+        if cached:
+            csv_data, styling_document = cached
+            styling_data = StylingData(styling_document) if styling_document is not None else None
+        else:
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                styling_future = None
+                if styling_path:
+                    styling_future = executor.submit(self.styling_parser.parse_styling_file, styling_path)
+                csv_data = self.file_manager.load_csv(csv_path)
+                styling_data = styling_future.result() if styling_future else None
+            if csv_data and (styling_data or not styling_path):
+                self.project_cache.store(csv_path, styling_path, csv_data, self._styling_document(styling_data))
         if not csv_data:
             raise ValueError("CSV file is empty or invalid.")
         self.current_csv_file = csv_path
-        styling_data = None
         if styling_path:
-            styling_data = self.styling_parser.parse_styling_file(styling_path)
             if not styling_data:
                 raise ValueError("Styling TOML is invalid.")
             self.current_styling_file = styling_path
         self.styling_data = styling_data
+        self.plugins.run_load_hooks(csv_data)
         return csv_data, styling_data
 
-    def save_project(self, csv_path: str, data: list) -> None:
+    def save_project(self, csv_path: str, data: list, preserve: bool = True) -> None:
         """
         Save the current project data to CSV.
+        ``preserve`` keeps the existing file's comments and unchanged records as they are.
         """
-        self.file_manager.save_csv(csv_path, data)
+        self.file_manager.save_csv(csv_path, data, preserve)
         self.current_csv_file = csv_path
+        # Refresh the cache so reopening the saved project skips parsing;
+        # a database-backed table (not a list) is too large to be worth copying there
+        if self.current_styling_file and self.styling_data and isinstance(data, list):
+            rows = [row for row in data if row]
+            self.project_cache.store(csv_path, self.current_styling_file, rows,
+                                     self._styling_document(self.styling_data))
+
+    @staticmethod
+    def _styling_document(styling_data: Optional[StylingData]) -> Optional[dict]:
+        """Return the raw TOML document behind parsed styling data, which is what the cache stores."""
+        return styling_data.document if styling_data is not None else None
 
     def validate_csv(self, csv_data: list) -> bool:
         """
         Validate CSV data structure.
         """
-        if not csv_data or not isinstance(csv_data, list):
+        if not csv_data or not isinstance(csv_data, Sequence):
             return False
         # Add more validation as needed
         return True
 
-    def push_undo(self, state: list) -> None:
-        """Push a state to the undo stack."""
-        # Store a shallow copy to avoid accidental external mutation
-        self.undo_stack.append([row[:] for row in state])
+    def push_command(self, command) -> None:
+        """Record an executed edit command as one undo entry."""
+        self.undo_stack.append(command)
         # Any new action invalidates the redo stack
         self.redo_stack.clear()
 
-    def undo(self) -> Optional[list]:
+    def reset_history(self) -> None:
+        """Forget all undo/redo entries (e.g. after loading a project)."""
+        self.undo_stack.clear()
+        self.redo_stack.clear()
+
+    def undo(self):
         """
-        Undo last action and return previous state.
+        Pop the last edit command and return it so the caller can undo it on the model.
         """
-        # Need at least two states to go back: current and previous
-        if len(self.undo_stack) >= 2:
-            current = self.undo_stack.pop()
-            self.redo_stack.append(current)
-            previous = self.undo_stack[-1]
-            return [row[:] for row in previous]
+        if self.undo_stack:
+            command = self.undo_stack.pop()
+            self.redo_stack.append(command)
+            return command
         return None
 
-    def redo(self) -> Optional[list]:
+    def redo(self):
         """
-        Redo last undone action and return state.
+        Pop the last undone edit command and return it so the caller can redo it.
         """
         if self.redo_stack:
-            state = self.redo_stack.pop()
-            self.undo_stack.append([row[:] for row in state])
-            return [row[:] for row in state]
+            command = self.redo_stack.pop()
+            self.undo_stack.append(command)
+            return command
         return None
 
     # Extensibility: plugin/config pattern for new style types
-    def register_style_plugin(self, plugin_func):
+    def register_style_plugin(self, plugin) -> Optional[Plugin]:
         """
-        Register a plugin for new style types/features.
+        Register a plugin for new column types and tools from code.
+        ``plugin`` is a Plugin, a metadata dict in the ``plugin.toml``
+        layout (references may be callables or importable ``module:function``
+        strings), or a callable that registers plugins on the registry itself.
         """
-        # Example: self.plugins.append(plugin_func)
-        pass
+        if isinstance(plugin, Plugin):
+            return self.plugins.register(plugin)
+        if isinstance(plugin, dict):
+            return self.plugins.register(Plugin(plugin))
+        plugin(self.plugins)
+        return None
@@ -0,0 +1,278 @@
+"""
+Row-level diff between two versions of a credits table.
+
+Rows are interned to integer ids (equal rows share an id), so the diff runs
+over two int sequences: common prefix and suffix are stripped, rows unique
+to both sides anchor a patience diff, and the gaps between anchors are
+diffed with Myers' O(ND) algorithm. Cell-level differences are only
+computed for the row pairs of changed hunks. Columns are matched by header.
+"""
+from bisect import bisect_left
+from collections import Counter
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Gaps without anchors whose edit distance exceeds this are reported as one replace
+MAX_EDIT_DISTANCE = 500
+
+Opcode = Tuple[str, int, int, int, int]
+
+
+def _myers(a: Sequence[int], b: Sequence[int], max_d: int) -> Optional[List[str]]:
+    """Return per-element steps ('=', '-', '+') turning ``a`` into ``b``, or None if over ``max_d`` edits."""
+    n, m = len(a), len(b)
+    offset = max_d + 1
+    v = [0] * (2 * max_d + 3)
+    trace = []
+    for d in range(max_d + 1):
+        trace.append(v[:])
+        for k in range(-d, d + 1, 2):
+            if k == -d or (k != d and v[offset + k - 1] < v[offset + k + 1]):
+                x = v[offset + k + 1]
+            else:
+                x = v[offset + k - 1] + 1
+            y = x - k
+            while x < n and y < m and a[x] == b[y]:
+                x += 1
+                y += 1
+            v[offset + k] = x
+            if x >= n and y >= m:
+                return _myers_steps(trace, n, m, d, offset)
+    return None
+
+
+def _myers_steps(trace, x, y, d, offset) -> List[str]:
+    steps = []
+    for depth in range(d, 0, -1):
+        v = trace[depth]
+        k = x - y
+        if k == -depth or (k != depth and v[offset + k - 1] < v[offset + k + 1]):
+            prev_k = k + 1
+        else:
+            prev_k = k - 1
+        prev_x = v[offset + prev_k]
+        prev_y = prev_x - prev_k
+        while x > prev_x and y > prev_y:
+            steps.append('=')
+            x -= 1
+            y -= 1
+        steps.append('+' if x == prev_x else '-')
+        x, y = prev_x, prev_y
+    steps.extend('=' * x)
+    steps.reverse()
+    return steps
+
+
+def _patience_anchors(a, alo, ahi, b, blo, bhi) -> List[Tuple[int, int]]:
+    """Return (i, j) pairs of rows unique on both sides, forming the longest increasing run."""
+    count_a = Counter(a[alo:ahi])
+    count_b = Counter(b[blo:bhi])
+    position_b = {b[j]: j for j in range(blo, bhi) if count_b[b[j]] == 1}
+    pairs = [(i, position_b[a[i]]) for i in range(alo, ahi)
+             if count_a[a[i]] == 1 and a[i] in position_b]
+    # Longest increasing subsequence on j (patience sorting)
+    tails: List[int] = []
+    tail_index: List[int] = []
+    previous = [-1] * len(pairs)
+    for index, (_, j) in enumerate(pairs):
+        pos = bisect_left(tails, j)
+        if pos == len(tails):
+            tails.append(j)
+            tail_index.append(index)
+        else:
+            tails[pos] = j
+            tail_index[pos] = index
+        previous[index] = tail_index[pos - 1] if pos else -1
+    anchors = []
+    index = tail_index[-1] if tail_index else -1
+    while index >= 0:
+        anchors.append(pairs[index])
+        index = previous[index]
+    anchors.reverse()
+    return anchors
+
+
+class _OpcodeBuilder:
+    """Collects equal/delete/insert runs and merges adjacent delete+insert into replace."""
+
+    def __init__(self):
+        self.opcodes: List[Opcode] = []
+
+    def add(self, tag, i1, i2, j1, j2):
+        if i1 == i2 and j1 == j2:
+            return
+        if self.opcodes:
+            last_tag, li1, _, lj1, _ = self.opcodes[-1]
+            if (last_tag == 'equal') == (tag == 'equal'):
+                self.opcodes[-1] = (tag if tag == last_tag else 'replace', li1, i2, lj1, j2)
+                return
+        self.opcodes.append((tag, i1, i2, j1, j2))
+
+    def add_steps(self, steps, i, j):
+        for step in steps:
+            if step == '=':
+                self.add('equal', i, i + 1, j, j + 1)
+                i += 1
+                j += 1
+            elif step == '-':
+                self.add('delete', i, i + 1, j, j)
+                i += 1
+            else:
+                self.add('insert', i, i, j, j + 1)
+                j += 1
+
+
+def diff_sequences(a: Sequence[int], b: Sequence[int]) -> List[Opcode]:
+    """Return difflib-style opcodes (tag, i1, i2, j1, j2) turning ``a`` into ``b``."""
+    out = _OpcodeBuilder()
+    # Explicit stack instead of recursion: (alo, ahi, blo, bhi) regions, or finished opcodes
+    stack = [(0, len(a), 0, len(b))]
+    while stack:
+        item = stack.pop()
+        if len(item) == 5:
+            out.add(*item)
+            continue
+        alo, ahi, blo, bhi = item
+        # Common prefix and suffix
+        head = 0
+        while alo + head < ahi and blo + head < bhi and a[alo + head] == b[blo + head]:
+            head += 1
+        out.add('equal', alo, alo + head, blo, blo + head)
+        alo += head
+        blo += head
+        tail = 0
+        while alo < ahi - tail and blo < bhi - tail and a[ahi - tail - 1] == b[bhi - tail - 1]:
+            tail += 1
+        suffix = ('equal', ahi - tail, ahi, bhi - tail, bhi)
+        ahi -= tail
+        bhi -= tail
+        if alo == ahi or blo == bhi:
+            out.add('delete' if alo < ahi else 'insert', alo, ahi, blo, bhi)
+            out.add(*suffix)
+            continue
+        anchors = _patience_anchors(a, alo, ahi, b, blo, bhi)
+        if anchors:
+            # Push in reverse so regions are processed in order
+            regions = []
+            i, j = alo, blo
+            for ai, bj in anchors:
+                if ai == i and bj == j and regions and regions[-1][0] == 'equal':
+                    # Adjacent anchors extend the current equal run
+                    _, ri, _, rj, _ = regions[-1]
+                    regions[-1] = ('equal', ri, ai + 1, rj, bj + 1)
+                else:
+                    if i < ai or j < bj:
+                        regions.append((i, ai, j, bj))
+                    regions.append(('equal', ai, ai + 1, bj, bj + 1))
+                i, j = ai + 1, bj + 1
+            regions.append((i, ahi, j, bhi))
+            regions.append(suffix)
+            stack.extend(reversed(regions))
+            continue
+        steps = _myers(a[alo:ahi], b[blo:bhi], MAX_EDIT_DISTANCE)
+        if steps is None:
+            out.add('replace', alo, ahi, blo, bhi)
+        else:
+            out.add_steps(steps, alo, blo)
+        out.add(*suffix)
+    return out.opcodes
+
+
+def project_rows(headers: Sequence[str], rows, target: Sequence[str]) -> List[tuple]:
+    """Return ``rows`` (with ``headers``) as tuples in ``target`` header order; missing cells are empty."""
+    headers = list(headers)
+    positions = [headers.index(h) if h in headers else -1 for h in target]
+    if positions == list(range(len(headers))) and len(headers) == len(target):
+        width = len(headers)
+        return [tuple(row[:width]) + ('',) * (width - len(row)) if len(row) < width else tuple(row[:width])
+                for row in rows]
+    return [tuple(row[p] if 0 <= p < len(row) else '' for p in positions) for row in rows]
+
+
+class Hunk:
+    """A changed region: old rows [i1, i2) became new rows [j1, j2)."""
+
+    def __init__(self, tag: str, i1: int, i2: int, j1: int, j2: int):
+        self.tag = tag
+        self.i1, self.i2, self.j1, self.j2 = i1, i2, j1, j2
+        # (old row, new row, changed column indexes) for rows paired in a replace
+        self.cell_changes: List[Tuple[int, int, List[int]]] = []
+
+    @property
+    def changed_rows(self) -> int:
+        return len(self.cell_changes)
+
+    @property
+    def deleted_rows(self) -> int:
+        return (self.i2 - self.i1) - self.changed_rows
+
+    @property
+    def inserted_rows(self) -> int:
+        return (self.j2 - self.j1) - self.changed_rows
+
+
+class TableDiff:
+    """
+    Diff of two tables aligned on the union of their headers (old order
+    first). ``old_rows`` and ``new_rows`` are projected onto ``headers``.
+    """
+
+    def __init__(self, old_headers, old_rows, new_headers, new_rows):
+        self.old_headers = [str(h).strip() for h in old_headers]
+        self.new_headers = [str(h).strip() for h in new_headers]
+        self.headers = list(self.old_headers) + [h for h in self.new_headers if h not in self.old_headers]
+        self.added_columns = [h for h in self.new_headers if h not in self.old_headers]
+        self.removed_columns = [h for h in self.old_headers if h not in self.new_headers]
+        self.old_rows = self._project(self.old_headers, old_rows)
+        self.new_rows = self._project(self.new_headers, new_rows)
+        ids: Dict[tuple, int] = {}
+        old_ids = [ids.setdefault(row, len(ids)) for row in self.old_rows]
+        new_ids = [ids.setdefault(row, len(ids)) for row in self.new_rows]
+        self.opcodes = diff_sequences(old_ids, new_ids)
+        self.hunks = [Hunk(*op) for op in self.opcodes if op[0] != 'equal']
+        for hunk in self.hunks:
+            if hunk.tag == 'replace':
+                for offset in range(min(hunk.i2 - hunk.i1, hunk.j2 - hunk.j1)):
+                    old = self.old_rows[hunk.i1 + offset]
+                    new = self.new_rows[hunk.j1 + offset]
+                    columns = [c for c, (x, y) in enumerate(zip(old, new)) if x != y]
+                    hunk.cell_changes.append((hunk.i1 + offset, hunk.j1 + offset, columns))
+
+    def _project(self, headers, rows) -> List[tuple]:
+        return project_rows(headers, rows, self.headers)
+
+    def summary(self) -> str:
+        changed = sum(h.changed_rows for h in self.hunks)
+        deleted = sum(h.deleted_rows for h in self.hunks)
+        inserted = sum(h.inserted_rows for h in self.hunks)
+        text = f"{len(self.hunks)} hunk(s): {changed} changed, {inserted} inserted, {deleted} deleted row(s)"
+        if self.added_columns or self.removed_columns:
+            text += f"; columns added: {', '.join(self.added_columns) or 'none'}, " \
+                    f"removed: {', '.join(self.removed_columns) or 'none'}"
+        return text
+
+    def row_edits(self, hunks: Sequence[Hunk], headers: Sequence[str]) -> List[Tuple[int, int, List[list]]]:
+        """
+        Return (first old row, old row count, new rows) edits applying
+        ``hunks`` to a table with ``headers`` (the old side). Columns the
+        table lacks are dropped; cells of columns missing from the new side
+        keep their old values.
+        """
+        columns = [self.headers.index(str(h).strip()) if str(h).strip() in self.headers else -1 for h in headers]
+        kept = {self.headers.index(h) for h in self.removed_columns}
+        edits = []
+        for hunk in sorted(hunks, key=lambda h: h.i1):
+            rows = []
+            for offset, j in enumerate(range(hunk.j1, hunk.j2)):
+                new = self.new_rows[j]
+                old = self.old_rows[hunk.i1 + offset] if hunk.i1 + offset < hunk.i2 else None
+                row = []
+                for c in columns:
+                    if c < 0:
+                        row.append('')
+                    elif c in kept:
+                        row.append(old[c] if old is not None else '')
+                    else:
+                        row.append(new[c])
+                rows.append(row)
+            edits.append((hunk.i1, hunk.i2 - hunk.i1, rows))
+        return edits
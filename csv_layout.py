@@ -0,0 +1,292 @@
+"""
+Byte layout of a Credits.csv file, so saving can reuse what did not change.
+
+Loading drops comment lines and blank lines and forgets how each record was
+quoted. To save without disturbing them, ``CsvLayout`` keeps per record where
+its bytes start and end in the file, a hash of its parsed row and its field
+count; the lines between two records (comments, blank lines) belong to the
+record that follows them. ``CsvLayout.save`` diffs the rows being saved
+against those hashes, copies runs of unchanged records and everything
+between them straight from the old file (with ``os.sendfile`` where
+available), and encodes only the rows that were edited or added. Saving an
+unedited table rewrites the file byte for byte.
+"""
+import codecs
+import csv
+import io
+import os
+import re
+import shutil
+import tempfile
+from array import array
+from difflib import SequenceMatcher
+from itertools import accumulate
+from operator import add
+from typing import List, Optional, Sequence
+
+# Changed regions longer than this (old plus new rows) are rewritten instead of diffed,
+# since diffing e.g. a fully re-sorted table is quadratic
+MAX_DIFF_ROWS = 20000
+COPY_BLOCK = 1024 * 1024
+
+_COMMENT_LINE = re.compile(rb'[ \t\f\v]*//')
+_LONE_CR = re.compile(rb'\r(?!\n)')
+
+
+def row_key(row: Sequence[str]) -> int:
+    """Hash of a row's cells, ignoring trailing empty ones (the table pads rows to its width)."""
+    end = len(row)
+    while end and not row[end - 1]:
+        end -= 1
+    return hash(tuple(row[:end]))
+
+
+def _common_prefix(a: array, b: array) -> int:
+    """Length of the common prefix of two arrays, found by comparing slices (in C) rather than items."""
+    low, high = 0, min(len(a), len(b))
+    while low < high:
+        middle = (low + high + 1) // 2
+        if a[low:middle] == b[low:middle]:
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+
+def _diff(old: array, new: array) -> List[tuple]:
+    """SequenceMatcher-style opcodes turning ``old`` into ``new``, trimming the common ends first."""
+    prefix = _common_prefix(old, new)
+    suffix = _common_prefix(old[:prefix - 1:-1] if prefix else old[::-1], new[:prefix - 1:-1] if prefix else new[::-1])
+    old_end, new_end = len(old) - suffix, len(new) - suffix
+    opcodes = []
+    if prefix:
+        opcodes.append(('equal', 0, prefix, 0, prefix))
+    if old_end - prefix + new_end - prefix > MAX_DIFF_ROWS:
+        opcodes.append(('replace', prefix, old_end, prefix, new_end))
+    elif prefix < old_end or prefix < new_end:
+        matcher = SequenceMatcher(None, old[prefix:old_end], new[prefix:new_end], autojunk=False)
+        opcodes.extend((tag, i1 + prefix, i2 + prefix, j1 + prefix, j2 + prefix)
+                       for tag, i1, i2, j1, j2 in matcher.get_opcodes())
+    if suffix:
+        opcodes.append(('equal', old_end, len(old), new_end, len(new)))
+    return opcodes
+
+
+class _SpanWriter:
+    """Writes a file from byte ranges of the old file and newly encoded rows, keeping track of offsets."""
+
+    def __init__(self, src, dst, newline: bytes):
+        self.src = src
+        self.dst = dst
+        self.newline = newline
+        self.position = 0
+        self.at_line_start = True
+        self.pending = bytearray()
+        self.text = io.StringIO()
+        self.csv = csv.writer(self.text, lineterminator=newline.decode('ascii'))
+
+    def end_line(self) -> None:
+        # Only the old file's last record can lack a line break; it needs one if anything follows it
+        if not self.at_line_start:
+            self.pending += self.newline
+            self.position += len(self.newline)
+            self.at_line_start = True
+
+    def copy(self, start: int, end: int, terminated: bool = True) -> None:
+        if start >= end:
+            return
+        self.end_line()
+        self.flush()
+        self._copy_range(start, end)
+        self.position += end - start
+        self.at_line_start = terminated
+
+    def encode(self, row: Sequence[str]) -> None:
+        self.end_line()
+        self.csv.writerow(row)
+        data = self.text.getvalue().encode('utf-8')
+        self.text.seek(0)
+        self.text.truncate()
+        self.pending += data
+        self.position += len(data)
+        if len(self.pending) >= COPY_BLOCK:
+            self.flush()
+
+    def flush(self) -> None:
+        written = 0
+        while written < len(self.pending):
+            written += os.write(self.dst.fileno(), self.pending[written:] if written else self.pending)
+        self.pending.clear()
+
+    def _copy_range(self, start: int, end: int) -> None:
+        count = end - start
+        if hasattr(os, 'sendfile'):
+            try:
+                while count > 0:
+                    sent = os.sendfile(self.dst.fileno(), self.src.fileno(), start, count)
+                    if not sent:
+                        break
+                    start += sent
+                    count -= sent
+            except OSError:
+                # Not supported for these files; copy the rest through a buffer
+                pass
+        self.src.seek(start)
+        while count > 0:
+            block = self.src.read(min(COPY_BLOCK, count))
+            if not block:
+                raise OSError("The file became shorter while it was being saved")
+            self.pending += block
+            self.flush()
+            count -= len(block)
+
+
+class CsvLayout:
+    """
+    Where the records of one CSV file are, as it was when loaded or last
+    saved. Per record, ``gaps`` holds the bytes of comment and blank lines
+    just before it and ``sizes`` its own bytes, line break included; both
+    stay valid when a run of records is copied elsewhere. ``head`` is the
+    length of a byte order mark.
+    """
+
+    def __init__(self, head: int, gaps: array, sizes: array, keys: array, widths: array,
+                 size: int, mtime_ns: int, terminated: bool, newline: bytes):
+        self.head = head
+        self.gaps = gaps
+        self.sizes = sizes
+        self.keys = keys
+        self.widths = widths
+        self.size = size
+        self.mtime_ns = mtime_ns
+        self.terminated = terminated
+        self.newline = newline
+
+    @classmethod
+    def scan(cls, data: bytes, rows: List[List[str]], stat) -> Optional["CsvLayout"]:
+        """
+        Map ``rows``, as FileManager parsed them from ``data``, to their byte
+        ranges. Returns None for files whose records can't be matched up
+        reliably (old Mac line breaks, comment lines inside quoted fields).
+        """
+        if _LONE_CR.search(data):
+            return None
+        head = len(codecs.BOM_UTF8) if data.startswith(codecs.BOM_UTF8) else 0
+        gaps, sizes = array('q'), array('q')
+        size = len(data)
+        position = previous_end = head
+        start = -1
+        quotes = 0
+        while position < size:
+            newline = data.find(b'\n', position)
+            end = size if newline < 0 else newline + 1
+            if _COMMENT_LINE.match(data, position):
+                if start >= 0:
+                    return None
+            elif start >= 0 or end - position > 2 or data[position:end] not in (b'\n', b'\r\n'):
+                if start < 0:
+                    start = position
+                # A line break ends the record only outside quotes
+                quotes += data.count(b'"', position, end)
+                if quotes % 2 == 0:
+                    gaps.append(start - previous_end)
+                    sizes.append(end - start)
+                    previous_end = end
+                    start = -1
+                    quotes = 0
+            position = end
+        if start >= 0 or len(sizes) != len(rows):
+            return None
+        terminated = not sizes or data[previous_end - 1:previous_end] == b'\n'
+        # New rows get the file's line break; csv.writer's "\r\n" for files without records
+        newline = b'\r\n'
+        if sizes:
+            first_end = head + gaps[0] + sizes[0]
+            if data[first_end - 2:first_end] != b'\r\n' and data[first_end - 1:first_end] == b'\n':
+                newline = b'\n'
+        return cls(head, gaps, sizes, array('q', map(row_key, rows)), array('I', map(len, rows)),
+                   size, stat.st_mtime_ns, terminated, newline)
+
+    def is_current(self, path: str) -> bool:
+        """Return True if the file at ``path`` still has the size and modification time recorded here."""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return False
+        return stat.st_size == self.size and stat.st_mtime_ns == self.mtime_ns
+
+    def save(self, path: str, rows: Sequence[Sequence[str]]) -> "CsvLayout":
+        """
+        Write ``rows`` to ``path``, which must still be the file this layout
+        describes, and return the layout of the new file. The file is written
+        next to the old one and then moved over it.
+        """
+        keys = array('q', map(row_key, rows))
+        # gap_starts[i]: where the lines before record i begin; gap_starts[i + 1]: where record i ends
+        gap_starts = array('q', accumulate(map(add, self.gaps, self.sizes), initial=self.head))
+        count = len(self.sizes)
+        gaps, sizes, widths = array('q'), array('q'), array('I')
+        # Comment lines of removed records, which go before the next record written
+        pending_gap = 0
+        terminated = True
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, temp_path = tempfile.mkstemp(prefix='.credits-', suffix='.csv.tmp', dir=directory)
+        try:
+            with open(path, 'rb') as src, open(fd, 'wb', buffering=0) as dst:
+                out = _SpanWriter(src, dst, self.newline)
+
+                def end_line():
+                    # Only the old last record can lack a line break; it needs one if anything follows
+                    if not out.at_line_start:
+                        out.end_line()
+                        sizes[-1] += len(self.newline)
+
+                out.copy(0, self.head)
+                for tag, i1, i2, j1, j2 in _diff(self.keys, keys):
+                    if tag == 'equal':
+                        # The whole run, with the comment and blank lines in it, in one copy
+                        end_line()
+                        gaps.append(pending_gap + self.gaps[i1])
+                        gaps.extend(self.gaps[i1 + 1:i2])
+                        sizes.extend(self.sizes[i1:i2])
+                        widths.extend(self.widths[i1:i2])
+                        pending_gap = 0
+                        terminated = i2 < count or self.terminated
+                        out.copy(gap_starts[i1], gap_starts[i2], terminated)
+                        continue
+                    # Keep each removed record's comment lines, then write its replacement in its place
+                    for k in range(max(i2 - i1, j2 - j1)):
+                        old = i1 + k if i1 + k < i2 else None
+                        if old is not None and self.gaps[old]:
+                            end_line()
+                            out.copy(gap_starts[old], gap_starts[old] + self.gaps[old])
+                            pending_gap += self.gaps[old]
+                        if j1 + k < j2:
+                            row = list(rows[j1 + k])
+                            if old is not None:
+                                # Keep the record's field count where the edit allows it
+                                end = len(row)
+                                while end > self.widths[old] and not row[end - 1]:
+                                    end -= 1
+                                row = row[:end] + [''] * (self.widths[old] - end)
+                            end_line()
+                            start = out.position
+                            out.encode(row)
+                            gaps.append(pending_gap)
+                            sizes.append(out.position - start)
+                            widths.append(len(row))
+                            pending_gap = 0
+                            terminated = True
+                out.copy(gap_starts[count], self.size)
+                out.flush()
+                size = out.position
+            shutil.copymode(path, temp_path)
+            os.replace(temp_path, path)
+        except BaseException:
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
+            raise
+        return CsvLayout(self.head, gaps, sizes, keys, widths, size, os.stat(path).st_mtime_ns,
+                         terminated, self.newline)
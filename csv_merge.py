@@ -0,0 +1,274 @@
+"""
+Streaming merge of several Credits.csv files into one.
+
+Inputs are read row by row through ``FileManager.iter_csv`` and written out
+as they are merged, so memory stays flat however large the inputs are; only
+a short digest per row is kept to spot duplicates.
+
+Columns are matched by header (after an optional rename map); the output has
+the union of the input headers in order of first appearance. Inputs are
+either concatenated in order, or merged on a key column with a k-way
+``heapq.merge``, which expects each input to be sorted on that column.
+Rows with an empty key keep the key of the row above them, so spacer rows
+and multi-row blocks stay together.
+
+    python csv_merge.py -o Master.csv Cast.csv Crew.csv --key "@Page Runtime"
+"""
+import argparse
+import csv
+import hashlib
+import heapq
+import json
+import os
+from itertools import groupby
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from file_manager import FileManager
+
+KEEP_ALL = 'all'
+KEEP_FIRST = 'first'
+# Conflicts, duplicates and ordering problems beyond this are counted but not listed
+MAX_REPORTED = 1000
+PROGRESS_ROWS = 10000
+
+
+def parse_header_map(pairs: Sequence[str]) -> Dict[str, str]:
+    """Parse OLD=NEW strings into a header rename map."""
+    mapping = {}
+    for pair in pairs:
+        old, sep, new = pair.partition('=')
+        if not sep or not old.strip() or not new.strip():
+            raise ValueError(f"Invalid header mapping: {pair!r} (expected OLD=NEW)")
+        mapping[old.strip()] = new.strip()
+    return mapping
+
+
+def sort_key(value: str) -> Tuple[int, object]:
+    """Order numbers numerically and before text, so mixed columns still compare."""
+    text = value.strip()
+    try:
+        return 0, float(text)
+    except ValueError:
+        return 1, text
+
+
+def row_digest(row: Sequence[str]) -> bytes:
+    return hashlib.blake2b('\x1f'.join(row).encode('utf-8'), digest_size=12).digest()
+
+
+class MergeReport:
+    """Counts and (capped) details of what a merge found."""
+
+    def __init__(self, inputs: Sequence[str]):
+        self.inputs = list(inputs)
+        self.headers: List[str] = []
+        self.rows_read = {path: 0 for path in inputs}
+        self.rows_written = 0
+        self.duplicate_count = 0
+        self.conflict_count = 0
+        self.unsorted_count = 0
+        # (file, row number, first seen file, first seen row number)
+        self.duplicates: List[Tuple[str, int, str, int]] = []
+        # (key, [(file, row number), ...], differing headers)
+        self.conflicts: List[Tuple[str, List[Tuple[str, int]], List[str]]] = []
+        # (file, row number, key, previous key)
+        self.unsorted: List[Tuple[str, int, str, str]] = []
+
+    def add_duplicate(self, entry) -> None:
+        self.duplicate_count += 1
+        if len(self.duplicates) < MAX_REPORTED:
+            self.duplicates.append(entry)
+
+    def add_conflict(self, entry) -> None:
+        self.conflict_count += 1
+        if len(self.conflicts) < MAX_REPORTED:
+            self.conflicts.append(entry)
+
+    def add_unsorted(self, entry) -> None:
+        self.unsorted_count += 1
+        if len(self.unsorted) < MAX_REPORTED:
+            self.unsorted.append(entry)
+
+    def summary(self) -> str:
+        read = sum(self.rows_read.values())
+        lines = [f"Merged {len(self.inputs)} file(s): {read} rows read, {self.rows_written} written",
+                 f"{self.duplicate_count} duplicate row(s), {self.conflict_count} key conflict(s)"]
+        if self.unsorted_count:
+            lines.append(f"{self.unsorted_count} row(s) out of key order; the output is not fully sorted")
+        return "\n".join(lines)
+
+    def to_dict(self) -> dict:
+        return {
+            'inputs': self.inputs,
+            'headers': self.headers,
+            'rows_read': self.rows_read,
+            'rows_written': self.rows_written,
+            'duplicate_count': self.duplicate_count,
+            'conflict_count': self.conflict_count,
+            'unsorted_count': self.unsorted_count,
+            'duplicates': self.duplicates,
+            'conflicts': self.conflicts,
+            'unsorted': self.unsorted,
+        }
+
+
+class CsvMerger:
+    """
+    Merge Credits.csv files by header.
+
+    ``key`` selects the output column to merge on (None concatenates in
+    order). ``drop_duplicates`` skips non-blank rows identical to an earlier
+    one. With ``keep=KEEP_FIRST``, rows of later inputs that conflict on the
+    key with an earlier input are dropped; by default all are kept and
+    reported.
+    """
+
+    def __init__(self, file_manager: Optional[FileManager] = None, header_map: Optional[Dict[str, str]] = None,
+                 key: Optional[str] = None, drop_duplicates: bool = True, keep: str = KEEP_ALL):
+        self.file_manager = file_manager or FileManager()
+        self.header_map = dict(header_map or {})
+        self.key = key
+        self.drop_duplicates = drop_duplicates
+        self.keep = keep
+
+    def read_headers(self, path: str) -> List[str]:
+        rows = self.file_manager.iter_csv(path)
+        try:
+            return [self.header_map.get(h.strip(), h.strip()) for h in next(rows, [])]
+        finally:
+            rows.close()
+
+    def output_headers(self, paths: Sequence[str]) -> List[str]:
+        """Return the union of the input headers in order of first appearance."""
+        headers = []
+        for path in paths:
+            for header in self.read_headers(path):
+                if header and header not in headers:
+                    headers.append(header)
+        return headers
+
+    def _mapped_rows(self, path: str, headers: List[str], report: MergeReport) -> Iterator[Tuple[int, List[str]]]:
+        """Yield (row number, row in output column order) for one input."""
+        rows = self.file_manager.iter_csv(path)
+        input_headers = [self.header_map.get(h.strip(), h.strip()) for h in next(rows, [])]
+        positions = [(i, headers.index(h)) for i, h in enumerate(input_headers) if h in headers]
+        width = len(headers)
+        for number, row in enumerate(rows, 1):
+            out = [''] * width
+            for i, j in positions:
+                if i < len(row):
+                    out[j] = row[i]
+            report.rows_read[path] += 1
+            yield number, out
+
+    def _keyed_rows(self, source: int, path: str, headers: List[str], key_col: int, report: MergeReport):
+        """Yield (sort key, source, row number, row); empty keys inherit the key above."""
+        current = None
+        previous_text = ''
+        for number, row in self._mapped_rows(path, headers, report):
+            if row[key_col].strip():
+                key = sort_key(row[key_col])
+                if current is not None and key < current:
+                    report.add_unsorted((path, number, row[key_col], previous_text))
+                current, previous_text = key, row[key_col]
+            yield (current or (-1, 0)), source, number, row
+
+    def merge(self, paths: Sequence[str], output_path: str,
+              progress: Optional[Callable[[int], None]] = None) -> MergeReport:
+        """Merge ``paths`` into ``output_path`` (written atomically) and return the report."""
+        report = MergeReport(paths)
+        headers = self.output_headers(paths)
+        report.headers = headers
+        if self.key is not None and self.key not in headers:
+            raise ValueError(f"Key column {self.key!r} is not in any input")
+        seen: Dict[bytes, Tuple[int, int]] = {}
+        tmp_path = f"{output_path}.tmp"
+        try:
+            with open(tmp_path, 'w', newline='', encoding='utf-8') as f:
+                writer = csv.writer(f)
+                writer.writerow(headers)
+                for source, number, row in self._merged(paths, headers, report):
+                    if self.drop_duplicates and any(row):
+                        digest = row_digest(row)
+                        first = seen.setdefault(digest, (source, number))
+                        if first != (source, number):
+                            report.add_duplicate((paths[source], number, paths[first[0]], first[1]))
+                            continue
+                    writer.writerow(row)
+                    report.rows_written += 1
+                    if progress and report.rows_written % PROGRESS_ROWS == 0:
+                        progress(report.rows_written)
+            os.replace(tmp_path, output_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        print(report.summary())
+        return report
+
+    def _merged(self, paths, headers, report) -> Iterator[Tuple[int, int, List[str]]]:
+        """Yield (source index, row number, row) in output order."""
+        if self.key is None:
+            for source, path in enumerate(paths):
+                for number, row in self._mapped_rows(path, headers, report):
+                    yield source, number, row
+            return
+        key_col = headers.index(self.key)
+        streams = [self._keyed_rows(source, path, headers, key_col, report) for source, path in enumerate(paths)]
+        # Ties on the key keep input order, so each input's blocks stay contiguous
+        merged = heapq.merge(*streams, key=lambda item: item[:2])
+        for key, group in groupby(merged, key=lambda item: item[0]):
+            group = list(group)
+            if key[0] >= 0 and len({source for _, source, _, _ in group}) > 1:
+                group = self._resolve_conflict(group, headers, key_col, paths, report)
+            for _, source, number, row in group:
+                yield source, number, row
+
+    def _resolve_conflict(self, group, headers, key_col, paths, report):
+        """Report rows of different inputs sharing a key with different values."""
+        by_source: Dict[int, list] = {}
+        for item in group:
+            by_source.setdefault(item[1], []).append(item)
+        sources = sorted(by_source)
+        first_rows = [by_source[s][0][3] for s in sources]
+        differing = [headers[c] for c in range(len(headers))
+                     if len({row[c] for row in first_rows}) > 1]
+        if not differing:
+            return group
+        report.add_conflict((group[0][3][key_col],
+                             [(paths[s], by_source[s][0][2]) for s in sources], differing))
+        if self.keep == KEEP_FIRST:
+            return by_source[sources[0]]
+        return group
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Merge several Credits.csv files into one.")
+    parser.add_argument('inputs', nargs='+', help="Input CSV files, in priority order")
+    parser.add_argument('-o', '--output', required=True, help="Merged CSV to write")
+    parser.add_argument('--key', help="Header of the column to merge on (inputs sorted by it); "
+                                      "without it inputs are concatenated")
+    parser.add_argument('--map', action='append', default=[], metavar='OLD=NEW',
+                        help="Rename an input header before matching (repeatable)")
+    parser.add_argument('--keep-duplicates', action='store_true', help="Write identical rows more than once")
+    parser.add_argument('--keep', choices=(KEEP_ALL, KEEP_FIRST), default=KEEP_ALL,
+                        help="On key conflicts keep all rows or only the first input's")
+    parser.add_argument('--report', help="Write the merge report to this JSON file")
+    args = parser.parse_args()
+
+    merger = CsvMerger(header_map=parse_header_map(args.map), key=args.key,
+                       drop_duplicates=not args.keep_duplicates, keep=args.keep)
+    report = merger.merge(args.inputs, args.output,
+                          progress=lambda n: print(f"{n} rows written", flush=True))
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump(report.to_dict(), f, indent=2)
+    for path, number, first_path, first_number in report.duplicates[:20]:
+        print(f"duplicate: {path} row {number} repeats {first_path} row {first_number}")
+    for key, rows, differing in report.conflicts[:20]:
+        where = ", ".join(f"{path} row {number}" for path, number in rows)
+        print(f"conflict on {key!r}: {where} differ in {', '.join(differing)}")
+
+
+if __name__ == '__main__':
+    main()
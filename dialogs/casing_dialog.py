@@ -0,0 +1,68 @@
+import time
+from PyQt5.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QTreeWidget, QTreeWidgetItem, QDialogButtonBox
+)
+from PyQt5.QtCore import Qt
+
+
+class CasingDialog(QDialog):
+    """
+    Lists the @Head/@Body/@Tail cells whose uppercase letter styles keep
+    part of the text as written because of ``uppercaseExceptions``, next
+    to how they render. Double-clicking a cell selects it in the table.
+    """
+
+    def __init__(self, spreadsheet, parent=None):
+        super().__init__(parent)
+        self.spreadsheet = spreadsheet
+        self.init_ui()
+        self.populate()
+
+    def init_ui(self):
+        """Initialize the dialog UI."""
+        self.setWindowTitle("Check Casing")
+        self.resize(820, 480)
+        layout = QVBoxLayout(self)
+        self.summary_label = QLabel()
+        self.summary_label.setWordWrap(True)
+        layout.addWidget(self.summary_label)
+        self.tree = QTreeWidget()
+        self.tree.setRootIsDecorated(False)
+        self.tree.setHeaderLabels(["Row", "Column", "Text", "As Rendered"])
+        self.tree.setColumnWidth(2, 280)
+        self.tree.itemDoubleClicked.connect(self.on_item_double_clicked)
+        layout.addWidget(self.tree)
+        buttons = QHBoxLayout()
+        refresh_btn = QPushButton("Refresh")
+        refresh_btn.clicked.connect(self.populate)
+        buttons.addWidget(refresh_btn)
+        buttons.addStretch()
+        button_box = QDialogButtonBox(QDialogButtonBox.Close)
+        button_box.rejected.connect(self.close)
+        buttons.addWidget(button_box)
+        layout.addLayout(buttons)
+
+    def populate(self):
+        casing = self.spreadsheet.casing
+        if not casing.is_active():
+            self.summary_label.setText("No letter style has uppercase enabled, so all text renders as written.")
+            self.tree.clear()
+            return
+        start = time.perf_counter()
+        result = self.spreadsheet.check_casing()
+        seconds = time.perf_counter() - start
+        headers = self.spreadsheet.get_headers()
+        self.tree.clear()
+        items = []
+        for row, col, text, rendered in result['exceptions']:
+            item = QTreeWidgetItem([str(row + 1), headers[col], text, rendered])
+            item.setData(0, Qt.UserRole, (row, col))
+            items.append(item)
+        self.tree.addTopLevelItems(items)
+        self.summary_label.setText(
+            f"{result['uppercased']} cell(s) render uppercased; {len(items)} keep text as written through "
+            f"{len(casing.engine.exceptions)} uppercase exception(s). Checked in {seconds * 1000:.0f} ms.")
+
+    def on_item_double_clicked(self, item, column):
+        row, col = item.data(0, Qt.UserRole)
+        self.spreadsheet.select_cell(row, col)
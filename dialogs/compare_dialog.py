@@ -0,0 +1,204 @@
+import time
+from PyQt5.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QFormLayout, QLabel, QComboBox, QLineEdit, QPushButton,
+    QTreeWidget, QTreeWidgetItem, QFileDialog, QDialogButtonBox, QMessageBox
+)
+from PyQt5.QtCore import Qt
+from csv_diff import TableDiff
+
+OPEN_TABLE = "Open table"
+# Cell changes listed per hunk; the hunk itself is still applied in full
+MAX_LISTED_ROWS = 200
+
+
+class CompareDialog(QDialog):
+    """
+    Compare the open table (or a CSV file) with another CSV file.
+
+    Each hunk is a checkable tree item listing its changed cells and
+    inserted or deleted rows. When the open table is the left side, the
+    checked hunks can be applied to it as a single undo entry.
+    """
+    def __init__(self, spreadsheet, file_manager, parent=None):
+        super().__init__(parent)
+        self.spreadsheet = spreadsheet
+        self.file_manager = file_manager
+        self.diff = None
+        self._stale = False
+        self.init_ui()
+        self.spreadsheet.data_changed.connect(self.on_table_changed)
+        self.spreadsheet.model.modelReset.connect(self.on_table_changed)
+
+    def init_ui(self):
+        """Initialize the dialog UI."""
+        self.setWindowTitle("Compare Credits")
+        self.resize(820, 600)
+        layout = QVBoxLayout(self)
+        form = QFormLayout()
+        left = QHBoxLayout()
+        self.left_combo = QComboBox()
+        self.left_combo.setEditable(True)
+        self.left_combo.addItem(OPEN_TABLE)
+        left.addWidget(self.left_combo, 1)
+        left_btn = QPushButton("Browse…")
+        left_btn.clicked.connect(lambda: self.choose_file(self.left_combo.setEditText))
+        left.addWidget(left_btn)
+        form.addRow("Old:", left)
+        right = QHBoxLayout()
+        self.right_edit = QLineEdit()
+        right.addWidget(self.right_edit, 1)
+        right_btn = QPushButton("Browse…")
+        right_btn.clicked.connect(lambda: self.choose_file(self.right_edit.setText))
+        right.addWidget(right_btn)
+        form.addRow("New:", right)
+        layout.addLayout(form)
+
+        compare_row = QHBoxLayout()
+        compare_btn = QPushButton("Compare")
+        compare_btn.clicked.connect(self.compare)
+        compare_row.addWidget(compare_btn)
+        self.summary_label = QLabel()
+        self.summary_label.setWordWrap(True)
+        compare_row.addWidget(self.summary_label, 1)
+        layout.addLayout(compare_row)
+
+        self.tree = QTreeWidget()
+        self.tree.setHeaderLabels(["Change", "Old", "New"])
+        self.tree.setColumnWidth(0, 260)
+        self.tree.setColumnWidth(1, 250)
+        self.tree.itemDoubleClicked.connect(self.on_item_activated)
+        layout.addWidget(self.tree)
+
+        buttons = QHBoxLayout()
+        for text, checked in (("Check All", True), ("Uncheck All", False)):
+            button = QPushButton(text)
+            button.clicked.connect(lambda _, c=checked: self.set_all_checked(c))
+            buttons.addWidget(button)
+        buttons.addStretch()
+        self.apply_btn = QPushButton("Apply Checked to Table")
+        self.apply_btn.setToolTip("Make the open table match the new file in the checked hunks")
+        self.apply_btn.clicked.connect(self.apply_checked)
+        self.apply_btn.setEnabled(False)
+        buttons.addWidget(self.apply_btn)
+        button_box = QDialogButtonBox(QDialogButtonBox.Close)
+        button_box.rejected.connect(self.close)
+        buttons.addWidget(button_box)
+        layout.addLayout(buttons)
+
+    def choose_file(self, setter):
+        path, _ = QFileDialog.getOpenFileName(self, "Choose CSV File", "", "CSV Files (*.csv)")
+        if path:
+            setter(path)
+
+    def compares_open_table(self):
+        return self.left_combo.currentText() == OPEN_TABLE
+
+    def load_side(self, source):
+        """Return (headers, rows) of the open table or a CSV file."""
+        if source == OPEN_TABLE:
+            return self.spreadsheet.get_headers(), self.spreadsheet.model.rows()
+        rows = self.file_manager.load_csv(source)
+        # The first data row is kept out of the table (see SpreadsheetWidget.load_data)
+        return (rows[0], rows[2:]) if rows else ([], [])
+
+    def compare(self):
+        right = self.right_edit.text().strip()
+        if not right:
+            QMessageBox.warning(self, "Compare Credits", "Choose the file to compare with.")
+            return
+        try:
+            old_headers, old_rows = self.load_side(self.left_combo.currentText().strip())
+            new_headers, new_rows = self.load_side(right)
+        except (OSError, UnicodeDecodeError) as e:
+            QMessageBox.critical(self, "Compare Credits", f"Failed to read file: {e}")
+            return
+        start = time.perf_counter()
+        self.diff = TableDiff(old_headers, old_rows, new_headers, new_rows)
+        elapsed = time.perf_counter() - start
+        self._stale = False
+        self.summary_label.setText(f"{self.diff.summary()} ({elapsed * 1000:.0f} ms)")
+        self.populate()
+        self.apply_btn.setEnabled(self.compares_open_table() and bool(self.diff.hunks))
+
+    def populate(self):
+        diff = self.diff
+        headers = diff.headers
+        self.tree.clear()
+        for hunk in diff.hunks:
+            parts = []
+            if hunk.changed_rows:
+                parts.append(f"{hunk.changed_rows} changed")
+            if hunk.inserted_rows:
+                parts.append(f"{hunk.inserted_rows} inserted")
+            if hunk.deleted_rows:
+                parts.append(f"{hunk.deleted_rows} deleted")
+            item = QTreeWidgetItem([f"Rows {hunk.i1 + 1}-{hunk.i2}: {', '.join(parts)}",
+                                    f"old {hunk.i1 + 1}-{hunk.i2}", f"new {hunk.j1 + 1}-{hunk.j2}"])
+            item.setFlags(item.flags() | Qt.ItemIsUserCheckable)
+            item.setCheckState(0, Qt.Checked)
+            item.setData(0, Qt.UserRole, (hunk, hunk.i1, None))
+            listed = 0
+            for old_row, new_row, columns in hunk.cell_changes:
+                for col in columns:
+                    if listed >= MAX_LISTED_ROWS:
+                        break
+                    child = QTreeWidgetItem([f"Row {old_row + 1} {headers[col]}",
+                                             diff.old_rows[old_row][col], diff.new_rows[new_row][col]])
+                    child.setData(0, Qt.UserRole, (None, old_row, col))
+                    item.addChild(child)
+                    listed += 1
+            for old_row in range(hunk.i1 + hunk.changed_rows, hunk.i2):
+                if listed >= MAX_LISTED_ROWS:
+                    break
+                child = QTreeWidgetItem([f"Row {old_row + 1} deleted", " | ".join(diff.old_rows[old_row]), ""])
+                child.setData(0, Qt.UserRole, (None, old_row, None))
+                item.addChild(child)
+                listed += 1
+            for new_row in range(hunk.j1 + hunk.changed_rows, hunk.j2):
+                if listed >= MAX_LISTED_ROWS:
+                    break
+                child = QTreeWidgetItem([f"Row inserted before old row {hunk.i2 + 1}", "",
+                                         " | ".join(diff.new_rows[new_row])])
+                child.setData(0, Qt.UserRole, (None, hunk.i2, None))
+                item.addChild(child)
+                listed += 1
+            self.tree.addTopLevelItem(item)
+
+    def set_all_checked(self, checked):
+        state = Qt.Checked if checked else Qt.Unchecked
+        for i in range(self.tree.topLevelItemCount()):
+            self.tree.topLevelItem(i).setCheckState(0, state)
+
+    def checked_hunks(self):
+        hunks = []
+        for i in range(self.tree.topLevelItemCount()):
+            item = self.tree.topLevelItem(i)
+            if item.checkState(0) == Qt.Checked:
+                hunks.append(item.data(0, Qt.UserRole)[0])
+        return hunks
+
+    def on_table_changed(self):
+        # Hunk positions refer to the table as it was compared
+        if self.diff is not None and self.compares_open_table() and not self._stale:
+            self._stale = True
+            self.apply_btn.setEnabled(False)
+            self.summary_label.setText(self.summary_label.text() + " — table changed, compare again to apply")
+
+    def apply_checked(self):
+        if self.diff is None or self._stale or not self.compares_open_table():
+            return
+        hunks = self.checked_hunks()
+        if not hunks:
+            return
+        edits = self.diff.row_edits(hunks, self.spreadsheet.get_headers())
+        self.spreadsheet.model.replace_row_ranges(edits, "Apply Compared Changes")
+        # Refresh so the remaining differences are shown against the updated table
+        self.compare()
+
+    def on_item_activated(self, item, column):
+        if not self.compares_open_table():
+            return
+        _, row, col = item.data(0, Qt.UserRole)
+        if row < self.spreadsheet.model.rowCount():
+            in_table = col is not None and col < self.spreadsheet.model.columnCount()
+            self.spreadsheet.select_cell(row, col if in_table else 0)
@@ -0,0 +1,103 @@
+from PyQt5.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QLabel, QTreeWidget, QTreeWidgetItem,
+    QPushButton, QDialogButtonBox
+)
+from PyQt5.QtCore import Qt, QTimer
+
+
+class DuplicatesDialog(QDialog):
+    """
+    Non-modal dialog listing exact and near-duplicate credit names.
+    Double-click a cell entry to jump to it in the spreadsheet.
+    """
+    def __init__(self, spreadsheet, parent=None):
+        super().__init__(parent)
+        self.spreadsheet = spreadsheet
+        self._shown_version = None
+        # Coalesce bursts of edits into a single refresh
+        self._refresh_timer = QTimer(self)
+        self._refresh_timer.setSingleShot(True)
+        self._refresh_timer.setInterval(300)
+        self._refresh_timer.timeout.connect(self.refresh)
+        self.init_ui()
+        self.spreadsheet.data_changed.connect(self.schedule_refresh)
+        self.refresh()
+
+    def init_ui(self):
+        """Initialize the dialog UI."""
+        self.setWindowTitle("Duplicate Credits")
+        self.resize(520, 480)
+        layout = QVBoxLayout(self)
+        self.summary_label = QLabel()
+        layout.addWidget(self.summary_label)
+        self.tree = QTreeWidget()
+        self.tree.setHeaderLabels(["Name", "Location"])
+        self.tree.setColumnWidth(0, 300)
+        self.tree.itemDoubleClicked.connect(self.on_item_activated)
+        layout.addWidget(self.tree)
+        buttons = QHBoxLayout()
+        refresh_btn = QPushButton("Refresh")
+        refresh_btn.clicked.connect(self.refresh)
+        buttons.addWidget(refresh_btn)
+        buttons.addStretch()
+        button_box = QDialogButtonBox(QDialogButtonBox.Close)
+        button_box.rejected.connect(self.close)
+        buttons.addWidget(button_box)
+        layout.addLayout(buttons)
+
+    def schedule_refresh(self):
+        if self.isVisible():
+            self._refresh_timer.start()
+
+    def refresh(self):
+        """Rebuild the result tree from the spreadsheet's duplicate index."""
+        index = self.spreadsheet.duplicate_index
+        if index.version == self._shown_version:
+            return
+        self._shown_version = index.version
+        headers = self.spreadsheet.get_headers()
+        self.tree.clear()
+
+        exact = index.exact_groups()
+        exact_root = QTreeWidgetItem(self.tree, [f"Exact duplicates ({len(exact)})", ""])
+        for key, cells in exact:
+            group = QTreeWidgetItem(exact_root, [key, f"{len(cells)} cells"])
+            self._add_cells(group, cells, headers)
+
+        rows = index.row_groups()
+        rows_root = QTreeWidgetItem(self.tree, [f"Duplicate rows ({len(rows)})", ""])
+        for group_rows in rows:
+            label = ", ".join(str(r + 1) for r in group_rows[:10])
+            group = QTreeWidgetItem(rows_root, [f"Rows {label}", f"{len(group_rows)} rows"])
+            for row in group_rows:
+                self._add_location(group, row, None, f"Row {row + 1}")
+
+        near = index.near_groups()
+        near_root = QTreeWidgetItem(self.tree, [f"Near duplicates ({len(near)})", ""])
+        for cluster in near:
+            group = QTreeWidgetItem(near_root, [" / ".join(k for k, _ in cluster), ""])
+            for key, cells in cluster:
+                self._add_cells(group, cells, headers, key)
+
+        for root in (exact_root, rows_root, near_root):
+            root.setExpanded(root.childCount() <= 50)
+        self.summary_label.setText(
+            f"{len(exact)} duplicated names, {len(rows)} duplicated rows, "
+            f"{len(near)} near-duplicate clusters"
+        )
+
+    def _add_cells(self, parent, cells, headers, text=None):
+        for row, col in cells:
+            column = headers[col] if col < len(headers) else f"Col {col + 1}"
+            self._add_location(parent, row, col, text or f"Row {row + 1}", f"Row {row + 1}, {column}")
+
+    def _add_location(self, parent, row, col, text, location=""):
+        item = QTreeWidgetItem(parent, [text, location])
+        item.setData(0, Qt.UserRole, (row, col))
+        return item
+
+    def on_item_activated(self, item, _column):
+        target = item.data(0, Qt.UserRole)
+        if target:
+            row, col = target
+            self.spreadsheet.select_cell(row, col if col is not None else 0)
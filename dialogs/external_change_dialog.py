@@ -0,0 +1,90 @@
+import os
+from PyQt5.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QTreeWidget, QTreeWidgetItem
+)
+from PyQt5.QtCore import Qt
+
+# Cells or rows listed per conflict
+MAX_LISTED = 50
+
+
+class ExternalChangeDialog(QDialog):
+    """
+    Shows the conflicts of a ThreeWayMerge of the CSV changed on disk into
+    the table. Checked conflicts take the file's version; the rest keep the
+    table's. Accepting merges everything; rejecting keeps the table as is.
+    """
+
+    def __init__(self, merge, path, parent=None):
+        super().__init__(parent)
+        self.merge = merge
+        self.path = path
+        self.init_ui()
+
+    def init_ui(self):
+        """Initialize the dialog UI."""
+        self.setWindowTitle("File Changed on Disk")
+        self.resize(760, 480)
+        layout = QVBoxLayout(self)
+        label = QLabel(f"{os.path.basename(self.path)} was changed by another program. "
+                       f"{self.merge.summary()}.\n"
+                       "Check the conflicts where the file's version should replace the table's.")
+        label.setWordWrap(True)
+        layout.addWidget(label)
+
+        self.tree = QTreeWidget()
+        self.tree.setHeaderLabels(["Conflict", "Table", "File"])
+        self.tree.setColumnWidth(0, 240)
+        self.tree.setColumnWidth(1, 230)
+        layout.addWidget(self.tree)
+        self.populate()
+
+        buttons = QHBoxLayout()
+        for text, checked in (("Keep All Table Values", False), ("Take All from File", True)):
+            button = QPushButton(text)
+            button.clicked.connect(lambda _, c=checked: self.set_all_checked(c))
+            buttons.addWidget(button)
+        buttons.addStretch()
+        ignore_btn = QPushButton("Ignore File Changes")
+        ignore_btn.setToolTip("Keep the table unchanged; saving will overwrite the file")
+        ignore_btn.clicked.connect(self.reject)
+        buttons.addWidget(ignore_btn)
+        merge_btn = QPushButton("Merge")
+        merge_btn.setDefault(True)
+        merge_btn.clicked.connect(self.accept)
+        buttons.addWidget(merge_btn)
+        layout.addLayout(buttons)
+
+    def populate(self):
+        headers = self.merge.merge_headers()
+        for conflict in self.merge.conflicts:
+            first = conflict.start + 1
+            if conflict.merged_rows is not None:
+                title = f"Rows {first}-{conflict.start + len(conflict.mine_rows)}: {len(conflict.cells)} cell(s)"
+            else:
+                title = (f"Rows {first}-{conflict.start + len(conflict.mine_rows)}: "
+                         f"{len(conflict.mine_rows)} row(s) in the table, {len(conflict.theirs_rows)} in the file")
+            item = QTreeWidgetItem([title, "", ""])
+            item.setFlags(item.flags() | Qt.ItemIsUserCheckable)
+            item.setCheckState(0, Qt.Unchecked)
+            if conflict.merged_rows is not None:
+                for k, col in conflict.cells[:MAX_LISTED]:
+                    item.addChild(QTreeWidgetItem([f"Row {first + k} {headers[col]}",
+                                                   conflict.mine_rows[k][col], conflict.theirs_rows[k][col]]))
+            else:
+                for k in range(min(max(len(conflict.mine_rows), len(conflict.theirs_rows)), MAX_LISTED)):
+                    mine = " | ".join(conflict.mine_rows[k]) if k < len(conflict.mine_rows) else ""
+                    theirs = " | ".join(conflict.theirs_rows[k]) if k < len(conflict.theirs_rows) else ""
+                    item.addChild(QTreeWidgetItem([f"Row {first + k}", mine, theirs]))
+            self.tree.addTopLevelItem(item)
+            item.setExpanded(True)
+
+    def set_all_checked(self, checked):
+        state = Qt.Checked if checked else Qt.Unchecked
+        for i in range(self.tree.topLevelItemCount()):
+            self.tree.topLevelItem(i).setCheckState(0, state)
+
+    def take_theirs(self):
+        """Return the indexes of the conflicts resolved to the file's version."""
+        return [i for i in range(self.tree.topLevelItemCount())
+                if self.tree.topLevelItem(i).checkState(0) == Qt.Checked]
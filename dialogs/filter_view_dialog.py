@@ -0,0 +1,196 @@
+from PyQt5.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QGridLayout, QLabel, QComboBox, QPushButton,
+    QTableView, QAbstractItemView, QHeaderView, QWidget, QDialogButtonBox, QApplication
+)
+from PyQt5.QtCore import Qt
+from filter_index import OP_IN, OP_NOT_IN, OP_SET, OP_EMPTY
+from widgets.style_delegate import StyleComboDelegate
+
+OPERATORS = (
+    ("is", OP_IN),
+    ("is not", OP_NOT_IN),
+    ("is set", OP_SET),
+    ("is empty", OP_EMPTY),
+)
+
+
+class FilterViewDialog(QDialog):
+    """
+    Non-modal view of the credits rows matching per-column conditions.
+    The table shows the main model through a FilterProxyModel, so edits made
+    here go straight to the spreadsheet and its undo history.
+    """
+    MAX_CONDITIONS = 6
+
+    def __init__(self, spreadsheet, parent=None):
+        super().__init__(parent)
+        self.spreadsheet = spreadsheet
+        self.proxy = spreadsheet.create_filter_proxy(self)
+        self.conditions = []
+        self.init_ui()
+        self.proxy.modelReset.connect(self.update_summary)
+        self.proxy.rowsInserted.connect(self.update_summary)
+        self.proxy.rowsRemoved.connect(self.update_summary)
+        self.spreadsheet.model.modelReset.connect(self.refresh_columns)
+        self.add_condition()
+
+    def init_ui(self):
+        """Initialize the dialog UI."""
+        self.setWindowTitle("Filter View")
+        self.resize(900, 600)
+        layout = QVBoxLayout(self)
+
+        top = QHBoxLayout()
+        top.addWidget(QLabel("Show rows matching"))
+        self.mode_combo = QComboBox()
+        self.mode_combo.addItem("all conditions (AND)", True)
+        self.mode_combo.addItem("any condition (OR)", False)
+        self.mode_combo.currentIndexChanged.connect(self.apply_filter)
+        top.addWidget(self.mode_combo)
+        top.addStretch()
+        add_btn = QPushButton("Add Condition")
+        add_btn.clicked.connect(self.add_condition)
+        top.addWidget(add_btn)
+        layout.addLayout(top)
+
+        self.conditions_widget = QWidget()
+        self.conditions_layout = QGridLayout(self.conditions_widget)
+        self.conditions_layout.setContentsMargins(0, 0, 0, 0)
+        layout.addWidget(self.conditions_widget)
+
+        self.table = QTableView()
+        self.table.setModel(self.proxy)
+        self.table.setAlternatingRowColors(True)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectItems)
+        self.table.setWordWrap(False)
+        self.table.setTextElideMode(Qt.ElideRight)
+        self.table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.table.verticalHeader().setDefaultSectionSize(24)
+        self.table.horizontalHeader().setStretchLastSection(True)
+        self.delegate = StyleComboDelegate(self.spreadsheet.style_items, self)
+        self.table.doubleClicked.connect(self.on_double_clicked)
+        layout.addWidget(self.table)
+
+        bottom = QHBoxLayout()
+        self.summary_label = QLabel()
+        bottom.addWidget(self.summary_label)
+        bottom.addStretch()
+        show_btn = QPushButton("Show in Table")
+        show_btn.setToolTip("Select the current row in the main spreadsheet")
+        show_btn.clicked.connect(self.show_in_table)
+        bottom.addWidget(show_btn)
+        reapply_btn = QPushButton("Reapply")
+        reapply_btn.setToolTip("Re-evaluate the filter after edits")
+        reapply_btn.clicked.connect(self.apply_filter)
+        bottom.addWidget(reapply_btn)
+        button_box = QDialogButtonBox(QDialogButtonBox.Close)
+        button_box.rejected.connect(self.close)
+        bottom.addWidget(button_box)
+        layout.addLayout(bottom)
+        self.refresh_columns()
+
+    def filter_columns(self):
+        """Return (column index, header) for the filterable columns."""
+        headers = self.spreadsheet.get_headers()
+        return [(col, headers[col]) for col in self.spreadsheet.filter_index.columns]
+
+    def refresh_columns(self):
+        """Sync column choices and delegates with the current headers."""
+        columns = self.spreadsheet.columns
+        for col in range(len(columns)):
+            self.table.setItemDelegateForColumn(col, self.delegate if columns.is_style_column(col) else None)
+        for condition in self.conditions:
+            self.fill_columns(condition)
+        self.apply_filter()
+
+    def add_condition(self):
+        if len(self.conditions) >= self.MAX_CONDITIONS:
+            return
+        row = len(self.conditions)
+        column_combo = QComboBox()
+        op_combo = QComboBox()
+        for text, op in OPERATORS:
+            op_combo.addItem(text, op)
+        value_combo = QComboBox()
+        value_combo.setMinimumWidth(200)
+        remove_btn = QPushButton("Remove")
+        condition = {'column': column_combo, 'op': op_combo, 'value': value_combo, 'remove': remove_btn}
+        self.conditions.append(condition)
+        for i, widget in enumerate((column_combo, op_combo, value_combo, remove_btn)):
+            self.conditions_layout.addWidget(widget, row, i)
+        self.fill_columns(condition)
+        column_combo.currentIndexChanged.connect(lambda _: self.fill_values(condition))
+        op_combo.currentIndexChanged.connect(self.apply_filter)
+        value_combo.currentIndexChanged.connect(self.apply_filter)
+        remove_btn.clicked.connect(lambda: self.remove_condition(condition))
+        self.apply_filter()
+
+    def remove_condition(self, condition):
+        self.conditions.remove(condition)
+        for widget in condition.values():
+            self.conditions_layout.removeWidget(widget)
+            widget.deleteLater()
+        # Re-pack the remaining rows
+        for row, remaining in enumerate(self.conditions):
+            for i, key in enumerate(('column', 'op', 'value', 'remove')):
+                self.conditions_layout.addWidget(remaining[key], row, i)
+        self.apply_filter()
+
+    def fill_columns(self, condition):
+        combo = condition['column']
+        current = combo.currentText()
+        combo.blockSignals(True)
+        combo.clear()
+        for col, header in self.filter_columns():
+            combo.addItem(header, col)
+        found = combo.findText(current)
+        combo.setCurrentIndex(found if found >= 0 else 0)
+        combo.blockSignals(False)
+        self.fill_values(condition)
+
+    def fill_values(self, condition):
+        """List the column's distinct values with their row counts."""
+        combo = condition['value']
+        current = combo.currentData()
+        combo.blockSignals(True)
+        combo.clear()
+        col = condition['column'].currentData()
+        if col is not None:
+            for value, count in self.spreadsheet.filter_index.value_counts(col):
+                combo.addItem(f"{value or '(empty)'}  ({count})", value)
+        found = combo.findData(current)
+        combo.setCurrentIndex(found if found >= 0 else 0)
+        combo.blockSignals(False)
+        self.apply_filter()
+
+    def clauses(self):
+        clauses = []
+        for condition in self.conditions:
+            col = condition['column'].currentData()
+            op = condition['op'].currentData()
+            value = condition['value'].currentData()
+            condition['value'].setEnabled(op in (OP_IN, OP_NOT_IN))
+            if col is None or (op in (OP_IN, OP_NOT_IN) and value is None):
+                continue
+            clauses.append((col, op, [value] if value is not None else []))
+        return clauses
+
+    def apply_filter(self, *args):
+        self.proxy.set_filter(self.clauses(), self.mode_combo.currentData())
+
+    def update_summary(self):
+        self.summary_label.setText(f"{self.proxy.rowCount()} of {self.spreadsheet.model.rowCount()} rows")
+
+    def current_source_row(self):
+        index = self.table.currentIndex()
+        return self.proxy.mapToSource(index) if index.isValid() else None
+
+    def show_in_table(self):
+        source = self.current_source_row()
+        if source is not None and source.isValid():
+            self.spreadsheet.select_cell(source.row(), source.column())
+
+    def on_double_clicked(self, index):
+        # Double-click edits; Ctrl+double-click jumps to the row in the main table
+        if QApplication.keyboardModifiers() & Qt.ControlModifier:
+            self.show_in_table()
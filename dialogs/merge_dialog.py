@@ -0,0 +1,191 @@
+from PyQt5.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QFormLayout, QLabel, QListWidget, QPushButton,
+    QComboBox, QCheckBox, QLineEdit, QPlainTextEdit, QFileDialog, QDialogButtonBox, QMessageBox
+)
+from PyQt5.QtCore import QThread, pyqtSignal
+from csv_merge import CsvMerger, KEEP_ALL, KEEP_FIRST, parse_header_map
+
+
+class MergeThread(QThread):
+    """Runs a CsvMerger off the GUI thread."""
+    progress = pyqtSignal(int)
+    merged = pyqtSignal(object)
+    failed = pyqtSignal(str)
+
+    def __init__(self, merger, paths, output_path, parent=None):
+        super().__init__(parent)
+        self.merger = merger
+        self.paths = paths
+        self.output_path = output_path
+
+    def run(self):
+        try:
+            report = self.merger.merge(self.paths, self.output_path, progress=self.progress.emit)
+        except (OSError, ValueError, UnicodeDecodeError) as e:
+            self.failed.emit(str(e))
+        else:
+            self.merged.emit(report)
+
+
+class MergeDialog(QDialog):
+    """
+    Merge several Credits.csv files into one, streaming the inputs.
+    ``merged_file`` is emitted with the output path when the user asks to
+    open the result.
+    """
+    merged_file = pyqtSignal(str)
+
+    def __init__(self, file_manager, parent=None):
+        super().__init__(parent)
+        self.file_manager = file_manager
+        self.thread = None
+        self.init_ui()
+
+    def init_ui(self):
+        """Initialize the dialog UI."""
+        self.setWindowTitle("Merge CSV Files")
+        self.resize(640, 560)
+        layout = QVBoxLayout(self)
+        layout.addWidget(QLabel("Input files (earlier files win key conflicts):"))
+        inputs = QHBoxLayout()
+        self.input_list = QListWidget()
+        inputs.addWidget(self.input_list)
+        input_buttons = QVBoxLayout()
+        for text, slot in (("Add…", self.add_inputs), ("Remove", self.remove_input),
+                           ("Up", lambda: self.move_input(-1)), ("Down", lambda: self.move_input(1))):
+            button = QPushButton(text)
+            button.clicked.connect(slot)
+            input_buttons.addWidget(button)
+        input_buttons.addStretch()
+        inputs.addLayout(input_buttons)
+        layout.addLayout(inputs)
+
+        form = QFormLayout()
+        self.key_combo = QComboBox()
+        self.key_combo.setEditable(True)
+        self.key_combo.setToolTip("Merge inputs sorted on this column; leave empty to append them in order")
+        form.addRow("Merge on column:", self.key_combo)
+        self.map_edit = QLineEdit()
+        self.map_edit.setPlaceholderText("e.g. @Gap=@Vertical Gap, @Style=@Content Style")
+        self.map_edit.setToolTip("Rename input headers before matching columns")
+        form.addRow("Header mapping:", self.map_edit)
+        self.keep_combo = QComboBox()
+        self.keep_combo.addItem("Keep rows from all files", KEEP_ALL)
+        self.keep_combo.addItem("Keep the first file's rows", KEEP_FIRST)
+        form.addRow("On key conflicts:", self.keep_combo)
+        self.duplicates_check = QCheckBox("Skip duplicate rows")
+        self.duplicates_check.setChecked(True)
+        form.addRow("", self.duplicates_check)
+        output = QHBoxLayout()
+        self.output_edit = QLineEdit()
+        output.addWidget(self.output_edit)
+        browse_btn = QPushButton("Browse…")
+        browse_btn.clicked.connect(self.choose_output)
+        output.addWidget(browse_btn)
+        form.addRow("Output file:", output)
+        layout.addLayout(form)
+
+        self.report_view = QPlainTextEdit()
+        self.report_view.setReadOnly(True)
+        layout.addWidget(self.report_view)
+
+        buttons = QHBoxLayout()
+        self.open_check = QCheckBox("Open the result when done")
+        buttons.addWidget(self.open_check)
+        buttons.addStretch()
+        self.merge_btn = QPushButton("Merge")
+        self.merge_btn.clicked.connect(self.start_merge)
+        buttons.addWidget(self.merge_btn)
+        button_box = QDialogButtonBox(QDialogButtonBox.Close)
+        button_box.rejected.connect(self.close)
+        buttons.addWidget(button_box)
+        layout.addLayout(buttons)
+
+    def input_paths(self):
+        return [self.input_list.item(i).text() for i in range(self.input_list.count())]
+
+    def add_inputs(self):
+        paths, _ = QFileDialog.getOpenFileNames(self, "Add CSV Files", "", "CSV Files (*.csv)")
+        if paths:
+            self.input_list.addItems(paths)
+            self.refresh_key_columns()
+
+    def remove_input(self):
+        row = self.input_list.currentRow()
+        if row >= 0:
+            self.input_list.takeItem(row)
+            self.refresh_key_columns()
+
+    def move_input(self, delta):
+        row = self.input_list.currentRow()
+        target = row + delta
+        if row < 0 or not 0 <= target < self.input_list.count():
+            return
+        item = self.input_list.takeItem(row)
+        self.input_list.insertItem(target, item)
+        self.input_list.setCurrentRow(target)
+
+    def refresh_key_columns(self):
+        """Offer the union of the input headers (only header rows are read)."""
+        current = self.key_combo.currentText()
+        self.key_combo.clear()
+        self.key_combo.addItem("")
+        try:
+            merger = CsvMerger(self.file_manager, self.header_map())
+            self.key_combo.addItems(merger.output_headers(self.input_paths()))
+        except (OSError, ValueError, UnicodeDecodeError) as e:
+            self.report_view.setPlainText(f"Failed to read headers: {e}")
+        self.key_combo.setCurrentText(current)
+
+    def header_map(self):
+        pairs = [p for p in self.map_edit.text().split(',') if p.strip()]
+        return parse_header_map(pairs)
+
+    def choose_output(self):
+        path, _ = QFileDialog.getSaveFileName(self, "Save Merged CSV", "Credits.csv", "CSV Files (*.csv)")
+        if path:
+            self.output_edit.setText(path)
+
+    def start_merge(self):
+        paths = self.input_paths()
+        output_path = self.output_edit.text().strip()
+        if len(paths) < 2 or not output_path:
+            QMessageBox.warning(self, "Merge CSV Files", "Add at least two input files and choose an output file.")
+            return
+        try:
+            merger = CsvMerger(self.file_manager, self.header_map(), key=self.key_combo.currentText().strip() or None,
+                               drop_duplicates=self.duplicates_check.isChecked(),
+                               keep=self.keep_combo.currentData())
+        except ValueError as e:
+            QMessageBox.warning(self, "Merge CSV Files", str(e))
+            return
+        self.merge_btn.setEnabled(False)
+        self.report_view.setPlainText("Merging…")
+        self.thread = MergeThread(merger, paths, output_path, self)
+        self.thread.progress.connect(lambda n: self.report_view.setPlainText(f"Merging… {n} rows written"))
+        self.thread.merged.connect(self.on_merged)
+        self.thread.failed.connect(self.on_failed)
+        self.thread.finished.connect(lambda: self.merge_btn.setEnabled(True))
+        self.thread.start()
+
+    def on_failed(self, message):
+        self.report_view.setPlainText(f"Merge failed: {message}")
+
+    def on_merged(self, report):
+        lines = [report.summary(), ""]
+        for path, number, first_path, first_number in report.duplicates[:200]:
+            lines.append(f"Duplicate: {path} row {number} repeats {first_path} row {first_number}")
+        for key, rows, differing in report.conflicts[:200]:
+            where = ", ".join(f"{path} row {number}" for path, number in rows)
+            lines.append(f"Conflict on {key!r}: {where} differ in {', '.join(differing)}")
+        for path, number, key, previous in report.unsorted[:200]:
+            lines.append(f"Out of order: {path} row {number} ({key!r} after {previous!r})")
+        self.report_view.setPlainText("\n".join(lines))
+        if self.open_check.isChecked():
+            self.merged_file.emit(self.thread.output_path)
+
+    def closeEvent(self, event):
+        # The merge writes to a temporary file, so waiting is the only safe way to close
+        if self.thread is not None and self.thread.isRunning():
+            self.thread.wait()
+        super().closeEvent(event)
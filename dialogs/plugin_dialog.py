@@ -0,0 +1,98 @@
+from PyQt5.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QTreeWidget, QTreeWidgetItem, QDialogButtonBox
+)
+from PyQt5.QtCore import Qt, pyqtSignal
+from PyQt5.QtGui import QBrush, QColor
+
+
+class PluginDialog(QDialog):
+    """
+    Lists the installed plugins with the time spent in each of their hooks,
+    slowest first. Unchecking a plugin disables it; ``plugins_changed`` is
+    emitted so the window can re-apply column types and menu entries.
+    """
+    plugins_changed = pyqtSignal()
+
+    def __init__(self, registry, parent=None):
+        super().__init__(parent)
+        self.registry = registry
+        self.init_ui()
+        self.populate()
+
+    def init_ui(self):
+        """Initialize the dialog UI."""
+        self.setWindowTitle("Plugins")
+        self.resize(720, 440)
+        layout = QVBoxLayout(self)
+        self.summary_label = QLabel()
+        self.summary_label.setWordWrap(True)
+        layout.addWidget(self.summary_label)
+        self.tree = QTreeWidget()
+        self.tree.setHeaderLabels(["Plugin / hook", "Calls", "Total (ms)", "Mean (µs)", "Max (ms)", "Errors"])
+        self.tree.setColumnWidth(0, 260)
+        self.tree.itemChanged.connect(self.on_item_changed)
+        layout.addWidget(self.tree)
+        buttons = QHBoxLayout()
+        refresh_btn = QPushButton("Refresh")
+        refresh_btn.clicked.connect(self.populate)
+        buttons.addWidget(refresh_btn)
+        reset_btn = QPushButton("Reset Timings")
+        reset_btn.clicked.connect(self.reset_timings)
+        buttons.addWidget(reset_btn)
+        buttons.addStretch()
+        button_box = QDialogButtonBox(QDialogButtonBox.Close)
+        button_box.rejected.connect(self.close)
+        buttons.addWidget(button_box)
+        layout.addLayout(buttons)
+
+    def populate(self):
+        registry = self.registry
+        self.tree.blockSignals(True)
+        self.tree.clear()
+        by_plugin = {}
+        failed = []
+        for row in registry.report():
+            by_plugin.setdefault(row['plugin'], []).append(row)
+        # Slowest plugins first (report order), then the ones never called
+        names = list(by_plugin) + [name for name in registry.plugins if name not in by_plugin]
+        for name in names:
+            plugin = registry.plugins.get(name)
+            rows = by_plugin.get(name, [])
+            calls = sum(r['calls'] for r in rows)
+            total = sum(r['seconds'] for r in rows)
+            errors = sum(r['errors'] for r in rows)
+            item = QTreeWidgetItem([name, str(calls), f"{total * 1000:.1f}", "", "", str(errors)])
+            item.setData(0, Qt.UserRole, name)
+            if plugin is not None:
+                item.setFlags(item.flags() | Qt.ItemIsUserCheckable)
+                item.setCheckState(0, Qt.Checked if plugin.enabled else Qt.Unchecked)
+                item.setToolTip(0, plugin.description or str(plugin.folder or "registered from code"))
+                errors = plugin.load_errors()
+                if errors:
+                    item.setText(0, f"{name} (failed to load)")
+                    item.setForeground(0, QBrush(QColor(176, 0, 32)))
+                    item.setToolTip(0, "\n".join(errors))
+                    failed.extend(errors)
+            for r in rows:
+                mean = r['seconds'] / r['calls'] * 1e6 if r['calls'] else 0
+                item.addChild(QTreeWidgetItem([r['hook'], str(r['calls']), f"{r['seconds'] * 1000:.1f}",
+                                               f"{mean:.1f}", f"{r['max_seconds'] * 1000:.2f}", str(r['errors'])]))
+            self.tree.addTopLevelItem(item)
+            item.setExpanded(True)
+        self.tree.blockSignals(False)
+        text = f"{len(registry.plugins)} plugin(s) in {', '.join(str(d) for d in registry.plugin_dirs)}."
+        if registry.problems:
+            text += " Skipped: " + "; ".join(registry.problems)
+        if failed:
+            text += " Failed to load: " + "; ".join(failed)
+        self.summary_label.setText(text)
+
+    def on_item_changed(self, item, column):
+        name = item.data(0, Qt.UserRole)
+        if column == 0 and item.parent() is None and name in self.registry.plugins:
+            self.registry.set_enabled(name, item.checkState(0) == Qt.Checked)
+            self.plugins_changed.emit()
+
+    def reset_timings(self):
+        self.registry.reset_stats()
+        self.populate()
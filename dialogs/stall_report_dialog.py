@@ -0,0 +1,85 @@
+from PyQt5.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QTreeWidget, QTreeWidgetItem,
+    QSpinBox, QDialogButtonBox, QFileDialog, QMessageBox
+)
+
+
+class StallReportDialog(QDialog):
+    """
+    Shows the UI stalls recorded by a StallWatchdog: count and duration
+    percentiles, then the stacks that stalled longest in total, each
+    expandable to its frames. Updates as new stalls are recorded.
+    """
+
+    def __init__(self, watchdog, parent=None):
+        super().__init__(parent)
+        self.watchdog = watchdog
+        self.init_ui()
+        self.populate()
+        watchdog.stall_detected.connect(self.populate)
+
+    def init_ui(self):
+        """Initialize the dialog UI."""
+        self.setWindowTitle("UI Stalls")
+        self.resize(760, 460)
+        layout = QVBoxLayout(self)
+        threshold_row = QHBoxLayout()
+        threshold_row.addWidget(QLabel("Report stalls longer than"))
+        self.threshold_spin = QSpinBox()
+        self.threshold_spin.setRange(50, 10000)
+        self.threshold_spin.setSingleStep(50)
+        self.threshold_spin.setSuffix(" ms")
+        self.threshold_spin.setValue(self.watchdog.threshold_ms)
+        self.threshold_spin.valueChanged.connect(self.watchdog.set_threshold)
+        threshold_row.addWidget(self.threshold_spin)
+        threshold_row.addStretch()
+        layout.addLayout(threshold_row)
+        self.summary_label = QLabel()
+        layout.addWidget(self.summary_label)
+        self.tree = QTreeWidget()
+        self.tree.setHeaderLabels(["Stack / frame", "Stalls", "Total (ms)", "Max (ms)", "Actions"])
+        self.tree.setColumnWidth(0, 320)
+        layout.addWidget(self.tree)
+        buttons = QHBoxLayout()
+        reset_btn = QPushButton("Reset")
+        reset_btn.clicked.connect(self.reset)
+        buttons.addWidget(reset_btn)
+        save_btn = QPushButton("Save JSON…")
+        save_btn.setToolTip("Write the stall report to a JSON file")
+        save_btn.clicked.connect(self.save_report)
+        buttons.addWidget(save_btn)
+        buttons.addStretch()
+        button_box = QDialogButtonBox(QDialogButtonBox.Close)
+        button_box.rejected.connect(self.close)
+        buttons.addWidget(button_box)
+        layout.addLayout(buttons)
+
+    def populate(self, *_):
+        report = self.watchdog.report()
+        self.summary_label.setText(
+            f"{report['stalls']} stall(s); p50 {report['p50_ms']:.0f} ms, p95 {report['p95_ms']:.0f} ms, "
+            f"p99 {report['p99_ms']:.0f} ms, max {report['max_ms']:.0f} ms")
+        self.tree.clear()
+        for group in report['top_stacks']:
+            stack = group['stack']
+            title = stack[-1] if stack else "(outside Python code)"
+            item = QTreeWidgetItem([title, str(group['count']), f"{group['total_ms']:.0f}",
+                                    f"{group['max_ms']:.0f}", ", ".join(group['actions'])])
+            # Innermost frame first, like the title
+            for frame in reversed(stack):
+                item.addChild(QTreeWidgetItem([frame]))
+            self.tree.addTopLevelItem(item)
+
+    def reset(self):
+        self.watchdog.reset()
+        self.populate()
+
+    def save_report(self):
+        path, _ = QFileDialog.getSaveFileName(self, "Save Stall Report", "stall_report.json",
+                                              "JSON Files (*.json)")
+        if not path:
+            return
+        try:
+            self.watchdog.dump_json(path)
+        except OSError as e:
+            QMessageBox.critical(self, "Error", f"Failed to save stall report: {e}")
@@ -0,0 +1,197 @@
+import copy
+from PyQt5.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QSplitter, QTreeWidget, QTreeWidgetItem,
+    QTableWidget, QTableWidgetItem, QHeaderView, QPushButton, QDialogButtonBox,
+    QInputDialog, QMessageBox, QLabel
+)
+from PyQt5.QtCore import Qt, pyqtSignal
+import toml_backends
+from style_graph import STYLE_TABLES
+from toml_patch import TomlPatcher, format_value, parse_value
+
+TABLE_TITLES = {
+    'pageStyle': "Page Styles",
+    'contentStyle': "Content Styles",
+    'letterStyle': "Letter Styles",
+    'transitionStyle': "Transitions",
+    'pictureStyle': "Pictures",
+}
+
+
+class StylingEditorDialog(QDialog):
+    """
+    Edit the top-level properties of the styles in Styling.toml.
+
+    Saving patches only the changed values in the original file text, so
+    formatting, key order and comments are kept. ``styles_changed`` is
+    emitted with ``(table, old name, style dict)`` for every modified style.
+    """
+    styles_changed = pyqtSignal(list)
+
+    def __init__(self, styling_path, parent=None):
+        super().__init__(parent)
+        self.styling_path = styling_path
+        with open(styling_path, 'r', encoding='utf-8', newline='') as f:
+            text = f.read()
+        self.document = toml_backends.loads(text)
+        self.patcher = TomlPatcher(text, STYLE_TABLES)
+        # (table, name) -> {key: new value}
+        self.pending = {}
+        self._current = None
+        self._loading = False
+        self.init_ui()
+
+    def init_ui(self):
+        """Initialize the dialog UI."""
+        self.setWindowTitle("Edit Styling")
+        self.resize(760, 560)
+        layout = QVBoxLayout(self)
+        splitter = QSplitter(Qt.Horizontal)
+        self.style_tree = QTreeWidget()
+        self.style_tree.setHeaderHidden(True)
+        for table in STYLE_TABLES:
+            group = QTreeWidgetItem([TABLE_TITLES[table]])
+            group.setFlags(group.flags() & ~Qt.ItemIsSelectable)
+            for style in self.document.get(table, []):
+                if 'name' in style:
+                    item = QTreeWidgetItem([style['name']])
+                    item.setData(0, Qt.UserRole, (table, style['name']))
+                    group.addChild(item)
+            self.style_tree.addTopLevelItem(group)
+        self.style_tree.expandAll()
+        self.style_tree.currentItemChanged.connect(self.on_style_selected)
+        splitter.addWidget(self.style_tree)
+
+        self.property_table = QTableWidget(0, 2)
+        self.property_table.setHorizontalHeaderLabels(["Property", "Value"])
+        self.property_table.horizontalHeader().setSectionResizeMode(1, QHeaderView.Stretch)
+        self.property_table.verticalHeader().setVisible(False)
+        self.property_table.itemChanged.connect(self.on_value_edited)
+        splitter.addWidget(self.property_table)
+        splitter.setSizes([220, 540])
+        layout.addWidget(splitter)
+
+        self.hint_label = QLabel("Strings are edited as plain text; other values use TOML syntax.")
+        layout.addWidget(self.hint_label)
+
+        buttons = QHBoxLayout()
+        add_btn = QPushButton("Add Property…")
+        add_btn.clicked.connect(self.add_property)
+        buttons.addWidget(add_btn)
+        buttons.addStretch()
+        button_box = QDialogButtonBox(QDialogButtonBox.Save | QDialogButtonBox.Close)
+        button_box.accepted.connect(self.save)
+        button_box.rejected.connect(self.reject)
+        buttons.addWidget(button_box)
+        layout.addLayout(buttons)
+
+    def style_dict(self, table, name):
+        """Return the style with pending edits applied."""
+        for style in self.document.get(table, []):
+            if style.get('name') == name:
+                style = dict(style)
+                style.update(self.pending.get((table, name), {}))
+                return style
+        return None
+
+    def on_style_selected(self, current, previous=None):
+        node = current.data(0, Qt.UserRole) if current else None
+        self._current = node
+        self._loading = True
+        self.property_table.setRowCount(0)
+        if node:
+            style = self.style_dict(*node)
+            # Sub-tables such as letter style layers are not edited here
+            keys = [k for k, v in style.items() if not (isinstance(v, list) and v and isinstance(v[0], dict))
+                    and not isinstance(v, dict)]
+            self.property_table.setRowCount(len(keys))
+            for row, key in enumerate(keys):
+                key_item = QTableWidgetItem(key)
+                key_item.setFlags(key_item.flags() & ~Qt.ItemIsEditable)
+                self.property_table.setItem(row, 0, key_item)
+                value_item = QTableWidgetItem(self.display_value(style[key]))
+                if key == 'name':
+                    # Renaming must also update the credits and the styles referencing it
+                    value_item.setFlags(value_item.flags() & ~Qt.ItemIsEditable)
+                    value_item.setToolTip("Use Rename… in the styles panel to rename a style everywhere")
+                self.property_table.setItem(row, 1, value_item)
+        self._loading = False
+
+    @staticmethod
+    def display_value(value):
+        return value if isinstance(value, str) else format_value(value)
+
+    @staticmethod
+    def convert_value(text, original):
+        """Convert edited text to the type of the original value."""
+        if isinstance(original, str):
+            return text
+        value = parse_value(text.strip())
+        # Allow ints where floats were, but keep the original type
+        if isinstance(original, float) and isinstance(value, int) and not isinstance(value, bool):
+            value = float(value)
+        if type(value) is not type(original):
+            raise ValueError(f"Expected {type(original).__name__}, got {type(value).__name__}")
+        return value
+
+    def on_value_edited(self, item):
+        if self._loading or item.column() != 1 or not self._current:
+            return
+        key = self.property_table.item(item.row(), 0).text()
+        style = self.style_dict(*self._current)
+        try:
+            value = self.convert_value(item.text(), style[key])
+        except ValueError as e:
+            QMessageBox.warning(self, "Invalid Value", f"{key}: {e}")
+            self._loading = True
+            item.setText(self.display_value(style[key]))
+            self._loading = False
+            return
+        self.pending.setdefault(self._current, {})[key] = value
+
+    def add_property(self):
+        """Add a new key to the selected style; the value is TOML syntax."""
+        if not self._current:
+            return
+        key, ok = QInputDialog.getText(self, "Add Property", "Property name:")
+        key = key.strip()
+        if not ok or not key:
+            return
+        if key in self.style_dict(*self._current):
+            QMessageBox.warning(self, "Add Property", f"{key} is already set; edit its value instead.")
+            return
+        text, ok = QInputDialog.getText(self, "Add Property", f"Value for {key} (TOML, e.g. \"text\", 1.0, true):")
+        if not ok:
+            return
+        try:
+            value = parse_value(text.strip())
+        except ValueError as e:
+            QMessageBox.warning(self, "Invalid Value", str(e))
+            return
+        self.pending.setdefault(self._current, {})[key] = value
+        self.on_style_selected(self.style_tree.currentItem())
+
+    def save(self):
+        """Patch the changed values into Styling.toml and report the changed styles."""
+        changes = [(table, name, key, value)
+                   for (table, name), values in self.pending.items() for key, value in values.items()]
+        if not changes:
+            self.accept()
+            return
+        try:
+            self.patcher.patch(changes)
+            self.patcher.save(self.styling_path)
+        except (OSError, KeyError, TypeError) as e:
+            QMessageBox.critical(self, "Error", f"Failed to save styling: {e}")
+            return
+        changed = []
+        for (table, name), values in self.pending.items():
+            for style in self.document.get(table, []):
+                if style.get('name') == name:
+                    style.update(copy.deepcopy(values))
+                    changed.append((table, name, style))
+                    break
+        print(f"Patched {len(changes)} value(s) in {self.styling_path}")
+        self.pending = {}
+        self.styles_changed.emit(changed)
+        self.accept()
@@ -0,0 +1,234 @@
+"""
+Duplicate and near-duplicate detection for credit names.
+
+Cells are reduced to normalized keys (case-folded, ``{{Style}}`` markup and
+redundant whitespace removed) and counted in hash maps, so exact duplicates
+fall out of a dictionary lookup. Near-duplicates (typos, swapped given and
+family names) are found through a blocking index over token-sorted keys: each
+key is filed under every single-character deletion of itself, so two keys one
+typo apart meet in a shared block and no pairwise comparison is needed.
+"""
+import re
+from collections import defaultdict
+from typing import Dict, List, Optional, Set, Tuple
+
+NAME_COLUMNS = ('@Head', '@Body', '@Tail')
+
+_STYLE_MARKUP = re.compile(r'\{\{\s*Style(?:\s[^}]*)?\}\}', re.IGNORECASE)
+_DIRECTIVE = re.compile(r'\{\{[^}]*\}\}')
+_TOKEN = re.compile(r'\w+')
+_DIGITS = re.compile(r'\d+')
+
+
+def normalize_text(text: str) -> str:
+    """Return the comparison key for a cell: no style markup, folded case and whitespace."""
+    text = text or ''
+    if '{' in text:
+        text = _STYLE_MARKUP.sub('', text)
+    return ' '.join(text.split()).casefold()
+
+
+def token_key(key: str) -> str:
+    """Return a key with its word tokens sorted, so reordered names compare equal."""
+    return ' '.join(sorted(_TOKEN.findall(key)))
+
+
+def deletion_variants(text: str) -> Set[str]:
+    """Return ``text`` and every string obtained by deleting one character from it."""
+    return {text} | {text[:i] + text[i + 1:] for i in range(len(text))}
+
+
+class DuplicateIndex:
+    """
+    Incrementally maintained index of duplicate credit names.
+
+    The index keeps one tuple of normalized name cells per table row plus
+    occurrence counts per key. Cell edits and row inserts/removals update the
+    counts and the blocking index in place; positions are only resolved when
+    results are requested. The blocking index itself is built on the first
+    near-duplicate query, so loading a table only pays for the exact counts.
+    """
+
+    def __init__(self, name_columns=NAME_COLUMNS, min_length: int = 5):
+        self.name_columns = tuple(name_columns)
+        # Shorter keys are too close to each other to call a one-letter difference a typo
+        self.min_length = min_length
+        self.columns: List[int] = []
+        self.version = 0
+        self._rows: List[Tuple[str, ...]] = []
+        self._key_counts: Dict[str, int] = defaultdict(int)
+        self._row_counts: Dict[Tuple[str, ...], int] = defaultdict(int)
+        self._blocks: Dict[str, Set[str]] = defaultdict(set)
+        self._near: Dict[str, Set[str]] = defaultdict(set)
+        self._near_ready = False
+
+    # Building and incremental updates
+    def rebuild(self, headers: list, rows: list) -> None:
+        """Index ``rows`` (table rows without the header row) from scratch."""
+        self.columns = [i for i, h in enumerate(headers) if str(h).strip() in self.name_columns]
+        self._rows = []
+        self._key_counts.clear()
+        self._row_counts.clear()
+        self._blocks.clear()
+        self._near.clear()
+        self._near_ready = False
+        for row in rows:
+            entry = self._normalize_row(row)
+            self._rows.append(entry)
+            self._add_entry(entry)
+        self.version += 1
+
+    def set_cell(self, row: int, col: int, value) -> None:
+        """Update the index after the cell at (row, col) changed to ``value``."""
+        if col not in self.columns or not 0 <= row < len(self._rows):
+            return
+        pos = self.columns.index(col)
+        old = self._rows[row]
+        key = self._cell_key(value)
+        if old[pos] == key:
+            return
+        self._remove_entry(old)
+        new = old[:pos] + (key,) + old[pos + 1:]
+        self._rows[row] = new
+        self._add_entry(new)
+        self.version += 1
+
+    def insert_rows(self, first: int, count: int = 1, rows: Optional[list] = None) -> None:
+        """Account for rows inserted before ``first``; ``rows`` holds their values if not blank."""
+        if rows is None:
+            entries = [('',) * len(self.columns)] * count
+        else:
+            entries = [self._normalize_row(row) for row in rows]
+            for entry in entries:
+                self._add_entry(entry)
+        self._rows[first:first] = entries
+        self.version += 1
+
+    def remove_rows(self, first: int, count: int = 1) -> None:
+        """Account for ``count`` rows removed starting at ``first``."""
+        for entry in self._rows[first:first + count]:
+            self._remove_entry(entry)
+        del self._rows[first:first + count]
+        self.version += 1
+
+    def move_rows(self, first: int, count: int, destination: int) -> None:
+        """Account for a block of rows moved before ``destination`` (Qt moveRows semantics)."""
+        block = self._rows[first:first + count]
+        del self._rows[first:first + count]
+        if destination > first:
+            destination -= count
+        self._rows[destination:destination] = block
+        self.version += 1
+
+    # Queries
+    def exact_groups(self) -> List[Tuple[str, List[Tuple[int, int]]]]:
+        """Return ``(key, [(row, col), ...])`` for every name used more than once."""
+        keys = {k for k, n in self._key_counts.items() if n > 1}
+        cells = self._locate(keys)
+        return sorted(((k, cells[k]) for k in keys), key=lambda g: g[1][0])
+
+    def row_groups(self) -> List[List[int]]:
+        """Return lists of rows whose name cells are all identical."""
+        keys = {k for k, n in self._row_counts.items() if n > 1}
+        groups = defaultdict(list)
+        for row, entry in enumerate(self._rows):
+            if entry in keys:
+                groups[entry].append(row)
+        return sorted(groups.values())
+
+    def near_groups(self) -> List[List[Tuple[str, List[Tuple[int, int]]]]]:
+        """Return clusters of similar but not identical names with their cells."""
+        if not self._near_ready:
+            self._near_ready = True
+            for key in self._key_counts:
+                self._add_key(key)
+        seen = set()
+        clusters = []
+        for start in sorted(k for k, links in self._near.items() if links):
+            if start in seen:
+                continue
+            cluster, stack = [], [start]
+            seen.add(start)
+            while stack:
+                key = stack.pop()
+                cluster.append(key)
+                for other in self._near[key]:
+                    if other not in seen:
+                        seen.add(other)
+                        stack.append(other)
+            clusters.append(sorted(cluster))
+        cells = self._locate({k for c in clusters for k in c})
+        return [[(k, cells[k]) for k in cluster] for cluster in clusters]
+
+    # Internals
+    def _cell_key(self, value) -> str:
+        if not value:
+            return ''
+        key = normalize_text(str(value))
+        # Cells made only of directives such as {{Blank}} or {{Pic ...}} are not names
+        if '{' in key and not _DIRECTIVE.sub('', key).strip():
+            return ''
+        return key
+
+    def _normalize_row(self, row) -> Tuple[str, ...]:
+        return tuple(self._cell_key(row[c]) if c < len(row) else '' for c in self.columns)
+
+    def _locate(self, keys: Set[str]) -> Dict[str, List[Tuple[int, int]]]:
+        cells = defaultdict(list)
+        if keys:
+            for row, entry in enumerate(self._rows):
+                for pos, key in enumerate(entry):
+                    if key in keys:
+                        cells[key].append((row, self.columns[pos]))
+        return cells
+
+    def _add_entry(self, entry: Tuple[str, ...]) -> None:
+        if any(entry):
+            self._row_counts[entry] += 1
+        for key in entry:
+            if key:
+                self._key_counts[key] += 1
+                if self._key_counts[key] == 1:
+                    self._add_key(key)
+
+    def _remove_entry(self, entry: Tuple[str, ...]) -> None:
+        if any(entry):
+            self._row_counts[entry] -= 1
+            if self._row_counts[entry] <= 0:
+                del self._row_counts[entry]
+        for key in entry:
+            if key:
+                self._key_counts[key] -= 1
+                if self._key_counts[key] <= 0:
+                    del self._key_counts[key]
+                    self._remove_key(key)
+
+    def _add_key(self, key: str) -> None:
+        """Register a newly seen key and link it to similar existing keys."""
+        if not self._near_ready:
+            return
+        sorted_key = token_key(key)
+        if len(sorted_key) < self.min_length:
+            return
+        variants = deletion_variants(sorted_key)
+        digits = _DIGITS.findall(sorted_key)
+        for variant in variants:
+            block = self._blocks[variant]
+            for other in block:
+                # "Artist01" and "Artist02" are different people, not a typo
+                if other != key and _DIGITS.findall(token_key(other)) == digits:
+                    self._near[key].add(other)
+                    self._near[other].add(key)
+            block.add(key)
+
+    def _remove_key(self, key: str) -> None:
+        if not self._near_ready:
+            return
+        for variant in deletion_variants(token_key(key)):
+            block = self._blocks.get(variant)
+            if block is not None:
+                block.discard(key)
+                if not block:
+                    del self._blocks[variant]
+        for other in self._near.pop(key, ()):
+            self._near[other].discard(key)
@@ -0,0 +1,137 @@
+"""
+Undoable edit commands for the credits table model.
+
+Each command records only what it changed (cell values, inserted or removed
+rows, a moved block), so undo history grows with the size of the edits rather
+than with the size of the table. Commands replay themselves through the
+model's unrecorded ``write_cells``/``insert_row_values``/``take_rows``/
+``relocate_rows`` primitives; ``StylingTextCommand`` swaps the text of the
+styling file for edits that change it together with the table.
+"""
+from typing import Callable, List, Optional, Sequence, Tuple
+
+from toml_patch import write_text
+
+
+class EditCommand:
+    """Base class for undoable edits."""
+    text = "Edit"
+
+    def redo(self, model) -> None:
+        raise NotImplementedError
+
+    def undo(self, model) -> None:
+        raise NotImplementedError
+
+
+class SetCellsCommand(EditCommand):
+    """Change a batch of cells; ``cells`` holds (row, col, old, new) tuples."""
+    def __init__(self, cells: List[Tuple[int, int, str, str]], text: str = "Edit Cells"):
+        self.cells = cells
+        self.text = text
+
+    def redo(self, model) -> None:
+        model.write_cells([(row, col, new) for row, col, _, new in self.cells])
+
+    def undo(self, model) -> None:
+        model.write_cells([(row, col, old) for row, col, old, _ in self.cells])
+
+
+class InsertRowsCommand(EditCommand):
+    """Insert ``rows`` (lists of values) before ``first``."""
+    def __init__(self, first: int, rows: List[list], text: str = "Insert Rows"):
+        self.first = first
+        self.rows = rows
+        self.text = text
+
+    def redo(self, model) -> None:
+        model.insert_row_values(self.first, [row[:] for row in self.rows])
+
+    def undo(self, model) -> None:
+        model.take_rows(self.first, len(self.rows))
+
+
+class RemoveRowsCommand(EditCommand):
+    """Remove a contiguous block of rows, keeping their values for undo."""
+    def __init__(self, first: int, rows: List[list], text: str = "Remove Rows"):
+        self.first = first
+        self.rows = rows
+        self.text = text
+
+    def redo(self, model) -> None:
+        model.take_rows(self.first, len(self.rows))
+
+    def undo(self, model) -> None:
+        model.insert_row_values(self.first, [row[:] for row in self.rows])
+
+
+class MoveRowsCommand(EditCommand):
+    """Move ``count`` rows starting at ``first`` before ``destination`` (Qt moveRows semantics)."""
+    def __init__(self, first: int, count: int, destination: int, text: str = "Move Rows"):
+        self.first = first
+        self.count = count
+        self.destination = destination
+        self.text = text
+
+    def redo(self, model) -> None:
+        model.relocate_rows(self.first, self.count, self.destination)
+
+    def undo(self, model) -> None:
+        if self.destination > self.first:
+            model.relocate_rows(self.destination - self.count, self.count, self.first)
+        else:
+            model.relocate_rows(self.destination, self.count, self.first + self.count)
+
+
+class ReplaceTableCommand(EditCommand):
+    """Swap the whole table; reserved for rare structural edits such as column changes."""
+    def __init__(self, before: Tuple[list, List[list]], after: Tuple[list, List[list]],
+                 text: str = "Change Columns"):
+        self.before = before
+        self.after = after
+        self.text = text
+
+    def redo(self, model) -> None:
+        headers, rows = self.after
+        model.replace_table(list(headers), [row[:] for row in rows])
+
+    def undo(self, model) -> None:
+        headers, rows = self.before
+        model.replace_table(list(headers), [row[:] for row in rows])
+
+
+class StylingTextCommand(EditCommand):
+    """Swap the styling file between two texts; ``changed`` reloads the styling after each write."""
+    def __init__(self, path: str, before: str, after: str, changed: Optional[Callable[[], None]] = None,
+                 text: str = "Edit Styling"):
+        self.path = path
+        self.before = before
+        self.after = after
+        self.changed = changed
+        self.text = text
+
+    def _write(self, text: str) -> None:
+        write_text(self.path, text)
+        if self.changed is not None:
+            self.changed()
+
+    def redo(self, model) -> None:
+        self._write(self.after)
+
+    def undo(self, model) -> None:
+        self._write(self.before)
+
+
+class CompoundCommand(EditCommand):
+    """Group several commands into one undo entry."""
+    def __init__(self, commands: Sequence[EditCommand], text: str = "Edit"):
+        self.commands = list(commands)
+        self.text = text
+
+    def redo(self, model) -> None:
+        for command in self.commands:
+            command.redo(model)
+
+    def undo(self, model) -> None:
+        for command in reversed(self.commands):
+            command.undo(model)
@@ -1,16 +1,112 @@
 import csv
+import io
+import multiprocessing
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+import spreadsheet_formats
+from csv_layout import CsvLayout
+
+DEFAULT_HEADERS = ["@Head", "@Body", "@Tail", "@Vertical Gap", "@Content Style",
+                   "@Break Harmonization", "@Spine Position", "@Page Style",
+                   "@Page Runtime", "@Page Gap"]
+
+# Files larger than this are parsed in chunks on a process pool
+PARALLEL_THRESHOLD_BYTES = 8 * 1024 * 1024
+# Chunks smaller than this are not worth the pickling round trip
+MIN_CHUNK_BYTES = 1024 * 1024
+
+# The editor runs other threads (styling parse, stall watchdog, Qt's pools), and forking a
+# threaded process can deadlock the child; start workers from a clean process instead
+_POOL_START_METHOD = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+
+_COMMENT_LINE = re.compile(r'^[^\S\n]*//[^\n]*(?:\n|$)', re.MULTILINE)
+
+
+def _strip_comment_lines(content):
+    """Normalize line endings and drop lines starting with // (after whitespace)."""
+    content = content.replace('\r\n', '\n').replace('\r', '\n')
+    return _COMMENT_LINE.sub('', content)
+
+
+def _is_comment_line(line):
+    return line.lstrip(' \t\f\v').startswith('//')
+
+
+def _credits_rows(rows):
+    """
+    The row pipeline shared by the CSV and spreadsheet readers: empty rows
+    are skipped and DEFAULT_HEADERS are yielded first when the first row is
+    not a header row.
+    """
+    first = True
+    for row in rows:
+        if not row:
+            continue
+        if first:
+            first = False
+            if not row[0].startswith('@'):
+                yield list(DEFAULT_HEADERS)
+        yield row
+
+
+def _parse_csv_text(text):
+    """Parse CSV text into rows, skipping empty rows."""
+    reader = csv.reader(io.StringIO(text), quoting=csv.QUOTE_MINIMAL)
+    return [row for row in reader if row]
+
+
+def find_record_boundaries(content, chunk_count):
+    """
+    Return offsets splitting ``content`` into at most ``chunk_count`` pieces
+    that each start at a record boundary.
+
+    A newline ends a record only when it is outside quotes, i.e. when the
+    number of '"' characters before it is even, so multiline @Body fields
+    are never split. Comment lines are expected to be stripped already.
+    """
+    size = len(content)
+    boundaries = [0]
+    quotes = 0
+    scanned = 0
+    for i in range(1, chunk_count):
+        pos = max(size * i // chunk_count, boundaries[-1])
+        while pos < size:
+            newline = content.find('\n', pos)
+            if newline < 0:
+                pos = size
+                break
+            # Count quotes incrementally so the whole scan stays linear
+            quotes += content.count('"', scanned, newline)
+            scanned = newline
+            pos = newline + 1
+            if quotes % 2 == 0:
+                break
+        if pos >= size:
+            break
+        if pos > boundaries[-1]:
+            boundaries.append(pos)
+    boundaries.append(size)
+    return boundaries
+
+
 class FileManager:
     """
     Handles loading and saving CSV files for the spreadsheet editor.
     """
-    def __init__(self):
-        pass
+    def __init__(self, parallel_threshold=PARALLEL_THRESHOLD_BYTES, max_workers=None):
+        self.parallel_threshold = parallel_threshold
+        self.max_workers = max_workers or os.cpu_count() or 1
+        # Absolute path -> CsvLayout of the file as last loaded or saved, so saves can reuse its bytes
+        self.layouts = {}
 
-    def load_csv(self, file_path):
+    def load_csv(self, file_path, parallel=None):
         """
         Load a CSV file and return a list of lists (rows).
+        Files above ``parallel_threshold`` bytes are parsed in parallel unless
+        ``parallel`` is given explicitly.
         """
         try:
             if not file_path:
@@ -22,21 +118,11 @@ class FileManager:
                 print(f"File not found: {file_path}")
                 return []
                 
-            rows = []
             print(f"Reading CSV file: {file_path}")
-            
-            # First read the file content and remove any comment lines
-            with open(file_path, 'r', newline='', encoding='utf-8-sig') as f:
-                content = f.read()
-                # Remove comment lines starting with //
-                content_lines = [line for line in content.splitlines() if not line.strip().startswith('//')]
-                content = '\n'.join(content_lines)
-            
-            # Now parse the cleaned content as CSV
-            import io
-            csv_file = io.StringIO(content)
-            reader = csv.reader(csv_file, quoting=csv.QUOTE_MINIMAL)
-            rows = [row for row in reader if row]  # Skip empty rows
+            if parallel is None:
+                parallel = path.stat().st_size >= self.parallel_threshold and self.max_workers > 1
+
+            rows = self._read_rows(file_path, parallel)
             
             print(f"Read {len(rows)} rows from CSV")
             if rows:
@@ -44,10 +130,7 @@ class FileManager:
                 
             # If first row isn't headers, add them
             if not rows or not rows[0][0].startswith('@'):
-                headers = ["@Head", "@Body", "@Tail", "@Vertical Gap", "@Content Style", 
-                          "@Break Harmonization", "@Spine Position", "@Page Style",
-                          "@Page Runtime", "@Page Gap"]
-                rows.insert(0, headers)
+                rows.insert(0, list(DEFAULT_HEADERS))
                 print("Added default headers")
                 
             return rows
@@ -55,13 +138,112 @@ class FileManager:
         except Exception as e:
             print(f"Error loading CSV: {str(e)}")
             raise
-            
 
-    def save_csv(self, file_path, data):
+    def _read_rows(self, file_path, parallel=False):
+        """Parse the rows of a CSV file, without added headers, and remember its layout."""
+        with open(file_path, 'rb') as f:
+            data = f.read()
+            stat = os.fstat(f.fileno())
+        # First remove any comment lines
+        content = _strip_comment_lines(data.decode('utf-8-sig'))
+
+        # Now parse the cleaned content as CSV
+        if parallel:
+            rows = self._parse_parallel(content)
+        else:
+            rows = _parse_csv_text(content)
+        layout = CsvLayout.scan(data, rows, stat)
+        if layout is not None:
+            self.layouts[os.path.abspath(file_path)] = layout
+        else:
+            self.layouts.pop(os.path.abspath(file_path), None)
+        return rows
+
+    def _parse_parallel(self, content):
+        """Parse ``content`` in record-aligned chunks on a process pool, keeping row order."""
+        chunk_count = min(self.max_workers, max(1, len(content) // MIN_CHUNK_BYTES))
+        bounds = find_record_boundaries(content, chunk_count)
+        chunks = [content[start:end] for start, end in zip(bounds, bounds[1:])]
+        if len(chunks) < 2:
+            return _parse_csv_text(content)
+        print(f"Parsing CSV in {len(chunks)} chunks")
+        try:
+            context = multiprocessing.get_context(_POOL_START_METHOD)
+            with ProcessPoolExecutor(max_workers=len(chunks), mp_context=context) as pool:
+                parsed = list(pool.map(_parse_csv_text, chunks))
+        except (OSError, RuntimeError) as e:
+            print(f"Parallel CSV parse unavailable, falling back to serial: {e}")
+            return _parse_csv_text(content)
+        rows = []
+        for chunk_rows in parsed:
+            rows.extend(chunk_rows)
+        return rows
+
+    def iter_csv(self, file_path):
+        """
+        Yield the rows of a CSV file one at a time, header row first.
+        Comment lines and empty rows are skipped as in load_csv, and
+        DEFAULT_HEADERS are yielded first when the file has no header row.
+        """
+        with open(file_path, 'r', newline='', encoding='utf-8-sig') as f:
+            lines = (line for line in f if not _is_comment_line(line))
+            yield from _credits_rows(csv.reader(lines, quoting=csv.QUOTE_MINIMAL))
+
+    def iter_rows(self, file_path):
+        """
+        Yield the rows of a CSV, ODS or XLSX file one at a time, header row
+        first. Spreadsheets are read by streaming their sheet XML and go
+        through the same pipeline as iter_csv; a row whose first cell starts
+        with // is a comment, like a comment line in a CSV file, and blank
+        rows are kept as blank records.
+        """
+        if not file_path.lower().endswith(spreadsheet_formats.SUFFIXES):
+            yield from self.iter_csv(file_path)
+            return
+        print(f"Reading spreadsheet: {file_path}")
+        rows = spreadsheet_formats.iter_rows(file_path)
+        # A blank sheet row is a blank record (",,," in CSV), which Cinecred reads as a gap
+        yield from _credits_rows(row or [''] for row in rows if not (row and _is_comment_line(row[0])))
+
+    def save_csv(self, file_path, data, preserve=True):
         """
         Save a list of lists (rows) to a CSV file.
+        With ``preserve``, rows of the existing file that did not change are
+        copied from it with their original quoting, comment lines and blank
+        lines, and only edited or added rows are written anew.
         """
+        layout = self._layout_for(file_path) if preserve else None
+        if layout is not None:
+            self.layouts[os.path.abspath(file_path)] = layout.save(file_path, data)
+            return
         with open(file_path, 'w', newline='', encoding='utf-8') as f:
             writer = csv.writer(f)
             for row in data:
                 writer.writerow(row)
+        # Mapped on the next save, if any
+        self.layouts.pop(os.path.abspath(file_path), None)
+
+    def _layout_for(self, file_path):
+        """Return the layout of the file as it is on disk, or None if it has none (or doesn't exist)."""
+        layout = self.layouts.get(os.path.abspath(file_path))
+        if layout is not None and layout.is_current(file_path):
+            return layout
+        # Changed on disk since, or loaded from the project cache: map it again
+        if not os.path.isfile(file_path):
+            return None
+        try:
+            self._read_rows(file_path)
+        except (OSError, UnicodeDecodeError, csv.Error) as e:
+            print(f"Could not map {file_path} for saving, rewriting it: {e}")
+            return None
+        return self.layouts.get(os.path.abspath(file_path))
+
+    def export_rows(self, file_path, rows):
+        """
+        Write rows to an ODS or XLSX file (chosen by suffix) as they are
+        iterated, so ``rows`` can be a generator over the table. Returns the
+        number of rows written.
+        """
+        count = spreadsheet_formats.write_rows(file_path, rows)
+        print(f"Exported {count} rows to {file_path}")
+        return count
@@ -0,0 +1,102 @@
+"""
+Watch the open Credits.csv for changes made by other programs.
+
+``QFileSystemWatcher`` reports every write, and tools that save by
+replacing the file make the path drop out of the watch list, so the parent
+folder is watched too and the path re-added when it reappears. Change
+notifications are debounced, and ``changed`` is only emitted when the file's
+content digest differs from the version the editor knows (the one last
+loaded, saved or merged), so the editor's own saves are ignored.
+"""
+import hashlib
+import os
+
+from PyQt5.QtCore import QObject, QFileSystemWatcher, QTimer, pyqtSignal
+
+# Wait this long after the last change notification before reading the file
+DEBOUNCE_MS = 400
+
+
+def file_digest(path):
+    """Return a digest of the file's bytes, or None if it can't be read."""
+    digest = hashlib.blake2b(digest_size=16)
+    try:
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+    except OSError:
+        return None
+    return digest.digest()
+
+
+class CsvFileWatcher(QObject):
+    """
+    Tracks one CSV file and the rows of the version the editor last synced
+    with (``base``, as returned by ``FileManager.load_csv``).
+    """
+    changed = pyqtSignal(str)
+
+    def __init__(self, file_manager, parent=None):
+        super().__init__(parent)
+        self.file_manager = file_manager
+        self.path = None
+        self.base = None
+        self.digest = None
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.fileChanged.connect(self.schedule_check)
+        self.watcher.directoryChanged.connect(self.on_directory_changed)
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(DEBOUNCE_MS)
+        self.timer.timeout.connect(self.check)
+
+    def watch(self, path, rows):
+        """Start watching ``path``, whose current content is ``rows``."""
+        self.unwatch()
+        self.path = os.path.abspath(path)
+        self.set_base(rows, file_digest(self.path))
+        self.watcher.addPath(os.path.dirname(self.path))
+        if os.path.exists(self.path):
+            self.watcher.addPath(self.path)
+
+    def unwatch(self):
+        paths = self.watcher.files() + self.watcher.directories()
+        if paths:
+            self.watcher.removePaths(paths)
+        self.timer.stop()
+        self.path = self.base = self.digest = None
+
+    def set_base(self, rows, digest):
+        """
+        Record ``rows`` (with file digest ``digest``) as the version the
+        table is synced with. ``rows`` is None when no copy is kept (database
+        storage); changes on disk are then reported but not merged.
+        """
+        self.base = [list(row) for row in rows] if rows is not None else None
+        self.digest = digest
+
+    def schedule_check(self, *_):
+        self.timer.start()
+
+    def on_directory_changed(self, _):
+        # A replaced file drops out of the watch list; pick it up again
+        if self.path and self.path not in self.watcher.files() and os.path.exists(self.path):
+            self.watcher.addPath(self.path)
+            self.schedule_check()
+
+    def is_stale(self):
+        """Return True if the file on disk differs from the synced version."""
+        if not self.path or not os.path.exists(self.path):
+            return False
+        digest = file_digest(self.path)
+        return digest is not None and digest != self.digest
+
+    def check(self):
+        if self.is_stale():
+            self.changed.emit(self.path)
+
+    def read(self):
+        """Return (digest, rows) of the file as it is now."""
+        # Digest first: if the file changes while it is parsed, the next check still sees a difference
+        digest = file_digest(self.path)
+        return digest, self.file_manager.load_csv(self.path)
@@ -0,0 +1,253 @@
+"""
+Bitmap indexes for filtering the credits table by style-like columns.
+
+Columns such as ``@Page Style`` hold a handful of distinct values, so each
+value is indexed as a row bitmap: a Python int whose bit ``i`` is set when row
+``i`` holds that value. A filter is evaluated with bitwise AND/OR/NOT over
+those ints, which costs a few microseconds per value even on 100k rows.
+Bitmaps are built per column on first use and then kept up to date through
+cell edits and row inserts, removals and moves. A table kept in a
+``SqliteRowStore`` is not indexed here: queries go to the store, which
+answers them from its database indexes.
+"""
+from operator import itemgetter
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+FILTER_COLUMNS = (
+    '@Content Style', '@Page Style', '@Break Harmonization', '@Spine Position',
+    '@Vertical Gap', '@Page Runtime', '@Page Gap',
+)
+
+# Clause operators: (column, op, values)
+OP_IN = 'in'
+OP_NOT_IN = 'not_in'
+OP_SET = 'set'
+OP_EMPTY = 'empty'
+
+# Above this many edited cells in one column, rebuild its bitmaps instead of patching bits
+REBUILD_CELLS = 2000
+
+Clause = Tuple[int, str, Sequence[str]]
+
+
+def rows_of(bitmap: int) -> List[int]:
+    """Return the indexes of the set bits of ``bitmap`` in ascending order."""
+    if not bitmap:
+        return []
+    bits = format(bitmap, 'b')[::-1]
+    rows = []
+    find = bits.find
+    i = find('1')
+    while i >= 0:
+        rows.append(i)
+        i = find('1', i + 1)
+    return rows
+
+
+def bit_count(bitmap: int) -> int:
+    return bin(bitmap).count('1')
+
+
+def _shift_insert(bitmap: int, first: int, count: int) -> int:
+    """Open a gap of ``count`` zero bits at ``first``."""
+    low = bitmap & ((1 << first) - 1)
+    return low | ((bitmap >> first) << (first + count))
+
+
+def _shift_remove(bitmap: int, first: int, count: int) -> int:
+    """Drop ``count`` bits starting at ``first``."""
+    low = bitmap & ((1 << first) - 1)
+    return low | ((bitmap >> (first + count)) << first)
+
+
+def _value_matches(value: str, op: str, operands: Sequence[str]) -> bool:
+    """Apply one clause operator to a stripped cell value."""
+    if op == OP_SET:
+        return value != ''
+    if op == OP_EMPTY:
+        return value == ''
+    found = value in {str(operand).strip() for operand in operands}
+    return not found if op == OP_NOT_IN else found
+
+
+class BitmapFilterIndex:
+    """
+    Per-value row bitmaps for the filterable columns of the table.
+
+    Follows the ``DuplicateIndex`` update interface (``rebuild``,
+    ``set_cell``, ``insert_rows``, ``remove_rows``, ``move_rows``). Cell
+    values are kept per column so edits know which bitmap to clear; the
+    bitmaps of a column are only built when a filter first needs them.
+    """
+
+    def __init__(self, filter_columns=FILTER_COLUMNS):
+        self.filter_columns = tuple(filter_columns)
+        self.columns: List[int] = []
+        self.version = 0
+        self._row_count = 0
+        self._values: Dict[int, List[str]] = {}
+        # col -> {value: bitmap}; missing until the column is first queried
+        self._bitmaps: Dict[int, Dict[str, int]] = {}
+        self._pending: Dict[int, int] = {}
+        # SqliteRowStore answering the queries instead of bitmaps, if the table is in one
+        self._store = None
+
+    # Building and incremental updates
+    def rebuild(self, headers: list, rows: list) -> None:
+        """Index ``rows`` (table rows without the header row) from scratch."""
+        self.columns = [i for i, h in enumerate(headers) if str(h).strip() in self.filter_columns]
+        self._row_count = len(rows)
+        self._store = rows if hasattr(rows, 'matching_rows') else None
+        if self._store is not None:
+            self._values = {}
+        else:
+            self._values = {col: [v.strip() for v in map(itemgetter(col), rows)] for col in self.columns}
+        self._bitmaps.clear()
+        self._pending.clear()
+        self.version += 1
+
+    def set_cell(self, row: int, col: int, value) -> None:
+        """Update the index after the cell at (row, col) changed to ``value``."""
+        if self._store is not None:
+            # The store is already written; only views need to know
+            if col in self.columns:
+                self.version += 1
+            return
+        values = self._values.get(col)
+        if values is None or not 0 <= row < self._row_count:
+            return
+        new = str(value or '').strip()
+        old = values[row]
+        if old == new:
+            return
+        values[row] = new
+        bitmaps = self._bitmaps.get(col)
+        if bitmaps is not None:
+            # Patching bits costs O(rows) per cell; large batches rebuild the column lazily
+            self._pending[col] = self._pending.get(col, 0) + 1
+            if self._pending[col] > REBUILD_CELLS:
+                del self._bitmaps[col]
+            else:
+                bit = 1 << row
+                bitmaps[old] &= ~bit
+                if not bitmaps[old]:
+                    del bitmaps[old]
+                bitmaps[new] = bitmaps.get(new, 0) | bit
+        self.version += 1
+
+    def insert_rows(self, first: int, count: int = 1, rows: Optional[list] = None) -> None:
+        """Account for rows inserted before ``first``; ``rows`` holds their values if not blank."""
+        for col, values in self._values.items():
+            new = [''] * count if rows is None else [str(row[col]).strip() if col < len(row) else '' for row in rows]
+            values[first:first] = new
+            bitmaps = self._bitmaps.get(col)
+            if bitmaps is not None:
+                for value in list(bitmaps):
+                    bitmaps[value] = _shift_insert(bitmaps[value], first, count)
+                for offset, value in enumerate(new):
+                    bitmaps[value] = bitmaps.get(value, 0) | (1 << (first + offset))
+        self._row_count += count
+        self.version += 1
+
+    def remove_rows(self, first: int, count: int = 1) -> None:
+        """Account for ``count`` rows removed starting at ``first``."""
+        for col, values in self._values.items():
+            del values[first:first + count]
+            bitmaps = self._bitmaps.get(col)
+            if bitmaps is not None:
+                for value in list(bitmaps):
+                    bitmap = _shift_remove(bitmaps[value], first, count)
+                    if bitmap:
+                        bitmaps[value] = bitmap
+                    else:
+                        del bitmaps[value]
+        self._row_count -= count
+        self.version += 1
+
+    def move_rows(self, first: int, count: int, destination: int) -> None:
+        """Account for a block of rows moved before ``destination`` (Qt moveRows semantics)."""
+        insert_at = destination - count if destination > first else destination
+        block_mask = (1 << count) - 1
+        for col, values in self._values.items():
+            block = values[first:first + count]
+            del values[first:first + count]
+            values[insert_at:insert_at] = block
+            bitmaps = self._bitmaps.get(col)
+            if bitmaps is not None:
+                for value, bitmap in bitmaps.items():
+                    moved = (bitmap >> first) & block_mask
+                    bitmap = _shift_insert(_shift_remove(bitmap, first, count), insert_at, count)
+                    bitmaps[value] = bitmap | (moved << insert_at)
+        self.version += 1
+
+    # Queries
+    def row_count(self) -> int:
+        return self._row_count
+
+    def all_rows(self) -> int:
+        return (1 << self._row_count) - 1
+
+    def bitmaps(self, col: int) -> Dict[str, int]:
+        """Return {value: bitmap} for a filterable column, building it on first use."""
+        bitmaps = self._bitmaps.get(col)
+        if bitmaps is None:
+            positions: Dict[str, List[int]] = {}
+            for row, value in enumerate(self._values.get(col, ())):
+                positions.setdefault(value, []).append(row)
+            size = (self._row_count >> 3) + 1
+            bitmaps = {}
+            for value, rows in positions.items():
+                bits = bytearray(size)
+                for row in rows:
+                    bits[row >> 3] |= 1 << (row & 7)
+                bitmaps[value] = int.from_bytes(bits, 'little')
+            self._bitmaps[col] = bitmaps
+            self._pending[col] = 0
+        return bitmaps
+
+    def value_counts(self, col: int) -> List[Tuple[str, int]]:
+        """Return (value, row count) pairs for a column, most frequent first."""
+        if self._store is not None:
+            return self._store.value_counts(col)
+        counts = [(value, bit_count(bitmap)) for value, bitmap in self.bitmaps(col).items()]
+        return sorted(counts, key=lambda vc: (-vc[1], vc[0]))
+
+    def clause_bitmap(self, clause: Clause) -> int:
+        col, op, values = clause
+        bitmaps = self.bitmaps(col)
+        if op == OP_SET:
+            return self.all_rows() & ~bitmaps.get('', 0)
+        if op == OP_EMPTY:
+            return bitmaps.get('', 0)
+        matched = 0
+        for value in values:
+            matched |= bitmaps.get(str(value).strip(), 0)
+        return self.all_rows() & ~matched if op == OP_NOT_IN else matched
+
+    def evaluate(self, clauses: Iterable[Clause], match_all: bool = True) -> int:
+        """Combine clause bitmaps with AND (``match_all``) or OR; no clauses match every row."""
+        result = None
+        for clause in clauses:
+            bitmap = self.clause_bitmap(clause)
+            if result is None:
+                result = bitmap
+            else:
+                result = result & bitmap if match_all else result | bitmap
+        return self.all_rows() if result is None else result
+
+    def row_matches(self, row: int, clauses: Sequence[Clause], match_all: bool = True) -> bool:
+        """Test a single row against filter clauses, e.g. after an edit, without evaluating bitmaps."""
+        if not clauses:
+            return True
+        if self._store is not None:
+            cells = self._store[row]
+            values = [str(cells[col] or '').strip() for col, _, _ in clauses]
+        else:
+            values = [self._values[col][row] for col, _, _ in clauses]
+        results = (_value_matches(value, op, operands) for value, (_, op, operands) in zip(values, clauses))
+        return all(results) if match_all else any(results)
+
+    def matching_rows(self, clauses: Iterable[Clause], match_all: bool = True) -> List[int]:
+        if self._store is not None:
+            return self._store.matching_rows(list(clauses), match_all)
+        return rows_of(self.evaluate(clauses, match_all))
@@ -0,0 +1,157 @@
+"""
+Proxy model showing the rows of the credits table that match a filter.
+"""
+from bisect import bisect_left
+from typing import List, Sequence
+from PyQt5.QtCore import Qt, QAbstractProxyModel, QModelIndex
+from filter_index import BitmapFilterIndex, Clause
+
+
+class FilterProxyModel(QAbstractProxyModel):
+    """
+    Maps a sorted list of matching source rows onto proxy rows; columns are
+    passed through unchanged, so edits go straight to the source model (and
+    its undo history).
+
+    Matching rows come from a ``BitmapFilterIndex`` kept in sync by the
+    spreadsheet widget, whose slots run before this model's because they are
+    connected first. Source inserts and removals add or remove just the
+    affected proxy rows, so selection, scrolling and open editors survive;
+    moves and resets re-evaluate the whole filter. Rows whose values change
+    stay visible until the filter is applied again.
+    """
+
+    def __init__(self, source_model, filter_index: BitmapFilterIndex, parent=None):
+        super().__init__(parent)
+        self.filter_index = filter_index
+        self.clauses: List[Clause] = []
+        self.match_all = True
+        self._rows: List[int] = []
+        self.setSourceModel(source_model)
+        source_model.dataChanged.connect(self.on_source_data_changed)
+        source_model.headerDataChanged.connect(self.headerDataChanged)
+        source_model.rowsInserted.connect(self.on_source_rows_inserted)
+        source_model.rowsAboutToBeRemoved.connect(self.on_source_rows_about_to_be_removed)
+        source_model.rowsRemoved.connect(self.on_source_rows_removed)
+        # Other structural source changes reset the proxy around the change
+        for about, done in ((source_model.rowsAboutToBeMoved, source_model.rowsMoved),
+                            (source_model.modelAboutToBeReset, source_model.modelReset),
+                            (source_model.layoutAboutToBeChanged, source_model.layoutChanged)):
+            about.connect(self.on_source_about_to_change)
+            done.connect(self.on_source_changed)
+        # Proxy rows (start, stop) of a source removal in progress
+        self._removing = None
+        self.refilter()
+
+    def set_filter(self, clauses: Sequence[Clause], match_all: bool = True) -> None:
+        self.clauses = list(clauses)
+        self.match_all = match_all
+        self.refilter()
+
+    def refilter(self) -> None:
+        """Re-evaluate the filter against the index."""
+        self.beginResetModel()
+        self._evaluate()
+        self.endResetModel()
+
+    def _evaluate(self) -> None:
+        if self.clauses:
+            self._rows = self.filter_index.matching_rows(self.clauses, self.match_all)
+        else:
+            self._rows = list(range(self.sourceModel().rowCount()))
+
+    def on_source_about_to_change(self, *args) -> None:
+        self.beginResetModel()
+        self._rows = []
+
+    def on_source_changed(self, *args) -> None:
+        self._evaluate()
+        self.endResetModel()
+
+    def on_source_rows_inserted(self, parent, first, last) -> None:
+        if parent.isValid():
+            return
+        count = last - first + 1
+        if self.clauses:
+            matching = self.filter_index.matching_rows(self.clauses, self.match_all)
+            added = matching[bisect_left(matching, first):bisect_left(matching, last + 1)]
+        else:
+            added = list(range(first, last + 1))
+        pos = bisect_left(self._rows, first)
+        shifted = [row + count for row in self._rows[pos:]]
+        if added:
+            self.beginInsertRows(QModelIndex(), pos, pos + len(added) - 1)
+            self._rows[pos:] = added + shifted
+            self.endInsertRows()
+        else:
+            self._rows[pos:] = shifted
+        if shifted:
+            # The row numbers in the vertical header moved
+            self.headerDataChanged.emit(Qt.Vertical, pos + len(added), len(self._rows) - 1)
+
+    def on_source_rows_about_to_be_removed(self, parent, first, last) -> None:
+        if parent.isValid():
+            return
+        start = bisect_left(self._rows, first)
+        stop = bisect_left(self._rows, last + 1)
+        self._removing = (start, stop)
+        if start < stop:
+            self.beginRemoveRows(QModelIndex(), start, stop - 1)
+
+    def on_source_rows_removed(self, parent, first, last) -> None:
+        if parent.isValid() or self._removing is None:
+            return
+        start, stop = self._removing
+        self._removing = None
+        count = last - first + 1
+        self._rows[start:] = [row - count for row in self._rows[stop:]]
+        if start < stop:
+            self.endRemoveRows()
+        if start < len(self._rows):
+            self.headerDataChanged.emit(Qt.Vertical, start, len(self._rows) - 1)
+
+    def source_rows(self) -> List[int]:
+        return self._rows
+
+    # Mapping
+    def mapToSource(self, proxy_index):
+        if not proxy_index.isValid() or proxy_index.row() >= len(self._rows):
+            return QModelIndex()
+        return self.sourceModel().index(self._rows[proxy_index.row()], proxy_index.column())
+
+    def mapFromSource(self, source_index):
+        if not source_index.isValid():
+            return QModelIndex()
+        row = source_index.row()
+        pos = bisect_left(self._rows, row)
+        if pos < len(self._rows) and self._rows[pos] == row:
+            return self.index(pos, source_index.column())
+        return QModelIndex()
+
+    # Qt model interface
+    def index(self, row, column, parent=QModelIndex()):
+        if parent.isValid() or not (0 <= row < len(self._rows) and 0 <= column < self.columnCount()):
+            return QModelIndex()
+        return self.createIndex(row, column)
+
+    def parent(self, index=QModelIndex()):
+        return QModelIndex()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.sourceModel().columnCount()
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Vertical and role == Qt.DisplayRole and 0 <= section < len(self._rows):
+            # Show the row number of the main table
+            return str(self._rows[section] + 1)
+        return self.sourceModel().headerData(section, orientation, role)
+
+    def on_source_data_changed(self, top_left, bottom_right, roles=None):
+        first = bisect_left(self._rows, top_left.row())
+        last = bisect_left(self._rows, bottom_right.row() + 1) - 1
+        if first <= last:
+            self.dataChanged.emit(self.index(first, top_left.column()),
+                                  self.index(last, bottom_right.column()), roles or [])
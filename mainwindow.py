@@ -6,24 +6,45 @@ A PyQt application for editing CredGen spreadsheet files with enhanced styling s
 Performance note: for large CSVs, consider virtualized table views in the future.
 """
 
+import csv
 import sys
 import os
+import time
 from pathlib import Path
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QVBoxLayout, QHBoxLayout, QWidget,
     QMenuBar, QToolBar, QStatusBar, QFileDialog, QMessageBox,
-    QSplitter, QTabWidget, QPushButton, QLabel
+    QSplitter, QTabWidget, QPushButton, QLabel, QInputDialog, QDialog
 )
-from PyQt5.QtCore import Qt, pyqtSignal
+from PyQt5.QtCore import Qt, pyqtSignal, QSettings
 from PyQt5.QtGui import QIcon, QKeySequence, QFont
 
 # Import our custom modules
+import toml_backends
 from spreadsheet_widget import SpreadsheetWidget
 from styling_parser import StylingParser
+from style_graph import STYLE_TABLES, rename_changes
+from toml_patch import TomlPatcher
+from edit_commands import CompoundCommand, StylingTextCommand
 from file_manager import FileManager
-from widgets.info_panel import InfoPanel
+from file_watcher import CsvFileWatcher, file_digest
+from three_way_merge import ThreeWayMerge
+from widgets.info_panel import InfoPanel, RENAMABLE_TABLES
 from widgets.menu_bar import MenuBar
+from widgets.memory_dock import MemoryDock
+from widgets.table_pane import TableWindow
+from memory_stats import MemoryAccountant
+from stall_watchdog import StallWatchdog
 from controller import CredGenController
+from dialogs.duplicates_dialog import DuplicatesDialog
+from dialogs.filter_view_dialog import FilterViewDialog
+from dialogs.merge_dialog import MergeDialog
+from dialogs.compare_dialog import CompareDialog
+from dialogs.external_change_dialog import ExternalChangeDialog
+from dialogs.plugin_dialog import PluginDialog
+from dialogs.casing_dialog import CasingDialog
+from dialogs.stall_report_dialog import StallReportDialog
+from dialogs.styling_editor_dialog import StylingEditorDialog
 
 
 class CredGenMainWindow(QMainWindow):
@@ -41,9 +62,22 @@ class CredGenMainWindow(QMainWindow):
         self.current_csv_file = None
         self.current_styling_file = None
         self.styling_data = None
+        self.duplicates_dialog = None
+        # Notices changes other programs make to the open CSV
+        self.csv_watcher = CsvFileWatcher(self.file_manager, self)
+        self.csv_watcher.changed.connect(self.on_csv_changed_on_disk)
+        self._merging_external = False
+        # Extra windows viewing the same table
+        self.table_windows = []
+        # Logs event-loop stalls with the GUI thread's stack
+        self.stall_watchdog = StallWatchdog(self)
         
         self.init_ui()
         self.setup_connections()
+        self.setup_plugins()
+        self.setup_memory_accounting()
+        if QSettings("CredGen", "CredGen Spreadsheet Editor").value("storage/database", False, type=bool):
+            self.menubar.actions['database_storage'].setChecked(True)
         
         # Load default styling data if available
         default_styling_path = str(Path('asset/Styling.toml'))
@@ -52,6 +86,7 @@ class CredGenMainWindow(QMainWindow):
             self.current_styling_file = default_styling_path
             self.update_info_panel(self.styling_data)
             self.spreadsheet_widget.update_styling_data(self.styling_data)
+        self.stall_watchdog.start()
         
     def init_ui(self) -> None:
         """Initialize the user interface. (Accessibility: add tooltips, ensure tab order, and add keyboard shortcuts.)"""
@@ -74,29 +109,79 @@ class CredGenMainWindow(QMainWindow):
         """Create the application menu bar. (Accessibility: keyboard shortcuts are set in MenuBar.)"""
         self.menubar = MenuBar(self)
         self.setMenuBar(self.menubar)
+        # Before the actions' own slots, so stalls can name the action that caused them
+        self.stall_watchdog.watch_actions(self.menubar.actions.values())
         # Tooltips
         self.menubar.actions['open'].setToolTip("Open a CredGen project folder")
         self.menubar.actions['save'].setToolTip("Save the current project")
+        self.menubar.actions['merge_csv'].setToolTip("Combine several Credits.csv files into one")
+        self.menubar.actions['import_sheet'].setToolTip("Replace the table with the first sheet of an ODS or XLSX file")
+        self.menubar.actions['export_sheet'].setToolTip("Write the table to an ODS or XLSX file")
+        self.menubar.actions['database_storage'].setToolTip(
+            "Keep the table in a local SQLite database instead of memory, for very large rolls")
         self.menubar.actions['exit'].setToolTip("Exit the application")
         self.menubar.actions['undo'].setToolTip("Undo last action")
         self.menubar.actions['redo'].setToolTip("Redo last undone action")
         self.menubar.actions['cut'].setToolTip("Cut selected cells")
         self.menubar.actions['copy'].setToolTip("Copy selected cells")
         self.menubar.actions['paste'].setToolTip("Paste cells from clipboard")
+        self.menubar.actions['fill_down'].setToolTip("Copy the top selected cell of each column down the selection")
+        self.menubar.actions['fill_value'].setToolTip("Set every selected cell to one value")
+        self.menubar.actions['fill_series'].setToolTip("Number the selected cells (e.g. gaps or runtimes)")
+        self.menubar.actions['clear_cells'].setToolTip("Clear the selected cells")
+        self.menubar.actions['move_rows_up'].setToolTip("Move selected rows up by one")
+        self.menubar.actions['move_rows_down'].setToolTip("Move selected rows down by one")
+        self.menubar.actions['cut_rows'].setToolTip("Mark selected rows to be moved")
+        self.menubar.actions['insert_cut_rows'].setToolTip("Move marked rows above the current row")
         self.menubar.actions['reorder'].setToolTip("Reorder selected cells")
         self.menubar.actions['refresh_styling'].setToolTip("Refresh styling data from TOML")
+        self.menubar.actions['edit_styling'].setToolTip("Edit style properties in Styling.toml")
+        self.menubar.actions['find_duplicates'].setToolTip("List duplicate and near-duplicate names")
+        self.menubar.actions['filter_view'].setToolTip("Open a view of the rows matching style conditions")
+        self.menubar.actions['compare'].setToolTip("Diff the table or a CSV file against another CSV file")
+        self.menubar.actions['split_view'].setToolTip("Show a second pane of the same table, e.g. to keep the end of the roll in view")
+        self.menubar.actions['new_window'].setToolTip("Open another window on the same table, sharing edits and undo history")
+        self.menubar.actions['rendered_preview'].setToolTip("Show names with the casing of their letter styles, including uppercase exceptions")
+        self.menubar.actions['check_casing'].setToolTip("List names whose uppercase rendering keeps particles such as \"van\" or \"Mc\" as written")
+        self.menubar.actions['thumbnails'].setToolTip("Show pictures referenced by {{Pic}} and {{Video}} in @Body cells")
+        self.menubar.actions['plugins'].setToolTip("Enable or disable plugins and see the time spent in each")
+        self.menubar.actions['stall_report'].setToolTip("Show where the editor stopped responding, and for how long")
+        self.menubar.actions['memory_dock'].setToolTip("Show approximate memory use per subsystem")
         self.menubar.actions['about'].setToolTip("About this application")
         # Connections
         self.menubar.actions['open'].triggered.connect(self.open_project)
         self.menubar.actions['save'].triggered.connect(self.save_project)
+        self.menubar.actions['merge_csv'].triggered.connect(self.merge_csv_files)
+        self.menubar.actions['import_sheet'].triggered.connect(self.import_spreadsheet)
+        self.menubar.actions['export_sheet'].triggered.connect(self.export_spreadsheet)
+        self.menubar.actions['database_storage'].toggled.connect(self.toggle_database_storage)
         self.menubar.actions['exit'].triggered.connect(self.close)
         self.menubar.actions['undo'].triggered.connect(self.undo)
         self.menubar.actions['redo'].triggered.connect(self.redo)
         self.menubar.actions['cut'].triggered.connect(self.cut)
         self.menubar.actions['copy'].triggered.connect(self.copy)
         self.menubar.actions['paste'].triggered.connect(self.paste)
+        self.menubar.actions['fill_down'].triggered.connect(self.fill_down)
+        self.menubar.actions['fill_value'].triggered.connect(self.fill_value)
+        self.menubar.actions['fill_series'].triggered.connect(self.fill_series)
+        self.menubar.actions['clear_cells'].triggered.connect(self.clear_cells)
+        self.menubar.actions['move_rows_up'].triggered.connect(self.move_rows_up)
+        self.menubar.actions['move_rows_down'].triggered.connect(self.move_rows_down)
+        self.menubar.actions['cut_rows'].triggered.connect(self.cut_rows)
+        self.menubar.actions['insert_cut_rows'].triggered.connect(self.insert_cut_rows)
         self.menubar.actions['reorder'].triggered.connect(self.reorder_cells)
         self.menubar.actions['refresh_styling'].triggered.connect(self.refresh_styling)
+        self.menubar.actions['edit_styling'].triggered.connect(self.edit_styling)
+        self.menubar.actions['find_duplicates'].triggered.connect(self.show_duplicates)
+        self.menubar.actions['filter_view'].triggered.connect(self.show_filter_view)
+        self.menubar.actions['compare'].triggered.connect(self.show_compare)
+        self.menubar.actions['thumbnails'].toggled.connect(self.toggle_thumbnails)
+        self.menubar.actions['split_view'].toggled.connect(self.toggle_split_view)
+        self.menubar.actions['new_window'].triggered.connect(self.new_table_window)
+        self.menubar.actions['rendered_preview'].toggled.connect(self.toggle_rendered_preview)
+        self.menubar.actions['check_casing'].triggered.connect(self.check_casing)
+        self.menubar.actions['plugins'].triggered.connect(self.show_plugins)
+        self.menubar.actions['stall_report'].triggered.connect(self.show_stall_report)
         self.menubar.actions['about'].triggered.connect(self.show_about)
         
     # def create_toolbar(self):
@@ -166,9 +251,106 @@ class CredGenMainWindow(QMainWindow):
     def setup_connections(self):
         """Setup signal-slot connections."""
         self.spreadsheet_widget.data_changed.connect(self.on_data_changed)
+        self.spreadsheet_widget.model.command_recorded.connect(self.on_command_recorded)
         self.spreadsheet_widget.selection_changed.connect(self.on_selection_changed)
+        self.spreadsheet_widget.model.modelReset.connect(self.info_panel.refresh_usage_counts)
+        self.info_panel.set_usage_index(self.spreadsheet_widget.style_usage)
+        self.info_panel.select_usages_requested.connect(self.select_style_usages)
+        self.info_panel.rename_requested.connect(self.rename_style)
         self.is_dirty = False
         
+    def setup_plugins(self):
+        """Apply saved plugin choices, then add plugin column types and menu entries (no plugin code runs yet)."""
+        registry = self.controller.plugins
+        settings = QSettings("CredGen", "CredGen Spreadsheet Editor")
+        for name in settings.value("plugins/disabled", [], type=list):
+            if name in registry.plugins:
+                registry.set_enabled(name, False)
+        self.spreadsheet_widget.set_plugin_registry(registry)
+        for tool in registry.tools():
+            action = self.menubar.add_plugin_action(tool.key, tool.menu, tool.title, tool.shortcut)
+            action.setToolTip(f"{tool.plugin.name}: {tool.plugin.description}" if tool.plugin.description
+                              else tool.plugin.name)
+            action.setEnabled(tool.plugin.enabled)
+            self.stall_watchdog.watch_actions([action])
+            action.triggered.connect(lambda _=False, tool=tool: registry.run_tool(tool, self))
+
+    def show_plugins(self):
+        """Show the installed plugins and their hook timings."""
+        dialog = PluginDialog(self.controller.plugins, self)
+        dialog.setAttribute(Qt.WA_DeleteOnClose)
+        dialog.plugins_changed.connect(self.on_plugins_changed)
+        dialog.show()
+
+    def show_stall_report(self):
+        """Show the UI stalls recorded so far."""
+        dialog = StallReportDialog(self.stall_watchdog, self)
+        dialog.setAttribute(Qt.WA_DeleteOnClose)
+        dialog.show()
+
+    def on_plugins_changed(self):
+        registry = self.controller.plugins
+        disabled = [plugin.name for plugin in registry.plugins.values() if not plugin.enabled]
+        QSettings("CredGen", "CredGen Spreadsheet Editor").setValue("plugins/disabled", disabled)
+        self.spreadsheet_widget.setup_special_columns()
+        for tool in registry.tools():
+            self.menubar.actions[tool.key].setEnabled(tool.plugin.enabled)
+
+    def setup_memory_accounting(self):
+        """Register the subsystems reported by the memory dock (hidden until shown from the Tools menu)."""
+        sw = self.spreadsheet_widget
+        model = sw.model
+        controller = self.controller
+        self.memory_accountant = accountant = MemoryAccountant()
+        accountant.register("Table storage", lambda: (model.headers(), model.rows()), self._table_storage_detail)
+        accountant.register("Widgets and delegates", None, lambda: (
+            f"{len(QApplication.allWidgets())} widgets, "
+            f"{sum(1 for col in range(model.columnCount()) if sw.table.itemDelegateForColumn(col))} column delegates"))
+        accountant.register("Undo history", lambda: (controller.undo_stack, controller.redo_stack),
+                            lambda: f"{len(controller.undo_stack)} undo, {len(controller.redo_stack)} redo entries")
+        accountant.register("Watched file snapshot", lambda: self.csv_watcher.base,
+                            lambda: "no file" if self.csv_watcher.base is None
+                            else f"{len(self.csv_watcher.base)} rows as last synced with disk")
+        accountant.register("Styling data", lambda: self.styling_data,
+                            lambda: "not loaded" if self.styling_data is None
+                            else f"{len(self.styling_data.document)} tables")
+        accountant.register("Column size cache", lambda: sw.column_sizer,
+                            lambda: f"{sw.column_sizer.cache_size()} text widths")
+        accountant.register("Thumbnails", None, lambda: "{} in memory ({:.1f} MiB), {} on disk ({:.1f} MiB)".format(
+            len(sw.thumbnail_cache.pixmaps), sw.thumbnail_cache.memory_bytes / (1024 * 1024),
+            *self._thumbnail_disk_usage()))
+        accountant.register("Project cache (disk)", None,
+                            lambda: "{} entries, {:.1f} MiB".format(*self._project_cache_usage()))
+        for name, index in (("Duplicate index", sw.duplicate_index),
+                            ("Style usage index", sw.style_usage),
+                            ("Filter index", sw.filter_index)):
+            accountant.register(name, lambda index=index: index,
+                                lambda index=index: f"{len(index.columns)} columns, version {index.version}")
+        accountant.register("Style graph", lambda: self.info_panel.style_graph,
+                            lambda: f"{len(self.info_panel.style_graph.nodes())} styles")
+        self.memory_dock = MemoryDock(accountant, self)
+        self.addDockWidget(Qt.RightDockWidgetArea, self.memory_dock)
+        self.memory_dock.hide()
+        action = self.menubar.actions['memory_dock']
+        action.toggled.connect(self.memory_dock.setVisible)
+        self.memory_dock.visibilityChanged.connect(action.setChecked)
+
+    def _table_storage_detail(self):
+        model = self.spreadsheet_widget.model
+        detail = f"{model.rowCount()} rows × {model.columnCount()} columns"
+        if model.store is not None:
+            detail += "; database {:.1f} MiB, {} rows cached".format(
+                model.store.file_size() / (1024 * 1024), model.store.cached_rows())
+        return detail
+
+    def _thumbnail_disk_usage(self):
+        count, size = self.spreadsheet_widget.thumbnail_cache.disk_usage()
+        return count, size / (1024 * 1024)
+
+    def _project_cache_usage(self):
+        count, size = self.controller.project_cache.disk_usage()
+        return count, size / (1024 * 1024)
+
     def new_project(self):
         """Create a new project."""
         try:
@@ -176,6 +358,8 @@ class CredGenMainWindow(QMainWindow):
                 return
             self.spreadsheet_widget.clear_data()
             self.current_csv_file = None
+            self.csv_watcher.unwatch()
+            self.spreadsheet_widget.set_project_folder(None)
             self.current_styling_file = None
             
             # Create new empty project structure
@@ -183,10 +367,8 @@ class CredGenMainWindow(QMainWindow):
             
             self.status_bar.showMessage("New project created")
             self.update_window_title()
-            # Reset undo/redo and push initial state
-            self.controller.undo_stack.clear()
-            self.controller.redo_stack.clear()
-            self.controller.push_undo(self.spreadsheet_widget.get_csv_data())
+            # Reset undo/redo history
+            self.controller.reset_history()
             self.is_dirty = False
             
             if self.styling_data:
@@ -223,6 +405,10 @@ class CredGenMainWindow(QMainWindow):
                     f"Styling.toml not found in {folder_path}"
                 )
                 return
+            if self.spreadsheet_widget.model.store is not None:
+                # Streams the CSV into the database rather than through the project cache
+                self.load_project(str(credits_file), str(styling_file))
+                return
             try:
                 csv_data, styling_data = self.controller.load_project(str(credits_file), str(styling_file))
                 self.current_csv_file = str(credits_file)
@@ -232,12 +418,12 @@ class CredGenMainWindow(QMainWindow):
                 self.update_info_panel(styling_data)
                 # csv_data is expected to include headers as the first row
                 self.spreadsheet_widget.load_data(csv_data, styling_data)
+                self.csv_watcher.watch(str(credits_file), csv_data)
+                self.spreadsheet_widget.set_project_folder(folder_path)
                 self.update_window_title()
                 self.statusBar().showMessage(f"Loaded project from: {folder_path}")
-                # Reset undo/redo and push initial state
-                self.controller.undo_stack.clear()
-                self.controller.redo_stack.clear()
-                self.controller.push_undo(self.spreadsheet_widget.get_csv_data(include_headers=True))
+                # Reset undo/redo history
+                self.controller.reset_history()
                 self.is_dirty = False
             except ValueError as e:
                 QMessageBox.critical(self, "Error", str(e))
@@ -246,11 +432,179 @@ class CredGenMainWindow(QMainWindow):
                 QMessageBox.critical(self, "Error", f"Failed to open project: {str(e)}")
                 return
 
+    def show_compare(self):
+        """Show the compare tool, defaulting to the open table against its file on disk."""
+        dialog = CompareDialog(self.spreadsheet_widget, self.file_manager, self)
+        dialog.setAttribute(Qt.WA_DeleteOnClose)
+        if self.current_csv_file:
+            dialog.right_edit.setText(self.current_csv_file)
+        dialog.show()
+
+    def on_csv_changed_on_disk(self, path):
+        if not self._merging_external:
+            self.merge_external_changes()
+
+    def merge_external_changes(self):
+        """Three-way merge the changes another program made to the open CSV into the table."""
+        watcher = self.csv_watcher
+        sw = self.spreadsheet_widget
+        if watcher.base is None:
+            if watcher.path and sw.model.store is not None:
+                # Database storage keeps no copy of the file to merge against
+                watcher.set_base(None, file_digest(watcher.path))
+                self.is_dirty = True
+                self.status_bar.showMessage(f"{os.path.basename(watcher.path)} changed on disk; saving will "
+                                            "overwrite it (changes can't be merged with database storage)")
+            return
+        try:
+            digest, data = watcher.read()
+        except (OSError, UnicodeDecodeError, csv.Error) as e:
+            # Probably caught mid-write; the next change notification retries
+            print(f"Could not read changed file: {e}")
+            return
+        if not data:
+            return
+        start = time.perf_counter()
+        merge = ThreeWayMerge(watcher.base, data, sw.get_headers(), sw.model.rows(), sw.hidden_first_row)
+        take_theirs = []
+        if merge.conflicts:
+            dialog = ExternalChangeDialog(merge, watcher.path, self)
+            self._merging_external = True
+            try:
+                accepted = dialog.exec_() == QDialog.Accepted
+            finally:
+                self._merging_external = False
+            if not accepted:
+                # The table wins; the file's version becomes the base for the next change
+                watcher.set_base(data, digest)
+                self.is_dirty = True
+                self.status_bar.showMessage("Ignored changes made on disk; saving will overwrite them")
+                return
+            take_theirs = dialog.take_theirs()
+        was_dirty = self.is_dirty
+        edits = merge.row_edits(take_theirs)
+        if edits:
+            sw.model.replace_row_ranges(edits, "Merge Changes from Disk")
+        if merge.hidden_row is not None:
+            sw.hidden_first_row = merge.hidden_row
+        watcher.set_base(data, digest)
+        # A clean table now matches the file, unless the file gained columns the table lacks
+        self.is_dirty = was_dirty or bool(merge.added_columns)
+        elapsed = (time.perf_counter() - start) * 1000
+        self.status_bar.showMessage(f"File changed on disk: {merge.summary()} ({elapsed:.0f} ms)")
+        # Changes that arrived while the conflicts were shown
+        if merge.conflicts:
+            watcher.schedule_check()
+
+    def toggle_thumbnails(self, visible):
+        self.spreadsheet_widget.set_thumbnails_visible(visible)
+
+    def toggle_rendered_preview(self, enabled):
+        self.spreadsheet_widget.set_rendered_preview(enabled)
+        if enabled and not self.spreadsheet_widget.casing.is_active():
+            self.status_bar.showMessage("No letter style has uppercase enabled; text renders as written", 5000)
+
+    def check_casing(self):
+        """Show the names affected by uppercase exceptions."""
+        dialog = CasingDialog(self.spreadsheet_widget, self)
+        dialog.setAttribute(Qt.WA_DeleteOnClose)
+        dialog.show()
+
+    def toggle_database_storage(self, enabled):
+        """Move the table rows into a SQLite database, or back into memory."""
+        start = time.perf_counter()
+        self.spreadsheet_widget.set_database_storage(enabled)
+        if enabled and self.csv_watcher.base is not None:
+            # Don't keep a copy of the whole file in memory either
+            self.csv_watcher.set_base(None, self.csv_watcher.digest)
+        QSettings("CredGen", "CredGen Spreadsheet Editor").setValue("storage/database", enabled)
+        elapsed = (time.perf_counter() - start) * 1000
+        where = "a SQLite database" if enabled else "memory"
+        self.status_bar.showMessage(f"Table rows are kept in {where} ({elapsed:.0f} ms)")
+
+    def toggle_split_view(self, enabled):
+        self.spreadsheet_widget.set_split(enabled)
+
+    def new_table_window(self):
+        """Open another window on the table; editing shortcuts work there too."""
+        keys = ('save', 'undo', 'redo', 'cut', 'copy', 'paste', 'fill_down', 'fill_value', 'fill_series',
+                'clear_cells', 'move_rows_up', 'move_rows_down', 'cut_rows', 'insert_cut_rows')
+        name = os.path.basename(self.current_csv_file) if self.current_csv_file else "Credits"
+        window = TableWindow(self.spreadsheet_widget, [self.menubar.actions[key] for key in keys],
+                             f"{name} — View {len(self.table_windows) + 2}", self)
+        self.table_windows.append(window)
+        window.destroyed.connect(lambda _=None, w=window: self.table_windows.remove(w))
+        window.show()
+
+    def merge_csv_files(self):
+        """Show the CSV merge tool."""
+        dialog = MergeDialog(self.file_manager, self)
+        dialog.setAttribute(Qt.WA_DeleteOnClose)
+        dialog.merged_file.connect(self.open_merged_file)
+        dialog.show()
+
+    def open_merged_file(self, path):
+        if self.maybe_discard_changes():
+            self.load_project(path, self.current_styling_file)
+
+    def import_spreadsheet(self):
+        """Load the first sheet of an ODS or XLSX file into the table; saving writes it to the project CSV."""
+        if not self.maybe_discard_changes():
+            return
+        file_path, _ = QFileDialog.getOpenFileName(
+            self, "Import Spreadsheet", os.path.dirname(self.current_csv_file or os.path.expanduser("~/")),
+            "Spreadsheets (*.ods *.xlsx);;All Files (*)"
+        )
+        if not file_path:
+            return
+        try:
+            start = time.perf_counter()
+            sw = self.spreadsheet_widget
+            # Database storage takes the rows as they are read, like load_project
+            if sw.model.store is not None:
+                sw.load_data(self.file_manager.iter_rows(file_path), self.styling_data)
+                self.controller.plugins.run_load_hooks(sw.csv_rows())
+            else:
+                csv_data = list(self.file_manager.iter_rows(file_path))
+                self.controller.plugins.run_load_hooks(csv_data)
+                sw.load_data(csv_data, self.styling_data)
+            self.controller.reset_history()
+            # The CSV on disk no longer matches the table
+            self.is_dirty = True
+            elapsed = (time.perf_counter() - start) * 1000
+            self.status_bar.showMessage(
+                f"Imported {sw.model.rowCount()} rows from {os.path.basename(file_path)} ({elapsed:.0f} ms)")
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to import spreadsheet: {str(e)}")
+
+    def export_spreadsheet(self):
+        """Write the table to an ODS or XLSX file, streaming rows from the model."""
+        base = os.path.splitext(self.current_csv_file or os.path.expanduser("~/Credits.csv"))[0]
+        file_path, selected = QFileDialog.getSaveFileName(
+            self, "Export Spreadsheet", base + ".xlsx",
+            "Excel Workbook (*.xlsx);;OpenDocument Spreadsheet (*.ods)"
+        )
+        if not file_path:
+            return
+        if not file_path.lower().endswith(('.xlsx', '.ods')):
+            file_path += ".ods" if "*.ods" in selected else ".xlsx"
+        try:
+            start = time.perf_counter()
+            count = self.file_manager.export_rows(file_path, self.spreadsheet_widget.iter_rows())
+            elapsed = (time.perf_counter() - start) * 1000
+            self.status_bar.showMessage(
+                f"Exported {count - 1} rows to {os.path.basename(file_path)} ({elapsed:.0f} ms)")
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to export spreadsheet: {str(e)}")
+
     def load_project(self, csv_file_path, styling_file_path=None):
         """Load a project from files."""
         try:
-            # Load CSV data
-            csv_data = self.file_manager.load_csv(csv_file_path)
+            sw = self.spreadsheet_widget
+            database = sw.model.store is not None
+            # Load CSV data; database storage takes the rows as they are parsed
+            csv_data = self.file_manager.iter_csv(csv_file_path) if database \
+                else self.file_manager.load_csv(csv_file_path)
             self.current_csv_file = csv_file_path
             
             # Load styling data if available
@@ -263,17 +617,23 @@ class CredGenMainWindow(QMainWindow):
                 
             # Update spreadsheet widget
             # csv_data is expected to include headers as the first row
-            self.spreadsheet_widget.load_data(csv_data, styling_data)
+            if database:
+                sw.load_data(csv_data, styling_data)
+                self.controller.plugins.run_load_hooks(sw.csv_rows())
+                self.csv_watcher.watch(csv_file_path, None)
+            else:
+                self.controller.plugins.run_load_hooks(csv_data)
+                sw.load_data(csv_data, styling_data)
+                self.csv_watcher.watch(csv_file_path, csv_data)
+            self.spreadsheet_widget.set_project_folder(os.path.dirname(os.path.abspath(csv_file_path)))
             
             # Update info panel
             self.update_info_panel(styling_data)
             
             self.status_bar.showMessage(f"Loaded project: {os.path.basename(csv_file_path)}")
             self.update_window_title()
-            # Reset undo/redo and push initial state
-            self.controller.undo_stack.clear()
-            self.controller.redo_stack.clear()
-            self.controller.push_undo(self.spreadsheet_widget.get_csv_data(include_headers=True))
+            # Reset undo/redo history
+            self.controller.reset_history()
             self.is_dirty = False
             
         except Exception as e:
@@ -285,16 +645,46 @@ class CredGenMainWindow(QMainWindow):
             self.save_as_project()
             return
         try:
-            csv_data = self.spreadsheet_widget.get_csv_data(include_headers=True)
+            # Never overwrite changes another program made since the file was loaded
+            if self.csv_watcher.is_stale():
+                self.merge_external_changes()
+            csv_data, database = self._table_for_saving()
             if not self.controller.validate_csv(csv_data):
                 QMessageBox.critical(self, "Error", "CSV data is invalid.")
                 return
-            self.controller.save_project(self.current_csv_file, csv_data)
+            if not self.confirm_plugin_problems(csv_data):
+                return
+            self.controller.save_project(self.current_csv_file, csv_data, preserve=not database)
+            self.csv_watcher.watch(self.current_csv_file, None if database else csv_data)
             self.status_bar.showMessage("Project saved successfully")
             self.is_dirty = False
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to save project: {str(e)}")
             
+    def _table_for_saving(self):
+        """
+        Return (rows with headers first, whether they are database-backed).
+        A database-backed table is streamed to a plain rewrite of the file,
+        since mapping unchanged records would parse the whole file into memory.
+        """
+        sw = self.spreadsheet_widget
+        if sw.model.store is not None:
+            return sw.csv_rows(), True
+        return sw.get_csv_data(include_headers=True), False
+
+    def confirm_plugin_problems(self, csv_data) -> bool:
+        """Ask before saving values that plugin validators reject; True to go ahead."""
+        problems = self.controller.plugins.problems_in(csv_data)
+        if not problems:
+            return True
+        lines = [f"Row {number}, {header}: {message}" for number, header, message in problems[:10]]
+        if len(problems) > 10:
+            lines.append("…")
+        reply = QMessageBox.warning(self, "Invalid Values", "Plugins reported invalid values:\n\n" +
+                                    "\n".join(lines) + "\n\nSave anyway?", QMessageBox.Save | QMessageBox.Cancel,
+                                    QMessageBox.Cancel)
+        return reply == QMessageBox.Save
+
     def save_as_project(self) -> None:
         """Save the project with a new name."""
         try:
@@ -305,12 +695,17 @@ class CredGenMainWindow(QMainWindow):
             )
             if not file_path:
                 return
-            csv_data = self.spreadsheet_widget.get_csv_data(include_headers=True)
+            csv_data, database = self._table_for_saving()
             if not self.controller.validate_csv(csv_data):
                 QMessageBox.critical(self, "Error", "CSV data is invalid.")
                 return
-            self.controller.save_project(file_path, csv_data)
+            # Replacing some other file: don't carry over its comments
+            same_file = bool(self.current_csv_file) and \
+                os.path.abspath(file_path) == os.path.abspath(self.current_csv_file)
+            self.controller.save_project(file_path, csv_data, preserve=same_file and not database)
             self.current_csv_file = file_path
+            self.csv_watcher.watch(file_path, None if database else csv_data)
+            self.spreadsheet_widget.set_project_folder(os.path.dirname(os.path.abspath(file_path)))
             self.status_bar.showMessage("Project saved successfully")
             self.update_window_title()
             self.is_dirty = False
@@ -333,6 +728,20 @@ class CredGenMainWindow(QMainWindow):
         """Reorder selected cells."""
         self.spreadsheet_widget.reorder_selected_cells()
         
+    def show_duplicates(self):
+        """Show the duplicate finder for the current table."""
+        if self.duplicates_dialog is None:
+            self.duplicates_dialog = DuplicatesDialog(self.spreadsheet_widget, self)
+        self.duplicates_dialog.show()
+        self.duplicates_dialog.raise_()
+        self.duplicates_dialog.refresh()
+
+    def show_filter_view(self):
+        """Open a new filter view; several can be open side by side."""
+        dialog = FilterViewDialog(self.spreadsheet_widget, self)
+        dialog.setAttribute(Qt.WA_DeleteOnClose)
+        dialog.show()
+
     def refresh_styling(self):
         """Refresh styling data from the current styling file."""
         if not self.current_styling_file:
@@ -349,31 +758,115 @@ class CredGenMainWindow(QMainWindow):
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to refresh styling data: {str(e)}")
             
+    def edit_styling(self):
+        """Open the styling editor for the current styling file."""
+        if not self.current_styling_file:
+            QMessageBox.information(self, "Info", "No styling file loaded")
+            return
+        try:
+            dialog = StylingEditorDialog(self.current_styling_file, self)
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Failed to open styling file: {str(e)}")
+            return
+        dialog.styles_changed.connect(self.on_styles_edited)
+        dialog.exec_()
+
+    def on_styles_edited(self, changes):
+        """Update styling data and dependent views for the edited styles only."""
+        if self.styling_data is None:
+            self.styling_data = {}
+        for table, name, style in changes:
+            self.styling_parser.update_style(self.styling_data, table, name, style)
+            self.info_panel.update_style(table, name, style)
+        self.spreadsheet_widget.update_styling_data(self.styling_data)
+        self.status_bar.showMessage(f"Saved {len(changes)} style(s) to {os.path.basename(self.current_styling_file)}")
+
     def undo(self) -> None:
         """Undo last action."""
-        prev_state = self.controller.undo()
-        if prev_state:
-            self.spreadsheet_widget.load_data(prev_state, self.styling_data)
-            self.status_bar.showMessage("Undo performed")
+        command = self.controller.undo()
+        if command:
+            command.undo(self.spreadsheet_widget.model)
+            self.status_bar.showMessage(f"Undo: {command.text}")
         else:
             self.status_bar.showMessage("Nothing to undo")
 
     def redo(self) -> None:
         """Redo last undone action."""
-        next_state = self.controller.redo()
-        if next_state:
-            self.spreadsheet_widget.load_data(next_state, self.styling_data)
-            self.status_bar.showMessage("Redo performed")
+        command = self.controller.redo()
+        if command:
+            command.redo(self.spreadsheet_widget.model)
+            self.status_bar.showMessage(f"Redo: {command.text}")
         else:
             self.status_bar.showMessage("Nothing to redo")
 
+    def on_command_recorded(self, command) -> None:
+        """Record an edit made through the table model as one undo entry."""
+        self.controller.push_command(command)
+
     def on_data_changed(self) -> None:
         """Handle data change in spreadsheet."""
-        # Push new state to undo stack
-        state = self.spreadsheet_widget.get_csv_data(include_headers=True)
-        self.controller.push_undo(state)
         self.status_bar.showMessage("Data modified")
         self.is_dirty = True
+        self.info_panel.refresh_usage_counts()
+
+    def select_style_usages(self, table, name):
+        """Select every cell using a style."""
+        count = self.spreadsheet_widget.select_style_usages(table, name)
+        self.status_bar.showMessage(f"{count} cell(s) use \"{name}\"")
+
+    def rename_style(self, table, name):
+        """
+        Rename a style in Styling.toml, together with the styles referencing
+        it, and every use of it in the credits, as one undoable edit that
+        also restores Styling.toml.
+        """
+        if table not in RENAMABLE_TABLES:
+            return
+        if not self.current_styling_file:
+            QMessageBox.information(self, "Info", "No styling file loaded")
+            return
+        new_name, ok = QInputDialog.getText(self, "Rename Style", f"Rename \"{name}\" to:", text=name)
+        new_name = new_name.strip()
+        if not ok or not new_name or new_name == name:
+            return
+        if self.info_panel.style_graph.exists((table, new_name)):
+            QMessageBox.warning(self, "Rename Style", f"A style named \"{new_name}\" already exists.")
+            return
+        try:
+            before, after, styles = self.rename_in_styling(table, name, new_name)
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            QMessageBox.critical(self, "Error", f"Failed to rename style: {e}")
+            return
+        text = f"Rename Style \"{name}\""
+        cells = self.spreadsheet_widget.rename_style(table, name, new_name)
+        commands = [StylingTextCommand(self.current_styling_file, before, after, self.refresh_styling, text)]
+        if cells is not None:
+            commands.append(cells)
+        self.spreadsheet_widget.model.record(CompoundCommand(commands, text))
+        count = len(cells.cells) if cells is not None else 0
+        self.refresh_styling()
+        self.status_bar.showMessage(f"Renamed \"{name}\" to \"{new_name}\" in {count} cell(s) "
+                                    f"and {styles} style definition(s)")
+
+    def rename_in_styling(self, table, old, new):
+        """
+        Patch the style's name and every reference to it into Styling.toml;
+        returns the file's text before and after, and the styles changed.
+        """
+        path = self.current_styling_file
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            text = f.read()
+        patcher = TomlPatcher(text, STYLE_TABLES)
+        changes = rename_changes(toml_backends.loads(text), table, old, new)
+        for source_table, source, key, _ in changes:
+            entry = patcher.find_entry(source_table, source)
+            # Keys written as [[table.key]] sections have no value span to patch
+            if entry is None or key not in entry.spans:
+                raise ValueError(f"{source}: \"{key}\" is not a plain value and can't be updated automatically")
+        patcher.patch(changes)
+        patcher.save(path)
+        print(f"Renamed {table} \"{old}\" to \"{new}\" in {path}")
+        return text, patcher.text, len({(t, n) for t, n, _, _ in changes})
         
     def on_selection_changed(self):
         """Handle selection change in spreadsheet."""
@@ -392,6 +885,65 @@ class CredGenMainWindow(QMainWindow):
         """Paste cells from clipboard."""
         self.spreadsheet_widget.paste()
         
+    def fill_down(self):
+        """Fill the selection down from its top cells."""
+        self.show_bulk_result(self.spreadsheet_widget.fill_down())
+
+    def fill_value(self):
+        """Set the selected cells to a value, offering styles for styling columns."""
+        sw = self.spreadsheet_widget
+        current = sw.active_view.currentIndex()
+        if not current.isValid():
+            return
+        items = sw.style_items(current.column()) if sw.columns.is_style_column(current.column()) else []
+        value, ok = QInputDialog.getItem(self, "Fill with Value", "Value:", items or [""], 0, True)
+        if ok:
+            self.show_bulk_result(sw.fill_value(value))
+
+    def fill_series(self):
+        """Number the selected cells of each column with a start value and step."""
+        sw = self.spreadsheet_widget
+        if not sw.selection_rects():
+            return
+        start, step = sw.series_defaults()
+        start, ok = QInputDialog.getDouble(self, "Fill Series", "Start:", start, -1e9, 1e9, 3)
+        if not ok:
+            return
+        step, ok = QInputDialog.getDouble(self, "Fill Series", "Step:", step, -1e9, 1e9, 3)
+        if not ok:
+            return
+        # Keep whole numbers as integers so "1" is not written as "1.0"
+        if start.is_integer() and step.is_integer():
+            start, step = int(start), int(step)
+        self.show_bulk_result(sw.fill_series(start, step))
+
+    def clear_cells(self):
+        """Clear the selected cells."""
+        self.show_bulk_result(self.spreadsheet_widget.clear_cells())
+
+    def show_bulk_result(self, command):
+        if command:
+            self.status_bar.showMessage(f"{command.text}: {len(command.cells)} cell(s) changed")
+        else:
+            self.status_bar.showMessage("No cells changed")
+
+    def move_rows_up(self):
+        """Move selected rows up by one."""
+        self.spreadsheet_widget.move_selected_rows(-1)
+
+    def move_rows_down(self):
+        """Move selected rows down by one."""
+        self.spreadsheet_widget.move_selected_rows(1)
+
+    def cut_rows(self):
+        """Mark selected rows for moving."""
+        self.spreadsheet_widget.cut_rows()
+        self.status_bar.showMessage("Rows marked; use Insert Cut Rows to move them")
+
+    def insert_cut_rows(self):
+        """Move marked rows above the current row."""
+        self.spreadsheet_widget.insert_cut_rows()
+
     def show_about(self):
         """Show about dialog."""
         QMessageBox.about(
@@ -408,6 +960,9 @@ class CredGenMainWindow(QMainWindow):
     def closeEvent(self, event):
         """Handle application close event."""
         if self.maybe_discard_changes():
+            store = self.spreadsheet_widget.model.store
+            if store is not None:
+                store.close()
             event.accept()
         else:
             event.ignore()
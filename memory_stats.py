@@ -0,0 +1,205 @@
+"""
+Approximate memory accounting for the editor's subsystems.
+
+Subsystems (table storage, undo history, indexes, caches, ...) register the
+objects they own with a ``MemoryAccountant``, plus a counter text. Sizes are
+sampled estimates, so the report can be refreshed while editing large
+projects; objects shared between subsystems (e.g. cell strings referenced by
+an index) are attributed to the first subsystem registered. For a precise picture, ``tracemalloc`` tracing can be started on
+demand and its top allocation sites added to the report.
+"""
+import json
+import os
+import sys
+import time
+import tracemalloc
+from itertools import islice
+from types import FunctionType, ModuleType
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Containers longer than this are measured from an evenly spaced sample
+SAMPLE_ITEMS = 512
+
+# Objects whose size is not meaningful to follow
+_SKIP_TYPES = (type, ModuleType, FunctionType)
+
+Target = Callable[[], object]
+Detail = Callable[[], str]
+
+
+def _sample(items, length: int, sample: int):
+    """Return up to ``sample`` evenly spaced items and the factor they stand for."""
+    if length <= sample:
+        return list(items), 1.0
+    step = length // sample
+    picked = list(islice(items, 0, None, step))
+    return picked, length / len(picked)
+
+
+def _is_qt_object(obj) -> bool:
+    return any(cls.__module__.startswith('PyQt5') for cls in type(obj).__mro__)
+
+
+def approx_sizeof(obj, sample: int = SAMPLE_ITEMS, seen: Optional[set] = None) -> int:
+    """
+    Estimate the bytes held by ``obj`` and everything it references.
+
+    Shared objects are counted once; pass the same ``seen`` set to several
+    calls to count them once across all of them. Large lists, tuples, sets
+    and dicts are extrapolated from a sample, so the result is approximate
+    but costs about the same on 1k and 100k rows.
+    """
+    if seen is None:
+        seen = set()
+
+    def size(o) -> float:
+        if id(o) in seen or isinstance(o, _SKIP_TYPES):
+            return 0
+        seen.add(id(o))
+        total = sys.getsizeof(o, 0)
+        if isinstance(o, (str, bytes, bytearray, int, float, bool)) or o is None:
+            return total
+        if isinstance(o, dict):
+            items, factor = _sample(o.items(), len(o), sample)
+            total += factor * sum(size(k) + size(v) for k, v in items)
+        elif isinstance(o, (list, tuple, set, frozenset)):
+            items, factor = _sample(iter(o), len(o), sample)
+            total += factor * sum(size(item) for item in items)
+        else:
+            # Plain Python objects: follow instance attributes, but not into Qt objects,
+            # which reference the whole widget tree
+            if _is_qt_object(o):
+                return total
+            attrs = getattr(o, '__dict__', None)
+            if attrs is not None:
+                total += size(attrs)
+            for slot in getattr(type(o), '__slots__', ()):
+                total += size(getattr(o, slot, None))
+        return total
+
+    return int(size(obj))
+
+
+def format_bytes(count: Optional[int]) -> str:
+    if count is None:
+        return "—"
+    for unit in ("B", "KiB", "MiB"):
+        if abs(count) < 1024:
+            return f"{count:.0f} {unit}" if unit == "B" else f"{count:.1f} {unit}"
+        count /= 1024
+    return f"{count:.1f} GiB"
+
+
+def process_memory() -> Dict[str, int]:
+    """Return the resident set size of this process, where the platform exposes it."""
+    info = {}
+    try:
+        with open('/proc/self/statm', 'r') as f:
+            info['rss'] = int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux reports KiB, macOS bytes
+        info['peak_rss'] = peak if sys.platform == 'darwin' else peak * 1024
+    except (ImportError, OSError):
+        pass
+    return info
+
+
+class MemoryAccountant:
+    """
+    Registry of per-subsystem memory measures.
+
+    Each subsystem has an optional ``target`` callable returning the objects
+    it owns, which are sized with ``approx_sizeof``, and an optional
+    ``detail`` callable returning counters as text. Failing measures are
+    reported rather than raised, so one broken subsystem does not hide the
+    others.
+    """
+    TRACE_FRAMES = 1
+
+    def __init__(self):
+        self._measures: Dict[str, Tuple[Optional[Target], Optional[Detail]]] = {}
+
+    def register(self, name: str, target: Optional[Target] = None, detail: Optional[Detail] = None) -> None:
+        self._measures[name] = (target, detail)
+
+    def unregister(self, name: str) -> None:
+        self._measures.pop(name, None)
+
+    def measure(self) -> List[dict]:
+        """Run every measure; returns dicts with subsystem, bytes, detail and seconds."""
+        results = []
+        seen = set()
+        for name, (target, detail_func) in self._measures.items():
+            start = time.perf_counter()
+            try:
+                count = approx_sizeof(target(), seen=seen) if target else None
+                detail = detail_func() if detail_func else ""
+            except Exception as e:
+                count, detail = None, f"error: {e}"
+            results.append({
+                'subsystem': name,
+                'bytes': count,
+                'detail': detail,
+                'seconds': round(time.perf_counter() - start, 6),
+            })
+        return results
+
+    # tracemalloc, on demand
+    @staticmethod
+    def is_tracing() -> bool:
+        return tracemalloc.is_tracing()
+
+    def start_tracing(self) -> None:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.TRACE_FRAMES)
+            print("tracemalloc started")
+
+    @staticmethod
+    def stop_tracing() -> None:
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+            print("tracemalloc stopped")
+
+    @staticmethod
+    def top_allocations(limit: int = 15, group_by: str = 'filename') -> List[dict]:
+        """Return the largest traced allocation sites; empty unless tracing."""
+        if not tracemalloc.is_tracing():
+            return []
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        ))
+        sites = []
+        for stat in snapshot.statistics(group_by)[:limit]:
+            frame = stat.traceback[0]
+            site = frame.filename if group_by == 'filename' else f"{frame.filename}:{frame.lineno}"
+            sites.append({'site': site, 'bytes': stat.size, 'blocks': stat.count})
+        return sites
+
+    def report(self, allocation_limit: int = 15) -> dict:
+        """Return a JSON-serializable memory report."""
+        report = {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'process': process_memory(),
+            'subsystems': self.measure(),
+        }
+        if tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            report['tracemalloc'] = {
+                'current': current,
+                'peak': peak,
+                'top': self.top_allocations(allocation_limit),
+            }
+        return report
+
+    def dump_json(self, path: str) -> dict:
+        """Write ``report()`` to ``path`` and return it."""
+        report = self.report()
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"Memory report written to {path}")
+        return report
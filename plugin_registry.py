@@ -0,0 +1,348 @@
+"""
+Plugin registry.
+
+A plugin is a folder holding a ``plugin.toml`` and its Python modules::
+
+    name = "Runtime Check"
+    description = "Checks @Page Runtime timecodes"
+    on_load = "runtime:check_rows"        # called with the loaded CSV rows
+
+    [[column_types]]
+    id = "timecode"
+    headers = ["@Page Runtime"]
+    editor = "runtime:make_editor"        # editor(parent) -> QWidget
+    validator = "runtime:validate"        # validator(value) -> error message or None
+    formatter = "runtime:format_value"    # formatter(value) -> display text
+
+    [[tools]]
+    id = "renumber"
+    title = "Renumber Pages"
+    menu = "Tools"
+    shortcut = "Ctrl+Alt+N"
+    run = "runtime:renumber"              # run(main_window)
+
+Plugins are found in the ``plugins`` folder next to the application and in
+the folders listed in ``CREDGEN_PLUGIN_PATH``. Only the metadata is read at
+startup; a ``module:function`` reference is imported the first time it is
+called. Every call into plugin code goes through ``PluginRegistry.call``,
+which times it per plugin and hook (import time included), so a slow plugin
+can be found and disabled.
+"""
+import importlib
+import os
+import re
+import sys
+import time
+import types
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+import toml_backends
+
+PLUGIN_DIRS = (Path(__file__).resolve().parent / 'plugins',)
+PLUGIN_PATH_ENV = 'CREDGEN_PLUGIN_PATH'
+METADATA_FILE = 'plugin.toml'
+# Parent package of folder plugins, so their modules can import each other relatively
+PACKAGE = 'credgen_plugins'
+
+HOOK_IMPORT = 'import'
+HOOK_LOAD = 'load'
+HOOK_VALIDATE = 'validate'
+HOOK_FORMAT = 'format'
+HOOK_EDITOR = 'editor'
+HOOK_TOOL = 'tool'
+
+
+class PluginError(Exception):
+    """Invalid plugin metadata or a reference that cannot be imported."""
+
+
+class LazyRef:
+    """
+    A ``module:attribute`` reference imported on first use (or a callable
+    used as is). A failed import is remembered in ``error`` and not retried
+    until the plugin is re-enabled, since hooks run for every painted cell.
+    """
+
+    def __init__(self, plugin: 'Plugin', ref: Union[str, Callable]):
+        self.plugin = plugin
+        self.ref = ref
+        self.error: Optional[PluginError] = None
+        self._target = ref if callable(ref) else None
+        if self._target is None:
+            module, sep, attr = str(ref).partition(':')
+            if not sep or not module or not attr:
+                raise PluginError(f"{plugin.name}: invalid reference {ref!r} (expected module:function)")
+            self.module, self.attr = module, attr
+
+    @property
+    def loaded(self) -> bool:
+        return self._target is not None
+
+    def resolve(self, registry: 'PluginRegistry') -> Callable:
+        if self.error is not None:
+            raise self.error
+        if self._target is None:
+            start = time.perf_counter()
+            try:
+                module = importlib.import_module(self.plugin.module_name(self.module))
+                self._target = getattr(module, self.attr)
+            except Exception as e:
+                registry.record(self.plugin.name, HOOK_IMPORT, time.perf_counter() - start, error=True)
+                self.error = PluginError(f"{self.plugin.name}: cannot import {self.ref}: {e}")
+                raise self.error from e
+            registry.record(self.plugin.name, HOOK_IMPORT, time.perf_counter() - start)
+        return self._target
+
+    def __repr__(self):
+        return f"LazyRef({self.ref!r})"
+
+
+class ColumnType:
+    """A column type contributed by a plugin, applied to columns with one of ``headers``."""
+
+    def __init__(self, plugin: 'Plugin', data: dict):
+        self.plugin = plugin
+        self.id = str(data.get('id') or '').strip()
+        if not self.id:
+            raise PluginError(f"{plugin.name}: column type without an id")
+        self.headers = [str(h).strip() for h in data.get('headers', [])]
+        self.editor = self._ref(data.get('editor'))
+        self.validator = self._ref(data.get('validator'))
+        self.formatter = self._ref(data.get('formatter'))
+
+    def _ref(self, ref) -> Optional[LazyRef]:
+        return LazyRef(self.plugin, ref) if ref else None
+
+
+class PluginTool:
+    """A menu entry contributed by a plugin; ``run`` is called with the main window."""
+
+    def __init__(self, plugin: 'Plugin', data: dict):
+        self.plugin = plugin
+        self.id = str(data.get('id') or '').strip()
+        self.title = str(data.get('title') or self.id)
+        self.menu = str(data.get('menu') or 'Tools')
+        self.shortcut = str(data.get('shortcut') or '')
+        if not self.id or not data.get('run'):
+            raise PluginError(f"{plugin.name}: tool needs an id and a run reference")
+        self.run = LazyRef(plugin, data['run'])
+
+    @property
+    def key(self) -> str:
+        return f"plugin:{self.plugin.name}:{self.id}"
+
+
+class Plugin:
+    """Metadata of one plugin. ``folder`` is None for plugins registered from code."""
+
+    def __init__(self, data: dict, folder: Optional[Path] = None):
+        self.folder = folder
+        self.name = str(data.get('name') or (folder.name if folder else '')).strip()
+        if not self.name:
+            raise PluginError("Plugin without a name")
+        self.description = str(data.get('description', ''))
+        self.version = str(data.get('version', ''))
+        self.enabled = True
+        self.column_types = [ColumnType(self, item) for item in data.get('column_types', [])]
+        self.tools = [PluginTool(self, item) for item in data.get('tools', [])]
+        self.on_load = LazyRef(self, data['on_load']) if data.get('on_load') else None
+
+    def refs(self) -> List[LazyRef]:
+        """Return every hook reference of the plugin."""
+        refs = [ref for column_type in self.column_types
+                for ref in (column_type.editor, column_type.validator, column_type.formatter) if ref]
+        refs.extend(tool.run for tool in self.tools)
+        if self.on_load is not None:
+            refs.append(self.on_load)
+        return refs
+
+    def load_errors(self) -> List[str]:
+        """Return the messages of the references that failed to import."""
+        return [str(ref.error) for ref in self.refs() if ref.error is not None]
+
+    @property
+    def package(self) -> str:
+        slug = re.sub(r'\W', '_', self.name.lower())
+        return f"{PACKAGE}.{slug}"
+
+    def module_name(self, module: str) -> str:
+        """Return the importable name of one of the plugin's modules."""
+        if self.folder is None:
+            return module
+        if self.package not in sys.modules:
+            if PACKAGE not in sys.modules:
+                root = types.ModuleType(PACKAGE)
+                root.__path__ = []
+                sys.modules[PACKAGE] = root
+            package = types.ModuleType(self.package)
+            package.__path__ = [str(self.folder)]
+            sys.modules[self.package] = package
+        return f"{self.package}.{module}"
+
+
+class HookStats:
+    """Accumulated timing of one plugin hook."""
+    __slots__ = ('calls', 'seconds', 'max_seconds', 'errors')
+
+    def __init__(self):
+        self.calls = 0
+        self.seconds = 0.0
+        self.max_seconds = 0.0
+        self.errors = 0
+
+
+class PluginRegistry:
+    """Discovers plugins, resolves their hooks lazily and times every call."""
+
+    def __init__(self, plugin_dirs=None):
+        if plugin_dirs is None:
+            extra = [p for p in os.environ.get(PLUGIN_PATH_ENV, '').split(os.pathsep) if p]
+            plugin_dirs = list(PLUGIN_DIRS) + [Path(p) for p in extra]
+        self.plugin_dirs = [Path(p) for p in plugin_dirs]
+        self.plugins: Dict[str, Plugin] = {}
+        # (plugin name, hook) -> HookStats
+        self.stats: Dict[Tuple[str, str], HookStats] = {}
+        # Metadata problems found during discovery, shown in the plugin dialog
+        self.problems: List[str] = []
+        self._header_types: Optional[Dict[str, ColumnType]] = None
+
+    def discover(self) -> None:
+        """Read the metadata of every plugin folder (no plugin code is imported)."""
+        for directory in self.plugin_dirs:
+            if not directory.is_dir():
+                continue
+            for folder in sorted(p for p in directory.iterdir() if (p / METADATA_FILE).is_file()):
+                try:
+                    self.register(Plugin(toml_backends.load(str(folder / METADATA_FILE)), folder))
+                except (OSError, ValueError, PluginError) as e:
+                    message = f"{folder.name}: {e}"
+                    print(f"Skipping plugin {message}")
+                    self.problems.append(message)
+
+    def register(self, plugin: Plugin) -> Plugin:
+        if plugin.name in self.plugins:
+            raise PluginError(f"Duplicate plugin name {plugin.name!r}")
+        self.plugins[plugin.name] = plugin
+        self._header_types = None
+        print(f"Registered plugin {plugin.name}: {len(plugin.column_types)} column type(s), "
+              f"{len(plugin.tools)} tool(s)")
+        return plugin
+
+    def set_enabled(self, name: str, enabled: bool) -> None:
+        plugin = self.plugins[name]
+        plugin.enabled = enabled
+        if enabled:
+            # Re-enabling retries imports that failed, e.g. after the plugin was fixed
+            for ref in plugin.refs():
+                ref.error = None
+        self._header_types = None
+
+    def enabled_plugins(self) -> List[Plugin]:
+        return [plugin for plugin in self.plugins.values() if plugin.enabled]
+
+    def column_type_for_header(self, header: str) -> Optional[ColumnType]:
+        """Return the enabled column type claiming ``header`` (the first plugin wins)."""
+        if self._header_types is None:
+            self._header_types = {}
+            for plugin in self.enabled_plugins():
+                for column_type in plugin.column_types:
+                    for h in column_type.headers:
+                        self._header_types.setdefault(h, column_type)
+        return self._header_types.get(str(header).strip())
+
+    def tools(self) -> List[PluginTool]:
+        return [tool for plugin in self.plugins.values() for tool in plugin.tools]
+
+    # Timed calls
+    def record(self, plugin: str, hook: str, seconds: float, error: bool = False) -> None:
+        stats = self.stats.get((plugin, hook))
+        if stats is None:
+            stats = self.stats[(plugin, hook)] = HookStats()
+        stats.calls += 1
+        stats.seconds += seconds
+        if seconds > stats.max_seconds:
+            stats.max_seconds = seconds
+        if error:
+            stats.errors += 1
+
+    def call(self, ref: LazyRef, hook: str, *args, default=None):
+        """Call plugin code, timing it; errors are counted and printed once, and ``default`` returned."""
+        if ref.error is not None:
+            return default
+        try:
+            target = ref.resolve(self)
+        except PluginError as e:
+            print(e)
+            return default
+        start = time.perf_counter()
+        try:
+            result = target(*args)
+        except Exception as e:
+            self.record(ref.plugin.name, hook, time.perf_counter() - start, error=True)
+            if self.stats[(ref.plugin.name, hook)].errors == 1:
+                print(f"Plugin {ref.plugin.name} failed in {hook}: {e!r}")
+            return default
+        self.record(ref.plugin.name, hook, time.perf_counter() - start)
+        return result
+
+    def validate(self, column_type: ColumnType, value: str) -> Optional[str]:
+        """Return the validator's error message for ``value``, or None if it is valid."""
+        if column_type.validator is None or not column_type.plugin.enabled:
+            return None
+        message = self.call(column_type.validator, HOOK_VALIDATE, value)
+        return str(message) if message else None
+
+    def format(self, column_type: ColumnType, value: str) -> str:
+        if column_type.formatter is None or not column_type.plugin.enabled:
+            return value
+        result = self.call(column_type.formatter, HOOK_FORMAT, value, default=value)
+        return value if result is None else str(result)
+
+    def create_editor(self, column_type: ColumnType, parent):
+        if column_type.editor is None or not column_type.plugin.enabled:
+            return None
+        return self.call(column_type.editor, HOOK_EDITOR, parent)
+
+    def run_load_hooks(self, csv_data: list) -> None:
+        """Pass freshly loaded CSV rows (headers first) to every enabled plugin's ``on_load``."""
+        for plugin in self.enabled_plugins():
+            if plugin.on_load is not None:
+                self.call(plugin.on_load, HOOK_LOAD, csv_data)
+
+    def run_tool(self, tool: PluginTool, *args) -> None:
+        if tool.plugin.enabled:
+            self.call(tool.run, HOOK_TOOL, *args)
+
+    def problems_in(self, csv_data: list, limit: int = 20) -> List[Tuple[int, str, str]]:
+        """Return up to ``limit`` (row number, header, message) validator errors in CSV rows (headers first)."""
+        rows = iter(csv_data or ())
+        headers = [str(h).strip() for h in next(rows, ())]
+        columns = [(c, self.column_type_for_header(h)) for c, h in enumerate(headers)]
+        columns = [(c, t) for c, t in columns if t is not None and t.validator is not None]
+        if not columns:
+            return []
+        problems = []
+        for number, row in enumerate(rows, 2):
+            for c, column_type in columns:
+                if c < len(row) and row[c]:
+                    message = self.validate(column_type, row[c])
+                    if message:
+                        problems.append((number, headers[c], message))
+                        if len(problems) >= limit:
+                            return problems
+        return problems
+
+    def report(self) -> List[dict]:
+        """Return per-plugin, per-hook timings, slowest plugins first."""
+        totals: Dict[str, float] = {}
+        for (plugin, _), stats in self.stats.items():
+            totals[plugin] = totals.get(plugin, 0.0) + stats.seconds
+        rows = [{'plugin': plugin, 'hook': hook, 'calls': s.calls, 'seconds': s.seconds,
+                 'max_seconds': s.max_seconds, 'errors': s.errors}
+                for (plugin, hook), s in self.stats.items()]
+        rows.sort(key=lambda r: (-totals[r['plugin']], r['plugin'], -r['seconds']))
+        return rows
+
+    def reset_stats(self) -> None:
+        self.stats.clear()
@@ -0,0 +1,161 @@
+"""
+Sidecar cache of parsed projects for fast re-opening.
+
+Each cache entry holds the parsed Credits.csv rows and the parsed Styling.toml
+document of one project, serialized with ``marshal`` so loading is a single C-level decode.
+Entries are keyed by the project paths and validated against the size,
+modification time and content hash of both source files; stale entries are
+rebuilt on the next load and the cache directory is kept under a byte budget
+by evicting least recently used entries.
+"""
+import gc
+import hashlib
+import marshal
+import os
+import struct
+import sys
+from pathlib import Path
+from typing import Optional, Tuple
+
+APP_CACHE_NAME = 'credgen-editor'
+MAGIC = b'CGPC\x03'
+# marshal output is only guaranteed to round-trip on the same Python version
+FORMAT_TAG = f"{sys.implementation.name}-{sys.version_info[0]}.{sys.version_info[1]}-m{marshal.version}"
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+_HEADER_SIZE = struct.Struct('<I')
+
+
+def user_cache_dir(*parts: str) -> Path:
+    """Return the per-user cache directory for this application."""
+    if sys.platform.startswith('win'):
+        base = Path(os.environ.get('LOCALAPPDATA') or Path.home() / 'AppData' / 'Local')
+    elif sys.platform == 'darwin':
+        base = Path.home() / 'Library' / 'Caches'
+    else:
+        base = Path(os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache')
+    return base.joinpath(APP_CACHE_NAME, *parts)
+
+
+def file_fingerprint(file_path: Optional[str]) -> Optional[tuple]:
+    """Return (path, size, mtime_ns, blake2b digest) for a file, or None if absent."""
+    if not file_path:
+        return None
+    path = Path(file_path)
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return (str(path.resolve()), stat.st_size, stat.st_mtime_ns, digest.hexdigest())
+
+
+class ProjectCache:
+    """
+    Size-bounded LRU cache of parsed projects stored as binary sidecar files.
+    """
+    def __init__(self, cache_dir=None, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = Path(cache_dir) if cache_dir else user_cache_dir('projects')
+        self.max_bytes = max_bytes
+
+    def entry_path(self, csv_path: str, styling_path: Optional[str]) -> Path:
+        """Return the cache file used for a project."""
+        key = f"{Path(csv_path).resolve()}\0{Path(styling_path).resolve() if styling_path else ''}"
+        return self.cache_dir / (hashlib.sha1(key.encode('utf-8')).hexdigest() + '.cgpc')
+
+    def load(self, csv_path: str, styling_path: Optional[str] = None) -> Optional[Tuple[list, Optional[dict]]]:
+        """
+        Return cached (csv_data, styling_document) if the entry matches both files, else None.
+        """
+        entry = self.entry_path(csv_path, styling_path)
+        try:
+            with open(entry, 'rb') as f:
+                if f.read(len(MAGIC)) != MAGIC:
+                    return None
+                (header_size,) = _HEADER_SIZE.unpack(f.read(_HEADER_SIZE.size))
+                header = marshal.loads(f.read(header_size))
+                if header != self._header(csv_path, styling_path):
+                    print(f"Project cache stale: {entry.name}")
+                    return None
+                payload = f.read()
+            # Millions of freshly decoded strings would otherwise trigger
+            # repeated full garbage collections during the decode
+            gc_was_enabled = gc.isenabled()
+            gc.disable()
+            try:
+                csv_data, styling_document = marshal.loads(payload)
+            finally:
+                if gc_was_enabled:
+                    gc.enable()
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, EOFError, TypeError, struct.error) as e:
+            print(f"Ignoring unreadable project cache {entry.name}: {e}")
+            return None
+        # Mark as recently used for LRU eviction
+        try:
+            os.utime(entry)
+        except OSError:
+            pass
+        print(f"Loaded project from cache: {entry.name}")
+        return csv_data, styling_document
+
+    def store(self, csv_path: str, styling_path: Optional[str], csv_data: list,
+              styling_document: Optional[dict]) -> None:
+        """Write a cache entry for the project, then enforce the size budget."""
+        entry = self.entry_path(csv_path, styling_path)
+        try:
+            header = marshal.dumps(self._header(csv_path, styling_path))
+            payload = marshal.dumps((csv_data, styling_document))
+        except ValueError as e:
+            # Documents holding types marshal cannot encode (e.g. TOML dates) are simply not cached
+            print(f"Project not cacheable: {e}")
+            return
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp = entry.with_suffix('.tmp')
+            with open(tmp, 'wb') as f:
+                f.write(MAGIC)
+                f.write(_HEADER_SIZE.pack(len(header)))
+                f.write(header)
+                f.write(payload)
+            os.replace(tmp, entry)
+            self.evict()
+        except OSError as e:
+            print(f"Failed to write project cache: {e}")
+
+    def invalidate(self, csv_path: str, styling_path: Optional[str] = None) -> None:
+        """Remove the cache entry for a project, if any."""
+        try:
+            self.entry_path(csv_path, styling_path).unlink()
+        except OSError:
+            pass
+
+    def evict(self) -> None:
+        """Delete least recently used entries until the cache fits in ``max_bytes``."""
+        try:
+            entries = [(e.stat(), e) for e in self.cache_dir.glob('*.cgpc')]
+        except OSError:
+            return
+        total = sum(stat.st_size for stat, _ in entries)
+        for stat, entry in sorted(entries, key=lambda item: item[0].st_mtime_ns):
+            if total <= self.max_bytes:
+                break
+            try:
+                entry.unlink()
+                total -= stat.st_size
+            except OSError:
+                pass
+
+    def disk_usage(self) -> Tuple[int, int]:
+        """Return (entry count, total bytes) of the cache directory."""
+        try:
+            sizes = [e.stat().st_size for e in self.cache_dir.glob('*.cgpc')]
+        except OSError:
+            return 0, 0
+        return len(sizes), sum(sizes)
+
+    def _header(self, csv_path, styling_path) -> tuple:
+        return (FORMAT_TAG, file_fingerprint(csv_path), file_fingerprint(styling_path))
@@ -0,0 +1,78 @@
+"""
+Helpers for working with table selections as rectangles.
+
+A selection is handled as a short list of ``(top, left, bottom, right)``
+rectangles taken from ``QItemSelection`` ranges, so selecting a whole sheet
+costs one rectangle instead of one ``QModelIndex`` per cell. Overlapping
+rectangles (possible with Ctrl-selection) are resolved per row band, so
+every cell is visited at most once.
+"""
+from typing import Iterable, Iterator, List, Tuple
+
+Rect = Tuple[int, int, int, int]
+
+
+def selection_rects(selection) -> List[Rect]:
+    """Return the rectangles of a QItemSelection as (top, left, bottom, right) tuples."""
+    return [(r.top(), r.left(), r.bottom(), r.right()) for r in selection if r.isValid()]
+
+
+def merge_intervals(intervals: Iterable[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """Merge inclusive (start, end) intervals that overlap or touch."""
+    merged = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1] + 1:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def row_intervals(rects: List[Rect]) -> List[Tuple[int, int]]:
+    """Return the selected rows as merged inclusive intervals."""
+    return merge_intervals((top, bottom) for top, _, bottom, _ in rects)
+
+
+def column_intervals(rects: List[Rect]) -> List[Tuple[int, int]]:
+    """Return the selected columns as merged inclusive intervals."""
+    return merge_intervals((left, right) for _, left, _, right in rects)
+
+
+def interval_length(intervals: List[Tuple[int, int]]) -> int:
+    return sum(end - start + 1 for start, end in intervals)
+
+
+def row_bands(rects: List[Rect]) -> Iterator[Tuple[int, int, List[Tuple[int, int]]]]:
+    """
+    Yield (first_row, last_row, column_intervals) for consecutive row bands in
+    which the same set of rectangles applies.
+    """
+    edges = sorted({top for top, _, _, _ in rects} | {bottom + 1 for _, _, bottom, _ in rects})
+    for first, after in zip(edges, edges[1:]):
+        columns = merge_intervals((left, right) for top, left, bottom, right in rects
+                                  if top <= first and bottom >= after - 1)
+        if columns:
+            yield first, after - 1, columns
+
+
+def cell_count(rects: List[Rect]) -> int:
+    """Return the number of distinct selected cells."""
+    return sum((last - first + 1) * interval_length(columns) for first, last, columns in row_bands(rects))
+
+
+def iter_cells(rects: List[Rect]) -> Iterator[Tuple[int, int]]:
+    """Yield each selected (row, col) once, in row-major order."""
+    for first, last, columns in row_bands(rects):
+        cols = [c for start, end in columns for c in range(start, end + 1)]
+        for row in range(first, last + 1):
+            for col in cols:
+                yield row, col
+
+
+def iter_row_columns(rects: List[Rect]) -> Iterator[Tuple[int, List[int]]]:
+    """Yield (row, selected columns) for each selected row in order."""
+    for first, last, columns in row_bands(rects):
+        cols = [c for start, end in columns for c in range(start, end + 1)]
+        for row in range(first, last + 1):
+            yield row, cols
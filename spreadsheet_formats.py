@@ -0,0 +1,408 @@
+"""
+Streaming ODS and XLSX reading and writing, using only ``zipfile`` and
+``xml.etree.ElementTree.iterparse``.
+
+Readers yield one row (a list of strings) at a time: the sheet XML is
+parsed incrementally and each row element is cleared once read, so memory
+does not grow with the number of rows. XLSX shared strings are the
+exception, as cells refer to them by index; they are held as one list.
+Writers take any iterable of rows and write the sheet XML in chunks into a
+deflated zip member, with XLSX text as inline strings, so no sheet-sized
+structure is built either. Every value is written as text, which keeps
+timecodes and numbers exactly as they are in the table.
+"""
+import posixpath
+import re
+import zipfile
+from typing import Iterable, Iterator, List
+from xml.etree.ElementTree import iterparse
+from xml.sax.saxutils import escape, quoteattr
+
+ODS_SUFFIX = '.ods'
+XLSX_SUFFIX = '.xlsx'
+SUFFIXES = (ODS_SUFFIX, XLSX_SUFFIX)
+# Bytes of XML gathered before each write to the zip member
+WRITE_CHUNK = 256 * 1024
+# Never materialize more than this many repeated blank cells or rows (ODS pads sheets with huge repeats)
+MAX_REPEAT = 16384
+
+_MAIN_NS = 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'
+_REL_NS = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+_PKG_REL_NS = 'http://schemas.openxmlformats.org/package/2006/relationships'
+_TABLE_NS = 'urn:oasis:names:tc:opendocument:xmlns:table:1.0'
+_TEXT_NS = 'urn:oasis:names:tc:opendocument:xmlns:text:1.0'
+_OFFICE_NS = 'urn:oasis:names:tc:opendocument:xmlns:office:1.0'
+
+_X = '{%s}' % _MAIN_NS
+_T = '{%s}' % _TABLE_NS
+_TX = '{%s}' % _TEXT_NS
+_O = '{%s}' % _OFFICE_NS
+
+_CELL_REF = re.compile(r'([A-Z]+)')
+# XML 1.0 forbids most control characters; they cannot be written to a sheet
+_INVALID_XML = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+
+def _column_index(ref: str) -> int:
+    """Return the 0-based column of an A1-style reference ("C7" -> 2)."""
+    match = _CELL_REF.match(ref)
+    index = 0
+    for char in match.group(1) if match else '':
+        index = index * 26 + ord(char) - 64
+    return index - 1
+
+
+def _column_name(index: int) -> str:
+    name = ''
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        name = chr(65 + remainder) + name
+    return name
+
+
+def _text(value) -> str:
+    return _INVALID_XML.sub('', str(value))
+
+
+def _trim(row: List[str]) -> List[str]:
+    while row and not row[-1]:
+        row.pop()
+    return row
+
+
+def _rows_with_blanks(rows) -> Iterator[List[str]]:
+    """Yield (row, repeat) pairs as rows, dropping trailing blank rows and capping blank runs."""
+    pending_blank = 0
+    for row, repeat in rows:
+        if not row:
+            pending_blank += repeat
+            continue
+        for _ in range(min(pending_blank, MAX_REPEAT)):
+            yield []
+        pending_blank = 0
+        for _ in range(min(repeat, MAX_REPEAT)):
+            yield list(row)
+
+
+# XLSX reading
+def _xlsx_sheet_path(archive: zipfile.ZipFile) -> str:
+    """Return the zip path of the workbook's first sheet."""
+    sheet_id = None
+    with archive.open('xl/workbook.xml') as f:
+        for _, elem in iterparse(f):
+            if elem.tag == _X + 'sheet':
+                sheet_id = elem.get('{%s}id' % _REL_NS)
+                break
+    targets = {}
+    with archive.open('xl/_rels/workbook.xml.rels') as f:
+        for _, elem in iterparse(f):
+            if elem.tag == '{%s}Relationship' % _PKG_REL_NS:
+                targets[elem.get('Id')] = elem.get('Target')
+    target = targets.get(sheet_id, 'worksheets/sheet1.xml')
+    return target.lstrip('/') if target.startswith('/') else posixpath.normpath(posixpath.join('xl', target))
+
+
+def _string_item_text(elem) -> str:
+    """Text of a shared or inline string: its ``t`` runs, skipping phonetic runs."""
+    phonetic = {id(t) for rph in elem.iter(_X + 'rPh') for t in rph.iter(_X + 't')}
+    return ''.join(t.text or '' for t in elem.iter(_X + 't') if id(t) not in phonetic)
+
+
+def _xlsx_shared_strings(archive: zipfile.ZipFile) -> List[str]:
+    try:
+        f = archive.open('xl/sharedStrings.xml')
+    except KeyError:
+        return []
+    strings = []
+    with f:
+        for _, elem in iterparse(f):
+            if elem.tag == _X + 'si':
+                strings.append(_string_item_text(elem))
+                elem.clear()
+    return strings
+
+
+def iter_xlsx(path: str) -> Iterator[List[str]]:
+    """Yield the rows of the first sheet of an XLSX file as lists of strings."""
+    with zipfile.ZipFile(path) as archive:
+        strings = _xlsx_shared_strings(archive)
+        sheet = _xlsx_sheet_path(archive)
+
+        def rows():
+            expected = 0
+            sheet_data = None
+            with archive.open(sheet) as f:
+                for event, elem in iterparse(f, events=('start', 'end')):
+                    if event == 'start':
+                        if elem.tag == _X + 'sheetData':
+                            sheet_data = elem
+                        continue
+                    if elem.tag != _X + 'row':
+                        continue
+                    number = int(elem.get('r', expected + 1))
+                    # Rows without cells are left out of the XML
+                    if number - 1 > expected:
+                        yield [], number - 1 - expected
+                    expected = number
+                    row = []
+                    for cell in elem.iter(_X + 'c'):
+                        col = _column_index(cell.get('r', '')) if cell.get('r') else len(row)
+                        kind = cell.get('t', 'n')
+                        if kind == 'inlineStr':
+                            inline = cell.find(_X + 'is')
+                            value = _string_item_text(inline) if inline is not None else ''
+                        else:
+                            v = cell.find(_X + 'v')
+                            value = v.text or '' if v is not None else ''
+                            if kind == 's' and value:
+                                value = strings[int(value)]
+                            elif kind == 'b':
+                                value = 'TRUE' if value == '1' else 'FALSE'
+                        if col >= len(row):
+                            row.extend([''] * (col - len(row) + 1))
+                        row[col] = value
+                    yield _trim(row), 1
+                    # Drop the finished row so memory stays flat
+                    if sheet_data is not None:
+                        sheet_data.clear()
+
+        yield from _rows_with_blanks(rows())
+
+
+# ODS reading
+def _ods_cell_text(cell) -> str:
+    """Text of an ODS cell: its paragraphs joined by newlines, with spaces, tabs and line breaks expanded."""
+    paragraphs = []
+    for p in cell.findall(_TX + 'p'):
+        parts = []
+
+        def walk(elem):
+            if elem.text:
+                parts.append(elem.text)
+            for child in elem:
+                if child.tag == _TX + 's':
+                    parts.append(' ' * int(child.get(_TX + 'c', '1')))
+                elif child.tag == _TX + 'tab':
+                    parts.append('\t')
+                elif child.tag == _TX + 'line-break':
+                    parts.append('\n')
+                elif child.tag != _O + 'annotation':
+                    walk(child)
+                if child.tail:
+                    parts.append(child.tail)
+
+        walk(p)
+        paragraphs.append(''.join(parts))
+    return '\n'.join(paragraphs)
+
+
+_ODS_ROW_PARENTS = (_T + 'table', _T + 'table-header-rows', _T + 'table-rows', _T + 'table-row-group')
+
+
+def iter_ods(path: str) -> Iterator[List[str]]:
+    """Yield the rows of the first table of an ODS file as lists of strings."""
+    with zipfile.ZipFile(path) as archive:
+
+        def rows():
+            table = None
+            parents = []
+            with archive.open('content.xml') as f:
+                for event, elem in iterparse(f, events=('start', 'end')):
+                    if elem.tag == _T + 'table':
+                        if event == 'end':
+                            # Only the first table is read
+                            return
+                        table = elem
+                    if table is None or elem.tag not in _ODS_ROW_PARENTS + (_T + 'table-row',):
+                        continue
+                    # Rows can sit in header-rows or row-group elements inside the table
+                    if event == 'start':
+                        if elem.tag != _T + 'table-row':
+                            parents.append(elem)
+                        continue
+                    if elem.tag != _T + 'table-row':
+                        parents.pop()
+                        continue
+                    row = []
+                    for cell in elem:
+                        if cell.tag not in (_T + 'table-cell', _T + 'covered-table-cell'):
+                            continue
+                        repeat = int(cell.get(_T + 'number-columns-repeated', '1'))
+                        value = _ods_cell_text(cell)
+                        if not value and cell.get(_O + 'value-type') not in (None, 'string'):
+                            value = cell.get(_O + 'value') or cell.get(_O + 'date-value') or \
+                                cell.get(_O + 'time-value') or cell.get(_O + 'boolean-value') or ''
+                        row.extend([value] * (repeat if value else min(repeat, MAX_REPEAT)))
+                    yield _trim(row), int(elem.get(_T + 'number-rows-repeated', '1'))
+                    parents[-1].remove(elem)
+
+        yield from _rows_with_blanks(rows())
+
+
+def iter_rows(path: str) -> Iterator[List[str]]:
+    """Yield the rows of an ODS or XLSX file, chosen by suffix."""
+    if path.lower().endswith(ODS_SUFFIX):
+        return iter_ods(path)
+    if path.lower().endswith(XLSX_SUFFIX):
+        return iter_xlsx(path)
+    raise ValueError(f"Not an ODS or XLSX file: {path}")
+
+
+# Writing
+class _ChunkedWriter:
+    """Gathers strings and writes them to a binary stream in WRITE_CHUNK pieces."""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.parts = []
+        self.size = 0
+
+    def write(self, text: str) -> None:
+        self.parts.append(text)
+        self.size += len(text)
+        if self.size >= WRITE_CHUNK:
+            self.flush()
+
+    def flush(self) -> None:
+        if self.parts:
+            self.stream.write(''.join(self.parts).encode('utf-8'))
+            self.parts = []
+            self.size = 0
+
+
+_XLSX_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    '<Override PartName="/xl/styles.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+    '</Types>')
+_XLSX_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    f'<Relationships xmlns="{_PKG_REL_NS}">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="xl/workbook.xml"/></Relationships>')
+_XLSX_WORKBOOK = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    f'<workbook xmlns="{_MAIN_NS}" xmlns:r="{_REL_NS}">'
+    '<sheets><sheet name="Credits" sheetId="1" r:id="rId1"/></sheets></workbook>')
+_XLSX_WORKBOOK_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    f'<Relationships xmlns="{_PKG_REL_NS}">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+    'Target="worksheets/sheet1.xml"/>'
+    '<Relationship Id="rId2" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" '
+    'Target="styles.xml"/></Relationships>')
+_XLSX_STYLES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    f'<styleSheet xmlns="{_MAIN_NS}">'
+    '<fonts count="1"><font><sz val="11"/><name val="Calibri"/></font></fonts>'
+    '<fills count="1"><fill><patternFill patternType="none"/></fill></fills>'
+    '<borders count="1"><border/></borders>'
+    '<cellStyleXfs count="1"><xf/></cellStyleXfs>'
+    '<cellXfs count="1"><xf xfId="0"/></cellXfs>'
+    '</styleSheet>')
+
+
+def write_xlsx(path: str, rows: Iterable[Iterable]) -> int:
+    """Write ``rows`` to an XLSX file with one sheet; returns the number of rows written."""
+    count = 0
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr('[Content_Types].xml', _XLSX_CONTENT_TYPES)
+        archive.writestr('_rels/.rels', _XLSX_RELS)
+        archive.writestr('xl/workbook.xml', _XLSX_WORKBOOK)
+        archive.writestr('xl/_rels/workbook.xml.rels', _XLSX_WORKBOOK_RELS)
+        archive.writestr('xl/styles.xml', _XLSX_STYLES)
+        with archive.open('xl/worksheets/sheet1.xml', 'w', force_zip64=True) as stream:
+            out = _ChunkedWriter(stream)
+            out.write('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+                      f'<worksheet xmlns="{_MAIN_NS}"><sheetData>')
+            columns = []
+            for count, row in enumerate(rows, 1):
+                out.write(f'<row r="{count}">')
+                for col, value in enumerate(row):
+                    if value == '' or value is None:
+                        continue
+                    while col >= len(columns):
+                        columns.append(_column_name(len(columns)))
+                    out.write(f'<c r="{columns[col]}{count}" t="inlineStr"><is><t xml:space="preserve">'
+                              f'{escape(_text(value))}</t></is></c>')
+                out.write('</row>')
+            out.write('</sheetData></worksheet>')
+            out.flush()
+    return count
+
+
+_ODS_MANIFEST = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<manifest:manifest xmlns:manifest="urn:oasis:names:tc:opendocument:xmlns:manifest:1.0" '
+    'manifest:version="1.2">'
+    '<manifest:file-entry manifest:full-path="/" manifest:version="1.2" '
+    'manifest:media-type="application/vnd.oasis.opendocument.spreadsheet"/>'
+    '<manifest:file-entry manifest:full-path="content.xml" manifest:media-type="text/xml"/>'
+    '</manifest:manifest>')
+_SPACES = re.compile(r'^ | {2,}|\t')
+
+
+def _ods_paragraph(line: str) -> str:
+    """Escape one line as text:p content, encoding leading, repeated spaces and tabs."""
+    def replace(match):
+        run = match.group()
+        if run == '\t':
+            return '<text:tab/>'
+        if match.start() == 0:
+            return f'<text:s text:c="{len(run)}"/>' if len(run) > 1 else '<text:s/>'
+        return ' ' + (f'<text:s text:c="{len(run) - 1}"/>' if len(run) > 2 else '<text:s/>')
+    return _SPACES.sub(replace, escape(line))
+
+
+def write_ods(path: str, rows: Iterable[Iterable]) -> int:
+    """Write ``rows`` to an ODS file with one table; returns the number of rows written."""
+    count = 0
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as archive:
+        # The mimetype must come first and be stored uncompressed
+        archive.writestr(zipfile.ZipInfo('mimetype'), 'application/vnd.oasis.opendocument.spreadsheet',
+                         compress_type=zipfile.ZIP_STORED)
+        archive.writestr('META-INF/manifest.xml', _ODS_MANIFEST)
+        with archive.open('content.xml', 'w', force_zip64=True) as stream:
+            out = _ChunkedWriter(stream)
+            out.write('<?xml version="1.0" encoding="UTF-8"?>\n'
+                      f'<office:document-content xmlns:office="{_OFFICE_NS}" xmlns:table="{_TABLE_NS}" '
+                      f'xmlns:text="{_TEXT_NS}" office:version="1.2"><office:body><office:spreadsheet>'
+                      f'<table:table table:name={quoteattr("Credits")}>')
+            for count, row in enumerate(rows, 1):
+                out.write('<table:table-row>')
+                blanks = 0
+                for value in row:
+                    if value == '' or value is None:
+                        blanks += 1
+                        continue
+                    if blanks:
+                        out.write(f'<table:table-cell table:number-columns-repeated="{blanks}"/>'
+                                  if blanks > 1 else '<table:table-cell/>')
+                        blanks = 0
+                    paragraphs = ''.join(f'<text:p>{_ods_paragraph(line)}</text:p>'
+                                         for line in _text(value).split('\n'))
+                    out.write(f'<table:table-cell office:value-type="string">{paragraphs}</table:table-cell>')
+                out.write('</table:table-row>')
+            out.write('</table:table></office:spreadsheet></office:body></office:document-content>')
+            out.flush()
+    return count
+
+
+def write_rows(path: str, rows: Iterable[Iterable]) -> int:
+    """Write rows to an ODS or XLSX file, chosen by suffix."""
+    if path.lower().endswith(ODS_SUFFIX):
+        return write_ods(path, rows)
+    if path.lower().endswith(XLSX_SUFFIX):
+        return write_xlsx(path, rows)
+    raise ValueError(f"Not an ODS or XLSX file: {path}")
@@ -3,15 +3,61 @@ Enhanced spreadsheet widget for CredGen with styling dropdown support and cell r
 """
 
 import csv
+from collections.abc import Sequence
+from functools import partial
 from PyQt5.QtWidgets import (
-    QWidget, QTableWidget, QTableWidgetItem, QVBoxLayout, QHBoxLayout,
-    QComboBox, QHeaderView, QAbstractItemView, QPushButton, QMessageBox,
-    QDialog, QListWidget, QDialogButtonBox, QLabel, QCheckBox, QApplication
+    QWidget, QVBoxLayout, QHBoxLayout, QComboBox, QHeaderView,
+    QAbstractItemView, QPushButton, QMessageBox, QDialog, QApplication, QSplitter
 )
-from PyQt5.QtCore import Qt, pyqtSignal, QMimeData
-from PyQt5.QtGui import QColor, QFont, QDrag, QPalette, QClipboard
-from widgets.style_combobox import StyleComboBox
+from PyQt5.QtCore import (
+    Qt, pyqtSignal, QPersistentModelIndex, QItemSelection, QItemSelectionModel, QTimer
+)
+from PyQt5.QtGui import QClipboard
 from dialogs.reorder_dialog import CellReorderDialog
+from duplicate_index import DuplicateIndex
+from casing import LetterCasing, NAME_SLOTS
+from column_schema import ColumnSchema
+from bulk_edits import fill_down_cells, fill_value_cells, infer_series, series_cells
+from filter_index import BitmapFilterIndex
+from filter_proxy_model import FilterProxyModel
+from sqlite_store import SqliteRowStore
+from selection_ranges import (
+    selection_rects, row_intervals, column_intervals, interval_length,
+    cell_count, iter_cells, iter_row_columns
+)
+from style_usage import StyleUsageIndex
+from thumbnail_cache import ThumbnailCache
+from table_model import CreditsTableModel
+from widgets.column_sizer import ColumnSizer
+from widgets.credits_table_view import CreditsTableView
+from widgets.style_delegate import StyleComboDelegate
+from widgets.plugin_delegate import PluginColumnDelegate
+from widgets.table_pane import TablePane
+from widgets.thumbnail_delegate import ThumbnailDelegate
+
+
+class _CsvRows(Sequence):
+    """Header rows followed by the table rows, indexed and iterated without copying the table."""
+
+    def __init__(self, head, rows):
+        self.head = head
+        self.rows = rows
+
+    def __len__(self):
+        return len(self.head) + len(self.rows)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if index < len(self.head):
+            return self.head[index]
+        return self.rows[index - len(self.head)]
+
+    def __iter__(self):
+        yield from self.head
+        yield from self.rows
 
 
 class SpreadsheetWidget(QWidget):
@@ -19,29 +65,71 @@ class SpreadsheetWidget(QWidget):
     Enhanced spreadsheet widget with styling support, cell reordering, and undo/redo integration.
     Designed for extensibility and accessibility.
     """
-    
+
     data_changed = pyqtSignal()
     selection_changed = pyqtSignal()
-    
+
+    # Reordering more cells than this through a list dialog is not practical
+    MAX_REORDER_CELLS = 2000
+    # Distinct style values listed per column in the selection summary
+    SUMMARY_VALUES = 3
+    # Above this many changed cells, rescan columns instead of tracking each value
+    SIZER_RESCAN_CELLS = 20000
+    BODY_COLUMN_WIDTH = 320
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.styling_data = None
         # Keep the first data row hidden in the viewer if present
         self.hidden_first_row = None
-        # Column definitions - only define static properties here
-        self.special_columns = {
-            '@Content Style': {'type': 'content', 'col': 4},
-            '@Page Style': {'type': 'page', 'col': 7},
-            '@Break Harmonization': {'type': 'harmonization', 'col': 5},
-            '@Spine Position': {'type': 'spine', 'col': 6},
-            '@Vertical Gap': {'type': 'gap', 'col': 3},
-            '@Page Runtime': {'type': 'runtime', 'col': 8},
-            '@Page Gap': {'type': 'gap', 'col': 9}
-        }
-        
+        # Column roles by header; ``columns`` is compiled from the headers whenever they change
+        self.column_schema = ColumnSchema()
+        self.columns = self.column_schema.compile([])
+        # Letter style casing for the "as rendered" preview; content style per row, computed on demand
+        self.casing = LetterCasing()
+        self._name_slots = []
+        self._row_content_styles = None
+        # Name index backing the duplicate finder, kept in sync with the table
+        self.duplicate_index = DuplicateIndex()
+        # Reverse index of style references, backing usage counts and bulk renames
+        self.style_usage = StyleUsageIndex()
+        # Per-value row bitmaps of the style columns, backing filter views
+        self.filter_index = BitmapFilterIndex()
+        # Row indexes updated from model notifications
+        self.row_indexes = (self.duplicate_index, self.style_usage, self.filter_index)
+        # Rows marked by "Cut Rows", waiting to be moved by "Insert Cut Rows"
+        self.cut_row_blocks = []
+
+        self.model = CreditsTableModel(self)
+        self.style_delegate = StyleComboDelegate(self.style_items, self)
+        # Every view of the model (main table, split pane, extra windows); commands act on the focused one
+        self.views = []
+        self.active_view = None
+        self.split_pane = None
+        # Per view: its thumbnail delegate and its (clauses, match_all) row filter
+        self.thumbnail_delegates = {}
+        self.view_filters = {}
+        self._view_filter_slots = {}
+        # Thumbnails of {{Pic}}/{{Video}} references, rendered off the GUI thread
+        self.thumbnail_cache = ThumbnailCache(self)
+        self.project_folder = None
+        # Column types contributed by plugins (see plugin_registry.py)
+        self.plugin_registry = None
+        self._plugin_delegates = {}
+        # Coalesce selection changes while dragging a selection
+        self._selection_timer = QTimer(self)
+        self._selection_timer.setSingleShot(True)
+        self._selection_timer.setInterval(30)
+        self._selection_timer.timeout.connect(self.selection_changed.emit)
+        # Columns whose longest strings changed, re-measured after edits settle
+        self._pending_size_columns = set()
+        self._size_timer = QTimer(self)
+        self._size_timer.setSingleShot(True)
+        self._size_timer.setInterval(200)
+        self._size_timer.timeout.connect(self.resize_pending_columns)
         self.init_ui()
         self.setup_connections()
-        
+
     def init_ui(self):
         """Initialize the widget UI."""
         layout = QVBoxLayout(self)
@@ -50,29 +138,132 @@ class SpreadsheetWidget(QWidget):
         control_panel = self.create_control_panel()
         layout.addWidget(control_panel)
 
-        # Create table widget
-        self.table = QTableWidget()
-        self.table.setAlternatingRowColors(True)
-        self.table.setSelectionBehavior(QAbstractItemView.SelectItems)
-        self.table.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        # Main table view; a split pane can be added below it
+        self.table = self.create_view()
+        self.thumbnail_delegate = self.thumbnail_delegates[self.table]
+        self.active_view = self.table
+        self.splitter = QSplitter(Qt.Vertical)
+        self.splitter.addWidget(self.table)
+        layout.addWidget(self.splitter)
+        self.column_sizer = ColumnSizer(self.table)
+        # Other views follow the main table's column widths
+        self.table.horizontalHeader().sectionResized.connect(self.on_section_resized)
+
+    def create_view(self):
+        """Create a table view of the shared model, with its own scroll position and selection."""
+        # Drag and drop moves row blocks
+        view = CreditsTableView()
+        view.setModel(self.model)
+        view.setAlternatingRowColors(True)
+        view.setSelectionBehavior(QAbstractItemView.SelectItems)
+        view.setSelectionMode(QAbstractItemView.ExtendedSelection)
         # Keep rows compact
-        self.table.setWordWrap(False)
+        view.setWordWrap(False)
         # Elide long text instead of expanding columns
-        self.table.setTextElideMode(Qt.ElideRight)
+        view.setTextElideMode(Qt.ElideRight)
+        # Set initial sizing behavior
+        view.horizontalHeader().setStretchLastSection(True)
+        # Make rows a fixed, shorter height
+        view.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        view.verticalHeader().setDefaultSectionSize(24)
+        view.verticalHeader().setMinimumSectionSize(20)
+        self.thumbnail_delegates[view] = ThumbnailDelegate(self.thumbnail_cache, view)
+        view.selectionModel().selectionChanged.connect(self.on_selection_changed)
+        view.rows_dropped.connect(self.move_selected_rows_to)
+        # Connected after setModel, so the view's header has already shifted its hidden rows
+        slots = (partial(self.on_view_rows_inserted, view), partial(self.on_view_rows_moved, view))
+        self.model.rowsInserted.connect(slots[0])
+        self.model.rowsMoved.connect(slots[1])
+        self._view_filter_slots[view] = slots
+        if self.views:
+            self.thumbnail_delegates[view].set_enabled(self.thumbnail_delegate.enabled)
+            for col in range(self.model.columnCount()):
+                view.setColumnWidth(col, self.table.columnWidth(col))
+        self.views.append(view)
+        self._install_delegates(view)
+        return view
+
+    def remove_view(self, view):
+        """Forget a view created by create_view (before it is deleted)."""
+        if view is self.table or view not in self.views:
+            return
+        self.views.remove(view)
+        self.thumbnail_delegates.pop(view, None)
+        self.view_filters.pop(view, None)
+        slots = self._view_filter_slots.pop(view, None)
+        if slots is not None:
+            self.model.rowsInserted.disconnect(slots[0])
+            self.model.rowsMoved.disconnect(slots[1])
+        if self.active_view is view:
+            self.active_view = self.table
+            self.selection_changed.emit()
+
+    def set_split(self, enabled):
+        """Show or hide a second pane below the main table, scrolled to the end of the roll."""
+        if enabled and self.split_pane is None:
+            self.split_pane = TablePane(self)
+            self.splitter.addWidget(self.split_pane)
+            self.split_pane.view.scrollToBottom()
+        elif not enabled and self.split_pane is not None:
+            pane, self.split_pane = self.split_pane, None
+            self.remove_view(pane.view)
+            pane.deleteLater()
+
+    def on_focus_changed(self, old, now):
+        # Commands and the selection summary follow the view with keyboard focus
+        while now is not None and now not in self.views:
+            now = now.parentWidget()
+        if now is not None and now is not self.active_view:
+            self.active_view = now
+            self.selection_changed.emit()
+
+    def on_section_resized(self, col, old_size, size):
+        for view in self.views[1:]:
+            view.setColumnWidth(col, size)
+
+    def set_view_filter(self, view, clauses, match_all=True):
+        """
+        Hide the rows of ``view`` not matching filter clauses (see
+        filter_index); no clauses shows all. The filter follows later edits,
+        inserts and moves, and survives resets that keep its columns.
+        """
+        if clauses:
+            headers = self.model.headers()
+            self.view_filters[view] = (list(clauses), match_all, [headers[col] for col, _, _ in clauses])
+        else:
+            self.view_filters.pop(view, None)
+        self.apply_view_filter(view)
 
-        # Enable drag and drop for reordering
-        self.table.setDragDropMode(QAbstractItemView.InternalMove)
-        self.table.setDefaultDropAction(Qt.MoveAction)
+    def apply_view_filter(self, view, rows=None):
+        """
+        Show or hide the rows of ``view`` according to its filter: every row
+        from one index query, or only ``rows`` tested one by one after they
+        changed. Only rows whose visibility changes are touched.
+        """
+        entry = self.view_filters.get(view)
+        if entry is None:
+            shown = None
+        elif rows is None:
+            shown = set(self.filter_index.matching_rows(entry[0], entry[1])).__contains__
+        else:
+            shown = partial(self.filter_index.row_matches, clauses=entry[0], match_all=entry[1])
+        changed = []
+        for row in range(self.model.rowCount()) if rows is None else rows:
+            hidden = shown is not None and not shown(row)
+            if view.isRowHidden(row) != hidden:
+                changed.append((row, hidden))
+        if not changed:
+            return
+        view.setUpdatesEnabled(False)
+        for row, hidden in changed:
+            view.setRowHidden(row, hidden)
+        view.setUpdatesEnabled(True)
 
-        layout.addWidget(self.table)
+    def refresh_view_filters(self, rows=None):
+        """Re-apply the view filters to ``rows`` (all by default) after they changed."""
+        for view in list(self.view_filters):
+            self.apply_view_filter(view, rows)
 
-        # Set initial sizing behavior
-        self.table.horizontalHeader().setStretchLastSection(True)
-        # Make rows a fixed, shorter height
-        self.table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
-        self.table.verticalHeader().setDefaultSectionSize(24)
-        self.table.verticalHeader().setMinimumSectionSize(20)
-        
     def create_control_panel(self):
         """Create the control panel with action buttons."""
         panel = QWidget()
@@ -90,380 +281,572 @@ class SpreadsheetWidget(QWidget):
 
         layout.addStretch()
         return panel
-        
+
     def setup_connections(self):
         """Setup signal-slot connections."""
-        self.table.itemChanged.connect(self.on_item_changed)
-        self.table.itemSelectionChanged.connect(self.on_selection_changed)
-        
+        self.model.cells_written.connect(self.on_cells_written)
+        self.model.rowsInserted.connect(self.on_rows_inserted)
+        self.model.rowsRemoved.connect(self.on_rows_removed)
+        self.model.rowsMoved.connect(self.on_rows_moved)
+        self.model.modelReset.connect(self.on_model_reset)
+        QApplication.instance().focusChanged.connect(self.on_focus_changed)
+
     def load_data(self, csv_data, styling_data=None):
-        """Load CSV data into the table."""
-        print(f"Loading data into spreadsheet. Received {len(csv_data) if csv_data else 0} rows")
+        """
+        Load CSV data into the table. ``csv_data`` can also be an iterator
+        (e.g. FileManager.iter_csv), which database storage consumes without
+        holding all rows in memory.
+        """
+        print(f"Loading data into spreadsheet. Received {len(csv_data) if isinstance(csv_data, list) else 'streamed'} rows")
         self.styling_data = styling_data or {}
+        self.casing = LetterCasing(getattr(styling_data, 'document', None))
 
-        if not csv_data:
+        # Expect first row as headers; data follows
+        data_rows = iter(csv_data or ())
+        headers = next(data_rows, None)
+        if headers is None:
             print("No CSV data provided")
             return
 
-        # Block signals temporarily to prevent unnecessary updates
-        self.table.blockSignals(True)
-
-        try:
-            # Expect first row as headers; data follows
-            headers = csv_data[0]
-            data_rows = csv_data[1:] if len(csv_data) > 1 else []
-            # Per request: ignore the first data row in the viewer (but preserve it)
-            self.hidden_first_row = None
-            if data_rows:
-                print("Ignoring first data row in viewer")
-                self.hidden_first_row = data_rows[0]
-                data_rows = data_rows[1:]
-            # Set table dimensions
-            self.table.setRowCount(len(data_rows))
-            self.table.setColumnCount(len(headers))
-            print(f"Set table dimensions: {len(csv_data)} rows x {len(csv_data[0]) if csv_data else 0} columns")
-
-            # Set headers if first row contains headers
-            print(f"Setting headers: {headers}")
-            self.table.setHorizontalHeaderLabels(headers)
-
-            # Populate table
-            print(f"Populating {len(data_rows)} data rows")
-            for row_idx, row_data in enumerate(data_rows):
-                for col_idx, cell_value in enumerate(row_data):
-                    header_item = self.table.horizontalHeaderItem(col_idx)
-                    if header_item:
-                        column_name = header_item.text()
-                        if column_name in self.special_columns:
-                            # Create combo box for special columns
-                            combo = self.create_style_combo(column_name)
-                            # Set the current value
-                            index = combo.findText(str(cell_value))
-                            if index >= 0:
-                                combo.setCurrentIndex(index)
-                            combo.setToolTip(str(cell_value))
-                            self.table.setCellWidget(row_idx, col_idx, combo)
-                        else:
-                            text = str(cell_value)
-                            item = QTableWidgetItem(text)
-                            # Show full text on hover when elided
-                            item.setToolTip(text)
-                            self.table.setItem(row_idx, col_idx, item)
-
-        except Exception as e:
-            print(f"Error loading data into spreadsheet: {str(e)}")
-            raise
-        finally:
-            # Re-enable signals
-            self.table.blockSignals(False)
-
-        # Resize and clamp column sizes
-        self.adjust_column_sizes()
+        # Per request: ignore the first data row in the viewer (but preserve it)
+        self.hidden_first_row = next(data_rows, None)
+        if self.hidden_first_row is not None:
+            print("Ignoring first data row in viewer")
+        self.cut_row_blocks = []
+        # Resetting the model also re-sizes the columns
+        self.model.set_table(headers, data_rows)
+        print(f"Set {self.model.rowCount()} rows x {len(headers)} columns: {headers}")
+        self.setup_special_columns()
+
+    def set_database_storage(self, enabled: bool) -> None:
+        """Keep the table rows in a SQLite database (for very large rolls) or in memory."""
+        if enabled == (self.model.store is not None):
+            return
+        self.model.set_store(SqliteRowStore() if enabled else None)
 
     def adjust_column_sizes(self):
-        """Auto-size columns, then clamp @Body to a reasonable width."""
+        """Auto-size columns from a sample of their contents, then clamp @Body to a reasonable width."""
         try:
-            self.table.resizeColumnsToContents()
-            # Find @Body column
-            body_index = -1
-            for col in range(self.table.columnCount()):
-                header_item = self.table.horizontalHeaderItem(col)
-                if header_item and header_item.text().strip() == '@Body':
-                    body_index = col
-                    break
+            headers = self.model.headers()
+            self._size_timer.stop()
+            self._pending_size_columns.clear()
+            self.column_sizer.resize_columns(headers, self.model.rows(), force=True)
+            body_index = self.body_column()
             if body_index >= 0:
-                from PyQt5.QtWidgets import QHeaderView as _QHV
                 header = self.table.horizontalHeader()
-                header.setSectionResizeMode(body_index, _QHV.Interactive)
-                max_width = 320  # clamp width for readability
-                self.table.setColumnWidth(body_index, max_width)
+                header.setSectionResizeMode(body_index, QHeaderView.Interactive)
+                # clamp width for readability
+                self.table.setColumnWidth(body_index, self.BODY_COLUMN_WIDTH)
         except Exception as e:
             print(f"adjust_column_sizes error: {e}")
 
+    def body_column(self):
+        """Return the index of the @Body column, or -1."""
+        return self.columns.column_of('body')
+
+    def resize_pending_columns(self):
+        """Widen columns whose longest strings grew since they were last measured."""
+        body_index = self.body_column()
+        columns = sorted(c for c in self._pending_size_columns
+                         if c != body_index and c < self.model.columnCount())
+        self._pending_size_columns.clear()
+        if columns:
+            self.column_sizer.resize_columns(self.model.headers(), self.model.rows(), columns, grow_only=True)
+
     def set_cell_value(self, row, col, value):
-        """Set cell value with appropriate widget type."""
-        header_text = self.table.horizontalHeaderItem(col)
-        column_name = header_text.text() if header_text else ""
-
-        # Check if this is a special styling column
-        if column_name in self.special_columns:
-            combo = self.create_style_combo(column_name)
-            current_index = combo.findText(str(value))
-            if current_index >= 0:
-                combo.setCurrentIndex(current_index)
-            self.table.setCellWidget(row, col, combo)
-        else:
-            text = str(value) if value is not None else ""
-            item = QTableWidgetItem(text)
-            item.setToolTip(text)
-            self.table.setItem(row, col, item)
+        """Set a cell value as one undoable edit."""
+        self.model.set_values([(row, col, value)])
+
+    def cell_value(self, row, col):
+        """Return the text of a cell."""
+        return self.model.value(row, col)
+
+    def select_cell(self, row, col):
+        """Make (row, col) the current cell and scroll it into view."""
+        if 0 <= row < self.model.rowCount() and 0 <= col < self.model.columnCount():
+            index = self.model.index(row, col)
+            self.active_view.setCurrentIndex(index)
+            self.active_view.scrollTo(index, QAbstractItemView.PositionAtCenter)
+
+    def select_style_usages(self, table, name):
+        """Select every cell referencing a style; returns the number of cells."""
+        cells = self.style_usage.usages(table, name)
+        selection = QItemSelection()
+        # One range per run of consecutive rows in a column
+        runs = []
+        for row, col in sorted(cells, key=lambda cell: (cell[1], cell[0])):
+            if runs and runs[-1][1] == col and runs[-1][2] == row - 1:
+                runs[-1][2] = row
+            else:
+                runs.append([row, col, row])
+        for first, col, last in runs:
+            selection.select(self.model.index(first, col), self.model.index(last, col))
+        selection_model = self.active_view.selectionModel()
+        selection_model.select(selection, QItemSelectionModel.ClearAndSelect)
+        if cells:
+            index = self.model.index(*cells[0])
+            selection_model.setCurrentIndex(index, QItemSelectionModel.NoUpdate)
+            self.active_view.scrollTo(index, QAbstractItemView.PositionAtCenter)
+        return len(cells)
+
+    def rename_style(self, table, old, new):
+        """
+        Rename every reference to a style in the table. The edit is applied
+        but not recorded; returns its command (None if no cell changed) for
+        the caller to record together with the styling file change.
+        """
+        edits = self.style_usage.rename_edits(table, old, new, self.model.rows())
+        return self.model.set_values(edits, f"Rename Style \"{old}\"", record=False)
+
+    def style_items(self, col):
+        """Return the dropdown items for a styling column."""
+        items = ['']  # Always start with an empty option
+        if self.styling_data and self.columns.is_style_column(col):
+            items.extend(self.styling_data.get(self.columns.items_keys[col], []))
+        return items
 
     def create_style_combo(self, column_name):
         """Create a style combo box for the specified column."""
         combo = QComboBox()
         combo.setEditable(True)
         combo.setInsertPolicy(QComboBox.NoInsert)
-        
-        items = ['']  # Always start with an empty option
-        
-        if self.styling_data:
-            style_type = self.special_columns[column_name]['type']
-            
-            if style_type == 'content':
-                items.extend(self.styling_data.get('content_styles', []))
-            elif style_type == 'page':
-                items.extend(self.styling_data.get('page_styles', []))
-            elif style_type == 'harmonization':
-                items.extend(self.styling_data.get('harmonization_values', []))
-            elif style_type == 'spine':
-                items.extend(self.styling_data.get('spine_positions', []))
-            elif style_type == 'gap':
-                items.extend(self.styling_data.get('gaps', []))
-            elif style_type == 'runtime':
-                items.extend(self.styling_data.get('runtimes', []))
-                
-        combo.addItems(items)
-        combo.currentTextChanged.connect(self.on_combo_changed)
+        combo.addItems(self.style_items(self.model.column_of(column_name)))
         return combo
 
+    def compile_columns(self):
+        """Resolve the current headers (and plugin column types) into ``columns``."""
+        self.columns = self.column_schema.compile(self.model.headers(), self.plugin_registry)
+        self._name_slots = [NAME_SLOTS.get(header) for header in self.columns.canonical_headers]
+        self._row_content_styles = None
+
     def setup_special_columns(self):
-        """Setup special columns with appropriate widgets."""
-        for col in range(self.table.columnCount()):
-            header_text = self.table.horizontalHeaderItem(col)
-            if header_text and header_text.text() in self.special_columns:
-                # Set up dropdown for each row in this column
-                for row in range(self.table.rowCount()):
-                    existing_value = ""
-                    existing_item = self.table.item(row, col)
-                    if existing_item:
-                        existing_value = existing_item.text()
-                    self.set_cell_value(row, col, existing_value)
-                    
+        """Install the dropdown delegate on styling columns and the default one elsewhere."""
+        self.compile_columns()
+        for view in self.views:
+            self._install_delegates(view)
+
+    def _install_delegates(self, view):
+        columns = self.columns
+        body = columns.column_of('body')
+        for col in range(len(columns)):
+            delegate = self.style_delegate if columns.is_style_column(col) else None
+            if col == body:
+                delegate = self.thumbnail_delegates[view]
+            # A plugin column type takes over its columns
+            column_type = columns.plugin_types[col]
+            if column_type is not None:
+                delegate = self._plugin_delegates.get(id(column_type))
+                if delegate is None:
+                    delegate = PluginColumnDelegate(self.plugin_registry, column_type, self.table)
+                    self._plugin_delegates[id(column_type)] = delegate
+            view.setItemDelegateForColumn(col, delegate)
+        view.viewport().update()
+
+    def set_plugin_registry(self, registry):
+        self.plugin_registry = registry
+        self._plugin_delegates = {}
+        self.setup_special_columns()
+
+    def set_project_folder(self, folder):
+        """Resolve {{Pic}} and {{Video}} references against ``folder`` (None for no project)."""
+        self.project_folder = folder
+        self.thumbnail_cache.set_project(folder, self.styling_data)
+        for view in self.views:
+            view.viewport().update()
+
+    def set_thumbnails_visible(self, visible):
+        for delegate in self.thumbnail_delegates.values():
+            delegate.set_enabled(visible)
+
+    def set_rendered_preview(self, enabled):
+        """Show @Head/@Body/@Tail cells with the casing of their letter styles (editing shows the raw text)."""
+        self.model.display_text = self.rendered_text if enabled else None
+        for view in self.views:
+            view.viewport().update()
+
+    def rendered_text(self, row, col, value):
+        slot = self._name_slots[col] if col < len(self._name_slots) else None
+        if slot is None or not value:
+            return value
+        styles = self._row_content_styles
+        if styles is None:
+            styles = self._row_content_styles = LetterCasing.row_content_styles(
+                self.columns.canonical_headers, self.model.rows())
+        return self.casing.render(value, self.casing.letter_style(styles[row], slot))
+
+    def check_casing(self):
+        """Render all @Head/@Body/@Tail cells; see LetterCasing.check."""
+        return self.casing.check(self.columns.canonical_headers, self.model.rows())
+
+    def create_filter_proxy(self, parent=None):
+        """Return a proxy model over the table that shows the rows matching a filter."""
+        return FilterProxyModel(self.model, self.filter_index, parent)
+
     def update_styling_data(self, styling_data):
-        """Update styling data and refresh dropdowns."""
+        """Update styling data; dropdowns read it when they are next opened."""
         self.styling_data = styling_data
-        
-        # Update all existing combo boxes
-        for col in range(self.table.columnCount()):
-            header_item = self.table.horizontalHeaderItem(col)
-            if header_item:
-                column_name = header_item.text()
-                if column_name in self.special_columns:
-                    # Update combo boxes for each row in this column
-                    for row in range(self.table.rowCount()):
-                        widget = self.table.cellWidget(row, col)
-                        if isinstance(widget, QComboBox):
-                            current_value = widget.currentText()
-                            # Create new combo with updated data
-                            new_combo = self.create_style_combo(column_name)
-                            # Try to restore the previous value
-                            index = new_combo.findText(current_value)
-                            if index >= 0:
-                                new_combo.setCurrentIndex(index)
-                            self.table.setCellWidget(row, col, new_combo)
+        self.casing = LetterCasing(getattr(styling_data, 'document', None))
+        # Picture style names can be used as {{Pic}} references
+        self.thumbnail_cache.set_project(self.project_folder, styling_data)
+        for view in self.views:
+            view.viewport().update()
+
+    def get_headers(self):
+        """Return the current column header texts."""
+        return self.model.headers()
 
     def get_csv_data(self, include_headers: bool = True):
         """Get current table data as CSV-compatible list.
         By default includes the header row as the first row so downstream loaders
         can treat headers properly and not display them as data.
         """
-        data = []
+        return [row[:] for row in self.iter_rows(include_headers)]
+
+    def csv_rows(self):
+        """
+        The rows get_csv_data returns as a read-only sequence over the live
+        table, for saving a database-backed table without copying it.
+        """
+        head = [self.get_headers()]
+        if self.hidden_first_row is not None:
+            head.append([str(v) for v in self.hidden_first_row])
+        return _CsvRows(head, self.model.rows())
 
-        # Optionally include headers as the first row
+    def iter_rows(self, include_headers: bool = True):
+        """Yield the rows get_csv_data returns without copying them, for streaming exports."""
         if include_headers:
-            headers = []
-            for col in range(self.table.columnCount()):
-                header_item = self.table.horizontalHeaderItem(col)
-                headers.append(header_item.text() if header_item else "")
-            data.append(headers)
-
-        # Re-insert hidden first row (if any) right after headers
-        if include_headers and self.hidden_first_row is not None:
-            data.append([str(v) for v in self.hidden_first_row])
-
-        # Add table body rows
-        for row in range(self.table.rowCount()):
-            row_data = []
-            for col in range(self.table.columnCount()):
-                widget = self.table.cellWidget(row, col)
-                if isinstance(widget, QComboBox):
-                    row_data.append(widget.currentText())
-                else:
-                    item = self.table.item(row, col)
-                    row_data.append(item.text() if item else "")
-            data.append(row_data)
-        return data
+            yield self.get_headers()
+            # Re-insert hidden first row (if any) right after headers
+            if self.hidden_first_row is not None:
+                yield [str(v) for v in self.hidden_first_row]
+        yield from self.model.rows()
 
     def reorder_selected_cells(self):
         """Reorder selected cells using a dialog."""
-        selected = self.table.selectedIndexes()
-        if not selected:
+        rects = self.selection_rects()
+        if not rects:
             QMessageBox.information(self, "Info", "No cells selected to reorder.")
             return
-            
+        if cell_count(rects) > self.MAX_REORDER_CELLS:
+            QMessageBox.information(
+                self, "Info",
+                f"Select at most {self.MAX_REORDER_CELLS} cells to reorder, or move whole rows instead."
+            )
+            return
+
         # Collect selected cell data
-        cell_data = []
-        for idx in selected:
-            row, col = idx.row(), idx.column()
-            # Get value based on whether it's a combo box or regular cell
-            widget = self.table.cellWidget(row, col)
-            if isinstance(widget, QComboBox):
-                value = widget.currentText()
-            else:
-                item = self.table.item(row, col)
-                value = item.text() if item else ""
-            cell_data.append((row, col, value))
-            
+        rows = self.model.rows()
+        cell_data = [(row, col, rows[row][col]) for row, col in iter_cells(rects)]
+
         # Show reorder dialog
         dialog = CellReorderDialog(cell_data, self)
         if dialog.exec_() == QDialog.Accepted:
             reordered = dialog.get_reordered_data()
-            # Apply the reordered values according to new order
-            for (row, col, _), (_, _, value) in zip(cell_data, reordered):
-                self.set_cell_value(row, col, value)
-                
+            # Apply the reordered values according to new order as one edit
+            self.model.set_values(
+                [(row, col, value) for (row, col, _), (_, _, value) in zip(cell_data, reordered)],
+                "Reorder Cells"
+            )
+
+    def on_cells_written(self, cells):
+        """Keep indexes in sync with the (row, col, value) cells the model wrote."""
+        content_col = self.columns.column_of('content_style')
+        if self._row_content_styles is not None and any(col == content_col for _, col, _ in cells):
+            # Blank content styles inherit from above, so rows below may render differently now
+            self._row_content_styles = None
+            if self.model.display_text is not None:
+                for view in self.views:
+                    view.viewport().update()
+        for index in self.row_indexes:
+            columns = set(index.columns)
+            for row, col, value in cells:
+                if col in columns:
+                    index.set_cell(row, col, value)
+        if self.view_filters:
+            columns = set(self.filter_index.columns)
+            self.refresh_view_filters(sorted({row for row, col, _ in cells if col in columns}))
+        if len(cells) > self.SIZER_RESCAN_CELLS:
+            self.rescan_column_sizes({col for _, col, _ in cells})
+        else:
+            self.track_column_sizes(cells)
         self.data_changed.emit()
 
-    def on_combo_changed(self, value):
+    def track_column_sizes(self, cells):
+        """Note changed (row, col, value) cells with the column sizer and schedule resizes for columns that grew."""
+        for _, col, value in cells:
+            if self.column_sizer.note_value(col, value):
+                self._pending_size_columns.add(col)
+        if self._pending_size_columns:
+            self._size_timer.start()
+
+    def rescan_column_sizes(self, columns):
+        """Re-collect the longest strings of whole columns after large edits and schedule their resize."""
+        self.column_sizer.reset(self.model.headers(), self.model.rows(), columns)
+        self._pending_size_columns.update(columns)
+        self._size_timer.start()
+
+    def on_rows_inserted(self, parent, first, last):
+        self._row_content_styles = None
+        for index in self.row_indexes:
+            index.insert_rows(first, last - first + 1, self.model.rows()[first:last + 1])
+        columns = range(self.model.columnCount())
+        if (last - first + 1) * len(columns) > self.SIZER_RESCAN_CELLS:
+            self.rescan_column_sizes(columns)
+        else:
+            rows = self.model.rows()
+            self.track_column_sizes((row, col, rows[row][col]) for row in range(first, last + 1) for col in columns)
         self.data_changed.emit()
 
-    def on_item_changed(self, item):
-        """Handle item changed event from the table."""
+    def on_rows_removed(self, parent, first, last):
+        self._row_content_styles = None
+        for index in self.row_indexes:
+            index.remove_rows(first, last - first + 1)
         self.data_changed.emit()
 
-    def on_selection_changed(self):
+    def on_rows_moved(self, parent, start, end, destination, row):
+        self._row_content_styles = None
+        for index in self.row_indexes:
+            index.move_rows(start, end - start + 1, row)
+        self.data_changed.emit()
+
+    def on_view_rows_inserted(self, view, parent, first, last):
+        # The row indexes were updated by on_rows_inserted, connected before any view
+        if view in self.view_filters:
+            self.apply_view_filter(view, range(first, last + 1))
+
+    def on_view_rows_moved(self, view, parent, start, end, destination, row):
+        if view in self.view_filters:
+            self.apply_view_filter(view, range(min(start, row), max(end + 1, row)))
+
+    def on_model_reset(self):
+        self.compile_columns()
+        # Indexes match English header names, so localized tables are indexed by their canonical headers
+        for index in self.row_indexes:
+            index.rebuild(self.columns.canonical_headers, self.model.rows())
+        self.column_sizer.reset(self.model.headers(), self.model.rows())
+        self.adjust_column_sizes()
+        # Keep view filters whose columns are still there; panes sync their controls on the same reset
+        headers = self.model.headers()
+        for view, (clauses, _, names) in list(self.view_filters.items()):
+            if any(col not in self.filter_index.columns or col >= len(headers) or headers[col] != name
+                   for (col, _, _), name in zip(clauses, names)):
+                del self.view_filters[view]
+                self.apply_view_filter(view)
+        self.refresh_view_filters()
+
+    def on_selection_changed(self, *args):
         """Handle selection changed event from the table."""
-        self.selection_changed.emit()
+        self._selection_timer.start()
+
+    def selection_rects(self):
+        """Return the selection as (top, left, bottom, right) rectangles."""
+        return selection_rects(self.active_view.selectionModel().selection())
 
     def get_selection_info(self):
-        """Return a string describing the current selection."""
-        selected = self.table.selectedIndexes()
-        if not selected:
+        """Return a constant-size summary of the current selection."""
+        rects = self.selection_rects()
+        if not rects:
             return "None"
-        cells = [(idx.row()+1, idx.column()+1) for idx in selected]
-        return f"{len(cells)} cell(s) selected: {cells}"
+        rows = row_intervals(rects)
+        cols = column_intervals(rects)
+        parts = [
+            f"rows {rows[0][0] + 1}-{rows[-1][1] + 1} ({interval_length(rows)})",
+            f"cols {cols[0][0] + 1}-{cols[-1][1] + 1} ({interval_length(cols)})",
+            f"{cell_count(rects)} cell(s)",
+        ]
+        parts.extend(self._style_value_summary(rects))
+        return ", ".join(parts)
+
+    def _style_value_summary(self, rects):
+        """
+        Describe the distinct values of selected styling columns. The search
+        stops at SUMMARY_VALUES + 1 values, so the count of the rest is unknown.
+        """
+        store = self.model.store
+        headers = self.model.headers()
+        summary = []
+        for col in self.columns.style_columns():
+            header = headers[col]
+            spans = [(top, bottom) for top, left, bottom, right in rects if left <= col <= right]
+            if store is not None:
+                # One bounded query instead of reading every selected row
+                values = store.distinct_values(col, spans, self.SUMMARY_VALUES + 1)
+            else:
+                values = self._first_distinct_values(col, spans, self.SUMMARY_VALUES + 1)
+            if values:
+                shown = sorted(values)[:self.SUMMARY_VALUES]
+                more = " (+more)" if len(values) > len(shown) else ""
+                summary.append(f"{header}: {', '.join(shown)}{more}")
+        return summary
+
+    def _first_distinct_values(self, col, spans, limit):
+        """Return up to ``limit`` distinct non-empty values of a column within inclusive row spans."""
+        data = self.model.rows()
+        values = set()
+        for top, bottom in spans:
+            for row in range(top, bottom + 1):
+                value = data[row][col]
+                if value and value not in values:
+                    values.add(value)
+                    if len(values) >= limit:
+                        return values
+        return values
+
+    # Row moves
+    def selected_row_blocks(self):
+        """Return the rows covered by the selection as sorted (first, count) blocks."""
+        return [(start, end - start + 1) for start, end in row_intervals(self.selection_rects())]
+
+    def move_selected_rows_to(self, destination):
+        """Move the selected rows before ``destination`` as one undoable edit."""
+        blocks = self.selected_row_blocks()
+        if blocks:
+            self._move_blocks(blocks, destination)
+
+    def move_selected_rows(self, delta):
+        """Move the selected rows one row up (delta=-1) or down (delta=1)."""
+        blocks = self.selected_row_blocks()
+        if not blocks:
+            return
+        columns = self._selected_column_span()
+        if self.model.shift_row_blocks(blocks, delta):
+            self._select_blocks([(first + delta, count) for first, count in blocks], columns)
+
+    def cut_rows(self):
+        """Mark the selected rows to be moved by insert_cut_rows."""
+        self.cut_row_blocks = [
+            (QPersistentModelIndex(self.model.index(first, 0)), count)
+            for first, count in self.selected_row_blocks()
+        ]
+
+    def insert_cut_rows(self):
+        """Move the rows marked by cut_rows before the current row."""
+        blocks = [(index.row(), count) for index, count in self.cut_row_blocks if index.isValid()]
+        self.cut_row_blocks = []
+        if not blocks:
+            return
+        current = self.active_view.currentIndex()
+        destination = current.row() if current.isValid() else self.model.rowCount()
+        self._move_blocks(blocks, destination)
+
+    def _move_blocks(self, blocks, destination):
+        columns = self._selected_column_span()
+        moved = sum(count for _, count in blocks)
+        # Where the gathered rows start once everything above the drop point has moved
+        start = destination - sum(count for first, count in blocks if first + count <= destination)
+        if self.model.move_row_blocks(blocks, destination):
+            self._select_blocks([(start, moved)], columns)
+
+    def _selected_column_span(self):
+        columns = column_intervals(self.selection_rects())
+        if not columns:
+            return 0, max(0, self.model.columnCount() - 1)
+        return columns[0][0], columns[-1][1]
+
+    def _select_blocks(self, blocks, columns):
+        """Select the given row blocks over the column span after a move."""
+        selection = QItemSelection()
+        left, right = columns
+        for first, count in blocks:
+            selection.select(self.model.index(first, left), self.model.index(first + count - 1, right))
+        selection_model = self.active_view.selectionModel()
+        selection_model.select(selection, QItemSelectionModel.ClearAndSelect)
+        if blocks:
+            selection_model.setCurrentIndex(self.model.index(blocks[0][0], left), QItemSelectionModel.NoUpdate)
 
     def add_row(self):
         """Add a new row to the table."""
-        current_row_count = self.table.rowCount()
-        self.table.insertRow(current_row_count)
-        
-        for col in range(self.table.columnCount()):
-            header_item = self.table.horizontalHeaderItem(col)
-            if header_item:
-                column_name = header_item.text()
-                if column_name in self.special_columns:
-                    # Create combo box for special columns
-                    combo = self.create_style_combo(column_name)
-                    self.table.setCellWidget(current_row_count, col, combo)
-                else:
-                    self.table.setItem(current_row_count, col, QTableWidgetItem(""))
-        
-        self.data_changed.emit()
-        
+        self.model.insert_rows(self.model.rowCount(), [[]], "Add Row")
+
     def delete_row(self):
         """Delete the selected row(s) from the table."""
-        selected_rows = set(idx.row() for idx in self.table.selectedIndexes())
-        for row in sorted(selected_rows, reverse=True):
-            self.table.removeRow(row)
-            
-        self.data_changed.emit()
-        
+        self.model.remove_row_blocks(self.selected_row_blocks())
+
     def add_column(self):
         """Add a new column to the table."""
-        current_column_count = self.table.columnCount()
-        self.table.setColumnCount(current_column_count + 1)
-        
-        # Set header for the new column
-        self.table.setHorizontalHeaderItem(current_column_count, QTableWidgetItem(f"Column {current_column_count + 1}"))
-        
-        # Copy formatting from the last column if available
-        if current_column_count > 0:
-            for row in range(self.table.rowCount()):
-                item = self.table.item(row, current_column_count - 1)
-                if item:
-                    new_item = QTableWidgetItem(item)
-                    new_item.setFlags(item.flags() & ~Qt.ItemIsEditable)  # Make non-editable
-                    self.table.setItem(row, current_column_count, new_item)
-                
-                widget = self.table.cellWidget(row, current_column_count - 1)
-                if isinstance(widget, QComboBox):
-                    combo = QComboBox()
-                    combo.addItems([widget.itemText(i) for i in range(widget.count())])
-                    combo.setCurrentText(widget.currentText())
-                    combo.setEditable(True)
-                    combo.setInsertPolicy(QComboBox.NoInsert)
-                    self.table.setCellWidget(row, current_column_count, combo)
-        
-        self.data_changed.emit()
-        
+        headers = self.model.headers()
+        name = f"Column {len(headers) + 1}"
+        # Copy values from the last column if available
+        rows = [row + [row[-1] if row else ""] for row in self.model.rows()]
+        self.model.replace_table_recorded(headers + [name], rows, "Add Column")
+        self.setup_special_columns()
+
     def delete_column(self):
         """Delete the selected column(s) from the table."""
-        selected_columns = set(idx.column() for idx in self.table.selectedIndexes())
-        for col in sorted(selected_columns, reverse=True):
-            self.table.removeColumn(col)
-            
-        self.data_changed.emit()
+        selected_columns = set()
+        for start, end in column_intervals(self.selection_rects()):
+            selected_columns.update(range(start, end + 1))
+        if not selected_columns:
+            return
+        keep = [c for c in range(self.model.columnCount()) if c not in selected_columns]
+        headers = self.model.headers()
+        rows = [[row[c] for c in keep] for row in self.model.rows()]
+        self.model.replace_table_recorded([headers[c] for c in keep], rows, "Delete Column")
+        self.setup_special_columns()
 
     def clear_data(self):
         """Clear all table data."""
-        self.table.clear()
-        self.table.setRowCount(0)
-        self.table.setColumnCount(0)
+        self.model.set_table([], [])
         self.styling_data = None
         self.hidden_first_row = None
+        self.cut_row_blocks = []
+
+    # Bulk edits of the selection, each applied as one undo entry
+    def fill_down(self):
+        return self.model.set_values(fill_down_cells(self.model.rows(), self.selection_rects()), "Fill Down")
+
+    def fill_value(self, value):
+        return self.model.set_values(fill_value_cells(self.selection_rects(), value), "Fill Value")
+
+    def series_defaults(self):
+        """Return the (start, step) suggested for fill_series from the selected cells."""
+        return infer_series(self.model.rows(), self.selection_rects())
+
+    def fill_series(self, start, step):
+        return self.model.set_values(series_cells(self.selection_rects(), start, step), "Fill Series")
+
+    def clear_cells(self):
+        return self.model.set_values(fill_value_cells(self.selection_rects(), ""), "Clear Cells")
 
     # Clipboard operations
     def copy(self):
-        selected = self.table.selectedIndexes()
-        if not selected:
+        rects = self.selection_rects()
+        if not rects:
             return
-        # Group by rows
-        selected.sort(key=lambda x: (x.row(), x.column()))
-        rows = {}
-        for idx in selected:
-            rows.setdefault(idx.row(), {})[idx.column()] = idx
-        lines = []
-        for r in sorted(rows.keys()):
-            cols = rows[r]
-            line_vals = []
-            for c in sorted(cols.keys()):
-                idx = cols[c]
-                widget = self.table.cellWidget(idx.row(), idx.column())
-                if isinstance(widget, QComboBox):
-                    line_vals.append(widget.currentText())
-                else:
-                    item = self.table.item(idx.row(), idx.column())
-                    line_vals.append(item.text() if item else "")
-            lines.append("\t".join(line_vals))
+        data = self.model.rows()
+        if len(rects) == 1:
+            # Common case: one rectangle, sliced straight from the row lists
+            top, left, bottom, right = rects[0]
+            lines = ["\t".join(row[left:right + 1]) for row in data[top:bottom + 1]]
+        else:
+            lines = ["\t".join(data[r][c] for c in cols) for r, cols in iter_row_columns(rects)]
         QApplication.clipboard().setText("\n".join(lines), mode=QClipboard.Clipboard)
 
     def cut(self):
         self.copy()
         # After copying, clear selected cells
-        for idx in self.table.selectedIndexes():
-            self.set_cell_value(idx.row(), idx.column(), "")
-        self.data_changed.emit()
+        self.model.set_values(fill_value_cells(self.selection_rects(), ""), "Cut")
 
     def paste(self):
         text = QApplication.clipboard().text(QClipboard.Clipboard)
         if not text:
             return
-        start_indexes = self.table.selectedIndexes()
-        if not start_indexes:
+        rects = self.selection_rects()
+        if not rects:
             return
-        start_row = min(idx.row() for idx in start_indexes)
-        start_col = min(idx.column() for idx in start_indexes)
+        start_row = min(rect[0] for rect in rects)
+        start_col = min(rect[1] for rect in rects)
         rows = text.splitlines()
+        cells = []
         for r, line in enumerate(rows):
             values = line.split("\t")
             for c, val in enumerate(values):
                 row = start_row + r
                 col = start_col + c
-                if row < self.table.rowCount() and col < self.table.columnCount():
-                    self.set_cell_value(row, col, val)
-        self.data_changed.emit()
-        
+                if row < self.model.rowCount() and col < self.model.columnCount():
+                    cells.append((row, col, val))
+        self.model.set_values(cells, "Paste")
+
     def create_new_project(self):
         """Create a new empty project structure."""
         # Create basic CredGen structure
@@ -472,20 +855,18 @@ class SpreadsheetWidget(QWidget):
             "@Break Harmonization", "@Spine Position", "@Page Style",
             "@Page Runtime", "@Page Gap"
         ]
-        
+
         self.clear_data()
-        self.table.setColumnCount(len(headers))
-        self.table.setHorizontalHeaderLabels(headers)
-        
-        # Add an initial empty row
-        self.add_row()
-        
+        # Start with an initial empty row
+        self.model.set_table(headers, [[]])
+        self.setup_special_columns()
+
     def load_project(self, file_path):
         """Load a project from a .csv file."""
         with open(file_path, 'r', newline='', encoding='utf-8') as csvfile:
             reader = csv.reader(csvfile)
             csv_data = list(reader)
-            
+
             # Detect and load styling data if available
             styling_data = None
             if len(csv_data) > 0 and csv_data[0][0].startswith('@'):
@@ -493,9 +874,9 @@ class SpreadsheetWidget(QWidget):
                 styling_data = self.extract_styling_data(csv_data[0])
                 # Remove styling row from data
                 csv_data = csv_data[1:]
-            
+
             self.load_data(csv_data, styling_data)
-            
+
     def extract_styling_data(self, header_row):
         """Extract styling data from the header row."""
         styling_data = {
@@ -503,7 +884,7 @@ class SpreadsheetWidget(QWidget):
             "page_styles": [],
             "letter_styles": []
         }
-        
+
         for item in header_row:
             if item.startswith('@'):
                 style_type, _, style_name = item.partition(' ')
@@ -513,38 +894,38 @@ class SpreadsheetWidget(QWidget):
                     styling_data["page_styles"].append(style_name)
                 elif style_type == '@Letter':
                     styling_data["letter_styles"].append(style_name)
-        
+
         return styling_data
-    
+
     def save_project(self, file_path):
         """Save the current project to a .csv file."""
         with open(file_path, 'w', newline='', encoding='utf-8') as csvfile:
             writer = csv.writer(csvfile)
-            
+
             # Write styling data as the first row if available
             if self.styling_data:
                 header_row = self.generate_styling_header()
                 writer.writerow(header_row)
-            
+
             # Write the rest of the data
             data = self.get_csv_data()
             for row in data:
                 writer.writerow(row)
-                
+
     def generate_styling_header(self):
         """Generate the header row for styling data."""
         header = []
-        
+
         # Content styles
         for style in self.styling_data.get("content_styles", []):
             header.append(f"@Content {style}")
-            
+
         # Page styles
         for style in self.styling_data.get("page_styles", []):
             header.append(f"@Page {style}")
-            
+
         # Letter styles
         for style in self.styling_data.get("letter_styles", []):
             header.append(f"@Letter {style}")
-        
-        return header + [""] * (self.table.columnCount() - len(header))  # Fill
\ No newline at end of file
+
+        return header + [""] * (self.model.columnCount() - len(header))  # Fill
@@ -0,0 +1,271 @@
+"""
+SQLite storage for the rows of very large credits tables.
+
+``SqliteRowStore`` keeps the table in a scratch SQLite database in the user
+cache folder (deleted when the store is closed) and reads like the list of
+row lists ``CreditsTableModel`` normally holds: ``len``, indexing, slicing
+and iteration. Only a bounded number of row windows stay in memory. A miss
+loads the whole window around the row with one range query on the row order
+index, so a scrolling view pages through the table WINDOW_ROWS rows at a
+time. Edits go through ``insert``, ``delete``, ``move`` and ``write_cells``,
+and each one runs in a single transaction.
+
+Row order is a dense integer ``pos`` column. Inserting, removing or moving
+rows shifts the positions after the edit with one UPDATE. Filterable
+columns get an index on their stripped values the first time they are
+queried; ``value_counts`` and ``matching_rows`` answer the filter index's
+queries from those indexes.
+"""
+import os
+import sqlite3
+import tempfile
+import weakref
+from collections import OrderedDict
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from filter_index import OP_IN, OP_NOT_IN, OP_SET, OP_EMPTY
+from project_cache import user_cache_dir
+
+# Rows per cached window, and windows kept in memory
+WINDOW_ROWS = 256
+MAX_WINDOWS = 64
+# Rows per INSERT batch when loading, and per query when iterating
+BATCH_ROWS = 4096
+# SQLite page cache, in KiB
+PAGE_CACHE_KIB = 16384
+
+# Filter values are compared stripped by str.strip(), as in BitmapFilterIndex. SQLite's trim() only
+# removes the characters it is given, so the Python function is registered for queries and indexes
+_STRIP = "py_strip(c{})"
+
+
+def _strip(value) -> str:
+    return '' if value is None else str(value).strip()
+
+
+def _remove_database(path: str) -> None:
+    for suffix in ('', '-journal'):
+        try:
+            os.remove(path + suffix)
+        except OSError:
+            pass
+
+
+class SqliteRowStore:
+    """Table rows of fixed width in a scratch SQLite database; see the module docstring."""
+
+    def __init__(self, directory: Optional[str] = None):
+        directory = directory or str(user_cache_dir('tables'))
+        os.makedirs(directory, exist_ok=True)
+        fd, self.path = tempfile.mkstemp(prefix='table-', suffix='.sqlite', dir=directory)
+        os.close(fd)
+        self.db = sqlite3.connect(self.path)
+        self.db.create_function('py_strip', 1, _strip, deterministic=True)
+        # A scratch copy of the CSV: no need to survive a crash, so skip fsync
+        self.db.execute("PRAGMA synchronous = OFF")
+        self.db.execute(f"PRAGMA cache_size = -{PAGE_CACHE_KIB}")
+        self.db.execute("PRAGMA temp_store = FILE")
+        self._finalizer = weakref.finalize(self, self._close, self.db, self.path)
+        self.width = 0
+        self._count = 0
+        self._indexed = set()
+        # window number -> rows, least recently used first
+        self._windows: "OrderedDict[int, List[List[str]]]" = OrderedDict()
+        self.queries = 0
+        self._create_table(0)
+
+    @staticmethod
+    def _close(db, path) -> None:
+        db.close()
+        _remove_database(path)
+
+    def close(self) -> None:
+        """Close the database and delete its file."""
+        self._finalizer()
+
+    def _columns(self) -> str:
+        return ', '.join(f"c{col}" for col in range(self.width))
+
+    def _create_table(self, width: int) -> None:
+        self.width = width
+        self._indexed.clear()
+        self._windows.clear()
+        with self.db:
+            self.db.execute("DROP TABLE IF EXISTS cells")
+            columns = ''.join(f", c{col} TEXT NOT NULL DEFAULT ''" for col in range(width))
+            self.db.execute(f"CREATE TABLE cells (pos INTEGER NOT NULL{columns})")
+            self.db.execute("CREATE INDEX cells_pos ON cells (pos)")
+        self._count = 0
+
+    # Loading and exporting
+    def replace(self, width: int, rows: Iterable[Sequence[str]]) -> None:
+        """Replace the whole table with ``rows`` (each ``width`` cells), inserted in large batches."""
+        self._create_table(width)
+        with self.db:
+            self._count = self._insert_batches(0, rows)
+        # Give back page cache memory the load used beyond the cache limit
+        self.db.execute("PRAGMA shrink_memory")
+
+    def _insert_batches(self, first: int, rows: Iterable[Sequence[str]]) -> int:
+        """
+        Insert rows at positions ``first``, ``first + 1``, ... (which must be
+        free) in the caller's transaction; returns their count.
+        """
+        sql = f"INSERT INTO cells (pos{', ' if self.width else ''}{self._columns()}) " \
+              f"VALUES (?{', ?' * self.width})"
+        count = 0
+        batch = []
+        for row in rows:
+            batch.append((first + count, *row))
+            count += 1
+            if len(batch) >= BATCH_ROWS:
+                self.db.executemany(sql, batch)
+                batch = []
+        if batch:
+            self.db.executemany(sql, batch)
+        return count
+
+    def _select(self, start: int, stop: int) -> List[List[str]]:
+        self.queries += 1
+        if not self.width:
+            return [[] for _ in range(max(0, min(stop, self._count) - start))]
+        cursor = self.db.execute(f"SELECT {self._columns()} FROM cells WHERE pos >= ? AND pos < ? ORDER BY pos",
+                                 (start, stop))
+        return [list(row) for row in cursor]
+
+    def __iter__(self) -> Iterator[List[str]]:
+        """Yield every row in order, BATCH_ROWS per query, without filling the window cache."""
+        for start in range(0, self._count, BATCH_ROWS):
+            yield from self._select(start, start + BATCH_ROWS)
+
+    # Reading
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self._count)
+            rows = self._select(start, stop) if start < stop else []
+            return rows if step == 1 else rows[::step]
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("row index out of range")
+        number = index // WINDOW_ROWS
+        window = self._windows.get(number)
+        if window is None:
+            window = self._select(number * WINDOW_ROWS, (number + 1) * WINDOW_ROWS)
+            self._windows[number] = window
+            if len(self._windows) > MAX_WINDOWS:
+                self._windows.popitem(last=False)
+        else:
+            self._windows.move_to_end(number)
+        return window[index - number * WINDOW_ROWS]
+
+    def cached_rows(self) -> int:
+        return sum(len(window) for window in self._windows.values())
+
+    def file_size(self) -> int:
+        try:
+            return os.path.getsize(self.path)
+        except OSError:
+            return 0
+
+    # Editing; each call is one transaction
+    def write_cells(self, cells: Iterable[Tuple[int, int, str]]) -> None:
+        by_column = {}
+        for row, col, value in cells:
+            by_column.setdefault(col, []).append((value, row))
+            window = self._windows.get(row // WINDOW_ROWS)
+            if window is not None:
+                window[row % WINDOW_ROWS][col] = value
+        with self.db:
+            for col, values in by_column.items():
+                self.db.executemany(f"UPDATE cells SET c{col} = ? WHERE pos = ?", values)
+
+    def insert(self, first: int, rows: List[Sequence[str]]) -> None:
+        """Insert rows before row ``first``."""
+        self._windows.clear()
+        with self.db:
+            self.db.execute("UPDATE cells SET pos = pos + ? WHERE pos >= ?", (len(rows), first))
+            self._count += self._insert_batches(first, rows)
+
+    def delete(self, first: int, count: int) -> None:
+        """Remove ``count`` rows starting at ``first``."""
+        self._windows.clear()
+        with self.db:
+            self.db.execute("DELETE FROM cells WHERE pos >= ? AND pos < ?", (first, first + count))
+            self.db.execute("UPDATE cells SET pos = pos - ? WHERE pos >= ?", (count, first + count))
+        self._count -= count
+
+    def move(self, first: int, count: int, insert_at: int) -> None:
+        """Move ``count`` rows from ``first`` so they start at ``insert_at`` (an index after their removal)."""
+        self._windows.clear()
+        with self.db:
+            # Park the block at negative positions, shift the rows in between, then drop the block in
+            self.db.execute("UPDATE cells SET pos = -1 - (pos - ?) WHERE pos >= ? AND pos < ?",
+                            (first, first, first + count))
+            if insert_at < first:
+                self.db.execute("UPDATE cells SET pos = pos + ? WHERE pos >= ? AND pos < ?",
+                                (count, insert_at, first))
+            else:
+                self.db.execute("UPDATE cells SET pos = pos - ? WHERE pos >= ? AND pos < ?",
+                                (count, first + count, insert_at + count))
+            self.db.execute("UPDATE cells SET pos = ? - 1 - pos WHERE pos < 0", (insert_at,))
+
+    def longest_values(self, col: int, count: int) -> List[str]:
+        """Return up to ``count`` of the longest values in a column, found by one scan in SQLite."""
+        self.queries += 1
+        return [value for value, in self.db.execute(
+            f"SELECT c{col} FROM cells ORDER BY length(c{col}) DESC LIMIT ?", (count,))]
+
+    def distinct_values(self, col: int, spans: Sequence[Tuple[int, int]], limit: int) -> List[str]:
+        """
+        Return up to ``limit`` distinct non-empty values of a column within
+        the inclusive row spans. The query stops once it has found ``limit``
+        values, so a large selection is not read in full.
+        """
+        if not spans:
+            return []
+        self.queries += 1
+        where = ' OR '.join('(pos BETWEEN ? AND ?)' for _ in spans)
+        parameters = [bound for span in spans for bound in span]
+        return [value for value, in self.db.execute(
+            f"SELECT DISTINCT c{col} FROM cells WHERE ({where}) AND c{col} != '' LIMIT ?", parameters + [limit])]
+
+    # Filter queries
+    def _ensure_index(self, col: int) -> None:
+        if col not in self._indexed:
+            with self.db:
+                self.db.execute(f"CREATE INDEX IF NOT EXISTS cells_c{col} ON cells ({_STRIP.format(col)})")
+            self._indexed.add(col)
+
+    def value_counts(self, col: int) -> List[Tuple[str, int]]:
+        """Return (stripped value, row count) pairs for a column, most frequent first."""
+        self._ensure_index(col)
+        self.queries += 1
+        value = _STRIP.format(col)
+        return self.db.execute(f"SELECT {value} AS value, COUNT(*) AS n FROM cells GROUP BY {value} "
+                               f"ORDER BY n DESC, value").fetchall()
+
+    def matching_rows(self, clauses, match_all: bool = True) -> List[int]:
+        """Return the rows matching filter clauses (see filter_index), in order; no clauses match all."""
+        conditions = []
+        parameters = []
+        for col, op, values in clauses:
+            self._ensure_index(col)
+            value = _STRIP.format(col)
+            if op == OP_SET:
+                conditions.append(f"{value} != ''")
+            elif op == OP_EMPTY:
+                conditions.append(f"{value} = ''")
+            elif op in (OP_IN, OP_NOT_IN):
+                values = [str(v).strip() for v in values]
+                marks = ', '.join('?' * len(values))
+                conditions.append(f"{value} {'NOT IN' if op == OP_NOT_IN else 'IN'} ({marks})")
+                parameters.extend(values)
+        if not conditions:
+            return list(range(self._count))
+        self.queries += 1
+        where = (' AND ' if match_all else ' OR ').join(f"({c})" for c in conditions)
+        return [row for row, in self.db.execute(f"SELECT pos FROM cells WHERE {where} ORDER BY pos", parameters)]
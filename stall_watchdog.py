@@ -0,0 +1,197 @@
+"""
+Watchdog for UI stalls.
+
+A heartbeat timer on the GUI thread records when the event loop last ran; a
+monitor thread wakes several times per threshold and, once the heartbeat is
+late by more than the threshold, captures the GUI thread's Python stack with
+``sys._current_frames``. When the event loop runs again the stall is recorded
+with its duration, the stack and the menu action that was running, and
+logged. The report aggregates stalls into counts, duration percentiles and
+the stacks that stalled most often.
+"""
+import json
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from typing import Dict, List, Optional
+
+from PyQt5.QtCore import QCoreApplication, QObject, QTimer, pyqtSignal
+
+THRESHOLD_ENV = 'CREDGEN_STALL_MS'
+DEFAULT_THRESHOLD_MS = 200
+HEARTBEAT_MS = 50
+# Frames kept per stack; the innermost ones say the most
+STACK_FRAMES = 12
+MAX_STALLS = 500
+# Gaps this long are a suspended machine, not a stall
+MAX_STALL_SECONDS = 600
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Return the nearest-rank ``q`` percentile (0-100) of sorted ``values``."""
+    if not values:
+        return 0.0
+    rank = max(1, -(-len(values) * q // 100))
+    return values[min(len(values), int(rank)) - 1]
+
+
+def format_stack(frames) -> List[str]:
+    """Return 'file:line function' entries for extracted frames, innermost last."""
+    return [f"{os.path.basename(f.filename)}:{f.lineno} {f.name}" for f in frames]
+
+
+class StallWatchdog(QObject):
+    """
+    Measures event-loop latency and records stalls longer than
+    ``threshold_ms``. Create it on the GUI thread; ``start`` begins
+    monitoring and ``stop`` ends it (also on application quit).
+    """
+    stall_detected = pyqtSignal(dict)
+
+    def __init__(self, parent=None, threshold_ms: Optional[int] = None):
+        super().__init__(parent)
+        if threshold_ms is None:
+            try:
+                threshold_ms = int(os.environ.get(THRESHOLD_ENV, DEFAULT_THRESHOLD_MS))
+            except ValueError:
+                threshold_ms = DEFAULT_THRESHOLD_MS
+        self.threshold_ms = threshold_ms
+        self.gui_thread = threading.get_ident()
+        self.stalls = deque(maxlen=MAX_STALLS)
+        self.total_stalls = 0
+        self._lock = threading.Lock()
+        self._last_beat = time.monotonic()
+        self._stack = None
+        # (text, monotonic time) of the last menu action triggered
+        self._action = ("", 0.0)
+        self._stop = threading.Event()
+        self._thread = None
+        self.timer = QTimer(self)
+        self.timer.setInterval(HEARTBEAT_MS)
+        self.timer.timeout.connect(self.beat)
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.stop)
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._last_beat = time.monotonic()
+        self._stop.clear()
+        self.timer.start()
+        self._thread = threading.Thread(target=self._monitor, name="stall-watchdog", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self.timer.stop()
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(1.0)
+            self._thread = None
+
+    def is_running(self) -> bool:
+        return self._thread is not None
+
+    def set_threshold(self, threshold_ms: int) -> None:
+        self.threshold_ms = max(HEARTBEAT_MS, int(threshold_ms))
+
+    # User actions
+    def watch_actions(self, actions) -> None:
+        """Note each QAction's text when triggered; connect before the action's own slots."""
+        for action in actions:
+            action.triggered.connect(lambda _=False, a=action: self.note_action(a.text().replace('&', '')))
+
+    def note_action(self, text: str) -> None:
+        self._action = (text, time.monotonic())
+
+    # Heartbeat (GUI thread) and monitor (worker thread)
+    def beat(self) -> None:
+        now = time.monotonic()
+        with self._lock:
+            started = self._last_beat
+            self._last_beat = now
+            stack = self._stack
+            self._stack = None
+        latency = now - started - HEARTBEAT_MS / 1000
+        if latency * 1000 >= self.threshold_ms and latency < MAX_STALL_SECONDS:
+            self._record(started, latency, stack)
+
+    def _monitor(self) -> None:
+        while not self._stop.wait(self.threshold_ms / 4000):
+            with self._lock:
+                beat = self._last_beat
+                late = time.monotonic() - beat - HEARTBEAT_MS / 1000
+                if late * 1000 < self.threshold_ms or self._stack is not None:
+                    continue
+                frame = sys._current_frames().get(self.gui_thread)
+            if frame is None:
+                continue
+            # Outside the lock: reading source lines can be slow, and beat() must not wait for it
+            stack = format_stack(traceback.extract_stack(frame, STACK_FRAMES))
+            del frame
+            with self._lock:
+                # Unless the stall ended meanwhile, in which case the stack is from after it
+                if self._last_beat == beat:
+                    self._stack = stack
+
+    def _record(self, started: float, latency: float, stack) -> None:
+        text, triggered = self._action
+        stall = {
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(time.time() - latency)),
+            'ms': round(latency * 1000, 1),
+            # Only an action triggered after the last heartbeat is what stalled
+            'action': text if triggered >= started else "",
+            'stack': stack or [],
+        }
+        self.stalls.append(stall)
+        self.total_stalls += 1
+        where = stall['stack'][-1] if stall['stack'] else "outside Python code"
+        print(f"UI stall: {stall['ms']:.0f} ms in {where}" + (f" during '{stall['action']}'" if stall['action'] else ""))
+        for line in stall['stack']:
+            print(f"    {line}")
+        self.stall_detected.emit(stall)
+
+    # Report
+    def reset(self) -> None:
+        self.stalls.clear()
+        self.total_stalls = 0
+
+    def report(self, top: int = 10) -> dict:
+        """Return stall count, duration percentiles and the stacks that stalled longest in total."""
+        stalls = list(self.stalls)
+        durations = sorted(s['ms'] for s in stalls)
+        groups: Dict[tuple, dict] = {}
+        for stall in stalls:
+            key = tuple(stall['stack'])
+            group = groups.setdefault(key, {'stack': stall['stack'], 'count': 0, 'total_ms': 0.0,
+                                            'max_ms': 0.0, 'actions': set()})
+            group['count'] += 1
+            group['total_ms'] += stall['ms']
+            group['max_ms'] = max(group['max_ms'], stall['ms'])
+            if stall['action']:
+                group['actions'].add(stall['action'])
+        stacks = sorted(groups.values(), key=lambda g: g['total_ms'], reverse=True)[:top]
+        for group in stacks:
+            group['total_ms'] = round(group['total_ms'], 1)
+            group['actions'] = sorted(group['actions'])
+        return {
+            'threshold_ms': self.threshold_ms,
+            'stalls': self.total_stalls,
+            'p50_ms': percentile(durations, 50),
+            'p95_ms': percentile(durations, 95),
+            'p99_ms': percentile(durations, 99),
+            'max_ms': durations[-1] if durations else 0.0,
+            'top_stacks': stacks,
+            'recent': stalls[-20:],
+        }
+
+    def dump_json(self, path: str) -> dict:
+        """Write ``report()`` to ``path`` and return it."""
+        report = self.report()
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"Stall report written to {path}")
+        return report
@@ -0,0 +1,212 @@
+"""
+Dependency graph between the styles defined in Styling.toml.
+
+Nodes are ``(table, name)`` pairs such as ``('contentStyle', 'Card')``.
+Edges come from reference fields: keys ending in ``LetterStyleName``,
+``TransitionStyleName`` and so on, searched recursively so nested tables
+(e.g. letter style layers) are covered. Transitive dependencies are memoized
+per node; updating one style only drops the memoized results of the styles
+that can reach it.
+"""
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+STYLE_TABLES = ('pageStyle', 'contentStyle', 'letterStyle', 'transitionStyle', 'pictureStyle')
+
+# Reference key suffix -> referenced table
+REFERENCE_SUFFIXES = (
+    ('PageStyleName', 'pageStyle'),
+    ('ContentStyleName', 'contentStyle'),
+    ('LetterStyleName', 'letterStyle'),
+    ('TransitionStyleName', 'transitionStyle'),
+    ('PictureStyleName', 'pictureStyle'),
+)
+# Reference keys that do not follow the suffix convention
+REFERENCE_KEYS = {
+    'inheritLayersFromStyle': 'letterStyle',
+}
+
+Node = Tuple[str, str]
+Edge = Tuple[str, Node]
+
+
+def reference_table(key: str) -> Optional[str]:
+    """Return the table a key refers to, or None if it is not a reference field."""
+    if key in REFERENCE_KEYS:
+        return REFERENCE_KEYS[key]
+    for suffix, table in REFERENCE_SUFFIXES:
+        if key.endswith(suffix) or key == suffix[0].lower() + suffix[1:]:
+            return table
+    return None
+
+
+def find_references(style: dict, path: str = '') -> List[Edge]:
+    """Return (key path, target node) for every reference in a style table."""
+    found = []
+    for key, value in style.items():
+        key_path = f"{path}.{key}" if path else key
+        if isinstance(value, dict):
+            found.extend(find_references(value, key_path))
+        elif isinstance(value, list):
+            for i, item in enumerate(value):
+                if isinstance(item, dict):
+                    found.extend(find_references(item, f"{key_path}[{i}]"))
+        elif isinstance(value, str) and value:
+            table = reference_table(key)
+            if table:
+                found.append((key_path, (table, value)))
+    return found
+
+
+def _renamed(key: str, value, table: str, old: str, new: str):
+    """Return ``value`` with references to ``(table, old)`` renamed, or ``value`` itself if it has none."""
+    if isinstance(value, dict):
+        items = {k: _renamed(k, v, table, old, new) for k, v in value.items()}
+        return items if any(items[k] is not v for k, v in value.items()) else value
+    if isinstance(value, list):
+        items = [_renamed(key, v, table, old, new) if isinstance(v, dict) else v for v in value]
+        return items if any(a is not b for a, b in zip(items, value)) else value
+    if isinstance(value, str) and value == old and reference_table(key) == table:
+        return new
+    return value
+
+
+def rename_changes(tables: Dict[str, list], table: str, old: str, new: str) -> List[Tuple[str, str, str, object]]:
+    """
+    Return the (table, style name, top-level key, value) changes, as taken
+    by TomlPatcher.patch, that rename style ``(table, old)`` to ``new`` and
+    every reference to it in ``{table: [style dicts]}``.
+    """
+    changes = [(table, old, 'name', new)]
+    for source_table in STYLE_TABLES:
+        for style in tables.get(source_table, []) or []:
+            if not isinstance(style, dict) or 'name' not in style:
+                continue
+            for key, value in style.items():
+                renamed = _renamed(key, value, table, old, new)
+                if renamed is not value:
+                    changes.append((source_table, style['name'], key, renamed))
+    return changes
+
+
+class StyleGraph:
+    """
+    Style nodes with their outgoing references and memoized transitive
+    dependencies.
+    """
+    def __init__(self):
+        self._edges: Dict[Node, List[Edge]] = {}
+        self._reverse: Dict[Node, Set[Node]] = {}
+        self._closure: Dict[Node, frozenset] = {}
+
+    @classmethod
+    def from_tables(cls, tables: Dict[str, list]) -> 'StyleGraph':
+        """Build a graph from ``{table: [style dicts]}`` as found in the TOML document."""
+        graph = cls()
+        for table in STYLE_TABLES:
+            for style in tables.get(table, []) or []:
+                if isinstance(style, dict) and 'name' in style:
+                    graph.set_style(table, style['name'], style)
+        return graph
+
+    @classmethod
+    def from_styling(cls, styling_data: Optional[dict]) -> 'StyleGraph':
+        """Build a graph from the dict returned by StylingParser.parse_styling_file()."""
+        return cls.from_tables((styling_data or {}).get('style_tables', {}))
+
+    # Editing
+    def set_style(self, table: str, name: str, style: dict) -> None:
+        """Add or replace a style, recomputing only its own references."""
+        node = (table, name)
+        self._drop_edges(node)
+        edges = find_references(style)
+        self._edges[node] = edges
+        for _, target in edges:
+            self._reverse.setdefault(target, set()).add(node)
+        self._invalidate(node)
+
+    def remove_style(self, table: str, name: str) -> None:
+        node = (table, name)
+        if node in self._edges:
+            self._drop_edges(node)
+            del self._edges[node]
+            self._invalidate(node)
+
+    def _drop_edges(self, node: Node) -> None:
+        for _, target in self._edges.get(node, []):
+            sources = self._reverse.get(target)
+            if sources:
+                sources.discard(node)
+                if not sources:
+                    del self._reverse[target]
+
+    def _invalidate(self, node: Node) -> None:
+        """Forget memoized closures of ``node`` and of every style that can reach it."""
+        stack = [node]
+        seen = {node}
+        while stack:
+            current = stack.pop()
+            self._closure.pop(current, None)
+            for source in self._reverse.get(current, ()):
+                if source not in seen:
+                    seen.add(source)
+                    stack.append(source)
+
+    # Queries
+    def nodes(self, table: Optional[str] = None) -> List[Node]:
+        return [n for n in self._edges if table is None or n[0] == table]
+
+    def exists(self, node: Node) -> bool:
+        return node in self._edges
+
+    def references(self, node: Node) -> List[Edge]:
+        """Return the direct (key path, target) references of a style."""
+        return list(self._edges.get(node, []))
+
+    def dependencies(self, node: Node) -> frozenset:
+        """Return every style ``node`` depends on, directly or transitively."""
+        cached = self._closure.get(node)
+        if cached is not None:
+            return cached
+        seen: Set[Node] = set()
+        stack = [target for _, target in self._edges.get(node, [])]
+        while stack:
+            current = stack.pop()
+            if current in seen or current == node:
+                continue
+            seen.add(current)
+            known = self._closure.get(current)
+            if known is not None:
+                seen.update(known)
+                continue
+            stack.extend(target for _, target in self._edges.get(current, []))
+        # A cycle may lead back to the node itself
+        seen.discard(node)
+        result = frozenset(seen)
+        self._closure[node] = result
+        return result
+
+    def dependents(self, node: Node) -> Set[Node]:
+        """Return every style that depends on ``node``, directly or transitively."""
+        seen: Set[Node] = set()
+        stack = list(self._reverse.get(node, ()))
+        while stack:
+            current = stack.pop()
+            if current not in seen:
+                seen.add(current)
+                stack.extend(self._reverse.get(current, ()))
+        seen.discard(node)
+        return seen
+
+    def broken_references(self, nodes: Optional[Iterable[Node]] = None) -> List[Tuple[Node, str, Node]]:
+        """Return (source, key path, missing target) for references to undefined styles."""
+        sources = self._edges.keys() if nodes is None else nodes
+        broken = []
+        for source in sources:
+            for key_path, target in self._edges.get(source, []):
+                if target not in self._edges:
+                    broken.append((source, key_path, target))
+        return broken
+
+    def broken_dependencies(self, node: Node) -> List[Tuple[Node, str, Node]]:
+        """Return broken references reachable from ``node``, including its own."""
+        return self.broken_references([node, *self.dependencies(node)])
@@ -0,0 +1,178 @@
+"""
+Reverse index from style names to the cells that use them.
+
+Style columns (``@Content Style``, ``@Page Style``) reference a style by their
+whole value; name columns reference letter styles through inline
+``{{Style Name}}`` markup. Each table row is reduced to a tuple of
+``(col, table, name)`` references and per-style counts are kept in a dict, so
+edits update the index in O(changed cells) and usage counts are a lookup.
+Cell positions are only resolved when usages are requested.
+"""
+import re
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+# Column header -> style table referenced by the whole cell value
+STYLE_COLUMNS = {
+    '@Content Style': 'contentStyle',
+    '@Page Style': 'pageStyle',
+}
+# Columns whose {{Style ...}} markup references letter styles
+MARKUP_COLUMNS = ('@Head', '@Body', '@Tail')
+MARKUP_TABLE = 'letterStyle'
+
+# {{Style Name}}; a bare {{Style}} resets the letter style and references nothing
+STYLE_TAG = re.compile(r'(\{\{\s*Style\s+)([^}]*?)(\s*\}\})', re.IGNORECASE)
+
+Node = Tuple[str, str]
+Reference = Tuple[int, str, str]
+
+
+def markup_styles(text: str) -> List[str]:
+    """Return the letter style names referenced by ``{{Style ...}}`` tags in ``text``."""
+    if '{{' not in text:
+        return []
+    return [m.group(2) for m in STYLE_TAG.finditer(text) if m.group(2)]
+
+
+def rename_markup(text: str, old: str, new: str) -> str:
+    """Replace ``{{Style old}}`` tags with ``{{Style new}}``, keeping the tag spacing."""
+    return STYLE_TAG.sub(lambda m: m.group(1) + new + m.group(3) if m.group(2) == old else m.group(0), text)
+
+
+class StyleUsageIndex:
+    """
+    Incrementally maintained index of style references in the credits table.
+
+    Mirrors ``DuplicateIndex``: one tuple of references per table row plus
+    counts per ``(table, name)`` node, updated from the model's cell, insert,
+    remove and move notifications.
+    """
+
+    def __init__(self, style_columns=None, markup_columns=MARKUP_COLUMNS):
+        self.style_columns = dict(STYLE_COLUMNS if style_columns is None else style_columns)
+        self.markup_columns = tuple(markup_columns)
+        self.columns: List[int] = []
+        self.version = 0
+        self._tables: Dict[int, Optional[str]] = {}
+        self._rows: List[Tuple[Reference, ...]] = []
+        self._counts: Dict[Node, int] = defaultdict(int)
+
+    # Building and incremental updates
+    def rebuild(self, headers: list, rows: list) -> None:
+        """Index ``rows`` (table rows without the header row) from scratch."""
+        self._tables = {}
+        for i, header in enumerate(headers):
+            header = str(header).strip()
+            if header in self.style_columns:
+                self._tables[i] = self.style_columns[header]
+            elif header in self.markup_columns:
+                self._tables[i] = None
+        self.columns = sorted(self._tables)
+        self._counts.clear()
+        self._rows = [self._row_references(row) for row in rows]
+        for entry in self._rows:
+            self._add_entry(entry)
+        self.version += 1
+
+    def set_cell(self, row: int, col: int, value) -> None:
+        """Update the index after the cell at (row, col) changed to ``value``."""
+        if col not in self._tables or not 0 <= row < len(self._rows):
+            return
+        old = self._rows[row]
+        refs = self._cell_references(col, value)
+        if refs == tuple(ref for ref in old if ref[0] == col):
+            return
+        new = tuple(ref for ref in old if ref[0] != col) + refs
+        self._remove_entry(old)
+        self._rows[row] = new
+        self._add_entry(new)
+        self.version += 1
+
+    def insert_rows(self, first: int, count: int = 1, rows: Optional[list] = None) -> None:
+        """Account for rows inserted before ``first``; ``rows`` holds their values if not blank."""
+        if rows is None:
+            entries = [()] * count
+        else:
+            entries = [self._row_references(row) for row in rows]
+            for entry in entries:
+                self._add_entry(entry)
+        self._rows[first:first] = entries
+        self.version += 1
+
+    def remove_rows(self, first: int, count: int = 1) -> None:
+        """Account for ``count`` rows removed starting at ``first``."""
+        for entry in self._rows[first:first + count]:
+            self._remove_entry(entry)
+        del self._rows[first:first + count]
+        self.version += 1
+
+    def move_rows(self, first: int, count: int, destination: int) -> None:
+        """Account for a block of rows moved before ``destination`` (Qt moveRows semantics)."""
+        block = self._rows[first:first + count]
+        del self._rows[first:first + count]
+        if destination > first:
+            destination -= count
+        self._rows[destination:destination] = block
+        self.version += 1
+
+    # Queries
+    def count(self, table: str, name: str) -> int:
+        """Return how many cells or tags reference the style."""
+        return self._counts.get((table, name), 0)
+
+    def counts(self) -> Dict[Node, int]:
+        return dict(self._counts)
+
+    def usages(self, table: str, name: str) -> List[Tuple[int, int]]:
+        """Return the (row, col) cells referencing the style, in row order."""
+        node = (table, name)
+        if node not in self._counts:
+            return []
+        cells = []
+        for row, entry in enumerate(self._rows):
+            for col, ref_table, ref_name in entry:
+                if ref_table == table and ref_name == name and (not cells or cells[-1] != (row, col)):
+                    cells.append((row, col))
+        return cells
+
+    def rename_edits(self, table: str, old: str, new: str, rows: list) -> List[Tuple[int, int, str]]:
+        """Return (row, col, value) edits renaming every reference to ``old`` in ``rows``."""
+        edits = []
+        for row, col in self.usages(table, old):
+            value = rows[row][col]
+            if self._tables.get(col) is None:
+                edits.append((row, col, rename_markup(value, old, new)))
+            elif value.strip() == old:
+                # Swap the whole stripped value, keeping any surrounding whitespace
+                start = len(value) - len(value.lstrip())
+                edits.append((row, col, value[:start] + new + value[start + len(old):]))
+        return edits
+
+    # Internals
+    def _cell_references(self, col: int, value) -> Tuple[Reference, ...]:
+        if not value:
+            return ()
+        table = self._tables[col]
+        if table is None:
+            return tuple((col, MARKUP_TABLE, name) for name in markup_styles(str(value)))
+        name = str(value).strip()
+        return ((col, table, name),) if name else ()
+
+    def _row_references(self, row) -> Tuple[Reference, ...]:
+        refs = ()
+        for col in self.columns:
+            if col < len(row) and row[col]:
+                refs += self._cell_references(col, row[col])
+        return refs
+
+    def _add_entry(self, entry: Tuple[Reference, ...]) -> None:
+        for _, table, name in entry:
+            self._counts[(table, name)] += 1
+
+    def _remove_entry(self, entry: Tuple[Reference, ...]) -> None:
+        for _, table, name in entry:
+            node = (table, name)
+            self._counts[node] -= 1
+            if self._counts[node] <= 0:
+                del self._counts[node]
@@ -1,38 +1,128 @@
-import toml
+from collections.abc import MutableMapping
 from pathlib import Path
+import toml_backends
+from style_graph import STYLE_TABLES
+
+# Style table -> name list in the parsed styling dict
+NAME_LISTS = {
+    'pageStyle': 'page_styles',
+    'contentStyle': 'content_styles',
+    'letterStyle': 'letter_styles',
+}
+
+
+class StylingData(MutableMapping):
+    """
+    Parsed styling data with lazily derived lists.
+
+    Behaves like the dict ``parse_styling_file`` used to return
+    (``page_styles``, ``content_styles``, ``gaps``...), but each list is
+    derived from the raw TOML ``document`` on first access and memoized, so a
+    dropdown that needs one list does not pay for the others. Assigned values
+    take precedence over derived ones.
+    """
+    KEYS = ('page_styles', 'content_styles', 'letter_styles', 'harmonization_values',
+            'spine_positions', 'gaps', 'runtimes', 'style_tables')
+
+    def __init__(self, document=None):
+        self.document = document if document is not None else {}
+        self._values = {}
+
+    def __getitem__(self, key):
+        try:
+            return self._values[key]
+        except KeyError:
+            pass
+        if key not in self.KEYS:
+            raise KeyError(key)
+        value = getattr(self, f'_derive_{key}')()
+        self._values[key] = value
+        return value
+
+    def __setitem__(self, key, value):
+        self._values[key] = value
+
+    def __delitem__(self, key):
+        del self._values[key]
+
+    def __iter__(self):
+        yield from self.KEYS
+        for key in self._values:
+            if key not in self.KEYS:
+                yield key
+
+    def __len__(self):
+        return len(self.KEYS) + sum(1 for key in self._values if key not in self.KEYS)
+
+    def __repr__(self):
+        return f"StylingData({sorted(self._values)} computed)"
+
+    def invalidate(self, *keys):
+        """Drop memoized values (all by default) so they are derived again."""
+        for key in keys or list(self._values):
+            self._values.pop(key, None)
+
+    def _styles(self, table):
+        return self.document.get(table, [])
+
+    def _derive_page_styles(self):
+        return StylingParser.style_names(self._styles('pageStyle'))
+
+    def _derive_content_styles(self):
+        return StylingParser.style_names(self._styles('contentStyle'))
+
+    def _derive_letter_styles(self):
+        return StylingParser.style_names(self._styles('letterStyle'))
+
+    def _derive_harmonization_values(self):
+        return StylingParser.harmonization_values(self._styles('contentStyle'))
+
+    def _derive_spine_positions(self):
+        return ['BODY_CENTER', 'HEAD_GAP_CENTER', 'BODY_LEFT', 'BODY_RIGHT']
+
+    def _derive_gaps(self):
+        # Gaps from global settings
+        unit_gap = self.document.get('global', {}).get('unitVGapPx', 32.0)
+        return ['0', str(int(unit_gap/2)), str(int(unit_gap)),
+                str(int(unit_gap*1.5)), str(int(unit_gap*2))]
+
+    def _derive_runtimes(self):
+        return StylingParser.runtimes(self._styles('pageStyle'))
+
+    def _derive_style_tables(self):
+        # Raw style tables, used to build the style dependency graph
+        return {table: self.document.setdefault(table, []) for table in STYLE_TABLES}
+
 
 class StylingParser:
     """
     Parses Styling.toml and extracts style node lists for use in dropdowns and info panels.
+    ``backend`` selects the TOML parser (see toml_backends); by default the fastest installed one.
     """
-    def __init__(self):
-        pass
+    def __init__(self, backend=None):
+        self.backend_name, self._loads = toml_backends.get_backend(backend)
 
     def parse_styling_file(self, file_path):
         """
-        Parse the TOML styling file and return a dict with lists of style names and other values.
+        Parse the TOML styling file and return a StylingData mapping with lists of style names and other values.
         """
         if not Path(file_path).exists():
-            return {
-                'page_styles': [],
-                'content_styles': [],
-                'letter_styles': [],
-                'harmonization_values': [],
-                'spine_positions': [],
-                'gaps': [],
-                'runtimes': []
-            }
-            
-        data = toml.load(file_path)
-        
-        # Extract styles
-        page_styles = [s['name'] for s in data.get('pageStyle', []) if 'name' in s]
-        content_styles = [s['name'] for s in data.get('contentStyle', []) if 'name' in s]
-        letter_styles = [s['name'] for s in data.get('letterStyle', []) if 'name' in s]
-        
-        # Extract harmonization values from content styles
+            data = StylingData()
+            for key in StylingData.KEYS:
+                data[key] = {} if key == 'style_tables' else []
+            return data
+
+        with open(file_path, 'r', encoding='utf-8') as f:
+            return StylingData(self._loads(f.read()))
+
+    @staticmethod
+    def style_names(styles):
+        return [s['name'] for s in styles if 'name' in s]
+
+    @staticmethod
+    def harmonization_values(content_styles):
         harmonization_values = set()
-        for style in data.get('contentStyle', []):
+        for style in content_styles:
             # Look for any *harmonize* fields that have values
             for key, value in style.items():
                 if 'harmonize' in key.lower() and isinstance(value, str):
@@ -40,31 +130,36 @@ class StylingParser:
         harmonization_values = sorted(list(harmonization_values))
         if 'OFF' not in harmonization_values:
             harmonization_values.insert(0, 'OFF')
-            
-        # Extract spine positions
-        spine_positions = ['BODY_CENTER', 'HEAD_GAP_CENTER', 'BODY_LEFT', 'BODY_RIGHT']
-        
-        # Extract gaps from global settings
-        unit_gap = data.get('global', {}).get('unitVGapPx', 32.0)
-        gaps = ['0', str(int(unit_gap/2)), str(int(unit_gap)), 
-                str(int(unit_gap*1.5)), str(int(unit_gap*2))]
-        
-        # Extract runtimes from pageStyle
+        return harmonization_values
+
+    @staticmethod
+    def runtimes(page_styles):
         runtimes = set()
-        for style in data.get('pageStyle', []):
+        for style in page_styles:
             if style.get('behavior') == 'CARD' and 'cardRuntimeFrames' in style:
                 runtimes.add(str(style['cardRuntimeFrames']))
         runtimes = sorted(list(runtimes))
         if '24' not in runtimes:  # Add some standard values
             runtimes.extend(['24', '48', '72', '96'])
         runtimes = sorted(list(set(runtimes)), key=lambda x: int(x))
-        
-        return {
-            'page_styles': page_styles,
-            'content_styles': content_styles,
-            'letter_styles': letter_styles,
-            'harmonization_values': harmonization_values,
-            'spine_positions': spine_positions,
-            'gaps': gaps,
-            'runtimes': runtimes
-        }
+        return runtimes
+
+    def update_style(self, styling_data, table, name, style):
+        """
+        Replace the style ``name`` of ``table`` in parsed styling data with
+        ``style`` (which may carry a new name) and re-derive only the lists
+        that depend on that table.
+        """
+        styles = styling_data.setdefault('style_tables', {}).setdefault(table, [])
+        for i, existing in enumerate(styles):
+            if existing.get('name') == name:
+                styles[i] = style
+                break
+        else:
+            styles.append(style)
+        if table in NAME_LISTS:
+            styling_data[NAME_LISTS[table]] = self.style_names(styles)
+        if table == 'contentStyle':
+            styling_data['harmonization_values'] = self.harmonization_values(styles)
+        elif table == 'pageStyle':
+            styling_data['runtimes'] = self.runtimes(styles)
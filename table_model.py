@@ -0,0 +1,347 @@
+"""
+Table model holding the credits rows for the spreadsheet views.
+"""
+from typing import Iterable, List, Optional, Sequence, Tuple
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, pyqtSignal
+from edit_commands import (
+    EditCommand, SetCellsCommand, InsertRowsCommand, RemoveRowsCommand,
+    MoveRowsCommand, ReplaceTableCommand, CompoundCommand
+)
+
+
+class CreditsTableModel(QAbstractTableModel):
+    """
+    Stores the credits table as a list of row lists of strings, or in a
+    ``SqliteRowStore`` for very large tables (see ``set_store``).
+
+    Public editing methods (``set_values``, ``insert_rows``, ``remove_rows``,
+    ``moveRows``, ``move_row_blocks``...) change the storage in place, notify
+    views through the regular Qt model signals and emit ``command_recorded``
+    with a compact undoable command. The lower-level ``write_cells``,
+    ``insert_row_values``, ``take_rows``, ``relocate_rows`` and
+    ``replace_table`` primitives do the same work without recording and are
+    what commands use to undo and redo.
+    """
+
+    command_recorded = pyqtSignal(object)
+    # Emitted after dataChanged with the exact (row, col, value) cells written
+    cells_written = pyqtSignal(object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._headers: List[str] = []
+        self._rows: List[List[str]] = []
+        # SqliteRowStore holding the rows instead of a list, if any; self._rows is then the store
+        self.store = None
+        # Optional (row, col, value) -> text shown instead of the value; editing still sees the value
+        self.display_text = None
+
+    # Table access
+    def set_table(self, headers: Sequence[str], rows: Iterable[Sequence]) -> None:
+        """Replace the whole table without recording an undo entry; ``rows`` may be a generator."""
+        width = len(headers)
+
+        def padded():
+            for row in rows:
+                values = [str(v) for v in row[:width]]
+                if len(values) < width:
+                    values.extend([''] * (width - len(values)))
+                yield values
+
+        # A store is filled straight from the generator, so the rows are never all in memory
+        self.replace_table([str(h) for h in headers], padded() if self.store is not None else list(padded()))
+
+    def set_store(self, store) -> None:
+        """
+        Move the rows into ``store`` (a SqliteRowStore), or back into a list
+        for None, keeping the headers and undo history valid.
+        """
+        if store is self.store:
+            return
+        previous = self.store
+        rows = self._rows
+        self.store = store
+        self.replace_table(self._headers, rows if store is not None else list(rows))
+        if previous is not None:
+            previous.close()
+
+    def headers(self) -> List[str]:
+        return list(self._headers)
+
+    def rows(self) -> List[List[str]]:
+        """
+        Return the live row storage, a list or the store (which reads like
+        one). Callers must not modify it.
+        """
+        return self._rows
+
+    def value(self, row: int, col: int) -> str:
+        return self._rows[row][col]
+
+    def column_of(self, header: str) -> int:
+        """Return the index of the column titled ``header``, or -1."""
+        try:
+            return self._headers.index(header)
+        except ValueError:
+            return -1
+
+    # Qt model interface
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._headers)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and self.display_text is not None:
+            return self.display_text(index.row(), index.column(), self._rows[index.row()][index.column()])
+        if role in (Qt.DisplayRole, Qt.EditRole):
+            return self._rows[index.row()][index.column()]
+        if role == Qt.ToolTipRole:
+            # Show full text on hover when elided
+            return self._rows[index.row()][index.column()] or None
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal and 0 <= section < len(self._headers):
+            return self._headers[section]
+        return super().headerData(section, orientation, role)
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.ItemIsDropEnabled
+        return (Qt.ItemIsSelectable | Qt.ItemIsEnabled | Qt.ItemIsEditable
+                | Qt.ItemIsDragEnabled | Qt.ItemIsDropEnabled)
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if role != Qt.EditRole or not index.isValid():
+            return False
+        self.set_values([(index.row(), index.column(), value)])
+        return True
+
+    def supportedDropActions(self):
+        return Qt.MoveAction
+
+    def moveRows(self, source_parent, source_row, count, destination_parent, destination_child):
+        """Move a block of rows as one recorded edit."""
+        if source_parent.isValid() or destination_parent.isValid():
+            return False
+        if not self.relocate_rows(source_row, count, destination_child):
+            return False
+        self.command_recorded.emit(MoveRowsCommand(source_row, count, destination_child))
+        return True
+
+    # Recorded edits
+    def record(self, command: EditCommand) -> None:
+        """Record an already applied command, e.g. one combining table edits with a styling file change."""
+        self.command_recorded.emit(command)
+
+    def set_values(self, cells: Iterable[Tuple[int, int, object]], text: str = "Edit Cells",
+                   record: bool = True) -> Optional[EditCommand]:
+        """Set many cells as one undo entry (or only apply them, for ``record``); unchanged cells are skipped."""
+        changes = []
+        for row, col, value in cells:
+            new = '' if value is None else str(value)
+            old = self._rows[row][col]
+            if old != new:
+                changes.append((row, col, old, new))
+        if not changes:
+            return None
+        self.write_cells([(row, col, new) for row, col, _, new in changes])
+        command = SetCellsCommand(changes, text)
+        if record:
+            self.command_recorded.emit(command)
+        return command
+
+    def insert_rows(self, first: int, rows: List[list], text: str = "Insert Rows") -> EditCommand:
+        """Insert rows of values before ``first`` as one undo entry."""
+        width = len(self._headers)
+        rows = [(list(map(str, row)) + [''] * width)[:width] for row in rows]
+        self.insert_row_values(first, [row[:] for row in rows])
+        command = InsertRowsCommand(first, rows, text)
+        self.command_recorded.emit(command)
+        return command
+
+    def remove_rows(self, rows: Iterable[int], text: str = "Delete Rows") -> Optional[EditCommand]:
+        """Remove the given rows (any order, may be sparse) as one undo entry."""
+        return self.remove_row_blocks(row_blocks(rows), text)
+
+    def remove_row_blocks(self, blocks: List[Tuple[int, int]], text: str = "Delete Rows") -> Optional[EditCommand]:
+        """Remove sorted, non-overlapping (first, count) blocks as one undo entry."""
+        commands = []
+        # Remove bottom-up so earlier blocks keep their positions
+        for first, count in reversed(blocks):
+            commands.append(RemoveRowsCommand(first, self.take_rows(first, count), text))
+        if not commands:
+            return None
+        command = commands[0] if len(commands) == 1 else CompoundCommand(commands, text)
+        self.command_recorded.emit(command)
+        return command
+
+    def move_row_blocks(self, blocks: List[Tuple[int, int]], destination: int,
+                        text: str = "Move Rows") -> Optional[EditCommand]:
+        """
+        Gather row blocks ``(first, count)`` in order before ``destination``
+        as one undo entry. Each block is a single model-level move.
+        """
+        blocks = sorted(blocks)
+        for first, count in blocks:
+            if first < destination < first + count:
+                destination = first
+        commands = []
+        # Blocks above the drop point go bottom-up, each landing above the previous one
+        upper = destination
+        for first, count in reversed([b for b in blocks if b[0] + b[1] <= destination]):
+            if self.relocate_rows(first, count, upper):
+                commands.append(MoveRowsCommand(first, count, upper, text))
+            upper -= count
+        # Blocks below keep their positions until moved; they go top-down after the drop point
+        lower = destination
+        for first, count in [b for b in blocks if b[0] >= destination]:
+            if self.relocate_rows(first, count, lower):
+                commands.append(MoveRowsCommand(first, count, lower, text))
+            lower += count
+        if not commands:
+            return None
+        command = commands[0] if len(commands) == 1 else CompoundCommand(commands, text)
+        self.command_recorded.emit(command)
+        return command
+
+    def shift_row_blocks(self, blocks: List[Tuple[int, int]], delta: int,
+                         text: str = "Move Rows") -> Optional[EditCommand]:
+        """Move each block up (delta=-1) or down (delta=1) by one row as one undo entry."""
+        blocks = sorted(blocks, reverse=delta > 0)
+        if not blocks:
+            return None
+        edge = blocks[0]
+        if (delta < 0 and edge[0] == 0) or (delta > 0 and edge[0] + edge[1] >= len(self._rows)):
+            return None
+        commands = []
+        for first, count in blocks:
+            destination = first - 1 if delta < 0 else first + count + 1
+            if self.relocate_rows(first, count, destination):
+                commands.append(MoveRowsCommand(first, count, destination, text))
+        if not commands:
+            return None
+        command = commands[0] if len(commands) == 1 else CompoundCommand(commands, text)
+        self.command_recorded.emit(command)
+        return command
+
+    def replace_row_ranges(self, edits: List[Tuple[int, int, List[list]]],
+                           text: str = "Apply Changes") -> Optional[EditCommand]:
+        """
+        Replace sorted, non-overlapping row ranges ``(first, count, new rows)``
+        as one undo entry. Paired rows become cell edits; surplus old rows
+        are removed and surplus new rows inserted.
+        """
+        width = len(self._headers)
+        commands = []
+        # Bottom-up, so earlier ranges keep their positions
+        for first, count, rows in reversed(edits):
+            rows = [(list(map(str, row)) + [''] * width)[:width] for row in rows]
+            paired = min(count, len(rows))
+            changes = [(first + r, c, self._rows[first + r][c], rows[r][c])
+                       for r in range(paired) for c in range(width) if self._rows[first + r][c] != rows[r][c]]
+            if changes:
+                self.write_cells([(row, col, new) for row, col, _, new in changes])
+                commands.append(SetCellsCommand(changes, text))
+            if count > paired:
+                commands.append(RemoveRowsCommand(first + paired, self.take_rows(first + paired, count - paired), text))
+            elif len(rows) > paired:
+                self.insert_row_values(first + paired, [row[:] for row in rows[paired:]])
+                commands.append(InsertRowsCommand(first + paired, rows[paired:], text))
+        if not commands:
+            return None
+        command = commands[0] if len(commands) == 1 else CompoundCommand(commands, text)
+        self.command_recorded.emit(command)
+        return command
+
+    def replace_table_recorded(self, headers: list, rows: List[list], text: str = "Change Columns") -> EditCommand:
+        """Replace the whole table as one undo entry (used for column changes)."""
+        before = (self.headers(), [row[:] for row in self._rows])
+        self.replace_table(list(headers), [row[:] for row in rows])
+        command = ReplaceTableCommand(before, (list(headers), [row[:] for row in rows]), text)
+        self.command_recorded.emit(command)
+        return command
+
+    # Unrecorded primitives
+    def write_cells(self, cells: List[Tuple[int, int, str]]) -> None:
+        """Write values, emit one dataChanged covering all of them, then ``cells_written``."""
+        if not cells:
+            return
+        top = left = None
+        bottom = right = -1
+        if self.store is not None:
+            self.store.write_cells(cells)
+        for row, col, value in cells:
+            if self.store is None:
+                self._rows[row][col] = value
+            top = row if top is None or row < top else top
+            left = col if left is None or col < left else left
+            bottom = max(bottom, row)
+            right = max(right, col)
+        self.dataChanged.emit(self.index(top, left), self.index(bottom, right),
+                              [Qt.DisplayRole, Qt.EditRole])
+        self.cells_written.emit(cells)
+
+    def insert_row_values(self, first: int, rows: List[list]) -> None:
+        if not rows:
+            return
+        self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+        if self.store is not None:
+            self.store.insert(first, rows)
+        else:
+            self._rows[first:first] = rows
+        self.endInsertRows()
+
+    def take_rows(self, first: int, count: int) -> List[list]:
+        """Remove and return ``count`` rows starting at ``first``."""
+        if count <= 0:
+            return []
+        self.beginRemoveRows(QModelIndex(), first, first + count - 1)
+        taken = self._rows[first:first + count]
+        if self.store is not None:
+            self.store.delete(first, count)
+        else:
+            del self._rows[first:first + count]
+        self.endRemoveRows()
+        return taken
+
+    def relocate_rows(self, first: int, count: int, destination: int) -> bool:
+        """Move a block of rows; returns False for empty or no-op moves."""
+        if count <= 0 or first < 0 or first + count > len(self._rows):
+            return False
+        if first <= destination <= first + count or not 0 <= destination <= len(self._rows):
+            return False
+        if not self.beginMoveRows(QModelIndex(), first, first + count - 1, QModelIndex(), destination):
+            return False
+        insert_at = destination - count if destination > first else destination
+        if self.store is not None:
+            self.store.move(first, count, insert_at)
+        else:
+            block = self._rows[first:first + count]
+            del self._rows[first:first + count]
+            self._rows[insert_at:insert_at] = block
+        self.endMoveRows()
+        return True
+
+    def replace_table(self, headers: List[str], rows: Iterable[List[str]]) -> None:
+        self.beginResetModel()
+        if self.store is not None:
+            if rows is not self.store:
+                self.store.replace(len(headers), rows)
+            rows = self.store
+        self._headers = headers
+        self._rows = rows
+        self.endResetModel()
+
+
+def row_blocks(rows: Iterable[int]) -> List[Tuple[int, int]]:
+    """Collapse row numbers into sorted (first, count) runs."""
+    blocks = []
+    for row in sorted(set(rows)):
+        if blocks and blocks[-1][0] + blocks[-1][1] == row:
+            blocks[-1] = (blocks[-1][0], blocks[-1][1] + 1)
+        else:
+            blocks.append((row, 1))
+    return blocks
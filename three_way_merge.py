@@ -0,0 +1,255 @@
+"""
+Three-way merge of a CSV changed on disk into the open table.
+
+The base is the file as last loaded or saved, "mine" is the table and
+"theirs" is the file now on disk. Both sides are diffed against the base
+(``csv_diff.diff_sequences`` over interned rows), and only the base regions
+touched by the external change are merged. Regions changed on one side only take that side; regions
+changed on both sides are merged cell by cell when both kept the row count,
+and reported as conflicts where the same cell (or, for inserted and deleted
+rows, the same region) was changed differently.
+
+The prefix and suffix the base shares with the file on disk (and with the
+table, when its change lies elsewhere) are trimmed on the raw rows first,
+so only the window around the external change is projected and diffed.
+
+The result is a list of ``(first row, row count, new rows)`` edits in table
+coordinates for ``CreditsTableModel.replace_row_ranges``, so applying it
+touches only the merged rows.
+"""
+from typing import List, Optional, Sequence, Tuple
+
+from csv_diff import diff_sequences, project_rows
+
+MINE = 0
+THEIRS = 1
+
+RowEdit = Tuple[int, int, List[list]]
+
+
+class MergeConflict:
+    """
+    Base rows [i1, i2) changed differently in the table and on disk.
+    ``start`` is the first table row of the region. When both sides kept
+    the row count, ``merged_rows`` holds the cell-level merge (with the
+    table's values in ``cells``, the conflicting (row offset, column) pairs).
+    """
+
+    def __init__(self, start: int, i1: int, i2: int, mine_rows, theirs_rows,
+                 merged_rows: Optional[List[list]] = None, cells: Optional[List[Tuple[int, int]]] = None):
+        self.start = start
+        self.i1, self.i2 = i1, i2
+        self.mine_rows = mine_rows
+        self.theirs_rows = theirs_rows
+        self.merged_rows = merged_rows
+        self.cells = cells or []
+
+    def resolved_rows(self, take_theirs: bool) -> List[list]:
+        if self.merged_rows is None:
+            return [list(row) for row in (self.theirs_rows if take_theirs else self.mine_rows)]
+        rows = [row[:] for row in self.merged_rows]
+        if take_theirs:
+            for k, col in self.cells:
+                rows[k][col] = self.theirs_rows[k][col]
+        return rows
+
+
+class ThreeWayMerge:
+    """
+    Merge ``theirs`` (CSV rows as loaded: headers, hidden first row, table
+    rows) into the table ``headers``/``mine_rows``, relative to ``base`` in
+    the same shape as ``theirs``.
+
+    Columns the table has but the external file dropped are left alone;
+    columns the external file added are reported in ``added_columns`` and not
+    merged.
+    """
+
+    def __init__(self, base: Sequence[Sequence[str]], theirs: Sequence[Sequence[str]],
+                 headers: Sequence[str], mine_rows: Sequence[Sequence[str]], mine_hidden=None):
+        self.headers = [str(h).strip() for h in headers]
+        base_headers = [str(h).strip() for h in base[0]] if base else []
+        theirs_headers = [str(h).strip() for h in theirs[0]] if theirs else []
+        self.added_columns = [h for h in theirs_headers if h not in self.headers]
+        self.removed_columns = [h for h in self.headers if h in base_headers and h not in theirs_headers]
+        # Merge on the columns both files can speak for; the rest keep the table's values
+        self.columns = [c for c, h in enumerate(self.headers) if h not in self.removed_columns]
+        merge_headers = [self.headers[c] for c in self.columns]
+        self.mine_full = mine_rows
+        base_rows, theirs_rows = base[2:], theirs[2:]
+        # Only the window around the external change is projected and diffed
+        lo, hi, mine_lo, mine_hi = self._window(base_rows, mine_rows, theirs_rows, base_headers == theirs_headers,
+                                                self.headers == base_headers)
+        self.base_offset, self.mine_offset = lo, mine_lo
+        self.base = project_rows(base_headers, base_rows[lo:hi], merge_headers)
+        self.theirs = project_rows(theirs_headers, theirs_rows[lo:len(theirs_rows) - (len(base_rows) - hi)],
+                                   merge_headers)
+        self.mine = project_rows(self.headers, mine_rows[mine_lo:mine_hi], merge_headers)
+
+        # The hidden first row is not editable in the table, so it simply follows the file
+        self.hidden_row = None
+        if len(theirs) > 1:
+            theirs_hidden = project_rows(theirs_headers, [theirs[1]], self.headers)[0]
+            base_hidden = project_rows(base_headers, base[1:2], self.headers)
+            mine_hidden = tuple(mine_hidden) if mine_hidden is not None else None
+            if not base_hidden or (theirs_hidden != base_hidden[0] and mine_hidden == base_hidden[0]):
+                self.hidden_row = list(theirs_hidden)
+
+        # (base row, edit) for regions merged without conflict, in base order
+        self.edits: List[Tuple[int, RowEdit]] = []
+        self.conflicts: List[MergeConflict] = []
+        self.merged_regions = 0
+        self.mine_changed = False
+        self._merge()
+
+    @staticmethod
+    def _changed_span(a, b, comparable) -> Tuple[int, int]:
+        """Return the range of ``a`` outside the rows common to the start and end of ``a`` and ``b``."""
+        if not comparable:
+            return 0, len(a)
+        n = min(len(a), len(b))
+        head = 0
+        while head < n and a[head] == b[head]:
+            head += 1
+        tail = 0
+        while tail < n - head and a[-1 - tail] == b[-1 - tail]:
+            tail += 1
+        return head, len(a) - tail
+
+    def _window(self, base_rows, mine_rows, theirs_rows, theirs_comparable, mine_comparable):
+        """
+        Return (base start, base end, table start, table end) of the region
+        to merge. Rows compared here are only known to match when the
+        headers are the same, otherwise the whole table is merged.
+        """
+        n = len(base_rows)
+        t_lo, t_hi = self._changed_span(base_rows, theirs_rows, theirs_comparable)
+        if t_lo == t_hi and len(theirs_rows) == n:
+            return 0, 0, 0, 0
+        m_lo, m_hi = self._changed_span(base_rows, mine_rows, mine_comparable)
+        delta = len(mine_rows) - n
+        if m_lo == m_hi and delta == 0 or m_lo > t_hi:
+            # The table only changed after the external change (or not at all)
+            return t_lo, t_hi, t_lo, t_hi
+        if m_hi < t_lo:
+            return t_lo, t_hi, t_lo + delta, t_hi + delta
+        lo, hi = min(t_lo, m_lo), max(t_hi, m_hi)
+        return lo, hi, lo, len(mine_rows) - (n - hi)
+
+    def _merge(self) -> None:
+        ids = {}
+        base_ids = [ids.setdefault(row, len(ids)) for row in self.base]
+        mine_ids = [ids.setdefault(row, len(ids)) for row in self.mine]
+        theirs_ids = [ids.setdefault(row, len(ids)) for row in self.theirs]
+        hunks = [(op[1], op[2], MINE, op) for op in diff_sequences(base_ids, mine_ids) if op[0] != 'equal']
+        self.mine_changed = bool(hunks)
+        hunks += [(op[1], op[2], THEIRS, op) for op in diff_sequences(base_ids, theirs_ids) if op[0] != 'equal']
+        # Sorted by base position; inserts sort before changes starting at the same row
+        hunks.sort(key=lambda h: (h[0], h[1], h[2]))
+        offsets = [0, 0]
+        for lo, hi, ops in self._clusters(hunks):
+            deltas = [0, 0]
+            for side in (MINE, THEIRS):
+                for _, i1, i2, j1, j2 in ops[side]:
+                    deltas[side] += (j2 - j1) - (i2 - i1)
+            if ops[THEIRS]:
+                m_lo, t_lo = lo + offsets[MINE], lo + offsets[THEIRS]
+                self._merge_region(lo, hi, (m_lo, hi + offsets[MINE] + deltas[MINE]),
+                                   (t_lo, hi + offsets[THEIRS] + deltas[THEIRS]), bool(ops[MINE]))
+            offsets[MINE] += deltas[MINE]
+            offsets[THEIRS] += deltas[THEIRS]
+
+    @staticmethod
+    def _clusters(hunks):
+        """Group hunks of both sides whose base ranges overlap (or insert at the edge of one another)."""
+        clusters = []
+        for i1, i2, side, op in hunks:
+            if clusters:
+                lo, hi, ops, edge_insert = clusters[-1]
+                if i1 < hi or (i1 == hi and (i1 == i2 or edge_insert)):
+                    ops[side].append(op)
+                    new_hi = max(hi, i2)
+                    clusters[-1] = (lo, new_hi, ops, (i1 == i2 == new_hi) or (edge_insert and new_hi == hi))
+                    continue
+            ops = ([], [])
+            ops[side].append(op)
+            clusters.append((i1, i2, ops, i1 == i2))
+        return [(lo, hi, ops) for lo, hi, ops, _ in clusters]
+
+    def _merge_region(self, lo, hi, mine_range, theirs_range, mine_touched) -> None:
+        m_lo, m_hi = mine_range
+        # Positions in the whole table and base file
+        start, base_row = m_lo + self.mine_offset, lo + self.base_offset
+        theirs_rows = self.theirs[theirs_range[0]:theirs_range[1]]
+        if not mine_touched:
+            self._add_edit(base_row, start, hi - lo, theirs_rows)
+            return
+        base_rows = self.base[lo:hi]
+        mine_rows = self.mine[m_lo:m_hi]
+        if mine_rows == theirs_rows:
+            return
+        if not len(base_rows) == len(mine_rows) == len(theirs_rows):
+            self.conflicts.append(MergeConflict(start, base_row, base_row + hi - lo, mine_rows, theirs_rows))
+            return
+        merged = []
+        cells = []
+        for k, (old, mine_row, theirs_row) in enumerate(zip(base_rows, mine_rows, theirs_rows)):
+            row = list(mine_row)
+            for col, (b, m, t) in enumerate(zip(old, mine_row, theirs_row)):
+                if m == t or t == b:
+                    continue
+                if m == b:
+                    row[col] = t
+                else:
+                    cells.append((k, col))
+            merged.append(row)
+        if cells:
+            self.conflicts.append(MergeConflict(start, base_row, base_row + hi - lo, mine_rows, theirs_rows,
+                                                merged, cells))
+        elif merged != [list(row) for row in mine_rows]:
+            self._add_edit(base_row, start, len(mine_rows), merged)
+
+    def _add_edit(self, base_row, first, count, rows) -> None:
+        self.merged_regions += 1
+        self.edits.append((base_row, (first, count, [list(row) for row in rows])))
+
+    def _expand(self, edit: RowEdit) -> RowEdit:
+        """Widen merged rows to the table's columns; unmerged columns keep the table's values."""
+        first, count, rows = edit
+        if len(self.columns) == len(self.headers):
+            return edit
+        width = len(self.headers)
+        wide = []
+        for k, row in enumerate(rows):
+            out = list(self.mine_full[first + k]) if k < count else [''] * width
+            out = (out + [''] * width)[:width]
+            for value, col in zip(row, self.columns):
+                out[col] = value
+            wide.append(out)
+        return first, count, wide
+
+    def row_edits(self, take_theirs: Sequence[int] = ()) -> List[RowEdit]:
+        """Return the merge as sorted table edits, resolving the conflicts at ``take_theirs`` to the file's version."""
+        take_theirs = set(take_theirs)
+        edits = list(self.edits)
+        for index, conflict in enumerate(self.conflicts):
+            rows = conflict.resolved_rows(index in take_theirs)
+            if rows != [list(row) for row in conflict.mine_rows]:
+                edits.append((conflict.i1, (conflict.start, len(conflict.mine_rows), rows)))
+        # Base order, so an insert and a change at the same table row apply in the right order
+        edits.sort(key=lambda item: item[0])
+        return [self._expand(edit) for _, edit in edits]
+
+    def merge_headers(self) -> List[str]:
+        """Headers of the projected ``base``/``mine``/``theirs`` rows (and conflict rows)."""
+        return [self.headers[c] for c in self.columns]
+
+    def summary(self) -> str:
+        text = f"{self.merged_regions} external change(s) merged, {len(self.conflicts)} conflict(s)"
+        if self.hidden_row is not None:
+            text += ", first row updated"
+        if self.added_columns:
+            text += f"; new columns not merged: {', '.join(self.added_columns)}"
+        if self.removed_columns:
+            text += f"; columns removed on disk kept: {', '.join(self.removed_columns)}"
+        return text
@@ -0,0 +1,356 @@
+"""
+Thumbnails of the pictures and videos referenced in credits cells.
+
+``{{Pic name}}`` and ``{{Video name}}`` references are resolved against the
+project folder the way CredGen does: picture style names first, then file
+names with or without extension, ignoring trailing qualifier words. Images
+are rendered on a thread pool (SVGs with QSvgRenderer, raster images scaled
+while decoding by QImageReader) and kept in two caches: an LRU of pixmaps in
+memory and PNG files on disk keyed by path, size, mtime and height, so
+reopening a project does not render again. Video files have no preview;
+image sequence folders show their first frame.
+
+The GUI thread never touches the file system: indexing the project folder,
+resolving names and the periodic stat calls run as LookupJobs on the same
+thread pool, so a slow (e.g. network) folder only delays the thumbnails.
+"""
+import hashlib
+import os
+import re
+import stat as stat_module
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+from PyQt5.QtCore import QCoreApplication, QObject, QRunnable, QSize, QThread, QThreadPool, Qt, pyqtSignal
+from PyQt5.QtGui import QImage, QImageReader, QPainter, QPixmap
+
+try:
+    from PyQt5.QtSvg import QSvgRenderer
+except ImportError:  # SVGs then go through QImageReader's svg plugin, if installed
+    QSvgRenderer = None
+
+from project_cache import user_cache_dir
+
+MEDIA_REFERENCE = re.compile(r'\{\{(Pic|Video)\s+([^{}]+?)\s*\}\}')
+PICTURE_EXTENSIONS = ('.svg', '.png', '.jpg', '.jpeg', '.gif', '.bmp', '.webp', '.tif', '.tiff')
+MEMORY_BUDGET_BYTES = 32 * 1024 * 1024
+DISK_BUDGET_BYTES = 64 * 1024 * 1024
+# Folders with more files than this are only partly indexed
+MAX_INDEXED_FILES = 20000
+# Thumbnails wider than this many times their height are cropped
+MAX_ASPECT = 8
+# File stats are re-checked after this many seconds, so edited pictures are picked up
+STAT_TTL = 2.0
+
+# Results of ThumbnailCache.thumbnail besides a QPixmap (None means still rendering)
+MISSING = 'missing'
+NO_PREVIEW = 'no preview'
+
+
+@lru_cache(maxsize=4096)
+def media_references(text: str) -> Tuple[Tuple[str, str], ...]:
+    """Return the (kind, name) media references in a cell, kind being 'Pic' or 'Video'."""
+    if '{{' not in text:
+        return ()
+    return tuple((kind, name) for kind, name in MEDIA_REFERENCE.findall(text))
+
+
+class MediaResolver:
+    """Maps media reference names to files in a project folder."""
+
+    def __init__(self, folder: Optional[str], picture_styles=None):
+        self.folder = folder
+        # Picture style name -> picture file name
+        self.picture_styles = {str(style.get('name', '')).strip().lower(): str(style.get('picture', '')).strip()
+                               for style in picture_styles or [] if style.get('name') and style.get('picture')}
+        self._files: Optional[Dict[str, str]] = None
+        self._resolved: Dict[str, Optional[str]] = {}
+        # Lookups run on pool threads; the first one builds the index
+        self._lock = threading.Lock()
+
+    def _index(self) -> Dict[str, str]:
+        """Index files and folders by lower-case name and stem; shallower paths win."""
+        if self._files is not None:
+            return self._files
+        files: Dict[str, str] = {}
+        self._files = files
+        if not self.folder:
+            return files
+        count = 0
+        for root, dirs, names in os.walk(self.folder):
+            dirs[:] = sorted(d for d in dirs if not d.startswith('.'))
+            for name in sorted(names) + dirs:
+                path = os.path.join(root, name)
+                files.setdefault(name.lower(), path)
+                files.setdefault(os.path.splitext(name)[0].lower(), path)
+                count += 1
+            if count >= MAX_INDEXED_FILES:
+                print(f"Media index stopped after {count} files in {self.folder}")
+                break
+        return files
+
+    def resolve(self, name: str) -> Optional[str]:
+        """Return the file a reference name points to; walks the folder on first use, so call it off the GUI thread."""
+        key = name.strip().lower()
+        with self._lock:
+            if key not in self._resolved:
+                self._resolved[key] = self._lookup(key)
+            return self._resolved[key]
+
+    def _lookup(self, key: str) -> Optional[str]:
+        files = self._index()
+        words = key.split()
+        # Drop trailing qualifier words ("{{Video Blooper 3.mov XXL}}") until something matches
+        while words:
+            candidate = ' '.join(words)
+            picture = self.picture_styles.get(candidate)
+            if picture and picture.lower() in files:
+                return files[picture.lower()]
+            if candidate in files:
+                return files[candidate]
+            words.pop()
+        return None
+
+
+def _first_frame(folder: str) -> Optional[str]:
+    """Return the first picture of an image sequence folder."""
+    try:
+        names = sorted(n for n in os.listdir(folder) if n.lower().endswith(PICTURE_EXTENSIONS))
+    except OSError:
+        return None
+    return os.path.join(folder, names[0]) if names else None
+
+
+def _scaled_size(size: QSize, height: int) -> QSize:
+    if size.isEmpty():
+        return QSize(height, height)
+    width = max(1, round(size.width() * height / size.height()))
+    return QSize(min(width, height * MAX_ASPECT), height)
+
+
+def render_thumbnail(path: str, height: int) -> QImage:
+    """Render a thumbnail ``height`` pixels high; returns a null image if the file can't be read."""
+    if os.path.isdir(path):
+        path = _first_frame(path)
+        if path is None:
+            return QImage()
+    if path.lower().endswith('.svg') and QSvgRenderer is not None:
+        renderer = QSvgRenderer(path)
+        if not renderer.isValid():
+            return QImage()
+        size = _scaled_size(renderer.defaultSize(), height)
+        image = QImage(size, QImage.Format_ARGB32_Premultiplied)
+        image.fill(Qt.transparent)
+        painter = QPainter(image)
+        renderer.render(painter)
+        painter.end()
+        return image
+    reader = QImageReader(path)
+    size = reader.size()
+    if size.isValid():
+        # Decoding straight to the thumbnail size avoids holding the full image
+        reader.setScaledSize(_scaled_size(size, height))
+    image = reader.read()
+    if not image.isNull() and image.height() != height:
+        image = image.scaledToHeight(height, Qt.SmoothTransformation)
+    return image
+
+
+class LookupJob(QRunnable):
+    """Resolves one reference name and stats the file it points to."""
+
+    def __init__(self, cache, resolver, name):
+        super().__init__()
+        self.cache = cache
+        self.resolver = resolver
+        self.name = name
+
+    def run(self):
+        info = None
+        path = self.resolver.resolve(self.name)
+        if path is not None:
+            try:
+                stat = os.stat(path)
+                info = (path, stat.st_size, stat.st_mtime_ns, stat_module.S_ISDIR(stat.st_mode))
+            except OSError:
+                pass
+        self.cache.looked_up.emit(self.resolver, self.name, info)
+
+
+class ThumbnailJob(QRunnable):
+    """Loads one thumbnail from the disk cache, or renders and stores it."""
+
+    def __init__(self, cache, key, cache_file):
+        super().__init__()
+        self.cache = cache
+        self.key = key
+        self.cache_file = cache_file
+
+    def run(self):
+        path, _, _, height = self.key
+        image = QImage()
+        try:
+            os.makedirs(os.path.dirname(self.cache_file), exist_ok=True)
+            if os.path.exists(self.cache_file):
+                image = QImage(self.cache_file)
+                # Touch it so eviction sees it as recently used
+                os.utime(self.cache_file)
+            if image.isNull():
+                image = render_thumbnail(path, height)
+                if not image.isNull():
+                    tmp = f"{self.cache_file}.{threading.get_ident()}.tmp"
+                    if image.save(tmp, 'PNG'):
+                        os.replace(tmp, self.cache_file)
+        except OSError as e:
+            print(f"Thumbnail cache error for {path}: {e}")
+        self.cache.rendered.emit(self.key, image)
+
+
+class ThumbnailCache(QObject):
+    """
+    Asynchronous thumbnail provider. ``thumbnail`` returns a QPixmap when
+    one is ready and otherwise queues the render and returns None;
+    ``thumbnail_ready`` is emitted once it arrives. Requests made later run
+    first, so the rows in view render before the ones scrolled past.
+    """
+    thumbnail_ready = pyqtSignal()
+    # Emitted from pool threads with (key, QImage); delivered on the GUI thread
+    rendered = pyqtSignal(object, QImage)
+    # Emitted from pool threads with (resolver, name, (path, size, mtime, is folder) or None)
+    looked_up = pyqtSignal(object, str, object)
+
+    def __init__(self, parent=None, cache_dir=None, memory_budget=MEMORY_BUDGET_BYTES,
+                 disk_budget=DISK_BUDGET_BYTES):
+        super().__init__(parent)
+        self.cache_dir = str(cache_dir or user_cache_dir('thumbnails'))
+        self.memory_budget = memory_budget
+        self.disk_budget = disk_budget
+        self.resolver = MediaResolver(None)
+        self.pixmaps: "OrderedDict[tuple, QPixmap]" = OrderedDict()
+        self.memory_bytes = 0
+        self.failed = set()
+        self.pending = set()
+        # Reference name -> (time looked up, lookup result); names being looked up
+        self._lookups: Dict[str, Tuple[float, Optional[tuple]]] = {}
+        self._looking = set()
+        self._priority = 0
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max(1, min(4, QThread.idealThreadCount())))
+        self.rendered.connect(self.on_rendered)
+        self.looked_up.connect(self.on_looked_up)
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.shutdown)
+
+    def set_project(self, folder: Optional[str], styling_data=None) -> None:
+        """Resolve references against ``folder`` and the picture styles of ``styling_data``."""
+        picture_styles = []
+        if styling_data is not None and hasattr(styling_data, 'document'):
+            picture_styles = styling_data.document.get('pictureStyle', []) or []
+        self.resolver = MediaResolver(folder, picture_styles)
+        self._lookups.clear()
+        self._looking.clear()
+        self.failed.clear()
+        self.evict_disk()
+
+    def thumbnail(self, kind: str, name: str, height: int):
+        """Return a QPixmap, None while looking up or rendering, MISSING or NO_PREVIEW."""
+        info = self._look_up(name)
+        if info is None:
+            return None
+        path, size, mtime, is_folder = info
+        if path is None:
+            return MISSING
+        if kind == 'Video' and not is_folder:
+            return NO_PREVIEW
+        key = (path, size, mtime, height)
+        pixmap = self.pixmaps.get(key)
+        if pixmap is not None:
+            self.pixmaps.move_to_end(key)
+            return pixmap
+        if key in self.failed:
+            return NO_PREVIEW
+        if key not in self.pending:
+            self.pending.add(key)
+            digest = hashlib.sha1('\0'.join(map(str, key)).encode('utf-8')).hexdigest()
+            self._priority += 1
+            self.pool.start(ThumbnailJob(self, key, os.path.join(self.cache_dir, digest + '.png')),
+                            self._priority)
+        return None
+
+    def path_of(self, name: str) -> Tuple[bool, Optional[str]]:
+        """Return (whether the lookup has finished, file path or None) for a reference name."""
+        info = self._look_up(name)
+        return info is not None, info[0] if info is not None else None
+
+    def _look_up(self, name: str) -> Optional[tuple]:
+        """
+        Return the last lookup result, (path, size, mtime, is folder), with a
+        None path for missing files; None if there is none yet. Results older
+        than STAT_TTL are still returned while a fresh lookup runs.
+        """
+        key = name.strip().lower()
+        checked = self._lookups.get(key)
+        if (checked is None or time.monotonic() - checked[0] > STAT_TTL) and key not in self._looking:
+            self._looking.add(key)
+            self._priority += 1
+            self.pool.start(LookupJob(self, self.resolver, key), self._priority)
+        if checked is None:
+            return None
+        return checked[1] or (None, 0, 0, False)
+
+    def on_looked_up(self, resolver, name, info) -> None:
+        if resolver is not self.resolver:
+            # Started for the previous project
+            return
+        self._looking.discard(name)
+        previous = self._lookups.get(name)
+        self._lookups[name] = (time.monotonic(), info)
+        if previous is None or previous[1] != info:
+            self.thumbnail_ready.emit()
+
+    def on_rendered(self, key, image) -> None:
+        self.pending.discard(key)
+        if image.isNull():
+            self.failed.add(key)
+        else:
+            pixmap = QPixmap.fromImage(image)
+            self.pixmaps[key] = pixmap
+            self.memory_bytes += pixmap.width() * pixmap.height() * 4
+            while self.memory_bytes > self.memory_budget and len(self.pixmaps) > 1:
+                _, old = self.pixmaps.popitem(last=False)
+                self.memory_bytes -= old.width() * old.height() * 4
+        self.thumbnail_ready.emit()
+
+    def evict_disk(self) -> None:
+        """Delete least recently used thumbnail files until the disk cache fits its budget."""
+        try:
+            entries = [(entry.stat(), entry.path) for entry in os.scandir(self.cache_dir)
+                       if entry.name.endswith('.png')]
+        except OSError:
+            return
+        total = sum(stat.st_size for stat, _ in entries)
+        for stat, path in sorted(entries, key=lambda item: item[0].st_mtime_ns):
+            if total <= self.disk_budget:
+                break
+            try:
+                os.remove(path)
+                total -= stat.st_size
+            except OSError:
+                pass
+
+    def disk_usage(self) -> Tuple[int, int]:
+        """Return (file count, total bytes) of the disk cache."""
+        try:
+            sizes = [entry.stat().st_size for entry in os.scandir(self.cache_dir) if entry.name.endswith('.png')]
+        except OSError:
+            return 0, 0
+        return len(sizes), sum(sizes)
+
+    def shutdown(self) -> None:
+        """Drop queued renders and wait for running ones, before the cache goes away."""
+        self.pool.clear()
+        self.pool.waitForDone()
@@ -0,0 +1,54 @@
+"""
+TOML parsing backends.
+
+The stdlib ``tomllib`` (Python 3.11+) is preferred, then ``tomli`` (the same
+parser as a package for older Pythons), with the pure-Python ``toml`` package
+as the fallback. All backends decode from ``str`` and raise a ``ValueError``
+subclass on invalid input.
+"""
+import importlib
+from typing import Callable, Dict, List, Optional, Tuple
+
+PREFERRED_BACKENDS = ('tomllib', 'tomli', 'toml')
+
+_backends: Dict[str, Callable[[str], dict]] = {}
+
+
+def _register(name: str) -> None:
+    try:
+        module = importlib.import_module(name)
+    except ImportError:
+        return
+    _backends[name] = module.loads
+
+
+for _name in PREFERRED_BACKENDS:
+    _register(_name)
+
+
+def available_backends() -> List[str]:
+    """Return the names of the installed backends, fastest first."""
+    return [name for name in PREFERRED_BACKENDS if name in _backends]
+
+
+def get_backend(name: Optional[str] = None) -> Tuple[str, Callable[[str], dict]]:
+    """Return ``(name, loads)`` for the named backend, or the preferred installed one."""
+    if name is not None:
+        if name not in _backends:
+            raise ValueError(f"TOML backend {name!r} is not available (installed: {available_backends()})")
+        return name, _backends[name]
+    for candidate in PREFERRED_BACKENDS:
+        if candidate in _backends:
+            return candidate, _backends[candidate]
+    raise ImportError("No TOML parser installed; install 'toml' or use Python 3.11+")
+
+
+def loads(text: str, backend: Optional[str] = None) -> dict:
+    """Parse TOML text with the given or preferred backend."""
+    return get_backend(backend)[1](text)
+
+
+def load(path: str, backend: Optional[str] = None) -> dict:
+    """Parse a UTF-8 TOML file with the given or preferred backend."""
+    with open(path, 'r', encoding='utf-8') as f:
+        return loads(f.read(), backend)
@@ -0,0 +1,298 @@
+"""
+Span-preserving edits of Styling.toml.
+
+``TomlPatcher`` scans the original TOML text once and records, for every
+``[[table]]`` entry, the character span of each top-level ``key = value``.
+Edits replace only those value spans (or insert a new ``key = value`` line at
+the end of the entry), so comments, key order, indentation and number
+formatting elsewhere in the file are left byte-for-byte unchanged.
+"""
+import math
+import os
+import re
+import shutil
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import toml_backends
+
+_BARE_KEY = re.compile(r'[A-Za-z0-9_-]+$')
+_ESCAPES = {'"': '\\"', '\\': '\\\\', '\b': '\\b', '\t': '\\t', '\n': '\\n', '\f': '\\f', '\r': '\\r'}
+
+
+def format_value(value) -> str:
+    """Return ``value`` as a TOML literal."""
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if isinstance(value, int):
+        return str(value)
+    if isinstance(value, float):
+        if math.isnan(value):
+            return 'nan'
+        if math.isinf(value):
+            return 'inf' if value > 0 else '-inf'
+        return repr(value)
+    if isinstance(value, str):
+        return '"' + ''.join(_ESCAPES.get(c, c if c >= ' ' and c != '\x7f' else f'\\u{ord(c):04x}')
+                             for c in value) + '"'
+    if isinstance(value, (list, tuple)):
+        return '[' + ', '.join(format_value(v) for v in value) + ']'
+    if isinstance(value, dict):
+        items = ', '.join(f"{format_key(k)} = {format_value(v)}" for k, v in value.items())
+        return '{ ' + items + ' }' if items else '{}'
+    raise TypeError(f"Cannot write {type(value).__name__} to TOML")
+
+
+def format_key(key: str) -> str:
+    return key if _BARE_KEY.match(key) else format_value(key)
+
+
+def parse_value(text: str):
+    """Decode a single TOML value literal."""
+    return toml_backends.loads(f"v = {text}")['v']
+
+
+def _value_end(text: str, pos: int) -> int:
+    """Return the end offset of the value starting at ``pos`` (trailing blanks excluded)."""
+    n = len(text)
+    depth = 0
+    i = pos
+    while i < n:
+        c = text[i]
+        if text.startswith('"""', i) or text.startswith("'''", i):
+            quote = text[i:i + 3]
+            j = i + 3
+            while True:
+                j = text.find(quote, j)
+                if j < 0:
+                    return n
+                if quote == '"""' and _escaped(text, j):
+                    j += 1
+                    continue
+                break
+            # Up to two quotes may directly precede the closing delimiter
+            while text.startswith(quote[0], j + 3):
+                j += 1
+            i = j + 3
+            continue
+        if c in '"\'':
+            j = i + 1
+            while j < n and text[j] != '\n':
+                if text[j] == c and (c == "'" or not _escaped(text, j)):
+                    break
+                j += 1
+            i = j + 1
+            continue
+        if c in '[{':
+            depth += 1
+        elif c in ']}':
+            depth -= 1
+        elif c == '#':
+            if depth <= 0:
+                break
+            newline = text.find('\n', i)
+            i = n if newline < 0 else newline
+            continue
+        elif c == '\n' and depth <= 0:
+            break
+        i += 1
+    end = min(i, n)
+    while end > pos and text[end - 1] in ' \t\r':
+        end -= 1
+    return end
+
+
+def _escaped(text: str, pos: int) -> bool:
+    """True if the character at ``pos`` is preceded by an odd number of backslashes."""
+    count = 0
+    while pos > 0 and text[pos - 1] == '\\':
+        count += 1
+        pos -= 1
+    return count % 2 == 1
+
+
+def _line_end(text: str, pos: int) -> int:
+    newline = text.find('\n', pos)
+    return len(text) if newline < 0 else newline + 1
+
+
+class TomlEntry:
+    """One ``[[table]]`` entry: spans of its top-level values and where new keys go."""
+    def __init__(self, table: str, index: int):
+        self.table = table
+        self.index = index
+        self.name: Optional[str] = None
+        self.spans: Dict[str, Tuple[int, int]] = {}
+        self.insert_at = 0
+        self.indent = ''
+
+
+class TomlPatcher:
+    """
+    Apply value edits to TOML text without re-serializing it.
+
+    Only entries of the array tables listed in ``tables`` are indexed; their
+    sub-tables (e.g. ``[[letterStyle.layers]]``) are skipped, so edits target
+    the style's own keys.
+    """
+    def __init__(self, text: str, tables: Iterable[str]):
+        self.tables = tuple(tables)
+        self.newline = '\r\n' if '\r\n' in text else '\n'
+        self.text = text
+        self._scan()
+
+    # Scanning
+    def _scan(self) -> None:
+        text = self.text
+        self.entries: List[TomlEntry] = []
+        counts: Dict[str, int] = {}
+        current: Optional[TomlEntry] = None
+        in_subtable = False
+        pos = 0
+        n = len(text)
+        while pos < n:
+            line_start = pos
+            while pos < n and text[pos] in ' \t':
+                pos += 1
+            if pos >= n:
+                break
+            c = text[pos]
+            if c in '\r\n#':
+                pos = _line_end(text, pos)
+                continue
+            if c == '[':
+                close = text.find(']', pos)
+                array = text.startswith('[[', pos)
+                header = text[pos + (2 if array else 1):close].strip() if close > 0 else ''
+                if array and header in self.tables:
+                    current = TomlEntry(header, counts.get(header, 0))
+                    counts[header] = current.index + 1
+                    self.entries.append(current)
+                    in_subtable = False
+                    current.insert_at = _line_end(text, pos)
+                elif current is not None and header.startswith(current.table + '.'):
+                    in_subtable = True
+                else:
+                    current = None
+                pos = _line_end(text, pos)
+                continue
+            equals = self._find_equals(text, pos)
+            if equals < 0:
+                pos = _line_end(text, pos)
+                continue
+            key = text[pos:equals].strip()
+            start = equals + 1
+            while start < n and text[start] in ' \t':
+                start += 1
+            end = _value_end(text, start)
+            if current is not None and not in_subtable:
+                key = self._unquote_key(key)
+                if not current.spans:
+                    current.indent = text[line_start:pos]
+                current.spans[key] = (start, end)
+                if key == 'name':
+                    try:
+                        current.name = parse_value(text[start:end])
+                    except ValueError:
+                        pass
+                current.insert_at = _line_end(text, end)
+            pos = _line_end(text, end)
+
+    @staticmethod
+    def _find_equals(text: str, pos: int) -> int:
+        """Return the offset of the ``=`` separating a key from its value on this line."""
+        i = pos
+        while i < len(text) and text[i] not in '\r\n':
+            c = text[i]
+            if c in '"\'':
+                close = text.find(c, i + 1)
+                if close < 0:
+                    return -1
+                i = close + 1
+                continue
+            if c == '=':
+                return i
+            i += 1
+        return -1
+
+    @staticmethod
+    def _same_value(literal: str, value) -> bool:
+        try:
+            old = parse_value(literal)
+        except ValueError:
+            return False
+        return type(old) is type(value) and old == value
+
+    @staticmethod
+    def _unquote_key(key: str) -> str:
+        if len(key) >= 2 and key[0] == key[-1] and key[0] in '"\'':
+            return parse_value(key) if key[0] == '"' else key[1:-1]
+        return key
+
+    # Queries
+    def find_entry(self, table: str, name: str) -> Optional[TomlEntry]:
+        for entry in self.entries:
+            if entry.table == table and entry.name == name:
+                return entry
+        return None
+
+    def value_text(self, table: str, name: str, key: str) -> Optional[str]:
+        """Return the original TOML text of a value, or None."""
+        entry = self.find_entry(table, name)
+        if entry is None or key not in entry.spans:
+            return None
+        start, end = entry.spans[key]
+        return self.text[start:end]
+
+    # Editing
+    def patch(self, changes: Iterable[Tuple[str, str, str, object]]) -> int:
+        """
+        Apply (table, style name, key, value) changes in one pass.
+        Returns the number of characters rewritten.
+        """
+        edits = []
+        for table, name, key, value in changes:
+            entry = self.find_entry(table, name)
+            if entry is None:
+                raise KeyError(f"No {table} named {name!r}")
+            literal = format_value(value)
+            if key in entry.spans:
+                start, end = entry.spans[key]
+                original = self.text[start:end]
+                # Keep the original spelling of equal values (e.g. 1.0e3 vs 1000.0)
+                if original != literal and not self._same_value(original, value):
+                    edits.append((start, end, literal))
+            else:
+                line = f"{entry.indent}{format_key(key)} = {literal}{self.newline}"
+                at = entry.insert_at
+                # Entries at the very end of a file without a trailing newline
+                if at == len(self.text) and self.text and not self.text.endswith('\n'):
+                    line = self.newline + line
+                edits.append((at, at, line))
+        if not edits:
+            return 0
+        text = self.text
+        pieces = []
+        last = len(text)
+        # Splice from the end so earlier offsets stay valid
+        for start, end, literal in sorted(edits, key=lambda e: (e[0], e[1]), reverse=True):
+            pieces.append(text[end:last])
+            pieces.append(literal)
+            last = start
+        pieces.append(text[:last])
+        self.text = ''.join(reversed(pieces))
+        self._scan()
+        return sum(len(literal) for _, _, literal in edits)
+
+    def save(self, path: str) -> None:
+        """Write the patched text atomically."""
+        write_text(path, self.text)
+
+
+def write_text(path: str, text: str) -> None:
+    """Replace a file's text atomically, keeping its permissions."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8', newline='') as f:
+        f.write(text)
+    if os.path.exists(path):
+        shutil.copymode(path, tmp_path)
+    os.replace(tmp_path, path)
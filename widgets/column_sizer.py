@@ -0,0 +1,117 @@
+import heapq
+from operator import itemgetter
+from PyQt5.QtGui import QFontMetrics
+
+
+class ColumnSizer:
+    """
+    Computes column widths from a bounded sample of cells instead of
+    measuring every row like QTableView.resizeColumnsToContents().
+
+    The sample is the header, the first rows, the rows currently on screen
+    and the longest strings seen in each column. Text widths are cached per
+    font and string, and a column is only re-measured when its longest
+    strings change.
+    """
+    HEAD_ROWS = 100
+    LONGEST_PER_COLUMN = 12
+    PADDING = 18
+    MAX_CACHE_ENTRIES = 50000
+
+    def __init__(self, view, max_width=600):
+        self.view = view
+        self.max_width = max_width
+        self._width_cache = {}
+        # Per column: min-heap of (length, text) holding the longest strings
+        self._longest = []
+        self._signatures = []
+
+    # Tracking
+    def reset(self, headers, rows, columns=None):
+        """Scan the table to find the longest strings of the given columns (all by default)."""
+        if columns is None or len(self._longest) != len(headers):
+            self._longest = [[] for _ in headers]
+            self._signatures = [None] * len(headers)
+            columns = range(len(headers))
+        for col in columns:
+            if hasattr(rows, 'longest_values'):
+                # A SqliteRowStore: let the database scan the column instead of iterating it in Python
+                longest = rows.longest_values(col, self.LONGEST_PER_COLUMN)
+            else:
+                longest = heapq.nlargest(self.LONGEST_PER_COLUMN, map(itemgetter(col), rows), key=len)
+            heap = list({(len(text), text) for text in longest})
+            heapq.heapify(heap)
+            self._longest[col] = heap
+            self._signatures[col] = None
+
+    def note_value(self, col, text):
+        """Track an edited value; returns True if it is among the column's longest strings."""
+        if col >= len(self._longest):
+            return False
+        heap = self._longest[col]
+        entry = (len(text), text)
+        if entry in heap:
+            return False
+        if len(heap) < self.LONGEST_PER_COLUMN:
+            heapq.heappush(heap, entry)
+            return True
+        if entry > heap[0]:
+            heapq.heapreplace(heap, entry)
+            return True
+        return False
+
+    def cache_size(self):
+        """Return the number of cached text widths."""
+        return len(self._width_cache)
+
+    # Measuring
+    def text_width(self, font, text):
+        """Return the pixel width of the widest line of ``text`` in ``font``, cached."""
+        key = (font.key(), text)
+        width = self._width_cache.get(key)
+        if width is None:
+            if len(self._width_cache) >= self.MAX_CACHE_ENTRIES:
+                self._width_cache.clear()
+            metrics = QFontMetrics(font)
+            width = max(metrics.horizontalAdvance(line) for line in text.split('\n'))
+            self._width_cache[key] = width
+        return width
+
+    def sample_texts(self, col, rows):
+        """Return the texts sampled for a column."""
+        texts = {row[col] for row in rows[:self.HEAD_ROWS]}
+        first = max(0, self.view.rowAt(0))
+        last = self.view.rowAt(self.view.viewport().height())
+        last = len(rows) - 1 if last < 0 else last
+        texts.update(row[col] for row in rows[first:last + 1])
+        if col < len(self._longest):
+            texts.update(text for _, text in self._longest[col])
+        return texts
+
+    def column_width(self, col, header, rows):
+        font = self.view.font()
+        header_font = self.view.horizontalHeader().font()
+        width = self.text_width(header_font, header) + self.PADDING
+        for text in self.sample_texts(col, rows):
+            if text:
+                width = max(width, self.text_width(font, text) + self.PADDING)
+        return min(width, self.max_width)
+
+    def resize_columns(self, headers, rows, columns=None, force=False, grow_only=False):
+        """
+        Resize the given columns (all by default). Columns whose longest
+        strings are unchanged since the last resize are skipped unless
+        ``force``; with ``grow_only`` columns are never narrowed, so widths
+        set by the user survive edits.
+        """
+        if len(self._signatures) != len(headers):
+            self._signatures = [None] * len(headers)
+        for col in range(len(headers)) if columns is None else columns:
+            signature = (headers[col], tuple(sorted(self._longest[col])) if col < len(self._longest) else ())
+            if not force and signature == self._signatures[col]:
+                continue
+            self._signatures[col] = signature
+            width = self.column_width(col, headers[col], rows)
+            if grow_only:
+                width = max(width, self.view.columnWidth(col))
+            self.view.setColumnWidth(col, width)
@@ -0,0 +1,44 @@
+from PyQt5.QtWidgets import QTableView, QAbstractItemView
+from PyQt5.QtCore import Qt, pyqtSignal
+
+
+class CreditsTableView(QTableView):
+    """
+    Table view that turns internal drag and drop into row block moves.
+    Dropping emits ``rows_dropped`` with the destination row instead of
+    letting Qt copy cell data and clear the source cells.
+    """
+
+    rows_dropped = pyqtSignal(int)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setDragEnabled(True)
+        self.setAcceptDrops(True)
+        self.setDropIndicatorShown(True)
+        self.setDragDropMode(QAbstractItemView.InternalMove)
+        self.setDefaultDropAction(Qt.MoveAction)
+
+    def dropEvent(self, event):
+        if event.source() is not self or self.model() is None:
+            event.ignore()
+            return
+        index = self.indexAt(event.pos())
+        position = self.dropIndicatorPosition()
+        if not index.isValid() or position == QAbstractItemView.OnViewport:
+            destination = self.model().rowCount()
+        elif position == QAbstractItemView.BelowItem:
+            destination = index.row() + 1
+        elif position == QAbstractItemView.OnItem:
+            # Dropping onto a row inserts before or after it depending on the half hit
+            rect = self.visualRect(index)
+            destination = index.row() + (1 if event.pos().y() > rect.center().y() else 0)
+        else:
+            destination = index.row()
+        self.rows_dropped.emit(destination)
+        # Report a copy so the drag source does not clear the moved cells
+        event.setDropAction(Qt.CopyAction)
+        event.accept()
+        self.stopAutoScroll()
+        self.setState(QAbstractItemView.NoState)
+        self.viewport().update()
@@ -1,48 +1,195 @@
-from PyQt5.QtWidgets import QWidget, QVBoxLayout, QLabel, QTabWidget
+from PyQt5.QtCore import Qt, pyqtSignal
+from PyQt5.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QTabWidget, QListWidget, QListWidgetItem, QPushButton
+)
+from style_graph import StyleGraph
+from style_usage import MARKUP_TABLE, STYLE_COLUMNS
+
+# (table, tab title, styling_data key)
+STYLE_TABS = (
+    ('pageStyle', "Page Styles", 'page_styles'),
+    ('contentStyle', "Content Styles", 'content_styles'),
+    ('letterStyle', "Letter Styles", 'letter_styles'),
+    ('transitionStyle', "Transitions", None),
+    ('pictureStyle', "Pictures", None),
+)
+# Tables whose references in the credits the usage index tracks, so a rename can rewrite them
+RENAMABLE_TABLES = set(STYLE_COLUMNS.values()) | {MARKUP_TABLE}
+
 
 class InfoPanel(QWidget):
     """
     Panel displaying available page, content, and letter styles for reference.
-    Updates dynamically based on loaded styling data.
+    Updates dynamically based on loaded styling data. Selecting a style shows
+    its transitive dependencies and broken references from the style graph;
+    usage counts come from the spreadsheet's style usage index.
     """
 
+    select_usages_requested = pyqtSignal(str, str)
+    rename_requested = pyqtSignal(str, str)
+
     def __init__(self, parent=None):
         super().__init__(parent)
+        self.style_graph = StyleGraph()
+        self.style_usage = None
+        self._usage_version = None
         layout = QVBoxLayout(self)
+        # Summary of broken references across the styling file
+        self.broken_label = QLabel()
+        self.broken_label.setWordWrap(True)
+        self.broken_label.setStyleSheet("color: #b00020;")
+        self.broken_label.hide()
+        layout.addWidget(self.broken_label)
         # Tab widget for different info types
         self.info_tabs = QTabWidget()
         layout.addWidget(self.info_tabs)
-        # Page Styles tab
-        self.page_styles_label = QLabel("No styling file loaded")
-        page_styles_widget = QWidget()
-        page_styles_layout = QVBoxLayout(page_styles_widget)
-        page_styles_layout.addWidget(self.page_styles_label)
-        self.info_tabs.addTab(page_styles_widget, "Page Styles")
-        # Content Styles tab
-        self.content_styles_label = QLabel("No styling file loaded")
-        content_styles_widget = QWidget()
-        content_styles_layout = QVBoxLayout(content_styles_widget)
-        content_styles_layout.addWidget(self.content_styles_label)
-        self.info_tabs.addTab(content_styles_widget, "Content Styles")
-        # Letter Styles tab
-        self.letter_styles_label = QLabel("No styling file loaded")
-        letter_styles_widget = QWidget()
-        letter_styles_layout = QVBoxLayout(letter_styles_widget)
-        letter_styles_layout.addWidget(self.letter_styles_label)
-        self.info_tabs.addTab(letter_styles_widget, "Letter Styles")
+        self.style_lists = {}
+        self.style_labels = {}
+        for table, title, _ in STYLE_TABS:
+            label = QLabel("No styling file loaded")
+            style_list = QListWidget()
+            style_list.currentItemChanged.connect(self.on_style_selected)
+            tab = QWidget()
+            tab_layout = QVBoxLayout(tab)
+            tab_layout.addWidget(label)
+            tab_layout.addWidget(style_list)
+            buttons = QHBoxLayout()
+            select_btn = QPushButton("Select Usages")
+            select_btn.setToolTip("Select every cell using this style")
+            select_btn.clicked.connect(self.request_select_usages)
+            buttons.addWidget(select_btn)
+            # {{Pic}} and transition references are not indexed, so renaming those would leave them behind
+            if table in RENAMABLE_TABLES:
+                rename_btn = QPushButton("Rename…")
+                rename_btn.setToolTip("Rename this style in Styling.toml, in the styles using it and in the credits")
+                rename_btn.clicked.connect(self.request_rename)
+                buttons.addWidget(rename_btn)
+            tab_layout.addLayout(buttons)
+            self.info_tabs.addTab(tab, title)
+            self.style_labels[table] = label
+            self.style_lists[table] = style_list
+        # Details of the selected style
+        self.details_label = QLabel()
+        self.details_label.setWordWrap(True)
+        self.details_label.setTextInteractionFlags(Qt.TextSelectableByMouse)
+        layout.addWidget(self.details_label)
 
     def update_info(self, styling_data):
+        self.style_graph = StyleGraph.from_styling(styling_data)
+        self.details_label.clear()
         if not styling_data:
-            self.page_styles_label.setText("No styling file loaded")
-            self.content_styles_label.setText("No styling file loaded")
-            self.letter_styles_label.setText("No styling file loaded")
+            for table, _, _ in STYLE_TABS:
+                self.style_labels[table].setText("No styling file loaded")
+                self.style_lists[table].clear()
+            self.broken_label.hide()
+            return
+        for table, title, key in STYLE_TABS:
+            if key:
+                names = styling_data.get(key, [])
+            else:
+                names = [name for _, name in self.style_graph.nodes(table)]
+            self.style_labels[table].setText(f"Available {title}:")
+            style_list = self.style_lists[table]
+            style_list.clear()
+            for name in names:
+                item = QListWidgetItem(f"• {name}")
+                item.setData(Qt.UserRole, (table, name))
+                style_list.addItem(item)
+        self._usage_version = None
+        self.refresh_usage_counts()
+        self.refresh_broken_summary()
+
+    def set_usage_index(self, style_usage):
+        """Use ``style_usage`` (a StyleUsageIndex) for the per-style usage counts."""
+        self.style_usage = style_usage
+        self._usage_version = None
+        self.refresh_usage_counts()
+
+    def refresh_usage_counts(self):
+        """Show usage counts next to each style; cheap when the index has not changed."""
+        if self.style_usage is None or self._usage_version == self.style_usage.version:
+            return
+        self._usage_version = self.style_usage.version
+        for style_list in self.style_lists.values():
+            for i in range(style_list.count()):
+                item = style_list.item(i)
+                table, name = item.data(Qt.UserRole)
+                uses = self.style_usage.count(table, name)
+                item.setText(f"• {name} ({uses} use{'' if uses == 1 else 's'})" if uses else f"• {name}")
+
+    def request_select_usages(self):
+        node = self.current_style()
+        if node:
+            self.select_usages_requested.emit(*node)
+
+    def request_rename(self):
+        node = self.current_style()
+        if node:
+            self.rename_requested.emit(*node)
+
+    def update_style(self, table, name, style):
+        """
+        Re-read one edited style (``style`` may carry a new name, or be None
+        if it was removed); only the styles depending on it are recomputed.
+        """
+        new_name = style.get('name', name) if style is not None else None
+        if style is None or new_name != name:
+            self.style_graph.remove_style(table, name)
+        if style is not None:
+            self.style_graph.set_style(table, new_name, style)
+        style_list = self.style_lists.get(table)
+        if style_list is not None and new_name != name:
+            for i in range(style_list.count()):
+                item = style_list.item(i)
+                if item.data(Qt.UserRole) == (table, name):
+                    if style is None:
+                        style_list.takeItem(i)
+                    else:
+                        item.setData(Qt.UserRole, (table, new_name))
+                    break
+            self._usage_version = None
+            self.refresh_usage_counts()
+        self.refresh_broken_summary()
+        self.show_style_details(self.current_style())
+
+    def refresh_broken_summary(self):
+        broken = self.style_graph.broken_references()
+        if not broken:
+            self.broken_label.hide()
+            return
+        lines = [f"{source[1]}: {key} → missing {target[0]} \"{target[1]}\"" for source, key, target in broken]
+        self.broken_label.setText(f"{len(broken)} broken style reference(s):\n" + "\n".join(lines))
+        self.broken_label.show()
+
+    def current_style(self):
+        style_list = self.info_tabs.currentWidget().findChild(QListWidget)
+        item = style_list.currentItem() if style_list else None
+        return item.data(Qt.UserRole) if item else None
+
+    def on_style_selected(self, current, previous=None):
+        self.show_style_details(current.data(Qt.UserRole) if current else None)
+
+    def show_style_details(self, node):
+        """Show references, transitive dependencies and dependents of a style node."""
+        if not node:
+            self.details_label.clear()
             return
-        page_styles = styling_data.get('page_styles', [])
-        page_text = "Available Page Styles:\n" + "\n".join([f"• {style}" for style in page_styles])
-        self.page_styles_label.setText(page_text)
-        content_styles = styling_data.get('content_styles', [])
-        content_text = "Available Content Styles:\n" + "\n".join([f"• {style}" for style in content_styles])
-        self.content_styles_label.setText(content_text)
-        letter_styles = styling_data.get('letter_styles', [])
-        letter_text = "Available Letter Styles:\n" + "\n".join([f"• {style}" for style in letter_styles])
-        self.letter_styles_label.setText(letter_text)
+        graph = self.style_graph
+        lines = [f"{node[1]} ({node[0]})"]
+        references = graph.references(node)
+        if references:
+            lines.append("References:")
+            lines.extend(f"  {key} → {target[1]}" for key, target in references)
+        dependencies = sorted(graph.dependencies(node))
+        if dependencies:
+            lines.append("Depends on:")
+            lines.extend(f"  {name} ({table})" for table, name in dependencies)
+        dependents = sorted(graph.dependents(node))
+        if dependents:
+            lines.append("Used by:")
+            lines.extend(f"  {name} ({table})" for table, name in dependents)
+        broken = graph.broken_dependencies(node)
+        if broken:
+            lines.append("Broken references:")
+            lines.extend(f"  {source[1]}: {key} → missing \"{target[1]}\"" for source, key, target in broken)
+        self.details_label.setText("\n".join(lines))
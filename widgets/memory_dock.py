@@ -0,0 +1,120 @@
+from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtWidgets import (
+    QDockWidget, QWidget, QVBoxLayout, QHBoxLayout, QLabel, QTableWidget, QTableWidgetItem,
+    QHeaderView, QPushButton, QCheckBox, QFileDialog, QMessageBox
+)
+from memory_stats import format_bytes
+
+
+class MemoryDock(QDockWidget):
+    """
+    Debug dock listing approximate memory per subsystem.
+    Refreshes periodically while visible; allocation tracing (tracemalloc)
+    is only switched on while the checkbox is ticked, as it slows editing.
+    """
+    REFRESH_MS = 5000
+
+    def __init__(self, accountant, parent=None):
+        super().__init__("Memory", parent)
+        self.setObjectName("memory_dock")
+        self.accountant = accountant
+        body = QWidget()
+        layout = QVBoxLayout(body)
+        self.process_label = QLabel()
+        layout.addWidget(self.process_label)
+
+        self.subsystem_table = self._create_table(["Subsystem", "Size", "Details"])
+        layout.addWidget(self.subsystem_table)
+
+        self.trace_check = QCheckBox("Trace allocations (tracemalloc)")
+        self.trace_check.setToolTip("Record Python allocation sites; slows the editor while enabled")
+        self.trace_check.setChecked(accountant.is_tracing())
+        self.trace_check.toggled.connect(self.on_trace_toggled)
+        layout.addWidget(self.trace_check)
+        self.allocation_table = self._create_table(["Allocation Site", "Size", "Blocks"])
+        self.allocation_table.setVisible(accountant.is_tracing())
+        layout.addWidget(self.allocation_table)
+
+        buttons = QHBoxLayout()
+        refresh_btn = QPushButton("Refresh")
+        refresh_btn.clicked.connect(self.refresh)
+        buttons.addWidget(refresh_btn)
+        dump_btn = QPushButton("Save JSON…")
+        dump_btn.setToolTip("Write the memory report to a JSON file")
+        dump_btn.clicked.connect(self.save_report)
+        buttons.addWidget(dump_btn)
+        buttons.addStretch()
+        layout.addLayout(buttons)
+        self.setWidget(body)
+
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setInterval(self.REFRESH_MS)
+        self.refresh_timer.timeout.connect(self.refresh)
+        self.visibilityChanged.connect(self.on_visibility_changed)
+
+    @staticmethod
+    def _create_table(labels):
+        table = QTableWidget(0, len(labels))
+        table.setHorizontalHeaderLabels(labels)
+        table.verticalHeader().setVisible(False)
+        table.setEditTriggers(QTableWidget.NoEditTriggers)
+        table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeToContents)
+        table.horizontalHeader().setStretchLastSection(True)
+        return table
+
+    def on_visibility_changed(self, visible):
+        if visible:
+            self.refresh()
+            self.refresh_timer.start()
+        else:
+            self.refresh_timer.stop()
+
+    def on_trace_toggled(self, checked):
+        if checked:
+            self.accountant.start_tracing()
+        else:
+            self.accountant.stop_tracing()
+        self.allocation_table.setVisible(checked)
+        self.refresh()
+
+    def refresh(self):
+        report = self.accountant.report()
+        process = report['process']
+        parts = []
+        if 'rss' in process:
+            parts.append(f"Process RSS: {format_bytes(process['rss'])}")
+        if 'peak_rss' in process:
+            parts.append(f"peak {format_bytes(process['peak_rss'])}")
+        traced = report.get('tracemalloc')
+        if traced:
+            parts.append(f"traced {format_bytes(traced['current'])} (peak {format_bytes(traced['peak'])})")
+        self.process_label.setText(", ".join(parts) or "Process memory unavailable")
+
+        subsystems = report['subsystems']
+        self.subsystem_table.setRowCount(len(subsystems))
+        for row, entry in enumerate(subsystems):
+            self._set_row(self.subsystem_table, row,
+                          (entry['subsystem'], format_bytes(entry['bytes']), entry['detail']))
+        top = traced['top'] if traced else []
+        self.allocation_table.setRowCount(len(top))
+        for row, site in enumerate(top):
+            self._set_row(self.allocation_table, row,
+                          (site['site'], format_bytes(site['bytes']), str(site['blocks'])))
+
+    @staticmethod
+    def _set_row(table, row, values):
+        for col, text in enumerate(values):
+            item = QTableWidgetItem(text)
+            if col == 1:
+                item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+            table.setItem(row, col, item)
+
+    def save_report(self):
+        path, _ = QFileDialog.getSaveFileName(self, "Save Memory Report", "memory_report.json",
+                                              "JSON Files (*.json)")
+        if not path:
+            return
+        try:
+            self.accountant.dump_json(path)
+        except OSError as e:
+            QMessageBox.critical(self, "Error", f"Failed to save memory report: {e}")
@@ -1,4 +1,4 @@
-from PyQt5.QtWidgets import QMenuBar
+from PyQt5.QtWidgets import QMenuBar, QMenu
 from PyQt5.QtGui import QKeySequence
 
 
@@ -22,6 +22,13 @@ class MenuBar(QMenuBar):
         self.actions['save'] = file_menu.addAction('&Save')
         self.actions['save'].setShortcut(QKeySequence.Save)
         file_menu.addSeparator()
+        self.actions['merge_csv'] = file_menu.addAction('&Merge CSV Files…')
+        self.actions['import_sheet'] = file_menu.addAction('&Import Spreadsheet…')
+        self.actions['export_sheet'] = file_menu.addAction('Ex&port Spreadsheet…')
+        file_menu.addSeparator()
+        self.actions['database_storage'] = file_menu.addAction('&Database Storage')
+        self.actions['database_storage'].setCheckable(True)
+        file_menu.addSeparator()
         self.actions['exit'] = file_menu.addAction('E&xit')
         self.actions['exit'].setShortcut(QKeySequence.Quit)
 
@@ -38,6 +45,34 @@ class MenuBar(QMenuBar):
         self.actions['copy'].setShortcut(QKeySequence.Copy)
         self.actions['paste'] = edit_menu.addAction('&Paste')
         self.actions['paste'].setShortcut(QKeySequence.Paste)
+        edit_menu.addSeparator()
+        self.actions['fill_down'] = edit_menu.addAction('Fill &Down')
+        self.actions['fill_down'].setShortcut('Ctrl+D')
+        self.actions['fill_value'] = edit_menu.addAction('Fill with &Value…')
+        self.actions['fill_value'].setShortcut('Ctrl+Shift+L')
+        self.actions['fill_series'] = edit_menu.addAction('Fill &Series…')
+        self.actions['fill_series'].setShortcut('Ctrl+Alt+S')
+        self.actions['clear_cells'] = edit_menu.addAction('C&lear Cells')
+        self.actions['clear_cells'].setShortcut(QKeySequence.Delete)
+        edit_menu.addSeparator()
+        self.actions['move_rows_up'] = edit_menu.addAction('Move Rows &Up')
+        self.actions['move_rows_up'].setShortcut('Alt+Up')
+        self.actions['move_rows_down'] = edit_menu.addAction('Move Rows Do&wn')
+        self.actions['move_rows_down'].setShortcut('Alt+Down')
+        self.actions['cut_rows'] = edit_menu.addAction('Cut &Rows')
+        self.actions['cut_rows'].setShortcut('Ctrl+Shift+X')
+        self.actions['insert_cut_rows'] = edit_menu.addAction('&Insert Cut Rows')
+        self.actions['insert_cut_rows'].setShortcut('Ctrl+Shift+V')
+
+        # View menu
+        view_menu = self.addMenu('&View')
+        self.actions['split_view'] = view_menu.addAction('&Split View')
+        self.actions['split_view'].setCheckable(True)
+        self.actions['split_view'].setShortcut('Ctrl+Alt+2')
+        self.actions['new_window'] = view_menu.addAction('New &Window')
+        view_menu.addSeparator()
+        self.actions['rendered_preview'] = view_menu.addAction('Show As &Rendered')
+        self.actions['rendered_preview'].setCheckable(True)
 
         # Tools menu
         tools_menu = self.addMenu('&Tools')
@@ -45,7 +80,44 @@ class MenuBar(QMenuBar):
         self.actions['reorder'].setShortcut('Ctrl+R')
         self.actions['refresh_styling'] = tools_menu.addAction('Refresh &Styling Data')
         self.actions['refresh_styling'].setShortcut('F5')
+        self.actions['edit_styling'] = tools_menu.addAction('&Edit Styling…')
+        self.actions['edit_styling'].setShortcut('Ctrl+Shift+E')
+        tools_menu.addSeparator()
+        self.actions['find_duplicates'] = tools_menu.addAction('Find &Duplicates')
+        self.actions['find_duplicates'].setShortcut('Ctrl+Shift+D')
+        self.actions['filter_view'] = tools_menu.addAction('&Filter View…')
+        self.actions['filter_view'].setShortcut('Ctrl+Shift+F')
+        self.actions['compare'] = tools_menu.addAction('&Compare with File…')
+        self.actions['compare'].setShortcut('Ctrl+Shift+K')
+        self.actions['check_casing'] = tools_menu.addAction('Check C&asing…')
+        tools_menu.addSeparator()
+        self.actions['thumbnails'] = tools_menu.addAction('Show &Thumbnails')
+        self.actions['thumbnails'].setCheckable(True)
+        self.actions['thumbnails'].setChecked(True)
+        self.actions['memory_dock'] = tools_menu.addAction('&Memory Dashboard')
+        self.actions['memory_dock'].setCheckable(True)
+        self.actions['memory_dock'].setShortcut('Ctrl+Shift+M')
+        self.actions['plugins'] = tools_menu.addAction('&Plugins…')
+        self.actions['stall_report'] = tools_menu.addAction('UI Sta&lls…')
 
         # Help menu
-        help_menu = self.addMenu('&Help')
-        self.actions['about'] = help_menu.addAction('&About')
+        self.help_menu = self.addMenu('&Help')
+        self.actions['about'] = self.help_menu.addAction('&About')
+
+    def add_plugin_action(self, key, menu_title, title, shortcut=''):
+        """Add a plugin tool to the menu named ``menu_title`` (created before Help if missing)."""
+        menu = None
+        # ``self.actions`` is the dict of named actions, so call the QWidget method explicitly
+        for action in QMenuBar.actions(self):
+            if action.menu() is not None and action.text().replace('&', '') == menu_title:
+                menu = action.menu()
+                break
+        if menu is None:
+            # Keep Help last
+            menu = QMenu(menu_title, self)
+            self.insertMenu(self.help_menu.menuAction(), menu)
+        action = menu.addAction(title)
+        if shortcut:
+            action.setShortcut(QKeySequence(shortcut))
+        self.actions[key] = action
+        return action
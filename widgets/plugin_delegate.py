@@ -0,0 +1,41 @@
+from PyQt5.QtWidgets import QStyledItemDelegate, QToolTip
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QBrush, QColor
+
+INVALID_BACKGROUND = QColor(255, 222, 222)
+
+
+class PluginColumnDelegate(QStyledItemDelegate):
+    """
+    Delegate for a column claimed by a plugin column type: the plugin's
+    formatter supplies the display text, invalid values get a tinted
+    background (with the validator's message as tooltip) and the plugin's
+    editor replaces the default one. All calls go through the registry, which
+    times them.
+    """
+    def __init__(self, registry, column_type, parent=None):
+        super().__init__(parent)
+        self.registry = registry
+        self.column_type = column_type
+
+    def displayText(self, value, locale):
+        text = super().displayText(value, locale)
+        return self.registry.format(self.column_type, text) if text else text
+
+    def initStyleOption(self, option, index):
+        super().initStyleOption(option, index)
+        value = index.data(Qt.EditRole)
+        if value and self.registry.validate(self.column_type, value):
+            option.backgroundBrush = QBrush(INVALID_BACKGROUND)
+
+    def createEditor(self, parent, option, index):
+        editor = self.registry.create_editor(self.column_type, parent)
+        return editor if editor is not None else super().createEditor(parent, option, index)
+
+    def helpEvent(self, event, view, option, index):
+        value = index.data(Qt.EditRole)
+        message = self.registry.validate(self.column_type, value) if value else None
+        if message and event.type() == event.ToolTip:
+            QToolTip.showText(event.globalPos(), f"{self.column_type.plugin.name}: {message}", view)
+            return True
+        return super().helpEvent(event, view, option, index)
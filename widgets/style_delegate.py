@@ -0,0 +1,38 @@
+from PyQt5.QtWidgets import QStyledItemDelegate, QComboBox
+from PyQt5.QtCore import Qt
+
+
+class StyleComboDelegate(QStyledItemDelegate):
+    """
+    Item delegate offering a style dropdown while a styling cell is edited.
+    Cells are painted as plain text, so no widget exists per cell; the combo
+    box is created only for the cell being edited.
+    """
+    def __init__(self, items_provider, parent=None):
+        super().__init__(parent)
+        # Callable returning the dropdown items for a column index
+        self.items_provider = items_provider
+
+    def createEditor(self, parent, option, index):
+        combo = QComboBox(parent)
+        combo.setEditable(True)
+        combo.setInsertPolicy(QComboBox.NoInsert)
+        combo.addItems(self.items_provider(index.column()))
+        # Picking an entry commits right away instead of waiting for focus loss
+        combo.activated.connect(lambda _=None, c=combo: self._commit(c))
+        return combo
+
+    def setEditorData(self, editor, index):
+        value = index.data(Qt.EditRole) or ""
+        position = editor.findText(value)
+        if position >= 0:
+            editor.setCurrentIndex(position)
+        else:
+            editor.setEditText(value)
+
+    def setModelData(self, editor, model, index):
+        model.setData(index, editor.currentText(), Qt.EditRole)
+
+    def _commit(self, editor):
+        self.commitData.emit(editor)
+        self.closeEditor.emit(editor, QStyledItemDelegate.NoHint)
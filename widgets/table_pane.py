@@ -0,0 +1,99 @@
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QComboBox, QPushButton
+from PyQt5.QtCore import Qt
+from filter_index import OP_IN
+
+
+class TablePane(QWidget):
+    """
+    A second view of the spreadsheet's model, used for the split pane and
+    for extra windows. It has its own scroll position, selection and a
+    one-column row filter; edits go to the shared model and undo history.
+    """
+
+    def __init__(self, spreadsheet, parent=None):
+        super().__init__(parent)
+        self.spreadsheet = spreadsheet
+        self.view = spreadsheet.create_view()
+        self.init_ui()
+        spreadsheet.model.modelReset.connect(self.fill_columns)
+        self.fill_columns()
+
+    def init_ui(self):
+        """Initialize the pane UI."""
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        bar = QHBoxLayout()
+        bar.addWidget(QLabel("Show rows where"))
+        self.column_combo = QComboBox()
+        self.column_combo.currentIndexChanged.connect(self.fill_values)
+        bar.addWidget(self.column_combo)
+        bar.addWidget(QLabel("is"))
+        self.value_combo = QComboBox()
+        self.value_combo.setMinimumWidth(160)
+        self.value_combo.activated.connect(self.apply_filter)
+        bar.addWidget(self.value_combo)
+        clear_btn = QPushButton("Show All")
+        clear_btn.clicked.connect(self.clear_filter)
+        bar.addWidget(clear_btn)
+        bar.addStretch()
+        layout.addLayout(bar)
+        layout.addWidget(self.view)
+
+    def fill_columns(self):
+        headers = self.spreadsheet.get_headers()
+        self.column_combo.blockSignals(True)
+        self.column_combo.clear()
+        for col in self.spreadsheet.filter_index.columns:
+            self.column_combo.addItem(headers[col], col)
+        self.column_combo.blockSignals(False)
+        self.fill_values()
+        self.show_current_filter()
+
+    def show_current_filter(self):
+        """Set the combos to the filter the spreadsheet applies to this view (none after a reset dropped it)."""
+        entry = self.spreadsheet.view_filters.get(self.view)
+        if entry is None:
+            self.value_combo.setCurrentIndex(0)
+            return
+        col, _, values = entry[0][0]
+        found = self.column_combo.findData(col)
+        if found >= 0 and found != self.column_combo.currentIndex():
+            self.column_combo.setCurrentIndex(found)
+        found = self.value_combo.findData(values[0])
+        self.value_combo.setCurrentIndex(found if found >= 0 else 0)
+
+    def fill_values(self, *_):
+        """List the column's distinct values with their row counts."""
+        self.value_combo.clear()
+        self.value_combo.addItem("(any)", None)
+        col = self.column_combo.currentData()
+        if col is not None:
+            for value, count in self.spreadsheet.filter_index.value_counts(col):
+                self.value_combo.addItem(f"{value or '(empty)'}  ({count})", value)
+
+    def apply_filter(self, *_):
+        col = self.column_combo.currentData()
+        value = self.value_combo.currentData()
+        clauses = [(col, OP_IN, [value])] if col is not None and value is not None else []
+        self.spreadsheet.set_view_filter(self.view, clauses)
+
+    def clear_filter(self):
+        self.value_combo.setCurrentIndex(0)
+        self.spreadsheet.set_view_filter(self.view, [])
+
+    def closeEvent(self, event):
+        self.spreadsheet.remove_view(self.view)
+        super().closeEvent(event)
+
+
+class TableWindow(TablePane):
+    """Top-level window showing the credits through a TablePane; ``actions`` keep their shortcuts here."""
+
+    def __init__(self, spreadsheet, actions=(), title="Credits", parent=None):
+        super().__init__(spreadsheet, parent)
+        self.setWindowFlags(self.windowFlags() | Qt.Window)
+        self.setAttribute(Qt.WA_DeleteOnClose)
+        self.setWindowTitle(title)
+        self.layout().setContentsMargins(6, 6, 6, 6)
+        self.resize(900, 600)
+        self.addActions(list(actions))
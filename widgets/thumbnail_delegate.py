@@ -0,0 +1,95 @@
+from PyQt5.QtWidgets import QStyledItemDelegate, QStyleOptionViewItem, QStyle, QApplication, QToolTip
+from PyQt5.QtCore import Qt, QRect, QTimer
+from PyQt5.QtGui import QColor, QPen, QPixmap
+from thumbnail_cache import MISSING, NO_PREVIEW, media_references
+
+
+class ThumbnailDelegate(QStyledItemDelegate):
+    """
+    Paints cells with thumbnails of their ``{{Pic}}`` and ``{{Video}}``
+    references at the right edge. Thumbnails come from a ThumbnailCache;
+    until one is ready a placeholder box is drawn, and the view repaints
+    (at most once per REPAINT_MS) as thumbnails arrive.
+    """
+    PADDING = 2
+    MAX_THUMBNAILS = 4
+    REPAINT_MS = 50
+
+    def __init__(self, cache, view):
+        super().__init__(view)
+        self.cache = cache
+        self.view = view
+        self.enabled = True
+        self._repaint_timer = QTimer(self)
+        self._repaint_timer.setSingleShot(True)
+        self._repaint_timer.setInterval(self.REPAINT_MS)
+        self._repaint_timer.timeout.connect(lambda: self.view.viewport().update())
+        cache.thumbnail_ready.connect(self._repaint_timer.start)
+
+    def set_enabled(self, enabled):
+        self.enabled = enabled
+        self.view.viewport().update()
+
+    def paint(self, painter, option, index):
+        text = index.data(Qt.DisplayRole) or ""
+        references = media_references(text)[:self.MAX_THUMBNAILS] if self.enabled else ()
+        if not references:
+            super().paint(painter, option, index)
+            return
+        height = max(8, option.rect.height() - 2 * self.PADDING)
+        thumbnails = [self.cache.thumbnail(kind, name, height) for kind, name in references]
+        widths = [t.width() if isinstance(t, QPixmap) else height * 3 // 2 for t in thumbnails]
+        total = sum(widths) + self.PADDING * (len(widths) + 1)
+        total = min(total, option.rect.width() // 2)
+
+        # Background and selection for the whole cell, then the text beside the thumbnails
+        opt = QStyleOptionViewItem(option)
+        self.initStyleOption(opt, index)
+        style = opt.widget.style() if opt.widget else QApplication.style()
+        style.drawPrimitive(QStyle.PE_PanelItemViewItem, opt, painter, opt.widget)
+        text_option = QStyleOptionViewItem(option)
+        text_option.rect = option.rect.adjusted(0, 0, -total, 0)
+        super().paint(painter, text_option, index)
+
+        painter.save()
+        painter.setClipRect(option.rect)
+        x = option.rect.right() - total + self.PADDING + 1
+        y = option.rect.top() + self.PADDING
+        for (kind, name), thumbnail, width in zip(references, thumbnails, widths):
+            target = QRect(x, y, width, height)
+            if isinstance(thumbnail, QPixmap):
+                painter.drawPixmap(target, thumbnail)
+            else:
+                self._paint_placeholder(painter, target, kind, thumbnail)
+            x += width + self.PADDING
+        painter.restore()
+
+    @staticmethod
+    def _paint_placeholder(painter, rect, kind, state):
+        """Grey box while rendering; film mark for videos; red outline for missing files."""
+        color = QColor(200, 40, 40) if state == MISSING else QColor(160, 160, 160)
+        painter.setPen(QPen(color, 1, Qt.DashLine if state is None else Qt.SolidLine))
+        painter.setBrush(QColor(235, 235, 235))
+        painter.drawRect(rect.adjusted(0, 0, -1, -1))
+        if state == MISSING:
+            label = "?"
+        elif state == NO_PREVIEW:
+            label = "▶" if kind == 'Video' else "✕"
+        else:
+            return
+        painter.setPen(QColor(90, 90, 90))
+        painter.drawText(rect, Qt.AlignCenter, label)
+
+    def helpEvent(self, event, view, option, index):
+        # Name the referenced files, which the thumbnails alone may not make clear
+        text = index.data(Qt.DisplayRole) or ""
+        references = media_references(text) if self.enabled else ()
+        if references and event.type() == event.ToolTip:
+            lines = []
+            for kind, name in references:
+                found, path = self.cache.path_of(name)
+                where = (path or 'not found in the project folder') if found else 'looking in the project folder…'
+                lines.append(f"{kind} {name}: {where}")
+            QToolTip.showText(event.globalPos(), "\n".join(lines), view)
+            return True
+        return super().helpEvent(event, view, option, index)